@@ -9,10 +9,7 @@
 import pandas as pd
 import streamlit as st
 
-from relay_ai.batch import corpus_hash, load_tasks_from_path, run_batch
-
-# Corpus cache: avoid reloading same corpus across tasks
-_CORPUS_CACHE: dict[str, Any] = {}
+from relay_ai.batch import load_corpus_cached, load_tasks_from_path, run_batch
 
 
 async def _run_once(task_text: str, corpus_paths: list[str] | None, cfg: dict[str, Any]) -> dict[str, Any]:
@@ -22,17 +19,12 @@ async def _run_once(task_text: str, corpus_paths: list[str] | None, cfg: dict[st
     """
     grounded = bool(corpus_paths)
     try:
-        from relay_ai.corpus import load_corpus
         from relay_ai.debate import run_debate
         from relay_ai.judge import judge_drafts
         from relay_ai.publish import select_publish_text
 
         # Use corpus cache to avoid reloading
-        cor_hash = corpus_hash(corpus_paths)
-        corpus_docs = _CORPUS_CACHE.get(cor_hash)
-        if grounded and corpus_docs is None:
-            corpus_docs = load_corpus(corpus_paths)
-            _CORPUS_CACHE[cor_hash] = corpus_docs
+        corpus_docs = load_corpus_cached(corpus_paths) if grounded else None
         drafts = run_debate(
             task=task_text,
             max_tokens=int(cfg.get("max_tokens", 1000)),
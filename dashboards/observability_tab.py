@@ -781,10 +781,10 @@ def _render_orchestrator():
             get_events_path,
             get_state_path,
             load_events,
-            per_tenant_load,
+            per_tenant_load_from_log,
             summarize_dags,
             summarize_schedules,
-            summarize_tasks,
+            summarize_tasks_from_log,
         )
 
         # Load events
@@ -808,7 +808,7 @@ def _render_orchestrator():
         # Task KPIs (last 24h)
         st.markdown("#### Task Metrics (Last 24 Hours)")
 
-        task_stats = summarize_tasks(events, window_hours=24)
+        task_stats = summarize_tasks_from_log(events_path, window_hours=24)
         recent = task_stats.get("last_24h", {})
 
         col1, col2, col3, col4 = st.columns(4)
@@ -892,7 +892,7 @@ def _render_orchestrator():
         # Per-tenant load
         st.markdown("#### Per-Tenant Load (Last 24 Hours)")
 
-        tenant_stats = per_tenant_load(events, window_hours=24)
+        tenant_stats = per_tenant_load_from_log(events_path, window_hours=24)
 
         if tenant_stats:
             import pandas as pd
@@ -55,13 +55,31 @@
 }
 
 
+# The finder sits at the head of sys.meta_path and sees every import, so
+# resolution is answered from a table: names outside the mapped top-level
+# packages are rejected with one set lookup, and mapped names are resolved once.
+_MAPPED_ROOTS = frozenset(prefix.partition(".")[0] for prefix in IMPORT_MAP)
+_PREFIXES_LONGEST_FIRST = sorted(IMPORT_MAP, key=len, reverse=True)
+_RESOLVED: dict[str, Optional[str]] = {}
+
+
 def _resolve_new_path(fullname: str) -> Optional[str]:
     """Convert old src.* import path to new relay_ai.* path."""
-    for old_prefix, new_prefix in IMPORT_MAP.items():
+    if fullname.partition(".")[0] not in _MAPPED_ROOTS:
+        return None
+    try:
+        return _RESOLVED[fullname]
+    except KeyError:
+        pass
+
+    new_name = None
+    for old_prefix in _PREFIXES_LONGEST_FIRST:
         if fullname == old_prefix or fullname.startswith(old_prefix + "."):
             # Replace prefix: "src.knowledge.api" → "relay_ai.platform.api.knowledge.api"
-            return new_prefix + fullname[len(old_prefix) :]
-    return None
+            new_name = IMPORT_MAP[old_prefix] + fullname[len(old_prefix) :]
+            break
+    _RESOLVED[fullname] = new_name
+    return new_name
 
 
 class _SrcImportProxy(importlib.abc.MetaPathFinder, importlib.abc.Loader):
@@ -2,6 +2,7 @@
 
 from .api import router as knowledge_router
 from .db.asyncpg_client import close_pool, init_pool, with_user_conn, SecurityError
+from .ingestion import close_ingestion_pipeline
 from .schemas import (
     ErrorResponse,
     FileIndexRequest,
@@ -16,6 +17,7 @@
     "SearchRequest",
     "ErrorResponse",
     "close_pool",
+    "close_ingestion_pipeline",
     "init_pool",
     "with_user_conn",
     "SecurityError",
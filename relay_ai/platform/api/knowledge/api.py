@@ -3,12 +3,25 @@
 # Phase: R2 Phase 2 (Implementation)
 # Security: JWT → RLS → AAD (three-layer defense)
 
+import asyncio
+import json
+import os
+import time
 import uuid
 from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, File, Form, HTTPException, Query, Request, Response, UploadFile
 
+from relay_ai.platform.api.knowledge.db.asyncpg_client import execute_mutation, execute_query_one
+from relay_ai.platform.api.knowledge.embeddings.client import embed_text
+from relay_ai.platform.api.knowledge.embeddings.service import EmbeddingUnavailableError
+from relay_ai.platform.api.knowledge.ingestion import (
+    IngestionConflictError,
+    IngestionQueueFullError,
+    IngestJob,
+    get_ingestion_pipeline,
+)
 from relay_ai.platform.api.knowledge.rate_limit.redis_bucket import get_rate_limit
 from relay_ai.platform.api.knowledge.schemas import (
     FileIndexRequest,
@@ -18,6 +31,7 @@
     SearchRequest,
     SearchResponse,
 )
+from relay_ai.platform.api.knowledge.search import ChunkMetadataIntegrityError, search_chunks
 from relay_ai.platform.api.knowledge.suggestions import suggestion_for
 from relay_ai.platform.security.memory.rls import hmac_user
 from relay_ai.monitoring.metrics_adapter import (
@@ -31,6 +45,9 @@
 # Initialize router
 router = APIRouter(prefix="/api/v1/knowledge", tags=["Knowledge API"])
 
+# How long POST /index waits for the pipeline before answering "processing"
+INDEX_WAIT_SEC = float(os.getenv("KNOWLEDGE_INDEX_WAIT_SEC", "30"))
+
 
 # ============================================================================
 # SECURITY HELPERS
@@ -86,6 +103,15 @@ async def check_rate_limit_and_get_status(user_hash: str, user_tier: str = "free
     return is_limited, status
 
 
+def _parse_tags(tags: Optional[str]) -> list[str]:
+    """Parse the JSON-array tags form field; malformed input yields no tags."""
+    try:
+        parsed = json.loads(tags or "[]")
+    except ValueError:
+        return []
+    return [str(tag) for tag in parsed] if isinstance(parsed, list) else []
+
+
 def sanitize_error_detail(detail: str) -> str:
     """
     Sanitize error details to prevent information disclosure.
@@ -166,14 +192,13 @@ async def upload_file(
         # mime_type = magic.from_buffer(file_bytes, mime=True)
         # if mime_type not in MIME_WHITELIST: raise...
 
-        file_size = 0
-        if hasattr(file, "size"):
-            file_size = file.size
-        else:
-            file_bytes = await file.read()
-            file_size = len(file_bytes)
-            await file.seek(0)
+        file_size = getattr(file, "size", None)
+        if file_size is not None and file_size > 50 * 1024 * 1024:  # 50MB
+            record_api_error("file_too_large", 413, request_id=request_id)
+            raise HTTPException(status_code=413, detail="File exceeds 50MB limit") from None
 
+        file_bytes = await file.read()
+        file_size = len(file_bytes)
         if file_size > 50 * 1024 * 1024:  # 50MB
             record_api_error("file_too_large", 413, request_id=request_id)
             raise HTTPException(status_code=413, detail="File exceeds 50MB limit") from None
@@ -181,22 +206,53 @@ async def upload_file(
         # 4. Create file entry in DB (RLS enforced at insert via trigger)
         file_id = uuid.uuid4()
 
-        # TODO: Store file in S3/local (encrypted)
-        # s3_path = f"user_files/{user_hash}/{file_id}"
-        # await store_file_encrypted(file_bytes, s3_path, user_hash)
-
-        # TODO: Insert into files table with RLS context
-        # await db.execute(
-        #     """
-        #     SET app.user_hash = %s;
-        #     INSERT INTO files (id, user_hash, title, s3_path, processing_status)
-        #     VALUES (%s, %s, %s, %s, 'queued')
-        #     """,
-        #     user_hash, file_id, title or file.filename, s3_path
-        # )
+        # Store original in S3/local; the ingestion pipeline reads it back page by page
+        from relay_ai.platform.api.knowledge.storage.s3_client import upload_file as store_original
+
+        s3_path = await store_original(str(file_id), file_bytes, file.content_type, user_hash)
+
+        # Insert the files row under the user's RLS context before queueing: file_embeddings
+        # references it, and the pipeline's status updates and index_file's lookup need it
+        file_title = title or file.filename or "untitled"
+        file_tags = _parse_tags(tags)
+        await execute_mutation(
+            user_hash,
+            """
+            INSERT INTO files (id, user_hash, title, file_size_bytes, mime_type, source, s3_path, tags,
+                               processing_status)
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, 'queued')
+            """,
+            file_id,
+            user_hash,
+            file_title,
+            file_size,
+            file.content_type,
+            source or "upload",
+            s3_path,
+            file_tags,
+        )
 
-        # TODO: Queue for processing (Redis or in-memory)
-        # await queue_file_for_processing(file_id, user_hash)
+        # Queue for extract → chunk → embed → store (processing happens off the request path)
+        try:
+            await get_ingestion_pipeline().submit(
+                IngestJob(
+                    file_id=file_id,
+                    user_hash=user_hash,
+                    mime_type=file.content_type,
+                    title=file_title,
+                    source=source or "upload",
+                    tags=file_tags,
+                )
+            )
+        except IngestionQueueFullError:
+            # Row stays visible as failed; POST /index can queue it again later
+            await execute_mutation(user_hash, "UPDATE files SET processing_status = 'failed' WHERE id = $1", file_id)
+            record_api_error("ingest_queue_full", 503, request_id=request_id)
+            raise HTTPException(
+                status_code=503,
+                detail="Ingestion queue is full. Try again shortly.",
+                headers={"Retry-After": "30"},
+            ) from None
 
         # 5. Return 202 Accepted
         await add_rate_limit_headers(response, status)
@@ -256,54 +312,60 @@ async def index_file(
             ) from None
 
         # 2. Check ownership (RLS should prevent seeing other users' files, but be explicit)
-        # TODO: Fetch file from DB with RLS
-        # file_row = await db.fetchrow(
-        #     "SELECT id FROM files WHERE id = %s AND user_hash = %s",
-        #     body.file_id, user_hash
-        # )
-        # if not file_row:
-        #     raise HTTPException(status_code=403, detail="Access denied") from None
-
-        # 3. Extract text from file
-        # TODO: Extract based on MIME type
-        # extracted_text = await extract_file(body.file_id, user_hash)
-
-        # 4. Chunk text
-        # TODO: Apply chunking strategy
-        # chunks = await chunk_text(extracted_text, strategy=body.chunk_strategy)
-
-        # 5. Generate embeddings
-        # TODO: Call embedding service with circuit breaker
-        # try:
-        #     embeddings = await embed_chunks(chunks, model=body.embedding_model)
-        # except HTTPException as e:
-        #     if e.status_code == 503:
-        #         raise HTTPException(status_code=503, detail="Embedding service unavailable") from None
-        #     raise
-
-        # 6. Store vectors with AAD
-        # TODO: Batch insert with RLS + AAD
-        # vectors_stored = await store_vectors(body.file_id, user_hash, chunks, embeddings)
-
-        # 7. Update file metadata
-        # TODO: Set indexed_at, chunks_count, processing_status = 'completed'
-        # await db.execute(
-        #     "UPDATE files SET indexed_at = NOW(), chunks_count = %s WHERE id = %s AND user_hash = %s",
-        #     len(chunks), body.file_id, user_hash
-        # )
+        file_row = await execute_query_one(
+            user_hash,
+            "SELECT mime_type, title, source, tags FROM files WHERE id = $1 AND user_hash = $2",
+            body.file_id,
+            user_hash,
+        )
+        if not file_row:
+            raise HTTPException(status_code=403, detail="Access denied") from None
+
+        # 3-7. Extract → chunk → embed → store via the ingestion pipeline.
+        # Joins the upload's job if the file is still being processed with the same
+        # parameters; a different chunking/model while it is in flight is a 409.
+        job = IngestJob(
+            file_id=body.file_id,
+            user_hash=user_hash,
+            mime_type=file_row["mime_type"],
+            title=file_row["title"] or "",
+            source=file_row["source"] or "upload",
+            tags=list(file_row["tags"] or []),
+            chunk_strategy=body.chunk_strategy.value,
+            chunk_overlap=body.chunk_overlap,
+            embedding_model=body.embedding_model.value,
+        )
+        pipeline = get_ingestion_pipeline()
+        try:
+            future = await pipeline.submit(job)
+        except IngestionQueueFullError:
+            raise HTTPException(status_code=503, detail="Ingestion queue is full. Try again shortly.") from None
+        except IngestionConflictError as e:
+            raise HTTPException(status_code=409, detail=f"{e}. Retry once the current indexing finishes.") from None
+
+        status_label = "indexed"
+        try:
+            job = await asyncio.wait_for(asyncio.shield(future), timeout=INDEX_WAIT_SEC)
+        except asyncio.TimeoutError:
+            job = pipeline.get_job(body.file_id) or job
+            status_label = "processing"
+        except EmbeddingUnavailableError:
+            raise HTTPException(status_code=503, detail="Embedding service unavailable") from None
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="File not found") from None
 
         await add_rate_limit_headers(response, status)
-        record_index_operation(operation="embed", item_count=0)
+        record_index_operation(operation="embed", item_count=job.vectors_stored)
 
         return FileIndexResponse(
             file_id=body.file_id,
-            chunks_created=0,  # TODO: Return actual count
-            tokens_processed=0,  # TODO: Return actual count
-            embedding_latency_ms=0,  # TODO: Return actual latency
+            chunks_created=job.chunks_created,
+            tokens_processed=job.tokens_processed,
+            embedding_latency_ms=int(job.embedding_ms),
             embedding_model_used=body.embedding_model.value,
-            vectors_stored=0,  # TODO: Return actual count
+            vectors_stored=job.vectors_stored,
             file_url=f"/api/v2/knowledge/files/{body.file_id}",
-            status="indexed",
+            status=status_label,
         )
 
     except HTTPException:
@@ -347,46 +409,44 @@ async def search_knowledge(
             ) from None
 
         # 3. Generate or use provided embedding
-        # TODO: If no query_embedding, call embedding service
-        # if body.query_embedding is None:
-        #     query_embedding = await embed_text(body.query, model="ada-002")
-        # else:
-        #     query_embedding = body.query_embedding
-
-        # 4. Vector search with RLS + filters
-        # TODO: Query file_embeddings with RLS + similarity threshold + filters
-        # results = await vector_search(
-        #     query_embedding=query_embedding,
-        #     user_hash=user_hash,
-        #     top_k=body.top_k,
-        #     similarity_threshold=body.similarity_threshold,
-        #     filters=body.filters
-        # )
-
-        # 5. Check cache hit status
-        # TODO: Check if result came from cache
-        # cache_hit = is_cached(body.query)
-
-        # 6. Decrypt metadata for each result
-        # TODO: Decrypt metadata_encrypted + metadata_aad for each result
-        # for result in results:
-        #     aad = get_file_aad(user_hash, result.file_id)
-        #     try:
-        #         result.metadata = decrypt_with_aad(result.metadata_encrypted, aad)
-        #     except ValueError:
-        #         # AAD mismatch: Normalize to 404 (not 403) to prevent existence oracle
-        #         raise HTTPException(status_code=404, detail="File not found") from None
+        started = time.perf_counter()
+        query_embedding = body.query_embedding
+        if query_embedding is None:
+            query_embedding = await embed_text(body.query)
+            if query_embedding is None:
+                raise HTTPException(status_code=503, detail="Embedding service unavailable") from None
+
+        # 4. Vector search with RLS + filters (hot in-process index, else pgvector)
+        # 5. Metadata decrypted with AAD = HMAC(user_hash || file_id) per result
+        try:
+            results, cache_hit = await search_chunks(
+                user_hash,
+                query_embedding,
+                top_k=body.top_k,
+                similarity_threshold=body.similarity_threshold,
+                filters=body.filters,
+            )
+        except ChunkMetadataIntegrityError:
+            # AAD mismatch: Normalize to 404 (not 403) to prevent existence oracle
+            raise HTTPException(status_code=404, detail="File not found") from None
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from None
+
+        if not body.include_metadata:
+            for result in results:
+                result["metadata"] = {}
+        latency_ms = int((time.perf_counter() - started) * 1000)
 
         await add_rate_limit_headers(response, status)
-        record_vector_search(query_tokens=len(body.query.split()), results_count=0, latency_ms=0)
+        record_vector_search(query_tokens=len(body.query.split()), results_count=len(results), latency_ms=latency_ms)
 
         return SearchResponse(
             query=body.query,
-            results=[],  # TODO: Return actual results
-            total_results=0,  # TODO: Return actual count
-            latency_ms=0,  # TODO: Return actual latency
+            results=results,
+            total_results=len(results),
+            latency_ms=latency_ms,
             embedding_model_used="ada-002",
-            cache_hit=False,  # TODO: Return actual cache status
+            cache_hit=cache_hit,
         )
 
     except HTTPException:
@@ -3,8 +3,11 @@
 
 Multi-provider embeddings with circuit breaker and fallback.
 - Primary: OpenAI (text-embedding-ada-002)
-- Fallback: Local sentence-transformers
-- Circuit breaker: 250ms timeout, fail-fast on service unavailable
+- Local sentence-transformers: opt-in (EMBEDDING_BACKEND=local); never used as a
+  fallback for a model with a different dimension
+- Circuit breaker: 250ms + 20ms per text per provider batch, fail-fast on service unavailable
+- Cache + coalescing: see embeddings/service.py (content-addressed LRU with
+  optional disk/Redis tier; concurrent calls batched into one provider call)
 """
 
 import asyncio
@@ -12,13 +15,23 @@
 import os
 from typing import Optional
 
+from .service import get_embedding_service
+
 logger = logging.getLogger(__name__)
 
-# Phase 3 TODO: Initialize embedding services
 EMBEDDING_API_KEY = os.getenv("OPENAI_API_KEY", "")
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002")
 CIRCUIT_BREAKER_TIMEOUT_MS = 250
 
+# Known embedding dimensions per model
+EMBEDDING_DIMENSIONS = {
+    "text-embedding-ada-002": 1536,
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "all-MiniLM-L6-v2": 384,
+    "all-mpnet-base-v2": 768,
+}
+
 
 async def embed_text(
     text: str,
@@ -27,34 +40,24 @@ async def embed_text(
     """
     Generate embedding for text.
 
-    Primary: OpenAI API
-    Fallback: Local sentence-transformers
-    Circuit breaker: 250ms timeout
+    Primary: OpenAI API (or the local model with EMBEDDING_BACKEND=local)
+    Circuit breaker: per-batch provider timeout (see embeddings/service.py)
+
+    Identical (normalized) texts are served from the embedding cache, and
+    concurrent calls are coalesced into one provider batch.
 
     Returns: [0.1, 0.2, ...] or None if service unavailable
     """
     model = model or EMBEDDING_MODEL
 
     try:
-        # Phase 3 TODO: Implement OpenAI API call with circuit breaker
-        # import openai
-        # response = await asyncio.wait_for(
-        #     openai.ChatCompletion.acreate(
-        #         model=model,
-        #         input=text,
-        #     ),
-        #     timeout=CIRCUIT_BREAKER_TIMEOUT_MS / 1000.0,
-        # )
-        # return response["data"][0]["embedding"]
-
-        logger.debug(f"[Phase 3] Embed text with {model}: {len(text)} chars")
-        return None
+        return await get_embedding_service().embed(text, model)
 
     except asyncio.TimeoutError:
-        logger.warning(f"[Phase 3] Embedding service timeout ({CIRCUIT_BREAKER_TIMEOUT_MS}ms)")
+        logger.warning(f"Embedding service timeout ({CIRCUIT_BREAKER_TIMEOUT_MS}ms)")
         return None
     except Exception as e:
-        logger.error(f"[Phase 3] Embedding service error: {e}")
+        logger.error(f"Embedding service error: {e}")
         return None
 
 
@@ -65,36 +68,32 @@ async def embed_batch(
     """
     Generate embeddings for multiple texts (batch).
 
+    Cached texts are not re-embedded; the rest go to the provider in batches
+    of up to EMBEDDING_MAX_BATCH.
+
     Returns: [[0.1, 0.2, ...], ...] or None if service unavailable
     """
     model = model or EMBEDDING_MODEL
 
     try:
-        # Phase 3 TODO: Implement batch embedding with circuit breaker
-        # import openai
-        # response = await asyncio.wait_for(
-        #     openai.ChatCompletion.acreate(
-        #         model=model,
-        #         input=texts,
-        #     ),
-        #     timeout=CIRCUIT_BREAKER_TIMEOUT_MS / 1000.0,
-        # )
-        # return [item["embedding"] for item in response["data"]]
-
-        logger.debug(f"[Phase 3] Embed batch with {model}: {len(texts)} texts")
-        return None
+        return await get_embedding_service().embed_many(texts, model)
 
     except asyncio.TimeoutError:
-        logger.warning("[Phase 3] Embedding service timeout on batch")
+        logger.warning("Embedding service timeout on batch")
         return None
     except Exception as e:
-        logger.error(f"[Phase 3] Embedding service error on batch: {e}")
+        logger.error(f"Embedding service error on batch: {e}")
         return None
 
 
 def get_embedding_dimension(model: Optional[str] = None) -> int:
     """Get embedding dimension for model."""
     model = model or EMBEDDING_MODEL
-    # Phase 3 TODO: Return actual dimension per model
-    # ada-002: 1536, all-MiniLM-L6-v2: 384, etc.
+    if model in EMBEDDING_DIMENSIONS:
+        return EMBEDDING_DIMENSIONS[model]
     return 1536 if "ada" in model else 384
+
+
+def get_embedding_stats() -> dict:
+    """Cache hit rate and batching counters of the shared embedding service."""
+    return get_embedding_service().get_stats()
@@ -0,0 +1,537 @@
+"""
+Embedding service layer for Knowledge API.
+
+Sits between callers (embed_text / embed_batch) and embedding providers.
+- Content-addressed cache: key = (model, SHA-256 of normalized text)
+  - Tier 1: in-process LRU (packed float32)
+  - Tier 2 (optional): disk directory and/or Redis, shared across workers
+- Request coalescing: concurrent embed calls within EMBEDDING_BATCH_WINDOW_MS
+  become one provider batch; identical texts in flight share one request
+- Backends: OpenAI (default), local sentence-transformers (EMBEDDING_BACKEND=local).
+  An optional fallback (e.g. a second endpoint for the same model) is only used
+  if it serves the same model as the primary, since vectors from another model
+  (and dimension) can't share an index
+- Cache hit rate exported via Prometheus (embedding_cache_requests_total)
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sys
+import unicodedata
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from relay_ai.telemetry.prom import record_embedding_cache
+except ImportError:  # Telemetry package unavailable
+    record_embedding_cache = None
+
+# Backend selection: "openai" or "local". Local is opt-in only: a missing OPENAI_API_KEY
+# fails loudly rather than silently switching to a model with another dimension
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai")
+LOCAL_EMBEDDING_MODEL = os.getenv("LOCAL_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+# Provider timeout per batch: base + per-text allowance (a 256-text batch gets 250 + 256 * 20 ms)
+EMBEDDING_TIMEOUT_MS = float(os.getenv("EMBEDDING_TIMEOUT_MS", "250"))
+EMBEDDING_TIMEOUT_PER_TEXT_MS = float(os.getenv("EMBEDDING_TIMEOUT_PER_TEXT_MS", "20"))
+
+# Cache configuration
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "50000"))
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "")
+EMBEDDING_CACHE_REDIS_URL = os.getenv("EMBEDDING_CACHE_REDIS_URL", "")
+EMBEDDING_CACHE_TTL_SEC = int(os.getenv("EMBEDDING_CACHE_TTL_SEC", str(30 * 86400)))
+
+# Coalescing configuration
+EMBEDDING_BATCH_WINDOW_MS = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "10"))
+EMBEDDING_MAX_BATCH = int(os.getenv("EMBEDDING_MAX_BATCH", "256"))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_service_instance: Optional["EmbeddingService"] = None
+
+
+class EmbeddingUnavailableError(Exception):
+    """Raised when no backend could produce embeddings."""
+
+    pass
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys: NFC, collapsed whitespace, stripped."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def content_key(model: str, text: str) -> str:
+    """Content address for an embedding: SHA-256 of the normalized text, scoped by model."""
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model}:{digest}"
+
+
+def _pack(vector: list[float]) -> array:
+    return array("f", vector)
+
+
+def _to_bytes(vector: array) -> bytes:
+    if sys.byteorder != "little":
+        vector = array("f", vector)
+        vector.byteswap()
+    return vector.tobytes()
+
+
+def _from_bytes(data: bytes) -> array:
+    vector = array("f")
+    vector.frombytes(data)
+    if sys.byteorder != "little":
+        vector.byteswap()
+    return vector
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+
+class OpenAIEmbeddingBackend:
+    """OpenAI embeddings API (one request per batch)."""
+
+    name = "openai"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        timeout_ms: float = EMBEDDING_TIMEOUT_MS,
+        timeout_per_text_ms: float = EMBEDDING_TIMEOUT_PER_TEXT_MS,
+    ):
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY", "")
+        self.timeout_ms = timeout_ms
+        self.timeout_per_text_ms = timeout_per_text_ms
+        self._client = None
+
+    def timeout_for(self, count: int) -> float:
+        """Seconds allowed for one request of count texts."""
+        return (self.timeout_ms + self.timeout_per_text_ms * count) / 1000.0
+
+    def model_name(self, model: str) -> str:
+        return model
+
+    async def embed(self, texts: list[str], model: str) -> list[list[float]]:
+        if not self.api_key:
+            raise EmbeddingUnavailableError(
+                "OPENAI_API_KEY not configured (set EMBEDDING_BACKEND=local to use a local model)"
+            )
+        if self._client is None:
+            import openai
+
+            self._client = openai.AsyncOpenAI(api_key=self.api_key)
+
+        response = await asyncio.wait_for(
+            self._client.embeddings.create(model=model, input=texts),
+            timeout=self.timeout_for(len(texts)),
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+class LocalEmbeddingBackend:
+    """Local sentence-transformers model (CPU/GPU, no network once the model is cached).
+
+    Pass `encoder` (anything with a sentence-transformers style
+    encode(texts, ...) method) to run offline without loading a model.
+    """
+
+    name = "local"
+
+    def __init__(self, model_name: str = LOCAL_EMBEDDING_MODEL, encoder: Any = None):
+        self._model_name = model_name
+        self._encoder = encoder
+
+    def model_name(self, model: str) -> str:
+        # The local backend always uses its own model, whatever was requested
+        return self._model_name
+
+    def _get_encoder(self):
+        if self._encoder is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError as e:
+                raise EmbeddingUnavailableError(
+                    "sentence_transformers required for local embeddings. Install: pip install sentence-transformers"
+                ) from e
+            logger.info(f"Loading local embedding model: {self._model_name}")
+            self._encoder = SentenceTransformer(self._model_name)
+        return self._encoder
+
+    async def embed(self, texts: list[str], model: str) -> list[list[float]]:
+        def _encode():
+            vectors = self._get_encoder().encode(texts, batch_size=len(texts), normalize_embeddings=True)
+            return [list(map(float, vector)) for vector in vectors]
+
+        return await asyncio.to_thread(_encode)
+
+
+def get_backend(name: str):
+    """Instantiate a backend by name ("openai" or "local")."""
+    if name == "openai":
+        return OpenAIEmbeddingBackend()
+    if name == "local":
+        return LocalEmbeddingBackend()
+    raise ValueError(f"Unknown embedding backend: {name}")
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+
+class EmbeddingCache:
+    """Content-addressed embedding cache: memory LRU over optional disk and Redis tiers.
+
+    Vectors are stored as packed float32 in every tier.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = EMBEDDING_CACHE_SIZE,
+        disk_dir: Optional[str] = None,
+        redis_client: Any = None,
+        ttl_sec: int = EMBEDDING_CACHE_TTL_SEC,
+    ):
+        """Initialize cache.
+
+        Args:
+            max_entries: In-memory LRU capacity (0 disables the memory tier)
+            disk_dir: Directory for the disk tier (None disables)
+            redis_client: redis.asyncio client for the shared tier (None disables)
+            ttl_sec: Expiry for Redis entries
+        """
+        self.max_entries = max_entries
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.redis = redis_client
+        self.ttl_sec = ttl_sec
+        self._memory: OrderedDict[str, array] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _disk_path(self, key: str) -> Path:
+        model, digest = key.rsplit(":", 1)
+        model_dir = re.sub(r"[^A-Za-z0-9._-]", "_", model)
+        return self.disk_dir / model_dir / digest[:2] / f"{digest}.f32"
+
+    def _remember(self, key: str, vector: array) -> None:
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, keys: list[str]) -> dict[str, array]:
+        found = {}
+        for key in keys:
+            try:
+                found[key] = _from_bytes(self._disk_path(key).read_bytes())
+            except OSError:
+                continue
+        return found
+
+    def _write_disk(self, items: dict[str, array]) -> None:
+        for key, vector in items.items():
+            path = self._disk_path(key)
+            if path.exists():
+                continue
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(f".tmp{os.getpid()}")
+                tmp.write_bytes(_to_bytes(vector))
+                tmp.replace(path)
+            except OSError as e:
+                logger.warning(f"Embedding disk cache write failed: {e}")
+                return
+
+    async def get_many(self, keys: list[str]) -> dict[str, tuple[list[float], str]]:
+        """Look up keys tier by tier.
+
+        Returns:
+            {key: (vector, tier)} for hits; tier is "memory", "disk" or "redis".
+            Lower-tier hits are promoted to memory.
+        """
+        found: dict[str, tuple[list[float], str]] = {}
+        missing = []
+        for key in keys:
+            vector = self._memory.get(key)
+            if vector is None:
+                missing.append(key)
+            else:
+                self._memory.move_to_end(key)
+                found[key] = (vector.tolist(), "memory")
+
+        if missing and self.disk_dir is not None:
+            for key, vector in (await asyncio.to_thread(self._read_disk, missing)).items():
+                self._remember(key, vector)
+                found[key] = (vector.tolist(), "disk")
+            missing = [key for key in missing if key not in found]
+
+        if missing and self.redis is not None:
+            try:
+                values = await self.redis.mget([f"emb:{key}" for key in missing])
+            except Exception as e:
+                logger.warning(f"Embedding Redis cache read failed: {e}")
+                values = []
+            for key, value in zip(missing, values):
+                if value:
+                    vector = _from_bytes(value)
+                    self._remember(key, vector)
+                    found[key] = (vector.tolist(), "redis")
+
+        return found
+
+    async def put_many(self, items: dict[str, list[float]]) -> None:
+        """Store vectors in every configured tier."""
+        packed = {key: _pack(vector) for key, vector in items.items()}
+        for key, vector in packed.items():
+            self._remember(key, vector)
+
+        if self.disk_dir is not None:
+            await asyncio.to_thread(self._write_disk, packed)
+
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline()
+                for key, vector in packed.items():
+                    pipe.set(f"emb:{key}", _to_bytes(vector), ex=self.ttl_sec)
+                await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Embedding Redis cache write failed: {e}")
+
+    def clear(self) -> None:
+        self._memory.clear()
+
+
+# ============================================================================
+# Service
+# ============================================================================
+
+
+class EmbeddingService:
+    """Cached, coalescing front end over an embedding backend."""
+
+    def __init__(
+        self,
+        backend: Any = None,
+        fallback: Any = None,
+        cache: Optional[EmbeddingCache] = None,
+        batch_window_ms: float = EMBEDDING_BATCH_WINDOW_MS,
+        max_batch: int = EMBEDDING_MAX_BATCH,
+    ):
+        """Initialize service.
+
+        Args:
+            backend: Primary backend (default: EMBEDDING_BACKEND)
+            fallback: Backend used when the primary fails, only for models it
+                      serves identically (default: none)
+            cache: EmbeddingCache (default: memory LRU, plus disk/Redis tiers
+                   if EMBEDDING_CACHE_DIR / EMBEDDING_CACHE_REDIS_URL are set)
+            batch_window_ms: How long to wait for more texts before calling the provider
+            max_batch: Texts per provider call
+        """
+        self.backend = backend or get_backend(EMBEDDING_BACKEND)
+        self.fallback = fallback
+        self.cache = cache if cache is not None else _default_cache()
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+
+        # (model) -> pending [(key, text)] waiting for the window to close
+        self._pending: dict[str, list[tuple[str, str]]] = {}
+        self._flush_handles: dict[str, asyncio.TimerHandle] = {}
+        # key -> future shared by every caller waiting on that text (awaited through shield)
+        self._inflight: dict[str, asyncio.Future] = {}
+        # Running _flush tasks; the loop only keeps weak references
+        self._flush_tasks: set[asyncio.Task] = set()
+
+        self.stats = {
+            "requests": 0,
+            "hits_memory": 0,
+            "hits_disk": 0,
+            "hits_redis": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "provider_batches": 0,
+            "provider_texts": 0,
+            "fallback_batches": 0,
+        }
+
+    @property
+    def hit_rate(self) -> float:
+        hits = self.stats["hits_memory"] + self.stats["hits_disk"] + self.stats["hits_redis"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def get_stats(self) -> dict[str, Any]:
+        return {**self.stats, "hit_rate": self.hit_rate, "cache_entries": len(self.cache)}
+
+    async def embed(self, text: str, model: str) -> list[float]:
+        """Embed one text (coalesced with concurrent callers)."""
+        return (await self.embed_many([text], model))[0]
+
+    async def embed_many(self, texts: list[str], model: str) -> list[list[float]]:
+        """Embed texts, serving cached vectors and batching the rest.
+
+        Raises:
+            EmbeddingUnavailableError: If neither backend could embed a missing text
+        """
+        if not texts:
+            return []
+
+        cache_model = self._cache_model(model)
+        keys = [content_key(cache_model, text) for text in texts]
+        unique = dict(zip(keys, texts))
+        self.stats["requests"] += 1
+
+        hits = await self.cache.get_many(list(unique))
+        for _, tier in hits.values():
+            self.stats[f"hits_{tier}"] += 1
+            self._record_metric(cache_model, tier)
+
+        vectors = {key: vector for key, (vector, _) in hits.items()}
+        waiting = {}
+        for key, text in unique.items():
+            if key in vectors:
+                continue
+            self.stats["misses"] += 1
+            self._record_metric(cache_model, "miss")
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+            else:
+                future = self._enqueue(model, key, text)
+            waiting[key] = future
+
+        if waiting:
+            # Shielded: a caller that is cancelled or times out must not cancel the
+            # future other coalesced callers (and the flush) share
+            results = await asyncio.gather(*map(asyncio.shield, waiting.values()))
+            vectors.update(zip(waiting, results))
+
+        return [vectors[key] for key in keys]
+
+    def _cache_model(self, model: str) -> str:
+        return f"{self.backend.name}:{self.backend.model_name(model)}"
+
+    def _record_metric(self, cache_model: str, result: str) -> None:
+        if record_embedding_cache is not None:
+            record_embedding_cache(cache_model, result, self.hit_rate)
+
+    def _enqueue(self, model: str, key: str, text: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+        pending = self._pending.setdefault(model, [])
+        pending.append((key, text))
+
+        if len(pending) >= self.max_batch:
+            self._start_flush(model)
+        elif model not in self._flush_handles:
+            self._flush_handles[model] = loop.call_later(self.batch_window, self._start_flush, model)
+        return future
+
+    def _start_flush(self, model: str) -> None:
+        handle = self._flush_handles.pop(model, None)
+        if handle is not None:
+            handle.cancel()
+        batch = self._pending.pop(model, [])
+        while batch:
+            chunk, batch = batch[: self.max_batch], batch[self.max_batch :]
+            task = asyncio.ensure_future(self._flush(model, chunk))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: asyncio.Task) -> None:
+        self._flush_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Embedding flush failed: {task.exception()!r}")
+
+    async def _flush(self, model: str, batch: list[tuple[str, str]]) -> None:
+        keys = [key for key, _ in batch]
+        texts = [text for _, text in batch]
+        try:
+            vectors, backend = await self._call_backends(texts, model)
+            # Round to the cached float32 precision so misses and later hits return identical vectors
+            vectors = [_pack(vector).tolist() for vector in vectors]
+            if backend is self.backend:
+                await self.cache.put_many(dict(zip(keys, vectors)))
+            else:
+                # Fallback vectors come from another model: cache them under its key, not the primary's
+                fallback_model = f"{backend.name}:{backend.model_name(model)}"
+                await self.cache.put_many({content_key(fallback_model, t): v for t, v in zip(texts, vectors)})
+            for key, vector in zip(keys, vectors):
+                future = self._inflight.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_result(vector)
+        except Exception as e:
+            for key in keys:
+                future = self._inflight.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+
+    async def _call_backends(self, texts: list[str], model: str) -> tuple[list[list[float]], Any]:
+        """Embed with the primary backend, falling back on failure.
+
+        The fallback is only tried if it serves the same model as the primary;
+        vectors from a different model (e.g. 384-dim MiniLM for a vector(1536)
+        ada-002 column) would be silently wrong, so that case raises instead.
+
+        Returns:
+            (vectors, backend that produced them)
+        """
+        self.stats["provider_batches"] += 1
+        self.stats["provider_texts"] += len(texts)
+        try:
+            return await self.backend.embed(texts, model), self.backend
+        except Exception as e:
+            if self.fallback is None:
+                raise EmbeddingUnavailableError(f"{self.backend.name} embedding failed: {e}") from e
+            primary_model, fallback_model = self.backend.model_name(model), self.fallback.model_name(model)
+            if fallback_model != primary_model:
+                raise EmbeddingUnavailableError(
+                    f"{self.backend.name} embedding failed ({e}); {self.fallback.name} fallback serves "
+                    f"{fallback_model}, not {primary_model}"
+                ) from e
+            logger.warning(f"{self.backend.name} embedding failed ({e}); using {self.fallback.name} fallback")
+
+        self.stats["fallback_batches"] += 1
+        try:
+            return await self.fallback.embed(texts, model), self.fallback
+        except Exception as e:
+            raise EmbeddingUnavailableError(f"{self.fallback.name} fallback embedding failed: {e}") from e
+
+
+def _default_cache() -> EmbeddingCache:
+    redis_client = None
+    if EMBEDDING_CACHE_REDIS_URL:
+        try:
+            import redis.asyncio as redis_async
+
+            redis_client = redis_async.from_url(EMBEDDING_CACHE_REDIS_URL)
+        except ImportError:
+            logger.warning("redis not available; embedding cache Redis tier disabled")
+    return EmbeddingCache(disk_dir=EMBEDDING_CACHE_DIR or None, redis_client=redis_client)
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Get (or create) the shared embedding service configured from env."""
+    global _service_instance
+    if _service_instance is None:
+        _service_instance = EmbeddingService()
+    return _service_instance
+
+
+def set_embedding_service(service: Optional[EmbeddingService]) -> None:
+    """Replace the shared service (e.g. with a local backend in tests)."""
+    global _service_instance
+    _service_instance = service
@@ -0,0 +1,830 @@
+"""
+Streaming ingestion pipeline for Knowledge API.
+
+upload_file/index_file enqueue an IngestJob; pipeline workers run each file
+through four stages connected by bounded asyncio queues:
+
+    extract (page by page) -> chunk (token-aware) -> embed (batched) -> store (bulk insert)
+
+- Backpressure: a full channel blocks its producer, so a large PDF is never
+  fully extracted/chunked ahead of the embedder (memory ~ channel sizes)
+- Each stage has its own concurrency limit, shared across jobs, and metrics
+  (items, batches, busy time, time blocked on the downstream channel)
+- Chunking is deterministic, so chunk_index is stable across attempts; a
+  retried job skips chunks already committed and resumes at the chunk level
+- Failed attempts are retried with backoff up to INGEST_MAX_ATTEMPTS
+"""
+
+import asyncio
+import codecs
+import io
+import json
+import logging
+import os
+import re
+import time
+from collections.abc import Awaitable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+try:
+    from relay_ai.telemetry.prom import record_ingest_job, record_ingest_stage
+except ImportError:
+    record_ingest_job = None
+    record_ingest_stage = None
+
+# Configuration
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))  # Files processed concurrently
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "100"))  # Queued files before 503
+INGEST_CHANNEL_SIZE = int(os.getenv("INGEST_CHANNEL_SIZE", "16"))  # Items buffered between stages
+INGEST_EXTRACT_CONCURRENCY = int(os.getenv("INGEST_EXTRACT_CONCURRENCY", "2"))
+INGEST_CHUNK_CONCURRENCY = int(os.getenv("INGEST_CHUNK_CONCURRENCY", "2"))
+INGEST_EMBED_CONCURRENCY = int(os.getenv("INGEST_EMBED_CONCURRENCY", "4"))
+INGEST_STORE_CONCURRENCY = int(os.getenv("INGEST_STORE_CONCURRENCY", "2"))
+INGEST_CHUNK_TOKENS = int(os.getenv("INGEST_CHUNK_TOKENS", "512"))
+INGEST_EMBED_BATCH = int(os.getenv("INGEST_EMBED_BATCH", "64"))
+INGEST_STORE_BATCH = int(os.getenv("INGEST_STORE_BATCH", "256"))
+INGEST_MAX_ATTEMPTS = int(os.getenv("INGEST_MAX_ATTEMPTS", "3"))
+INGEST_RETRY_BACKOFF_SEC = float(os.getenv("INGEST_RETRY_BACKOFF_SEC", "2.0"))
+INGEST_TEXT_SEGMENT_BYTES = int(os.getenv("INGEST_TEXT_SEGMENT_BYTES", "65536"))
+
+STAGES = ("extract", "chunk", "embed", "store")
+
+# Provider model names for the EmbeddingModel enum values
+EMBEDDING_MODEL_NAMES = {
+    "ada-002": "text-embedding-ada-002",
+}
+
+PDF_TYPES = {"application/pdf"}
+DOCX_TYPES = {"application/vnd.openxmlformats-officedocument.wordprocessingml.document"}
+TEXT_TYPES = {"text/plain", "text/markdown"}
+
+_DONE = object()  # Channel sentinel
+
+
+class IngestionQueueFullError(Exception):
+    """Raised when the ingestion queue cannot accept another file."""
+
+    pass
+
+
+class IngestionConflictError(Exception):
+    """Raised when a file is already being ingested with different chunking/embedding parameters."""
+
+    pass
+
+
+class UnsupportedFileTypeError(Exception):
+    """Raised when no text extractor exists for a MIME type (not retried)."""
+
+    pass
+
+
+@dataclass
+class IngestJob:
+    """One file moving through the pipeline, with its progress counters."""
+
+    file_id: UUID
+    user_hash: str
+    mime_type: str
+    title: str = ""
+    source: str = "upload"
+    tags: list[str] = field(default_factory=list)
+    chunk_strategy: str = "smart"
+    chunk_overlap: int = 100
+    embedding_model: str = "ada-002"
+    resume: bool = False  # Keep chunks already stored for this file instead of re-indexing from scratch
+    status: str = "queued"  # queued | processing | completed | failed
+    attempts: int = 0
+    chunks_created: int = 0
+    chunks_skipped: int = 0
+    tokens_processed: int = 0
+    vectors_stored: int = 0
+    embedding_ms: float = 0.0
+    error: Optional[str] = None
+
+    def params(self) -> tuple[str, int, str]:
+        """Parameters that determine the stored chunks and vectors."""
+        return self.chunk_strategy, self.chunk_overlap, self.embedding_model
+
+
+@dataclass
+class Chunk:
+    """A chunk of extracted text; index is its stable position in the file."""
+
+    index: int
+    text: str
+    tokens: int
+    page: int
+
+
+@dataclass
+class StageStats:
+    """Counters for one pipeline stage."""
+
+    items: int = 0
+    batches: int = 0
+    errors: int = 0
+    busy_sec: float = 0.0  # Time spent doing the stage's work
+    blocked_sec: float = 0.0  # Time spent waiting on a full downstream channel
+
+
+# ============================================================================
+# EXTRACTION
+# ============================================================================
+
+
+def iter_segments(data: bytes, mime_type: str) -> Iterator[tuple[int, str]]:
+    """
+    Yield (page, text) segments of a file, one at a time.
+
+    PDF pages are extracted lazily, one per next(); DOCX paragraphs and plain
+    text are grouped into ~INGEST_TEXT_SEGMENT_BYTES segments.
+
+    Raises:
+        UnsupportedFileTypeError: No text extractor for mime_type (e.g. images)
+    """
+    if mime_type in PDF_TYPES:
+        return _iter_pdf_pages(data)
+    if mime_type in DOCX_TYPES:
+        return _iter_docx_segments(data)
+    if mime_type in TEXT_TYPES:
+        return _iter_text_segments(data)
+    raise UnsupportedFileTypeError(f"No text extractor for {mime_type}")
+
+
+def _iter_pdf_pages(data: bytes) -> Iterator[tuple[int, str]]:
+    import pypdf
+
+    reader = pypdf.PdfReader(io.BytesIO(data))
+    for number, page in enumerate(reader.pages, start=1):
+        yield number, (page.extract_text() or "") + "\n"  # Page break ends the last word
+
+
+def _iter_docx_segments(data: bytes) -> Iterator[tuple[int, str]]:
+    import docx
+
+    document = docx.Document(io.BytesIO(data))
+    segment, size, number = [], 0, 1
+    for paragraph in document.paragraphs:
+        segment.append(paragraph.text)
+        size += len(paragraph.text)
+        if size >= INGEST_TEXT_SEGMENT_BYTES:
+            yield number, "\n".join(segment)
+            segment, size, number = [], 0, number + 1
+    if segment:
+        yield number, "\n".join(segment)
+
+
+def _iter_text_segments(data: bytes) -> Iterator[tuple[int, str]]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    carry = ""
+    number = 1
+    for offset in range(0, len(data), INGEST_TEXT_SEGMENT_BYTES):
+        text = carry + decoder.decode(data[offset : offset + INGEST_TEXT_SEGMENT_BYTES])
+        # Cut at the last line break so words are not split between segments
+        cut = text.rfind("\n") + 1
+        if cut <= 0:
+            carry = text
+            continue
+        carry = text[cut:]
+        yield number, text[:cut]
+        number += 1
+    tail = carry + decoder.decode(b"", final=True)
+    if tail:
+        yield number, tail
+
+
+# ============================================================================
+# CHUNKING
+# ============================================================================
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+_WORD_RE = re.compile(r"\w+|[^\w\s]")
+
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # Not installed or encoding files unavailable offline
+    _ENCODING = None
+
+
+def count_tokens(text: str) -> int:
+    """Token count (cl100k_base via tiktoken, else ~1.3 tokens per word/punctuation)."""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return (len(_WORD_RE.findall(text)) * 13 + 9) // 10
+
+
+class TokenChunker:
+    """
+    Incremental token-bounded chunker.
+
+    feed() accepts text a segment at a time and returns the chunks completed
+    so far; finish() flushes the rest. Chunks never exceed max_tokens and
+    carry up to overlap_tokens of trailing context from the previous chunk.
+
+    Strategies:
+        smart / semantic: split on sentence and paragraph boundaries
+        fixed_size: split on words only
+    """
+
+    def __init__(self, max_tokens: int = INGEST_CHUNK_TOKENS, overlap_tokens: int = 100, strategy: str = "smart"):
+        self.max_tokens = max(1, max_tokens)
+        self.overlap_tokens = max(0, min(overlap_tokens, self.max_tokens // 2))
+        self.strategy = strategy
+        self._units: list[tuple[str, int]] = []  # (text, tokens) pending in the current chunk
+        self._tokens = 0
+        self._page = 1  # Page the pending chunk started on
+        self._current_page = 1
+        self._next_index = 0
+        self._partial = ""  # Unterminated sentence carried to the next segment
+
+    def feed(self, text: str, page: int = 1) -> list[Chunk]:
+        """Add a segment of text; returns chunks completed by it."""
+        self._current_page = page
+        if not self._units and not self._partial:
+            self._page = page
+        pieces = self._split(self._partial + text)
+        # The last piece may continue in the next segment
+        self._partial = pieces.pop() if pieces and not text[-1:].isspace() else ""
+        return self._add(pieces)
+
+    def finish(self) -> list[Chunk]:
+        """Flush remaining text as the final chunk(s)."""
+        chunks = self._add(self._split(self._partial))
+        self._partial = ""
+        if self._units:
+            chunks.append(self._emit())
+            self._units, self._tokens = [], 0
+        return chunks
+
+    def _split(self, text: str) -> list[str]:
+        if self.strategy == "fixed_size":
+            return text.split()
+        return [piece.strip() for piece in _SENTENCE_RE.split(text) if piece and piece.strip()]
+
+    def _add(self, pieces: list[str]) -> list[Chunk]:
+        chunks = []
+        for piece in pieces:
+            for unit in self._fit(piece):
+                tokens = count_tokens(unit)
+                if self._units and self._tokens + tokens > self.max_tokens:
+                    chunks.append(self._emit())
+                    self._carry_overlap(tokens)
+                    self._page = self._current_page
+                self._units.append((unit, tokens))
+                self._tokens += tokens
+        return chunks
+
+    def _fit(self, piece: str) -> list[str]:
+        """Split a piece longer than max_tokens into word runs that fit."""
+        if count_tokens(piece) <= self.max_tokens:
+            return [piece]
+        runs, run, run_tokens = [], [], 0
+        for word in piece.split():
+            tokens = count_tokens(word)
+            if run and run_tokens + tokens > self.max_tokens:
+                runs.append(" ".join(run))
+                run, run_tokens = [], 0
+            run.append(word)
+            run_tokens += tokens
+        if run:
+            runs.append(" ".join(run))
+        return runs
+
+    def _emit(self) -> Chunk:
+        chunk = Chunk(
+            index=self._next_index,
+            text=" ".join(unit for unit, _ in self._units),
+            tokens=self._tokens,
+            page=self._page,
+        )
+        self._next_index += 1
+        return chunk
+
+    def _carry_overlap(self, incoming_tokens: int) -> None:
+        """Keep trailing units (up to overlap_tokens) as the start of the next chunk."""
+        budget = min(self.overlap_tokens, self.max_tokens - incoming_tokens)
+        kept, kept_tokens = [], 0
+        for unit, tokens in reversed(self._units):
+            if kept_tokens + tokens > budget:
+                break
+            kept.append((unit, tokens))
+            kept_tokens += tokens
+        self._units = kept[::-1]
+        self._tokens = kept_tokens
+
+
+# ============================================================================
+# STORAGE
+# ============================================================================
+
+
+class PostgresVectorStore:
+    """
+    file_embeddings writer using the Knowledge API pool (RLS via with_user_conn).
+
+    Chunk metadata is sealed (AES-GCM) with AAD = HMAC(user_hash || file_id).
+    Inserts are idempotent on (file_id, chunk_index), so a retried batch is safe.
+    """
+
+    async def reset(self, job: IngestJob) -> None:
+        """Delete previously stored chunks before a full re-index."""
+        from .db.asyncpg_client import with_user_conn
+
+        async with with_user_conn(job.user_hash) as conn:
+            await conn.execute("DELETE FROM file_embeddings WHERE file_id = $1", job.file_id)
+        _invalidate_search_cache(job.user_hash)
+
+    async def stored_chunks(self, job: IngestJob) -> set[int]:
+        """Chunk indexes already committed for the file."""
+        from .db.asyncpg_client import with_user_conn
+
+        async with with_user_conn(job.user_hash) as conn:
+            rows = await conn.fetch("SELECT chunk_index FROM file_embeddings WHERE file_id = $1", job.file_id)
+        return {row["chunk_index"] for row in rows}
+
+    async def store(self, job: IngestJob, rows: list[tuple[Chunk, list[float]]]) -> int:
+        """Insert a batch of (chunk, vector) rows in one transaction; returns rows written."""
+        from relay_ai.platform.security.memory.rls import hmac_user
+        from relay_ai.platform.security.memory.security import seal_many
+
+        from .db.asyncpg_client import with_user_conn
+
+        metadata_aad = hmac_user(f"{job.user_hash}:{job.file_id}")
+        metadata = [
+            json.dumps(
+                {
+                    "title": job.title,
+                    "source": job.source,
+                    "tags": job.tags,
+                    "position_in_file": chunk.index,
+                    "page": chunk.page,
+                    "chunk_strategy": job.chunk_strategy,
+                }
+            ).encode("utf-8")
+            for chunk, _ in rows
+        ]
+        sealed = await asyncio.to_thread(seal_many, metadata, metadata_aad.encode("utf-8"))
+        records = [
+            (job.file_id, chunk.index, chunk.text, vector_literal(vector), job.user_hash, blob, metadata_aad)
+            for (chunk, vector), blob in zip(rows, sealed)
+        ]
+
+        async with with_user_conn(job.user_hash) as conn:
+            await conn.executemany(
+                """
+                INSERT INTO file_embeddings
+                    (file_id, chunk_index, text_content, embedding, user_hash, metadata_encrypted, metadata_aad)
+                VALUES ($1, $2, $3, $4::vector, $5, $6, $7)
+                ON CONFLICT DO NOTHING
+                """,
+                records,
+            )
+        _invalidate_search_cache(job.user_hash)
+        return len(records)
+
+    async def update_status(self, job: IngestJob) -> None:
+        """Mirror job status and chunk count onto the files row."""
+        from .db.asyncpg_client import with_user_conn
+
+        async with with_user_conn(job.user_hash) as conn:
+            await conn.execute(
+                """
+                UPDATE files
+                SET processing_status = $1,
+                    chunks_count = $2,
+                    indexed_at = CASE WHEN $1 = 'completed' THEN NOW() ELSE indexed_at END
+                WHERE id = $3
+                """,
+                job.status,
+                job.vectors_stored,
+                job.file_id,
+            )
+
+
+def _invalidate_search_cache(user_hash: str) -> None:
+    from .search import invalidate_knowledge_vectors
+
+    invalidate_knowledge_vectors(user_hash)
+
+
+def vector_literal(vector: list[float]) -> str:
+    """pgvector text form ('[x,y,...]') for a $n::vector parameter."""
+    return "[" + ",".join(f"{x:.7g}" for x in vector) + "]"
+
+
+async def load_from_storage(job: IngestJob) -> bytes:
+    """Default loader: fetch the uploaded file from S3/local storage."""
+    from .storage.s3_client import download_file
+
+    data = await download_file(str(job.file_id), job.user_hash)
+    if data is None:
+        raise FileNotFoundError(f"Stored file not found for {job.file_id}")
+    return data
+
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+NON_RETRYABLE = (UnsupportedFileTypeError, FileNotFoundError)
+
+
+class IngestionPipeline:
+    """
+    Queue-fed extract → chunk → embed → store pipeline.
+
+    Args:
+        store: Vector store (reset/stored_chunks/store/update_status); defaults to PostgresVectorStore
+        loader: async job -> file bytes; defaults to load_from_storage
+        embedder: object with async embed_many(texts, model); defaults to the shared EmbeddingService
+        workers: Files processed concurrently
+        queue_size: Files waiting before submit() raises IngestionQueueFullError
+        channel_size: Items buffered between two stages of one file
+        concurrency: Per-stage limit shared across files, e.g. {"embed": 4}
+    """
+
+    def __init__(
+        self,
+        store: Any = None,
+        loader: Optional[Callable[[IngestJob], Awaitable[bytes]]] = None,
+        embedder: Any = None,
+        workers: int = INGEST_WORKERS,
+        queue_size: int = INGEST_QUEUE_SIZE,
+        channel_size: int = INGEST_CHANNEL_SIZE,
+        concurrency: Optional[dict[str, int]] = None,
+        chunk_tokens: int = INGEST_CHUNK_TOKENS,
+        embed_batch: int = INGEST_EMBED_BATCH,
+        store_batch: int = INGEST_STORE_BATCH,
+        max_attempts: int = INGEST_MAX_ATTEMPTS,
+        retry_backoff_sec: float = INGEST_RETRY_BACKOFF_SEC,
+    ):
+        self.store = store or PostgresVectorStore()
+        self.loader = loader or load_from_storage
+        self._embedder = embedder
+        self.workers = workers
+        self.queue_size = queue_size
+        self.channel_size = channel_size
+        self.concurrency = {
+            "extract": INGEST_EXTRACT_CONCURRENCY,
+            "chunk": INGEST_CHUNK_CONCURRENCY,
+            "embed": INGEST_EMBED_CONCURRENCY,
+            "store": INGEST_STORE_CONCURRENCY,
+            **(concurrency or {}),
+        }
+        self.chunk_tokens = chunk_tokens
+        self.embed_batch = embed_batch
+        self.store_batch = store_batch
+        self.max_attempts = max_attempts
+        self.retry_backoff_sec = retry_backoff_sec
+
+        self.stages = {stage: StageStats() for stage in STAGES}
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "retries": 0, "rejected": 0}
+        self.jobs: dict[UUID, IngestJob] = {}  # Queued or in flight, by file_id
+        self._futures: dict[UUID, asyncio.Future] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._limits: dict[str, asyncio.Semaphore] = {}
+        self._workers: list[asyncio.Task] = []
+
+    @property
+    def embedder(self) -> Any:
+        if self._embedder is None:
+            from .embeddings.service import get_embedding_service
+
+            self._embedder = get_embedding_service()
+        return self._embedder
+
+    async def start(self) -> None:
+        """Start worker tasks on the running loop (idempotent)."""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(self.queue_size)
+        self._limits = {stage: asyncio.Semaphore(self.concurrency[stage]) for stage in STAGES}
+        self._workers = [asyncio.create_task(self._worker(), name=f"IngestWorker-{i}") for i in range(self.workers)]
+
+    async def close(self) -> None:
+        """Cancel workers; queued files stay 'queued' and can be resubmitted with resume=True."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    async def submit(self, job: IngestJob) -> asyncio.Future:
+        """
+        Enqueue a file; returns a future resolved with the finished job.
+
+        A file already queued or in flight is not enqueued twice: its existing
+        future is returned if the job has the same chunking/embedding parameters.
+
+        Raises:
+            IngestionQueueFullError: Queue is at queue_size
+            IngestionConflictError: The file is in flight with different parameters
+        """
+        await self.start()
+        existing = self._futures.get(job.file_id)
+        if existing is not None and not existing.done():
+            running = self.jobs[job.file_id]
+            if running.params() != job.params():
+                raise IngestionConflictError(
+                    f"File {job.file_id} is already being indexed with "
+                    f"chunk_strategy={running.chunk_strategy}, chunk_overlap={running.chunk_overlap}, "
+                    f"embedding_model={running.embedding_model}"
+                )
+            return existing
+
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            raise IngestionQueueFullError(f"Ingestion queue full ({self.queue_size} files)") from None
+
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume_exception)  # Uploads never await their future
+        self._futures[job.file_id] = future
+        self.jobs[job.file_id] = job
+        self.stats["submitted"] += 1
+        return future
+
+    def get_job(self, file_id: UUID) -> Optional[IngestJob]:
+        return self.jobs.get(file_id)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Pipeline counters plus per-stage items, batches, busy and blocked time."""
+        return {
+            **self.stats,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "in_flight": sum(1 for f in self._futures.values() if not f.done()),
+            "stages": {
+                stage: {
+                    "items": s.items,
+                    "batches": s.batches,
+                    "errors": s.errors,
+                    "busy_ms": round(s.busy_sec * 1000, 1),
+                    "blocked_ms": round(s.blocked_sec * 1000, 1),
+                    "concurrency": self.concurrency[stage],
+                }
+                for stage, s in self.stages.items()
+            },
+        }
+
+    # ------------------------------------------------------------------------
+    # Job lifecycle
+    # ------------------------------------------------------------------------
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run_job(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job: IngestJob) -> None:
+        future = self._futures.get(job.file_id)
+        while True:
+            job.attempts += 1
+            job.status = "processing"
+            await self._update_status(job)
+            try:
+                await self._run_attempt(job)
+                job.status, job.error = "completed", None
+                self.stats["completed"] += 1
+                await self._update_status(job)
+                self._finish(job)
+                if future is not None and not future.done():
+                    future.set_result(job)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.error = str(e)
+                retryable = not isinstance(e, NON_RETRYABLE)
+                if retryable and job.attempts < self.max_attempts:
+                    self.stats["retries"] += 1
+                    job.resume = True  # Keep what was stored; resume at the first missing chunk
+                    delay = self.retry_backoff_sec * 2 ** (job.attempts - 1)
+                    logger.warning(f"Ingest attempt {job.attempts} failed for {job.file_id} ({e}); retry in {delay}s")
+                    await asyncio.sleep(delay)
+                    continue
+
+                logger.error(f"Ingest failed for {job.file_id} after {job.attempts} attempt(s): {e}")
+                job.status = "failed"
+                self.stats["failed"] += 1
+                await self._update_status(job)
+                self._finish(job)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+                return
+
+    def _finish(self, job: IngestJob) -> None:
+        self.jobs.pop(job.file_id, None)
+        self._futures.pop(job.file_id, None)
+        if record_ingest_job is not None:
+            record_ingest_job(job.status)
+
+    async def _update_status(self, job: IngestJob) -> None:
+        try:
+            await self.store.update_status(job)
+        except Exception as e:
+            logger.debug(f"Could not update file status for {job.file_id}: {e}")
+
+    async def _run_attempt(self, job: IngestJob) -> None:
+        """Run the four stages for one attempt; the first stage error cancels the rest."""
+        if job.resume:
+            skip = await self.store.stored_chunks(job)
+        else:
+            await self.store.reset(job)
+            skip = set()
+        job.chunks_created = job.tokens_processed = 0
+        job.chunks_skipped = len(skip)
+        job.vectors_stored = len(skip)
+
+        data = await self.loader(job)
+        segments: asyncio.Queue = asyncio.Queue(self.channel_size)
+        chunks: asyncio.Queue = asyncio.Queue(self.channel_size)
+        vectors: asyncio.Queue = asyncio.Queue(self.channel_size)
+        embedders = self.concurrency["embed"]
+        storers = self.concurrency["store"]
+
+        async def embed_all() -> None:
+            await asyncio.gather(*(self._embed(job, chunks, vectors) for _ in range(embedders)))
+            for _ in range(storers):
+                await vectors.put(_DONE)
+
+        tasks = [
+            asyncio.create_task(self._extract(job, data, segments)),
+            asyncio.create_task(self._chunk(job, segments, chunks, skip, embedders)),
+            asyncio.create_task(embed_all()),
+            *(asyncio.create_task(self._store(job, vectors)) for _ in range(storers)),
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ------------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------------
+
+    async def _put(self, stage: str, channel: asyncio.Queue, item: Any) -> None:
+        """Put with backpressure, charging the wait to the producing stage."""
+        if channel.full():
+            started = time.perf_counter()
+            await channel.put(item)
+            self.stages[stage].blocked_sec += time.perf_counter() - started
+        else:
+            channel.put_nowait(item)
+
+    def _record(self, stage: str, items: int, seconds: float) -> None:
+        stats = self.stages[stage]
+        stats.items += items
+        stats.batches += 1
+        stats.busy_sec += seconds
+        if record_ingest_stage is not None:
+            record_ingest_stage(stage, items, seconds)
+
+    async def _extract(self, job: IngestJob, data: bytes, out: asyncio.Queue) -> None:
+        try:
+            segments = iter_segments(data, job.mime_type)
+            while True:
+                async with self._limits["extract"]:
+                    started = time.perf_counter()
+                    segment = await asyncio.to_thread(next, segments, None)
+                    if segment is None:
+                        break
+                    self._record("extract", 1, time.perf_counter() - started)
+                await self._put("extract", out, segment)
+        except Exception:
+            self.stages["extract"].errors += 1
+            raise
+        await out.put(_DONE)
+
+    async def _chunk(
+        self, job: IngestJob, inp: asyncio.Queue, out: asyncio.Queue, skip: set[int], consumers: int
+    ) -> None:
+        chunker = TokenChunker(self.chunk_tokens, job.chunk_overlap, job.chunk_strategy)
+        while True:
+            segment = await inp.get()
+            async with self._limits["chunk"]:
+                started = time.perf_counter()
+                if segment is _DONE:
+                    produced = chunker.finish()
+                else:
+                    page, text = segment
+                    produced = await asyncio.to_thread(chunker.feed, text, page)
+                self._record("chunk", len(produced), time.perf_counter() - started)
+
+            for chunk in produced:
+                job.chunks_created += 1
+                job.tokens_processed += chunk.tokens
+                if chunk.index not in skip:
+                    await self._put("chunk", out, chunk)
+            if segment is _DONE:
+                break
+        for _ in range(consumers):
+            await out.put(_DONE)
+
+    async def _embed(self, job: IngestJob, inp: asyncio.Queue, out: asyncio.Queue) -> None:
+        model = EMBEDDING_MODEL_NAMES.get(job.embedding_model, job.embedding_model)
+        done = False
+        while not done:
+            batch, done = await _take(inp, self.embed_batch)
+            if not batch:
+                continue
+            async with self._limits["embed"]:
+                started = time.perf_counter()
+                try:
+                    embedded = await self.embedder.embed_many([chunk.text for chunk in batch], model)
+                except Exception:
+                    self.stages["embed"].errors += 1
+                    raise
+                elapsed = time.perf_counter() - started
+                job.embedding_ms += elapsed * 1000
+                self._record("embed", len(batch), elapsed)
+            await self._put("embed", out, list(zip(batch, embedded)))
+
+    async def _store(self, job: IngestJob, inp: asyncio.Queue) -> None:
+        done = False
+        while not done:
+            batches, done = await _take(inp, max(1, self.store_batch // max(1, self.embed_batch)))
+            rows = [row for batch in batches for row in batch]
+            if not rows:
+                continue
+            async with self._limits["store"]:
+                started = time.perf_counter()
+                try:
+                    await self.store.store(job, rows)
+                except Exception:
+                    self.stages["store"].errors += 1
+                    raise
+                job.vectors_stored += len(rows)
+                self._record("store", len(rows), time.perf_counter() - started)
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+async def _take(channel: asyncio.Queue, limit: int) -> tuple[list, bool]:
+    """
+    Wait for one item, then drain up to limit without waiting.
+
+    Batches fill up when the producer is ahead and stay small when it is not,
+    so a slow extractor never holds back already-chunked text.
+
+    Returns:
+        (items, saw_done_sentinel)
+    """
+    item = await channel.get()
+    if item is _DONE:
+        return [], True
+    items = [item]
+    while len(items) < limit:
+        try:
+            item = channel.get_nowait()
+        except asyncio.QueueEmpty:
+            break
+        if item is _DONE:
+            return items, True
+        items.append(item)
+    return items, False
+
+
+# ============================================================================
+# SHARED PIPELINE
+# ============================================================================
+
+_pipeline: Optional[IngestionPipeline] = None
+
+
+def get_ingestion_pipeline() -> IngestionPipeline:
+    """Shared pipeline (workers start on first submit)."""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = IngestionPipeline()
+    return _pipeline
+
+
+def set_ingestion_pipeline(pipeline: Optional[IngestionPipeline]) -> None:
+    """Replace the shared pipeline (tests, custom stores)."""
+    global _pipeline
+    _pipeline = pipeline
+
+
+async def close_ingestion_pipeline() -> None:
+    """Stop the shared pipeline's workers (call before closing the DB pool)."""
+    if _pipeline is not None:
+        await _pipeline.close()
@@ -0,0 +1,204 @@
+"""Knowledge vector search: in-process hot cache in front of pgvector.
+
+Query path:
+1. HotVectorCache partition for the user (loaded from file_embeddings on a
+   miss, reloaded after a TTL, skipped for tenants too large to cache)
+2. Cache hit: top-k from the in-process index, then one fetch of those rows
+   by id. Cache bypass: ORDER BY embedding <=> query in Postgres (HNSW)
+3. Metadata opened with AAD = HMAC(user_hash || file_id); a mismatch fails
+   closed with ChunkMetadataIntegrityError
+
+Every query runs under with_user_conn, so RLS still scopes the rows even on
+the cached path.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Optional
+
+from relay_ai.platform.security.memory.rls import hmac_user
+from relay_ai.platform.security.memory.vector_index import HotVectorCache, vectors_from_pgvector
+
+from .db.asyncpg_client import with_user_conn
+from .ingestion import vector_literal
+
+KNOWLEDGE_VECTOR_CACHE = os.getenv("KNOWLEDGE_VECTOR_CACHE", "true").lower() == "true"
+# Candidates fetched per requested result when filters may discard some
+SEARCH_FILTER_OVERFETCH = int(os.getenv("KNOWLEDGE_SEARCH_FILTER_OVERFETCH", "4"))
+
+_COLUMNS = "id, file_id, chunk_index, text_content, metadata_encrypted, metadata_aad, created_at"
+
+_cache: Optional[HotVectorCache] = None
+
+
+class ChunkMetadataIntegrityError(Exception):
+    """Chunk metadata failed AAD verification (callers answer 404, not 403)."""
+
+    pass
+
+
+def get_knowledge_vector_cache() -> Optional[HotVectorCache]:
+    """Process-wide cache of per-user file_embeddings, or None when disabled."""
+    global _cache
+    if not KNOWLEDGE_VECTOR_CACHE:
+        return None
+    if _cache is None:
+        _cache = HotVectorCache()
+    return _cache
+
+
+def invalidate_knowledge_vectors(user_hash: str) -> None:
+    """Drop a user's cached vectors after their file_embeddings changed."""
+    if _cache is not None:
+        _cache.invalidate(user_hash)
+
+
+async def _load_tenant(user_hash: str, limit: int) -> tuple[list[str], Any]:
+    """Cache loader: up to limit + 1 (id, vector) rows for the user."""
+    async with with_user_conn(user_hash) as conn:
+        rows = await conn.fetch(
+            """
+            SELECT id::text AS id, vector_send(embedding) AS embedding
+            FROM file_embeddings
+            WHERE user_hash = $1 AND embedding IS NOT NULL
+            LIMIT $2
+            """,
+            user_hash,
+            limit + 1,
+        )
+    return [row["id"] for row in rows], vectors_from_pgvector([row["embedding"] for row in rows])
+
+
+async def search_chunks(
+    user_hash: str,
+    embedding: list[float],
+    top_k: int,
+    similarity_threshold: float = 0.0,
+    filters: Optional[dict[str, Any]] = None,
+) -> tuple[list[dict[str, Any]], bool]:
+    """
+    Top-k chunks for a query embedding.
+
+    Args:
+        user_hash: Tenant (RLS scope and metadata AAD)
+        embedding: Query vector
+        top_k: Results to return
+        similarity_threshold: Minimum cosine similarity
+        filters: Optional tags / source / created_after / created_before
+
+    Returns:
+        (results, cache_hit): results are SearchResultItem-shaped dicts, best first
+
+    Raises:
+        ChunkMetadataIntegrityError: A row's metadata failed AAD verification
+        ValueError: Query dimension does not match the stored vectors
+    """
+    fetch_k = top_k * SEARCH_FILTER_OVERFETCH if filters else top_k
+    cache = get_knowledge_vector_cache()
+    index = await cache.get(user_hash, partial(_load_tenant, user_hash)) if cache is not None else None
+
+    if index is not None:
+        if len(index) and index.dim != len(embedding):
+            raise ValueError(f"Query embedding has {len(embedding)} dims, index has {index.dim}")
+        hits = [
+            (chunk_id, score) for chunk_id, score in index.search(embedding, fetch_k) if score >= similarity_threshold
+        ]
+        scored = await _fetch_by_id(user_hash, hits)
+    else:
+        scored = await _search_pgvector(user_hash, embedding, fetch_k, similarity_threshold)
+
+    expected_aad = {}
+    results = []
+    for row, score in scored:
+        file_id = row["file_id"]
+        if file_id not in expected_aad:
+            expected_aad[file_id] = hmac_user(f"{user_hash}:{file_id}")
+        metadata = _open_metadata(row, expected_aad[file_id])
+        if filters and not _matches(metadata, row["created_at"], filters):
+            continue
+        results.append(
+            {
+                "rank": len(results) + 1,
+                "chunk_id": row["id"],
+                "file_id": file_id,
+                "file_title": metadata.get("title") or "",
+                "text": row["text_content"],
+                "similarity_score": min(max(score, 0.0), 1.0),
+                "chunk_index": row["chunk_index"],
+                "metadata": metadata,
+                "position_in_file": {"page": metadata.get("page")},
+            }
+        )
+        if len(results) == top_k:
+            break
+    return results, index is not None
+
+
+async def _fetch_by_id(user_hash: str, hits: list[tuple[str, float]]) -> list[tuple[Any, float]]:
+    if not hits:
+        return []
+    async with with_user_conn(user_hash) as conn:
+        rows = await conn.fetch(
+            f"SELECT {_COLUMNS} FROM file_embeddings WHERE id = ANY($1::uuid[])",
+            [chunk_id for chunk_id, _ in hits],
+        )
+    by_id = {str(row["id"]): row for row in rows}
+    # Rows deleted since the cache loaded are simply missing
+    return [(by_id[chunk_id], score) for chunk_id, score in hits if chunk_id in by_id]
+
+
+async def _search_pgvector(
+    user_hash: str, embedding: list[float], limit: int, similarity_threshold: float
+) -> list[tuple[Any, float]]:
+    async with with_user_conn(user_hash) as conn:
+        rows = await conn.fetch(
+            f"""
+            SELECT * FROM (
+                SELECT {_COLUMNS}, 1 - (embedding <=> $1::vector) AS score
+                FROM file_embeddings
+                WHERE embedding IS NOT NULL
+                ORDER BY embedding <=> $1::vector
+                LIMIT $2
+            ) nearest
+            WHERE score >= $3
+            """,
+            vector_literal(embedding),
+            limit,
+            similarity_threshold,
+        )
+    return [(row, float(row["score"])) for row in rows]
+
+
+def _open_metadata(row: Any, expected_aad: str) -> dict[str, Any]:
+    from relay_ai.platform.security.memory.security import open_sealed
+
+    # The stored AAD must be the one derived for this user and file, and must open the blob
+    if row["metadata_aad"] != expected_aad:
+        raise ChunkMetadataIntegrityError(f"AAD mismatch for chunk {row['id']}")
+    try:
+        plaintext = open_sealed(bytes(row["metadata_encrypted"]), expected_aad.encode("utf-8"))
+    except Exception as e:
+        raise ChunkMetadataIntegrityError(f"Metadata verification failed for chunk {row['id']}") from e
+    return json.loads(plaintext)
+
+
+def _matches(metadata: dict[str, Any], created_at: Optional[datetime], filters: dict[str, Any]) -> bool:
+    tags = filters.get("tags")
+    if tags and not set(tags) & set(metadata.get("tags") or []):
+        return False
+    source = filters.get("source")
+    if source and metadata.get("source") != source:
+        return False
+    for key, newer in (("created_after", True), ("created_before", False)):
+        bound = filters.get(key)
+        if bound is None or created_at is None:
+            continue
+        if isinstance(bound, str):
+            bound = datetime.fromisoformat(bound.replace("Z", "+00:00"))
+        if bound.tzinfo is None:
+            bound = bound.replace(tzinfo=timezone.utc)
+        if (created_at <= bound) if newer else (created_at >= bound):
+            return False
+    return True
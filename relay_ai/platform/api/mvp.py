@@ -38,7 +38,7 @@
 from relay_ai.platform.api.auth_router import router as auth_router
 
 # Import routers via adapters (production-proven code)
-from relay_ai.platform.api.knowledge import close_pool, init_pool, knowledge_router
+from relay_ai.platform.api.knowledge import close_ingestion_pipeline, close_pool, init_pool, knowledge_router
 
 # MVP Chat Console for beta testing
 from relay_ai.platform.api.mvp_router import router as mvp_router
@@ -310,6 +310,12 @@ async def shutdown_event():
     """
     logger.info("🛑 Relay MVP shutting down...")
 
+    # Stop ingestion workers before the pool they write through
+    try:
+        await close_ingestion_pipeline()
+    except Exception as e:
+        logger.error(f"Ingestion pipeline close failed: {e}")
+
     # Close database pool
     if close_pool:
         try:
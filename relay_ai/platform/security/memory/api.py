@@ -270,30 +270,27 @@ async def memory_query(request: Request, req: QueryRequest) -> QueryResponse:
         aad = get_aad_from_user_hash(user_hash)  # noqa: F841 - Phase 3: used in decrypt_with_aad
 
         # 3. (Phase 3) Generate embedding, ANN search, decrypt
-        # async with set_rls_context(conn, user_id):
-        #     embedding = await embed_query(req.query)
-        #     rows = await conn.fetch(
-        #         "SELECT id, text_cipher FROM memory_chunks WHERE ... ORDER BY embedding <-> $1 LIMIT $2",
-        #         embedding, req.k
-        #     )
-        #     candidates = []
-        #     for row in rows:
-        #         try:
-        #             plaintext = decrypt_with_aad(row["text_cipher"], aad)
-        #             candidates.append(plaintext)
-        #         except ValueError:
-        #             raise PermissionError("AAD validation failed")
+        # ANN goes through index.search_memory_chunks (per-user hot vector cache, pgvector fallback)
+        # embedding = await embed_query(req.query)
+        # rows = await search_memory_chunks(conn, user_id, embedding, k=req.k)
+        # candidates = []
+        # for row in rows:
+        #     try:
+        #         plaintext = decrypt_with_aad(row["text_cipher"], aad)
+        #         candidates.append(plaintext)
+        #     except ValueError:
+        #         raise PermissionError("AAD validation failed")
         #
-        #     # 4. Reranking with circuit breaker
-        #     if req.rerank and RERANK_ENABLED:
-        #         try:
-        #             ranked = await asyncio.wait_for(
-        #                 maybe_rerank(req.query, candidates),
-        #                 timeout=RERANK_TIMEOUT_MS / 1000.0
-        #             )
-        #         except asyncio.TimeoutError:
-        #             logger.warning(f"Reranking timeout ({RERANK_TIMEOUT_MS}ms), returning ANN order")
-        #             ranked = candidates
+        # # 4. Reranking with circuit breaker
+        # if req.rerank and RERANK_ENABLED:
+        #     try:
+        #         ranked = await asyncio.wait_for(
+        #             maybe_rerank(req.query, candidates),
+        #             timeout=RERANK_TIMEOUT_MS / 1000.0
+        #         )
+        #     except asyncio.TimeoutError:
+        #         logger.warning(f"Reranking timeout ({RERANK_TIMEOUT_MS}ms), returning ANN order")
+        #         ranked = candidates
 
         # For Phase 2 scaffold: return mock response
         elapsed_ms = time.time() * 1000 - start_ms
@@ -4,21 +4,149 @@
 
 Provides:
 - index_memory_chunk() → encrypt + store chunk with AAD binding
+- index_memory_chunks_bulk() → parallel sealing + one COPY per document
+- search_memory_chunks() → top-k sealed rows from the per-user hot vector
+  cache (vector_index.HotVectorCache), falling back to pgvector
 - Maintains RLS isolation (user_hash context)
 - Supports batch operations with transaction safety
 """
 
+import asyncio
 import json
 import logging
+import os
+import struct
+import sys
+import uuid
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
 from typing import Any, Optional
 
 import asyncpg
 
 from relay_ai.platform.security.memory.rls import hmac_user, set_rls_context
-from relay_ai.platform.security.memory.security import seal
+from relay_ai.platform.security.memory.security import seal, seal_many
+from relay_ai.platform.security.memory.vector_index import HotVectorCache, vectors_from_pgvector
 
 logger = logging.getLogger(__name__)
 
+# Threads used to seal chunks in parallel (cryptography releases the GIL)
+MEMORY_INDEX_SEAL_WORKERS = int(os.getenv("MEMORY_INDEX_SEAL_WORKERS", str(min(8, os.cpu_count() or 1))))
+# Serve ANN queries from an in-process per-user index instead of pgvector when it fits
+MEMORY_VECTOR_CACHE = os.getenv("MEMORY_VECTOR_CACHE", "true").lower() == "true"
+
+# Columns written by index_memory_chunks_bulk (created_at/updated_at use table defaults)
+BULK_COLUMNS = (
+    "id",
+    "user_hash",
+    "doc_id",
+    "source",
+    "text_cipher",
+    "meta_cipher",
+    "embedding",
+    "emb_cipher",
+    "chunk_index",
+    "char_start",
+    "char_end",
+    "tags",
+    "model",
+)
+
+_seal_executor: Optional[ThreadPoolExecutor] = None
+
+
+def pack_embedding(embedding: list[float]) -> bytes:
+    """Pack an embedding as little-endian float32 (numpy ``tobytes()`` layout)."""
+    packed = array("f", embedding)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_embedding(data: bytes) -> list[float]:
+    """Inverse of pack_embedding()."""
+    packed = array("f")
+    packed.frombytes(data)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tolist()
+
+
+def encode_vector(embedding: list[float]) -> bytes:
+    """Encode an embedding in pgvector's binary wire format.
+
+    Layout: uint16 dim, uint16 unused, dim x float32, all big-endian.
+    """
+    packed = array("f", embedding)
+    if sys.byteorder == "little":
+        packed.byteswap()
+    return struct.pack(">HH", len(packed), 0) + packed.tobytes()
+
+
+def decode_vector(data: bytes) -> list[float]:
+    """Decode pgvector's binary wire format."""
+    dim, _ = struct.unpack_from(">HH", data)
+    packed = array("f")
+    packed.frombytes(data[4 : 4 + 4 * dim])
+    if sys.byteorder == "little":
+        packed.byteswap()
+    return packed.tolist()
+
+
+async def register_vector_codec(conn: asyncpg.Connection) -> None:
+    """Register a binary codec for pgvector's ``vector`` type on conn.
+
+    Required for COPY (asyncpg copies in binary format). The encoder accepts
+    either a float sequence or bytes already produced by encode_vector().
+    The codec stays on conn until reset; on pooled connections use
+    vector_codec() so it doesn't leak into later text-format ``$n::vector``
+    queries.
+    """
+    await conn.set_type_codec(
+        "vector",
+        schema="public",
+        encoder=lambda value: value if isinstance(value, (bytes, bytearray)) else encode_vector(value),
+        decoder=decode_vector,
+        format="binary",
+    )
+
+
+@asynccontextmanager
+async def vector_codec(conn: asyncpg.Connection):
+    """Binary ``vector`` codec on conn for the duration of the block, then asyncpg's default."""
+    await register_vector_codec(conn)
+    try:
+        yield conn
+    finally:
+        await conn.reset_type_codec("vector", schema="public")
+
+
+def _get_seal_executor() -> ThreadPoolExecutor:
+    global _seal_executor
+    if _seal_executor is None:
+        _seal_executor = ThreadPoolExecutor(
+            max_workers=max(1, MEMORY_INDEX_SEAL_WORKERS), thread_name_prefix="memory-seal"
+        )
+    return _seal_executor
+
+
+def _seal_chunks(chunks: list[dict[str, Any]], aad: bytes) -> list[tuple[bytes, bytes, bytes, bytes, int]]:
+    """Seal text, metadata and embedding for a slice of chunks (runs in a worker thread).
+
+    Returns:
+        Per chunk: (text_cipher, meta_cipher, emb_cipher, vector_bytes, metadata_size)
+    """
+    texts = [chunk["text"].encode("utf-8") for chunk in chunks]
+    metas = [json.dumps(chunk.get("metadata") or {}).encode("utf-8") for chunk in chunks]
+    embeddings = [pack_embedding(chunk["embedding"]) for chunk in chunks]
+    vectors = [encode_vector(chunk["embedding"]) for chunk in chunks]
+
+    sealed = seal_many(texts + metas + embeddings, aad=aad)
+    n = len(chunks)
+    return [(sealed[i], sealed[n + i], sealed[2 * n + i], vectors[i], len(metas[i])) for i in range(n)]
+
 
 async def index_memory_chunk(
     conn: asyncpg.Connection,
@@ -111,14 +239,14 @@ async def index_memory_chunk(
             logger.debug(f"Encrypted metadata: {len(meta_json)} bytes → {len(meta_cipher)} bytes")
 
             # 3. Encrypt embedding (backup, for recovery if needed)
-            # Store as comma-separated float values
-            embedding_bytes = ",".join(str(x) for x in embedding).encode("utf-8")
+            # Store as packed little-endian float32 (see unpack_embedding)
+            embedding_bytes = pack_embedding(embedding)
             emb_cipher = seal(embedding_bytes, aad=aad)
             logger.debug(f"Encrypted embedding: {len(embedding_bytes)} bytes → {len(emb_cipher)} bytes")
 
-            # 4. Prepare embedding string for pgvector (plaintext for ANN)
-            # Format: [0.1, 0.2, ..., 0.1536]
-            embedding_str = "[" + ",".join(str(x) for x in embedding) + "]"
+            # 4. Embedding for pgvector (plaintext for ANN), sent as real[] and cast in SQL
+            # so it works whether or not register_vector_codec() ran on this connection
+            embedding_floats = [float(x) for x in embedding]
 
             # 5. INSERT into memory_chunks with all encrypted fields
             # RLS policy will filter based on user_hash match with SET app.user_hash
@@ -129,7 +257,7 @@ async def index_memory_chunk(
                     chunk_index, char_start, char_end, tags, model,
                     created_at, updated_at
                 )
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, NOW(), NOW())
+                VALUES ($1, $2, $3, $4, $5, $6::real[]::vector, $7, $8, $9, $10, $11, $12, NOW(), NOW())
                 RETURNING id, user_hash, doc_id, source, created_at, updated_at
             """
 
@@ -140,7 +268,7 @@ async def index_memory_chunk(
                 source,  # $3
                 text_cipher,  # $4
                 meta_cipher,  # $5
-                embedding_str,  # $6
+                embedding_floats,  # $6
                 emb_cipher,  # $7
                 chunk_index,  # $8
                 char_start,  # $9
@@ -152,6 +280,7 @@ async def index_memory_chunk(
             logger.info(
                 f"Indexed chunk: id={result['id']}, user={user_id[:20]}..., " f"source={source}, text_len={len(text)}"
             )
+            _add_to_vector_cache(user_hash, [str(result["id"])], [embedding])
 
             return {
                 "id": result["id"],
@@ -237,3 +366,209 @@ async def index_memory_batch(
 
     logger.info(f"Indexed {len(results)} chunks for user={user_id[:20]}...")
     return results
+
+
+async def index_memory_chunks_bulk(
+    conn: asyncpg.Connection,
+    user_id: str,
+    chunks: list[dict[str, Any]],
+    use_copy: bool = True,
+    max_workers: Optional[int] = None,
+) -> list[dict[str, Any]]:
+    """Index many chunks for one user in a single transaction.
+
+    Unlike index_memory_batch (one RLS setup, three seals and one INSERT round
+    trip per chunk), this:
+    1. Sets the RLS context once for the whole batch
+    2. Seals text/metadata/embedding for all chunks in parallel on a thread pool
+    3. Sends embeddings as packed float32 (pgvector binary format) instead of text
+    4. Loads all rows with one COPY (copy_records_to_table), or one pipelined
+       executemany INSERT when use_copy=False
+
+    Row IDs are generated client-side so they can be returned without
+    RETURNING; created_at/updated_at come from the table defaults.
+
+    Args:
+        conn: asyncpg database connection
+        user_id: User identifier (same for all chunks)
+        chunks: List of chunk dicts:
+            - doc_id, source, text, embedding (required)
+            - metadata, tags, char_start, char_end, chunk_index, model (optional)
+        use_copy: COPY rows (default) or use a multi-row INSERT
+        max_workers: Seal threads to use (default: MEMORY_INDEX_SEAL_WORKERS)
+
+    Returns:
+        List of indexed chunk dicts (as index_memory_chunk, without timestamps)
+
+    Raises:
+        asyncpg.PostgresError: Database error (includes RLS violations)
+        ValueError: Invalid input (missing required fields)
+    """
+    if not chunks:
+        return []
+    if not user_id:
+        raise ValueError("Required fields missing: user_id")
+    for i, chunk in enumerate(chunks):
+        if not all(chunk.get(key) for key in ("doc_id", "source", "text", "embedding")):
+            raise ValueError(f"Chunk {i}: required fields missing: doc_id, source, text, embedding")
+
+    user_hash = hmac_user(user_id)
+    aad = user_hash.encode()
+
+    # Seal in parallel: one slice per worker keeps executor overhead per batch, not per chunk
+    workers = max(1, min(max_workers or MEMORY_INDEX_SEAL_WORKERS, len(chunks)))
+    slice_size = -(-len(chunks) // workers)
+    slices = [chunks[i : i + slice_size] for i in range(0, len(chunks), slice_size)]
+    loop = asyncio.get_running_loop()
+    executor = _get_seal_executor()
+    sealed_slices = await asyncio.gather(*(loop.run_in_executor(executor, _seal_chunks, part, aad) for part in slices))
+    sealed = [item for part in sealed_slices for item in part]
+
+    ids = [uuid.uuid4() for _ in chunks]
+    records = [
+        (
+            ids[i],
+            user_hash,
+            chunk["doc_id"],
+            chunk["source"],
+            text_cipher,
+            meta_cipher,
+            vector_bytes,
+            emb_cipher,
+            chunk.get("chunk_index", i),
+            chunk.get("char_start"),
+            chunk.get("char_end"),
+            chunk.get("tags"),
+            chunk.get("model", "text-embedding-3-small"),
+        )
+        for i, (chunk, (text_cipher, meta_cipher, emb_cipher, vector_bytes, _)) in enumerate(zip(chunks, sealed))
+    ]
+
+    try:
+        async with vector_codec(conn), conn.transaction():
+            async with set_rls_context(conn, user_id):
+                if use_copy:
+                    await conn.copy_records_to_table("memory_chunks", records=records, columns=list(BULK_COLUMNS))
+                else:
+                    placeholders = ", ".join(f"${n}" for n in range(1, len(BULK_COLUMNS) + 1))
+                    await conn.executemany(
+                        f"INSERT INTO memory_chunks ({', '.join(BULK_COLUMNS)}) VALUES ({placeholders})",
+                        records,
+                    )
+    except Exception as e:
+        logger.error(f"Failed to bulk index {len(chunks)} chunks: {e}")
+        raise
+
+    logger.info(f"Bulk indexed {len(chunks)} chunks for user={user_id[:20]}... ({'copy' if use_copy else 'insert'})")
+    _add_to_vector_cache(user_hash, [str(chunk_id) for chunk_id in ids], [chunk["embedding"] for chunk in chunks])
+
+    return [
+        {
+            "id": ids[i],
+            "user_hash": user_hash,
+            "doc_id": chunk["doc_id"],
+            "source": chunk["source"],
+            "text_length": len(chunk["text"]),
+            "metadata_size": sealed[i][4],
+            "embedding_size": len(chunk["embedding"]),
+            "encrypted": True,
+            "aad_binding": True,
+        }
+        for i, chunk in enumerate(chunks)
+    ]
+
+
+# ============================================================================
+# ANN search (hot cache in front of pgvector)
+# ============================================================================
+
+_vector_cache: Optional[HotVectorCache] = None
+
+SEARCH_COLUMNS = "id, doc_id, source, text_cipher, meta_cipher, chunk_index, tags, model, created_at"
+
+
+def get_memory_vector_cache() -> Optional[HotVectorCache]:
+    """Process-wide per-user cache of memory_chunks embeddings, or None when disabled."""
+    global _vector_cache
+    if not MEMORY_VECTOR_CACHE:
+        return None
+    if _vector_cache is None:
+        _vector_cache = HotVectorCache()
+    return _vector_cache
+
+
+def _add_to_vector_cache(user_hash: str, ids: list[str], embeddings: list[list[float]]) -> None:
+    # Write-through only touches tenants already loaded; others load fresh on their next query
+    if _vector_cache is not None:
+        _vector_cache.add(user_hash, ids, embeddings)
+
+
+async def _load_memory_vectors(conn: asyncpg.Connection, user_hash: str, limit: int) -> tuple[list[str], Any]:
+    rows = await conn.fetch(
+        """
+        SELECT id::text AS id, vector_send(embedding) AS embedding
+        FROM memory_chunks
+        WHERE user_hash = $1 AND embedding IS NOT NULL
+        LIMIT $2
+        """,
+        user_hash,
+        limit + 1,
+    )
+    return [row["id"] for row in rows], vectors_from_pgvector([row["embedding"] for row in rows])
+
+
+async def search_memory_chunks(
+    conn: asyncpg.Connection,
+    user_id: str,
+    embedding: list[float],
+    k: int = 24,
+    use_cache: bool = True,
+) -> list[dict[str, Any]]:
+    """Top-k memory chunks for a query embedding, still sealed.
+
+    The user's vectors are served from the hot cache (loaded on first query,
+    reloaded after VECTOR_CACHE_TTL_SEC); users too large to cache, or
+    use_cache=False, go to pgvector (ORDER BY embedding <=> query). Either
+    way rows are read inside the user's RLS context, and the caller opens
+    text_cipher/meta_cipher with AAD = user_hash before reranking.
+
+    Args:
+        conn: asyncpg database connection
+        user_id: User identifier
+        embedding: Query vector (same model as the indexed chunks)
+        k: Candidates to return
+        use_cache: Allow the in-process index
+
+    Returns:
+        Row dicts (SEARCH_COLUMNS plus "score", cosine similarity), best first
+    """
+    user_hash = hmac_user(user_id)
+    cache = get_memory_vector_cache() if use_cache else None
+
+    async with conn.transaction():
+        async with set_rls_context(conn, user_id):
+            index = await cache.get(user_hash, partial(_load_memory_vectors, conn, user_hash)) if cache else None
+            if index is not None:
+                hits = index.search(embedding, k)
+                if not hits:
+                    return []
+                rows = await conn.fetch(
+                    f"SELECT {SEARCH_COLUMNS} FROM memory_chunks WHERE id = ANY($1::uuid[])",
+                    [chunk_id for chunk_id, _ in hits],
+                )
+                by_id = {str(row["id"]): row for row in rows}
+                return [{**by_id[chunk_id], "score": score} for chunk_id, score in hits if chunk_id in by_id]
+
+            # real[] parameter works whether or not register_vector_codec() ran on this connection
+            rows = await conn.fetch(
+                f"""
+                SELECT {SEARCH_COLUMNS}, 1 - (embedding <=> $1::real[]::vector) AS score
+                FROM memory_chunks
+                WHERE embedding IS NOT NULL
+                ORDER BY embedding <=> $1::real[]::vector
+                LIMIT $2
+                """,
+                [float(x) for x in embedding],
+                k,
+            )
+            return [dict(row) for row in rows]
@@ -13,6 +13,11 @@
 - Historical analysis (long-term storage)
 
 All metrics operations are non-blocking and have < 1% overhead impact.
+
+Latency percentiles (query, rerank, SSE TTFV) come from constant-memory
+log-linear histograms (relay_ai.telemetry.histograms): recording is an O(1) bucket increment on a per-thread
+shard, reads are O(buckets), and a ring of per-minute histograms provides
+recent-window percentiles without keeping raw samples.
 """
 
 import logging
@@ -23,6 +28,16 @@
 from threading import Lock
 from typing import Any, Callable, Optional
 
+from relay_ai.telemetry.histograms import (  # noqa: F401 - re-exported for existing importers
+    DEFAULT_QUANTILES,
+    HIST_MAX_VALUE_MS,
+    HIST_SHARDS,
+    HIST_SUB_BUCKET_BITS,
+    HIST_UNIT_MS,
+    LogLinearHistogram,
+    WindowedHistogram,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -75,6 +90,37 @@ class SecurityEvent:
     severity: str = "high"  # info, warning, critical
 
 
+class WindowedCounter:
+    """Event counter in one-second buckets, for trailing-window rates."""
+
+    def __init__(self, window_sec: int = 60, clock: Callable[[], float] = time.time):
+        self.window_sec = window_sec
+        self.clock = clock
+        self._counts = [0] * window_sec
+        self._epochs = [-1] * window_sec
+        self._lock = Lock()
+
+    def add(self, count: int = 1) -> None:
+        second = int(self.clock())
+        slot = second % self.window_sec
+        with self._lock:
+            if self._epochs[slot] != second:
+                self._epochs[slot] = second
+                self._counts[slot] = 0
+            self._counts[slot] += count
+
+    def count(self) -> int:
+        """Events in the trailing window_sec seconds"""
+        second = int(self.clock())
+        with self._lock:
+            return sum(c for c, epoch in zip(self._counts, self._epochs) if 0 <= second - epoch < self.window_sec)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * self.window_sec
+            self._epochs = [-1] * self.window_sec
+
+
 class MemoryMetricsCollector:
     """
     Thread-safe collector for memory subsystem metrics.
@@ -86,12 +132,20 @@ class MemoryMetricsCollector:
     - Automatic aggregation for high-cardinality labels
     """
 
-    def __init__(self, max_buffer_size: int = 100_000, flush_interval_sec: int = 60):
+    def __init__(
+        self,
+        max_buffer_size: int = 100_000,
+        flush_interval_sec: int = 60,
+        percentile_window_min: int = 5,
+        clock: Callable[[], float] = time.time,
+    ):
         """Initialize metrics collector
 
         Args:
             max_buffer_size: Max metrics before circular buffer wraps
             flush_interval_sec: How often to flush to remote
+            percentile_window_min: Minutes of history behind recent percentiles
+            clock: Time source (injectable for tests)
         """
         self.max_buffer_size = max_buffer_size
         self.flush_interval_sec = flush_interval_sec
@@ -104,10 +158,14 @@ def __init__(self, max_buffer_size: int = 100_000, flush_interval_sec: int = 60)
         self._security_events: deque = deque(maxlen=10_000)
         self._security_lock = Lock()
 
-        # Running aggregates (for percentile calculations)
-        self._query_latencies: deque = deque(maxlen=10_000)
-        self._rerank_latencies: deque = deque(maxlen=5_000)
-        self._latency_lock = Lock()
+        # Latency histograms (cumulative + per-minute ring for recent percentiles)
+        self._query_latency = WindowedHistogram(60.0, percentile_window_min, clock)
+        self._rerank_latency = WindowedHistogram(60.0, percentile_window_min, clock)
+        self._ttfv_latency = WindowedHistogram(60.0, percentile_window_min, clock)
+
+        # Trailing one-minute event counts (for per-minute rate alerts)
+        self._rerank_skip_rate = WindowedCounter(60, clock)
+        self._rls_block_rate = WindowedCounter(60, clock)
 
         # Alert thresholds (can be tuned via ENV)
         self.thresholds = {
@@ -127,6 +185,7 @@ def __init__(self, max_buffer_size: int = 100_000, flush_interval_sec: int = 60)
             "memory_cross_tenant_attempts_total": 0,
             "memory_rls_blocks_total": 0,
             "memory_invalid_user_hash_total": 0,
+            "memory_sse_ttfv_total": 0,
         }
         self._counter_lock = Lock()
 
@@ -166,8 +225,7 @@ def record_query_latency(
 
         # Track for percentile calculation
         if stage == "total":
-            with self._latency_lock:
-                self._query_latencies.append(latency_ms)
+            self._query_latency.record(latency_ms)
 
     def record_rerank_latency(
         self,
@@ -193,11 +251,33 @@ def record_rerank_latency(
             self._metric_buffer.append(event)
 
         if skipped:
+            self._rerank_skip_rate.add()
             with self._counter_lock:
                 self._counters["memory_rerank_skipped_total"] += 1
 
-        with self._latency_lock:
-            self._rerank_latencies.append(latency_ms)
+        self._rerank_latency.record(latency_ms)
+
+    def record_ttfv(self, ttfv_ms: float, user_id: Optional[str] = None) -> None:
+        """Record SSE time-to-first-visible-token
+
+        Args:
+            ttfv_ms: Time from request start to first streamed chunk
+            user_id: User ID for tracing
+        """
+        event = MemoryMetricEvent(
+            metric_name="memory_sse_ttfv_ms",
+            metric_type=MetricType.HISTOGRAM,
+            value=ttfv_ms,
+            labels={"user_id": user_id[:8] if user_id else "unknown"},
+        )
+
+        with self._metric_lock:
+            self._metric_buffer.append(event)
+
+        with self._counter_lock:
+            self._counters["memory_sse_ttfv_total"] += 1
+
+        self._ttfv_latency.record(ttfv_ms)
 
     def record_index_operation(
         self,
@@ -263,6 +343,7 @@ def record_security_event(
                 self._counters["memory_cross_tenant_attempts_total"] += 1
             elif event_type == AnomalyType.RLS_POLICY_VIOLATION:
                 self._counters["memory_rls_blocks_total"] += 1
+                self._rls_block_rate.add()
             elif event_type == AnomalyType.INVALID_USER_HASH:
                 self._counters["memory_invalid_user_hash_total"] += 1
 
@@ -326,43 +407,55 @@ def record_pool_utilization(
 
     # --- Query APIs ---
 
-    def get_query_percentiles(self) -> dict[str, float]:
+    @staticmethod
+    def _percentiles(histogram: WindowedHistogram, window: bool) -> dict[str, float]:
+        source = histogram.window() if window else histogram.total
+        values = source.percentiles(DEFAULT_QUANTILES)
+        return {"p50_ms": values[0.50], "p95_ms": values[0.95], "p99_ms": values[0.99]}
+
+    def get_query_percentiles(self, window: bool = True) -> dict[str, float]:
         """Get p50, p95, p99 latencies from recent queries
 
+        Args:
+            window: Recent window only (default) or all queries since start
+
         Returns:
             {"p50_ms": 100, "p95_ms": 350, "p99_ms": 500}
         """
-        with self._latency_lock:
-            if not self._query_latencies:
-                return {"p50_ms": 0, "p95_ms": 0, "p99_ms": 0}
-
-            sorted_latencies = sorted(self._query_latencies)
-            length = len(sorted_latencies)
+        return self._percentiles(self._query_latency, window)
 
-            return {
-                "p50_ms": sorted_latencies[int(length * 0.50)],
-                "p95_ms": sorted_latencies[int(length * 0.95)],
-                "p99_ms": sorted_latencies[int(length * 0.99)],
-            }
-
-    def get_rerank_percentiles(self) -> dict[str, float]:
+    def get_rerank_percentiles(self, window: bool = True) -> dict[str, float]:
         """Get p50, p95, p99 reranking latencies
 
+        Args:
+            window: Recent window only (default) or all reranks since start
+
         Returns:
             {"p50_ms": 50, "p95_ms": 120, "p99_ms": 200}
         """
-        with self._latency_lock:
-            if not self._rerank_latencies:
-                return {"p50_ms": 0, "p95_ms": 0, "p99_ms": 0}
+        return self._percentiles(self._rerank_latency, window)
 
-            sorted_latencies = sorted(self._rerank_latencies)
-            length = len(sorted_latencies)
+    def get_ttfv_percentiles(self, window: bool = True) -> dict[str, float]:
+        """Get p50, p95, p99 SSE time-to-first-visible-token
 
-            return {
-                "p50_ms": sorted_latencies[int(length * 0.50)],
-                "p95_ms": sorted_latencies[int(length * 0.95)],
-                "p99_ms": sorted_latencies[int(length * 0.99)],
-            }
+        Args:
+            window: Recent window only (default) or all streams since start
+
+        Returns:
+            {"p50_ms": 400, "p95_ms": 1100, "p99_ms": 1400}
+        """
+        return self._percentiles(self._ttfv_latency, window)
+
+    def get_rates(self) -> dict[str, int]:
+        """Get event counts over the trailing minute
+
+        Returns:
+            {"rerank_skips_per_min": 3, "rls_blocks_per_min": 0}
+        """
+        return {
+            "rerank_skips_per_min": self._rerank_skip_rate.count(),
+            "rls_blocks_per_min": self._rls_block_rate.count(),
+        }
 
     def get_counters(self) -> dict[str, int]:
         """Get snapshot of all counters
@@ -412,15 +505,36 @@ def get_alert_status(self) -> dict[str, Any]:
                 }
             )
 
-        # Check rerank skips (rate-based)
-        counters = self.get_counters()
-        skips = counters.get("memory_rerank_skipped_total", 0)
-        if skips > self.thresholds["rerank_skips_per_min"] * 60:  # Assume ~1 hour window
+        # Check SSE time-to-first-visible-token
+        ttfv_p95 = self.get_ttfv_percentiles().get("p95_ms", 0)
+        if ttfv_p95 > self.thresholds["ttfv_p95_ms"]:
+            alerts.append(
+                {
+                    "level": "high",
+                    "name": "ttfv_regression",
+                    "value": ttfv_p95,
+                    "threshold": self.thresholds["ttfv_p95_ms"],
+                }
+            )
+
+        # Check rerank skips and RLS blocks (trailing-minute rates)
+        rates = self.get_rates()
+        if rates["rerank_skips_per_min"] > self.thresholds["rerank_skips_per_min"]:
             alerts.append(
                 {
                     "level": "high",
                     "name": "rerank_skips_high",
-                    "value": skips,
+                    "value": rates["rerank_skips_per_min"],
+                    "threshold": self.thresholds["rerank_skips_per_min"],
+                }
+            )
+        if rates["rls_blocks_per_min"] > self.thresholds["rls_blocks_per_min"]:
+            alerts.append(
+                {
+                    "level": "high",
+                    "name": "rls_blocks_high",
+                    "value": rates["rls_blocks_per_min"],
+                    "threshold": self.thresholds["rls_blocks_per_min"],
                 }
             )
 
@@ -455,16 +569,17 @@ def export_prometheus(self) -> str:
         """
         lines = []
 
-        # Latency metrics
-        percentiles = self.get_query_percentiles()
-        for name, value in percentiles.items():
-            pct = name.replace("_ms", "").lower()
-            lines.append(f'memory_query_latency_ms{{quantile="{pct}"}} {value}')
-
-        rerank_pcts = self.get_rerank_percentiles()
-        for name, value in rerank_pcts.items():
-            pct = name.replace("_ms", "").lower()
-            lines.append(f'memory_rerank_ms{{quantile="{pct}"}} {value}')
+        # Latency metrics (quantiles over the recent window, count/sum cumulative)
+        for metric_name, histogram in (
+            ("memory_query_latency_ms", self._query_latency),
+            ("memory_rerank_ms", self._rerank_latency),
+            ("memory_sse_ttfv_ms", self._ttfv_latency),
+        ):
+            for name, value in self._percentiles(histogram, window=True).items():
+                pct = name.replace("_ms", "").lower()
+                lines.append(f'{metric_name}{{quantile="{pct}"}} {value}')
+            lines.append(f"{metric_name}_count {histogram.total.count}")
+            lines.append(f"{metric_name}_sum {histogram.total.total_ms}")
 
         # Counters
         counters = self.get_counters()
@@ -497,9 +612,10 @@ def reset_buffers(self) -> None:
             self._metric_buffer.clear()
         with self._security_lock:
             self._security_events.clear()
-        with self._latency_lock:
-            self._query_latencies.clear()
-            self._rerank_latencies.clear()
+        for histogram in (self._query_latency, self._rerank_latency, self._ttfv_latency):
+            histogram.reset()
+        self._rerank_skip_rate.reset()
+        self._rls_block_rate.reset()
         with self._counter_lock:
             for key in self._counters:
                 self._counters[key] = 0
@@ -528,6 +644,11 @@ def record_query_latency(
     get_default_collector().record_query_latency(latency_ms, stage, user_id, success)
 
 
+def record_ttfv(ttfv_ms: float, user_id: Optional[str] = None) -> None:
+    """Record SSE time-to-first-visible-token to default collector"""
+    get_default_collector().record_ttfv(ttfv_ms, user_id)
+
+
 def record_security_event(
     event_type: AnomalyType,
     user_id: Optional[str] = None,
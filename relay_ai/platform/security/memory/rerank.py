@@ -4,18 +4,32 @@
 
 Provides:
 - rerank(query, candidates, timeout_ms) → reranked results with circuit breaker
-- get_cross_encoder() → lazy-loaded model on GPU
+- get_cross_encoder() → lazy-loaded model (torch on GPU/CPU, ONNX or int8 on CPU)
 - maybe_rerank(query, candidates) → feature-flagged reranking
+- RerankService → bounded, micro-batching scorer shared by all queries
 
 Circuit breaker: If reranking exceeds timeout_ms, skip CE and return ANN order (fail-open).
 This ensures query latency remains under budget even if GPU is slow.
+
+Scoring runs on a small dedicated executor rather than the loop's default one.
+Pending requests wait in a queue; a dispatcher thread merges the pairs of
+concurrent queries that arrive within RERANK_BATCH_WINDOW_MS into one
+model.predict() call. Requests whose deadline passed, or whose caller already
+timed out, are dropped before they reach the model, so abandoned work never
+occupies a worker. Scores are cached per (query, passage hash) in an LRU.
 """
 
 import asyncio
+import hashlib
 import logging
 import os
+import threading
 import time
-from typing import Any
+from collections import OrderedDict, deque
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -39,13 +53,53 @@ def _check_cuda() -> bool:
 # Cross-encoder model (TinyBERT for speed on consumer GPUs)
 CROSS_ENCODER_MODEL = os.getenv("CROSS_ENCODER_MODEL", "cross-encoder/ms-marco-TinyBERT-L-2-v2")
 
-# Device (cuda:0 if available, else cpu)
+# Inference backend: "torch" (default), "onnx" (ONNX Runtime on CPU) or "int8"
+# (torch dynamic int8 quantization of Linear layers on CPU)
+RERANK_BACKEND = os.getenv("RERANK_BACKEND", "torch").lower()
+
+# Optional ONNX file inside the model repo, e.g. a pre-quantized
+# "onnx/model_qint8_avx512_vnni.onnx"
+RERANK_ONNX_FILE = os.getenv("RERANK_ONNX_FILE", "")
+
+# Intra-op threads for CPU inference (0 = library default)
+RERANK_NUM_THREADS = int(os.getenv("RERANK_NUM_THREADS", "0"))
+
+# Dedicated scoring workers (each runs one batch at a time)
+RERANK_MAX_WORKERS = int(os.getenv("RERANK_MAX_WORKERS", "1"))
+
+# Micro-batching window and batch size across concurrent queries
+RERANK_BATCH_WINDOW_MS = float(os.getenv("RERANK_BATCH_WINDOW_MS", "5"))
+RERANK_MAX_BATCH_PAIRS = int(os.getenv("RERANK_MAX_BATCH_PAIRS", "64"))
+
+# Pairs allowed to wait for a worker before new requests are rejected (fail-open)
+RERANK_MAX_QUEUE_PAIRS = int(os.getenv("RERANK_MAX_QUEUE_PAIRS", "512"))
+
+# LRU score cache entries keyed by (query, passage hash); 0 disables
+RERANK_CACHE_SIZE = int(os.getenv("RERANK_CACHE_SIZE", "10000"))
+
+# Device (cuda:0 if available, else cpu). ONNX and int8 backends always run on CPU.
 _cuda_available = _check_cuda()
-DEVICE = "cuda" if _cuda_available else "cpu"
+DEVICE = "cuda" if _cuda_available and RERANK_BACKEND == "torch" else "cpu"
 
 # Global model instance (lazy-loaded)
 _cross_encoder_instance = None
 
+# Global service instance (lazy-created)
+_service_instance: Optional["RerankService"] = None
+_service_lock = threading.Lock()
+
+
+class RerankOverloadedError(Exception):
+    """Raised when the rerank queue is full and a request is rejected."""
+
+    pass
+
+
+class RerankDeadlineError(Exception):
+    """Raised when a request's deadline passed before it reached the model."""
+
+    pass
+
 
 class RerankedResult:
     """Result from reranking: (candidate, score, index)"""
@@ -62,8 +116,8 @@ def __repr__(self):
 def get_cross_encoder():
     """Lazy-load cross-encoder model on first call.
 
-    Loads ms-marco-TinyBERT-L-2-v2 model on DEVICE (cuda:0 or cpu).
-    Subsequent calls return cached instance.
+    Loads ms-marco-TinyBERT-L-2-v2 model on DEVICE (cuda:0 or cpu) using
+    RERANK_BACKEND. Subsequent calls return cached instance.
 
     Returns:
         CrossEncoder model instance
@@ -81,13 +135,13 @@ def get_cross_encoder():
         from sentence_transformers import CrossEncoder
 
         logger.info(f"Loading cross-encoder model: {CROSS_ENCODER_MODEL}")
-        logger.info(f"Device: {DEVICE}")
+        logger.info(f"Device: {DEVICE}, backend: {RERANK_BACKEND}")
 
         start = time.time()
-        model = CrossEncoder(CROSS_ENCODER_MODEL, device=DEVICE)
+        model = _load_cross_encoder(CrossEncoder)
         elapsed = time.time() - start
 
-        logger.info(f"Model loaded in {elapsed:.2f}s on {DEVICE}")
+        logger.info(f"Model loaded in {elapsed:.2f}s on {DEVICE} ({RERANK_BACKEND})")
         _cross_encoder_instance = model
         return model
 
@@ -101,71 +155,237 @@ def get_cross_encoder():
         raise RuntimeError(f"Model loading failed: {e}") from e
 
 
-async def rerank(query: str, candidates: list[str], timeout_ms: float = RERANK_TIMEOUT_MS) -> list[RerankedResult]:
-    """Rerank candidates using cross-encoder with circuit breaker.
+def _load_cross_encoder(cross_encoder_cls):
+    """Instantiate the cross-encoder for RERANK_BACKEND.
 
-    If reranking exceeds timeout_ms, skip CE and return original ANN order (fail-open).
-    This ensures TTFV doesn't exceed budget even if GPU is overloaded.
+    - torch: plain CrossEncoder on DEVICE
+    - onnx: CrossEncoder with the ONNX Runtime backend (optionally a specific,
+      e.g. pre-quantized, RERANK_ONNX_FILE)
+    - int8: CrossEncoder on CPU with Linear layers dynamically quantized to int8
+    """
+    if RERANK_NUM_THREADS > 0 and RERANK_BACKEND != "onnx":
+        import torch
 
-    Args:
-        query: User query string
-        candidates: List of candidate passages (typically 24-32 from ANN search)
-        timeout_ms: Max time allowed for reranking (default: 250ms)
-                   If exceeded, returns ANN order without reranking
+        torch.set_num_threads(RERANK_NUM_THREADS)
 
-    Returns:
-        List of RerankedResult sorted by CE score (highest first)
-        If timeout exceeded, returns candidates in ANN order
+    if RERANK_BACKEND == "onnx":
+        model_kwargs: dict[str, Any] = {}
+        if RERANK_ONNX_FILE:
+            model_kwargs["file_name"] = RERANK_ONNX_FILE
+        if RERANK_NUM_THREADS > 0:
+            import onnxruntime
 
-    Example:
-        >>> query = "How do I reset my password?"
-        >>> candidates = ["Reset password...", "Change password...", "Security..."]
-        >>> results = await rerank(query, candidates)
-        >>> results[0].candidate  # Best match
-        "Reset password..."
+            options = onnxruntime.SessionOptions()
+            options.intra_op_num_threads = RERANK_NUM_THREADS
+            model_kwargs["session_options"] = options
+        return cross_encoder_cls(CROSS_ENCODER_MODEL, device="cpu", backend="onnx", model_kwargs=model_kwargs)
+
+    model = cross_encoder_cls(CROSS_ENCODER_MODEL, device=DEVICE)
+    if RERANK_BACKEND == "int8":
+        import torch
+
+        model.model = torch.quantization.quantize_dynamic(model.model, {torch.nn.Linear}, dtype=torch.qint8)
+    elif RERANK_BACKEND != "torch":
+        logger.warning(f"Unknown RERANK_BACKEND={RERANK_BACKEND!r}, using torch")
+    return model
+
+
+def _predict_pairs(pairs: list[tuple[str, str]]) -> Sequence[float]:
+    """Default scorer: one model.predict() call over a whole micro-batch."""
+    model = get_cross_encoder()
+    return model.predict(pairs, batch_size=len(pairs), show_progress_bar=False)
+
+
+def passage_hash(passage: str) -> str:
+    """Stable short hash of a passage for score cache keys."""
+    return hashlib.blake2b(passage.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ScoreCache:
+    """Thread-safe LRU of cross-encoder scores keyed by (query, passage hash)."""
+
+    def __init__(self, max_entries: int = RERANK_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, keys: list[tuple[str, str]]) -> list[Optional[float]]:
+        """Look up scores, marking hits as recently used; misses are None."""
+        if self.max_entries <= 0:
+            return [None] * len(keys)
+        scores: list[Optional[float]] = []
+        with self._lock:
+            for key in keys:
+                score = self._entries.get(key)
+                if score is not None:
+                    self._entries.move_to_end(key)
+                scores.append(score)
+        return scores
+
+    def put_many(self, keys: list[tuple[str, str]], scores: list[float]) -> None:
+        """Store scores, evicting least recently used entries over capacity."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            for key, score in zip(keys, scores):
+                self._entries[key] = score
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+@dataclass
+class _PendingRequest:
+    """Pairs from one rerank() call waiting for a scoring worker."""
+
+    pairs: list[tuple[str, str]]
+    keys: list[tuple[str, str]]
+    deadline: float  # time.monotonic()
+    future: Future = field(default_factory=Future)
+    enqueued: float = field(default_factory=time.monotonic)
+
+
+class RerankService:
+    """Bounded, micro-batching cross-encoder scorer.
+
+    A single dispatcher thread owns the queue of pending requests. It waits up
+    to batch_window_ms after the first arrival (or until max_batch_pairs are
+    queued), waits for a free worker slot, then drops stale or abandoned
+    requests and hands the rest to the executor as one batch. Because requests
+    only leave the queue when a worker is free, a slow model backs up the
+    queue (where requests can still be dropped) instead of the executor.
     """
-    try:
-        # Guard: No candidates
+
+    def __init__(
+        self,
+        scorer: Optional[Callable[[list[tuple[str, str]]], Sequence[float]]] = None,
+        max_workers: int = RERANK_MAX_WORKERS,
+        batch_window_ms: float = RERANK_BATCH_WINDOW_MS,
+        max_batch_pairs: int = RERANK_MAX_BATCH_PAIRS,
+        max_queue_pairs: int = RERANK_MAX_QUEUE_PAIRS,
+        cache_size: int = RERANK_CACHE_SIZE,
+    ):
+        """Initialize service.
+
+        Args:
+            scorer: Callable scoring a list of (query, passage) pairs
+                    (default: cross-encoder predict)
+            max_workers: Concurrent model calls
+            batch_window_ms: How long to wait for more queries before scoring
+            max_batch_pairs: Upper bound on pairs per model call
+            max_queue_pairs: Pairs allowed to wait before requests are rejected
+            cache_size: LRU score cache entries (0 disables)
+        """
+        self.scorer = scorer or _predict_pairs
+        self.max_workers = max(1, max_workers)
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch_pairs = max(1, max_batch_pairs)
+        self.max_queue_pairs = max_queue_pairs
+        self.cache = ScoreCache(cache_size)
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="rerank")
+        self._slots = threading.Semaphore(self.max_workers)
+        self._cond = threading.Condition()
+        self._queue: deque[_PendingRequest] = deque()
+        self._queued_pairs = 0
+        self._dispatcher: Optional[threading.Thread] = None
+        self._closed = False
+
+        self.stats = {
+            "requests": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "batches": 0,
+            "batched_pairs": 0,
+            "dropped_stale": 0,
+            "rejected": 0,
+            "timeouts": 0,
+            "errors": 0,
+        }
+
+    def submit(self, pairs: list[tuple[str, str]], keys: list[tuple[str, str]], deadline: float) -> Future:
+        """Queue pairs for scoring.
+
+        Args:
+            pairs: (query, passage) pairs to score
+            keys: Cache keys for the pairs
+            deadline: time.monotonic() after which the request is dropped unscored
+
+        Returns:
+            Future resolving to the list of scores
+
+        Raises:
+            RerankOverloadedError: If the queue is full
+        """
+        request = _PendingRequest(pairs=pairs, keys=keys, deadline=deadline)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("RerankService is closed")
+            if self._queued_pairs and self._queued_pairs + len(pairs) > self.max_queue_pairs:
+                self.stats["rejected"] += 1
+                raise RerankOverloadedError(f"Rerank queue full ({self._queued_pairs} pairs pending)")
+            self._queue.append(request)
+            self._queued_pairs += len(pairs)
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch_loop, name="rerank-dispatch", daemon=True)
+                self._dispatcher.start()
+            self._cond.notify()
+        return request.future
+
+    async def rerank(
+        self, query: str, candidates: list[str], timeout_ms: float = RERANK_TIMEOUT_MS
+    ) -> list[RerankedResult]:
+        """Score candidates against query and sort by score; fail open to ANN order.
+
+        Cached pairs are served without touching the model. The remaining pairs
+        are queued with a deadline of timeout_ms from now.
+        """
         if not candidates:
             return []
-
-        # Guard: Single candidate (no need to rerank)
         if len(candidates) == 1:
             return [RerankedResult(candidates[0], 1.0, 0)]
 
-        # Time the reranking operation
-        start = time.time()
-
-        def _rerank_blocking():
-            """Blocking reranking call (runs in thread pool)"""
-            try:
-                model = get_cross_encoder()
-
-                # Create query-candidate pairs
-                pairs = [(query, candidate) for candidate in candidates]
-
-                # Score all pairs
-                scores = model.predict(pairs)
+        start = time.monotonic()
+        timeout_s = timeout_ms / 1000.0
+        keys = [(query, passage_hash(c)) for c in candidates]
+        scores = self.cache.get_many(keys)
+        missing = [i for i, score in enumerate(scores) if score is None]
 
-                return scores
+        with self._cond:
+            self.stats["requests"] += 1
+            self.stats["cache_hits"] += len(candidates) - len(missing)
+            self.stats["cache_misses"] += len(missing)
 
+        if missing:
+            try:
+                future = self.submit(
+                    [(query, candidates[i]) for i in missing], [keys[i] for i in missing], start + timeout_s
+                )
+                fresh = await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout_s)
+            except (asyncio.TimeoutError, RerankDeadlineError):
+                with self._cond:
+                    self.stats["timeouts"] += 1
+                logger.warning(f"Reranking timeout ({timeout_ms}ms) exceeded, " f"returning ANN order (fail-open)")
+                return _ann_order(candidates)
+            except RerankOverloadedError as e:
+                logger.warning(f"{e}, returning ANN order (fail-open)")
+                return _ann_order(candidates)
             except Exception as e:
-                logger.error(f"Reranking failed: {e}")
-                return None
-
-        # Run blocking operation in thread pool to avoid blocking async loop
-        loop = asyncio.get_event_loop()
-        scores = await asyncio.wait_for(
-            loop.run_in_executor(None, _rerank_blocking), timeout=timeout_ms / 1000.0  # Convert ms to seconds
-        )
+                with self._cond:
+                    self.stats["errors"] += 1
+                logger.error(f"Reranking error: {e}, returning ANN order")
+                return _ann_order(candidates)
 
-        elapsed_ms = (time.time() - start) * 1000
+            for i, score in zip(missing, fresh):
+                scores[i] = score
 
-        if scores is None:
-            logger.warning("Reranking returned None, returning ANN order")
-            return [RerankedResult(c, 0.0, i) for i, c in enumerate(candidates)]
-
-        # Sort by score (highest first)
         ranked = sorted(
             [RerankedResult(candidate, score, i) for i, (candidate, score) in enumerate(zip(candidates, scores))],
             key=lambda x: x.score,
@@ -173,21 +393,161 @@ def _rerank_blocking():
         )
 
         logger.debug(
-            f"Reranked {len(candidates)} candidates in {elapsed_ms:.1f}ms "
-            f"(p95 budget: 150ms, timeout: {timeout_ms}ms)"
+            f"Reranked {len(candidates)} candidates ({len(candidates) - len(missing)} cached) in "
+            f"{(time.monotonic() - start) * 1000:.1f}ms (timeout: {timeout_ms}ms)"
         )
-
         return ranked
 
-    except asyncio.TimeoutError:
-        # Circuit breaker: Timeout exceeded
-        logger.warning(f"Reranking timeout ({timeout_ms}ms) exceeded, " f"returning ANN order (fail-open)")
-        return [RerankedResult(c, 0.0, i) for i, c in enumerate(candidates)]
+    def close(self) -> None:
+        """Stop the dispatcher; queued requests are cancelled."""
+        with self._cond:
+            self._closed = True
+            while self._queue:
+                request = self._queue.popleft()
+                request.future.cancel()
+            self._queued_pairs = 0
+            self._cond.notify_all()
+        self._executor.shutdown(wait=False)
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._cond:
+            stats = dict(self.stats)
+            stats["queued_pairs"] = self._queued_pairs
+        stats["cache_entries"] = len(self.cache)
+        return stats
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Give concurrent queries a short window to join this batch
+                window_end = self._queue[0].enqueued + self.batch_window
+                while not self._closed and self._queued_pairs < self.max_batch_pairs:
+                    remaining = window_end - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+            # Wait for a worker outside the lock so callers can keep queueing
+            self._slots.acquire()
+            with self._cond:
+                batch = [] if self._closed else self._take_batch()
+            if not batch:
+                self._slots.release()
+                continue
+            try:
+                self._executor.submit(self._run_batch, batch)
+            except RuntimeError as e:  # Executor shut down
+                self._slots.release()
+                for request in batch:
+                    request.future.set_exception(e)
+                return
+
+    def _take_batch(self) -> list[_PendingRequest]:
+        """Pop up to max_batch_pairs of live requests (caller holds the lock)."""
+        now = time.monotonic()
+        batch: list[_PendingRequest] = []
+        batch_pairs = 0
+        while self._queue:
+            request = self._queue[0]
+            if batch and batch_pairs + len(request.pairs) > self.max_batch_pairs:
+                break
+            self._queue.popleft()
+            self._queued_pairs -= len(request.pairs)
+            if not request.future.set_running_or_notify_cancel():
+                # Caller already timed out
+                self.stats["dropped_stale"] += 1
+                continue
+            if now >= request.deadline:
+                self.stats["dropped_stale"] += 1
+                request.future.set_exception(RerankDeadlineError("Deadline passed before scoring started"))
+                continue
+            batch.append(request)
+            batch_pairs += len(request.pairs)
+        if batch:
+            self.stats["batches"] += 1
+            self.stats["batched_pairs"] += batch_pairs
+        return batch
+
+    def _run_batch(self, batch: list[_PendingRequest]) -> None:
+        try:
+            pairs = [pair for request in batch for pair in request.pairs]
+            scores = self.scorer(pairs)
+            offset = 0
+            for request in batch:
+                request_scores = [float(s) for s in scores[offset : offset + len(request.pairs)]]
+                offset += len(request.pairs)
+                # Cache even if the caller gave up meanwhile; a retry will hit
+                self.cache.put_many(request.keys, request_scores)
+                request.future.set_result(request_scores)
+        except Exception as e:
+            logger.error(f"Reranking failed: {e}")
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+        finally:
+            self._slots.release()
+
+
+def get_rerank_service() -> RerankService:
+    """Get (or create) the shared rerank service configured from env."""
+    global _service_instance
+
+    if _service_instance is None:
+        with _service_lock:
+            if _service_instance is None:
+                _service_instance = RerankService()
+    return _service_instance
+
+
+def shutdown_rerank_service() -> None:
+    """Close the shared rerank service (e.g. on app shutdown)."""
+    global _service_instance
+
+    with _service_lock:
+        if _service_instance is not None:
+            _service_instance.close()
+            _service_instance = None
+
+
+def _ann_order(candidates: list[str]) -> list[RerankedResult]:
+    return [RerankedResult(c, 0.0, i) for i, c in enumerate(candidates)]
+
+
+async def rerank(query: str, candidates: list[str], timeout_ms: float = RERANK_TIMEOUT_MS) -> list[RerankedResult]:
+    """Rerank candidates using cross-encoder with circuit breaker.
+
+    If reranking exceeds timeout_ms, skip CE and return original ANN order (fail-open).
+    This ensures TTFV doesn't exceed budget even if GPU is overloaded. Scoring is
+    micro-batched with concurrent queries by the shared RerankService; a request
+    that times out is dropped before it reaches the model.
 
+    Args:
+        query: User query string
+        candidates: List of candidate passages (typically 24-32 from ANN search)
+        timeout_ms: Max time allowed for reranking (default: 250ms)
+                   If exceeded, returns ANN order without reranking
+
+    Returns:
+        List of RerankedResult sorted by CE score (highest first)
+        If timeout exceeded, returns candidates in ANN order
+
+    Example:
+        >>> query = "How do I reset my password?"
+        >>> candidates = ["Reset password...", "Change password...", "Security..."]
+        >>> results = await rerank(query, candidates)
+        >>> results[0].candidate  # Best match
+        "Reset password..."
+    """
+    try:
+        return await get_rerank_service().rerank(query, candidates, timeout_ms)
     except Exception as e:
         # Fail-open: Any other error, return ANN order
         logger.error(f"Reranking error: {e}, returning ANN order")
-        return [RerankedResult(c, 0.0, i) for i, c in enumerate(candidates)]
+        return _ann_order(candidates)
 
 
 async def maybe_rerank(query: str, candidates: list[str]) -> list[str]:
@@ -235,13 +595,19 @@ def get_rerank_metrics() -> dict[str, Any]:
         - rerank_enabled: bool
         - model_loaded: bool
         - device: str (cuda:0 or cpu)
+        - backend: str (torch, onnx or int8)
         - model_name: str
         - timeout_ms: float
+        - service: dict of batching/cache counters (if the service is running)
     """
-    return {
+    metrics = {
         "rerank_enabled": RERANK_ENABLED,
         "model_loaded": _cross_encoder_instance is not None,
         "device": DEVICE,
+        "backend": RERANK_BACKEND,
         "model_name": CROSS_ENCODER_MODEL,
         "timeout_ms": RERANK_TIMEOUT_MS,
     }
+    if _service_instance is not None:
+        metrics["service"] = _service_instance.get_stats()
+    return metrics
@@ -4,6 +4,7 @@
 
 Provides:
 - seal(plaintext, aad) → AES-256-GCM encrypted blob
+- seal_many(plaintexts, aad) → seal() for a batch with one key setup
 - open_sealed(blob, aad) → decrypted plaintext
 - hmac_user() → tenant key derivation (imported from rls.py)
 
@@ -151,6 +152,34 @@ def seal(plaintext: bytes, aad: bytes = b"") -> bytes:
     return blob
 
 
+def seal_many(plaintexts: list[bytes], aad: bytes = b"") -> list[bytes]:
+    """Encrypt several plaintexts with the same AAD.
+
+    Same blob format as seal(), each with its own random nonce, but the key is
+    decoded and the AESGCM context built once for the whole batch. Safe to
+    call from worker threads (cryptography releases the GIL while encrypting).
+
+    Args:
+        plaintexts: Data to encrypt
+        aad: Additional Authenticated Data shared by every blob
+
+    Returns:
+        Encrypted blobs in input order
+    """
+    try:
+        key = _decode_key()
+    except ValueError as e:
+        logger.error(f"Invalid encryption key: {e}")
+        raise
+
+    cipher = AESGCM(key)
+    blobs = []
+    for plaintext in plaintexts:
+        nonce = secrets.token_bytes(12)
+        blobs.append(nonce + cipher.encrypt(nonce, plaintext, aad))
+    return blobs
+
+
 def open_sealed(blob: bytes, aad: bytes = b"") -> bytes:
     """Decrypt AES-256-GCM blob with AAD verification.
 
@@ -0,0 +1,641 @@
+"""In-process vector index (pgvector stand-in and per-tenant hot cache)
+
+Provides:
+- VectorIndex: the interface (add / remove / search / save / load)
+- NumpyVectorIndex: float32 cosine index. Brute-force matmul below
+  ivf_threshold vectors, an IVF (k-means inverted lists) above it
+- TenantVectorIndex: one partition per user_hash; every call is scoped to a
+  single tenant, so search can never return another user's vectors (same
+  guarantee as the RLS policy on memory_chunks / file_embeddings)
+- HotVectorCache: per-user partitions loaded from pgvector on first query,
+  LRU-bounded by tenant count and memory, refreshed after a TTL
+
+Indexes persist as .npy files and load memory-mapped, so a large saved index
+opens instantly and is paged in by the OS as queries touch it.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable, Sequence
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Brute force below this many vectors; IVF at or above it
+VECTOR_INDEX_IVF_THRESHOLD = int(os.getenv("VECTOR_INDEX_IVF_THRESHOLD", "20000"))
+# Inverted lists probed per query (recall/latency trade-off)
+VECTOR_INDEX_NPROBE = int(os.getenv("VECTOR_INDEX_NPROBE", "16"))
+
+# Hot cache limits
+VECTOR_CACHE_MAX_TENANTS = int(os.getenv("VECTOR_CACHE_MAX_TENANTS", "256"))
+VECTOR_CACHE_MAX_MB = int(os.getenv("VECTOR_CACHE_MAX_MB", "512"))  # float32 payload across tenants
+VECTOR_CACHE_MAX_TENANT_VECTORS = int(os.getenv("VECTOR_CACHE_MAX_TENANT_VECTORS", "20000"))
+VECTOR_CACHE_TTL_SEC = float(os.getenv("VECTOR_CACHE_TTL_SEC", "300"))
+
+_TENANT_RE = re.compile(r"[A-Za-z0-9_-]{1,128}")
+
+# async (limit) -> (ids, vectors); returns more than limit rows to signal "too large to cache"
+TenantLoader = Callable[[int], Awaitable[tuple[list[str], Any]]]
+
+
+class VectorIndex(ABC):
+    """Nearest-neighbour index over (id, vector) pairs."""
+
+    dim: int
+
+    @abstractmethod
+    def add(self, ids: Sequence[str], vectors: Any) -> None:
+        """Insert or replace vectors by id."""
+
+    @abstractmethod
+    def remove(self, ids: Sequence[str]) -> int:
+        """Remove ids; returns how many were present."""
+
+    @abstractmethod
+    def search(self, query: Any, k: int) -> list[tuple[str, float]]:
+        """Top-k (id, cosine similarity), best first."""
+
+    @abstractmethod
+    def save(self, path: str) -> None:
+        """Persist to a directory."""
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+
+def _as_matrix(vectors: Any, dim: int) -> np.ndarray:
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    if matrix.shape[1] != dim:
+        raise ValueError(f"Expected {dim}-dim vectors, got {matrix.shape[1]}")
+    return matrix
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indexes of the k largest scores, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+class NumpyVectorIndex(VectorIndex):
+    """
+    Cosine index on a float32 matrix.
+
+    Vectors are L2-normalized on insert, so similarity is a dot product.
+    Below ivf_threshold every query is one (n x dim) @ (dim,) matmul. At or
+    above it the index trains k-means centroids (nlist ~ 4*sqrt(n)) and each
+    query scans only the nprobe closest inverted lists. Centroids are
+    retrained when the index has grown 4x since the last training.
+
+    Args:
+        dim: Vector dimension
+        ivf_threshold: Size at which IVF replaces brute force
+        nprobe: Inverted lists scanned per IVF query
+        nlist: Fixed number of lists (default: derived from size)
+        seed: k-means seed (deterministic builds)
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        ivf_threshold: int = VECTOR_INDEX_IVF_THRESHOLD,
+        nprobe: int = VECTOR_INDEX_NPROBE,
+        nlist: Optional[int] = None,
+        seed: int = 0,
+    ):
+        self.dim = dim
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.nlist = nlist
+        self.seed = seed
+
+        self._vectors = np.empty((0, dim), dtype=np.float32)
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._size = 0
+
+        self._centroids: Optional[np.ndarray] = None
+        self._assign = np.empty(0, dtype=np.int32)
+        self._trained_size = 0
+        self._postings: Optional[list[np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, vector_id: str) -> bool:
+        return vector_id in self._rows
+
+    @property
+    def uses_ivf(self) -> bool:
+        return self._centroids is not None
+
+    @property
+    def nbytes(self) -> int:
+        return self._size * self.dim * 4
+
+    # ------------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------------
+
+    def add(self, ids: Sequence[str], vectors: Any) -> None:
+        matrix = _normalize(_as_matrix(vectors, self.dim))
+        if len(ids) != len(matrix):
+            raise ValueError(f"{len(ids)} ids for {len(matrix)} vectors")
+        self._make_writable(self._size + len(ids))
+
+        new_rows = []
+        for vector_id, vector in zip(ids, matrix):
+            row = self._rows.get(vector_id)
+            if row is None:
+                row = self._size
+                self._rows[vector_id] = row
+                self._ids.append(vector_id)
+                self._size += 1
+            self._vectors[row] = vector
+            new_rows.append(row)
+
+        if self._centroids is not None:
+            rows = np.asarray(new_rows)
+            self._assign[rows] = self._nearest_centroids(self._vectors[rows])
+            self._postings = None
+        self._maybe_train()
+
+    def remove(self, ids: Sequence[str]) -> int:
+        removed = 0
+        for vector_id in ids:
+            row = self._rows.pop(vector_id, None)
+            if row is None:
+                continue
+            if not removed:
+                self._make_writable(self._size)
+            last = self._size - 1
+            if row != last:
+                # Swap-remove keeps the matrix dense
+                moved = self._ids[last]
+                self._vectors[row] = self._vectors[last]
+                self._assign[row] = self._assign[last]
+                self._ids[row] = moved
+                self._rows[moved] = row
+            self._ids.pop()
+            self._size -= 1
+            removed += 1
+        if removed:
+            self._postings = None
+            if self._centroids is not None and self._size < self.ivf_threshold // 2:
+                self._centroids, self._trained_size = None, 0
+        return removed
+
+    def _make_writable(self, capacity: int) -> None:
+        """Grow (doubling) and copy memory-mapped arrays before the first write."""
+        if capacity <= len(self._vectors) and self._vectors.flags.writeable:
+            return
+        new_capacity = max(capacity, 2 * len(self._vectors), 64)
+        vectors = np.empty((new_capacity, self.dim), dtype=np.float32)
+        vectors[: self._size] = self._vectors[: self._size]
+        assign = np.zeros(new_capacity, dtype=np.int32)
+        assign[: self._size] = self._assign[: self._size]
+        self._vectors, self._assign = vectors, assign
+
+    # ------------------------------------------------------------------------
+    # IVF
+    # ------------------------------------------------------------------------
+
+    def _maybe_train(self) -> None:
+        if self._size < self.ivf_threshold:
+            return
+        if self._centroids is None or self._size >= 4 * self._trained_size:
+            self.train()
+
+    def train(self, iterations: int = 8, points_per_list: int = 64) -> None:
+        """(Re)build IVF centroids with spherical k-means on a sample of points_per_list * nlist vectors."""
+        data = self._vectors[: self._size]
+        nlist = self.nlist or max(1, min(self._size // 39, int(4 * np.sqrt(self._size))))
+        rng = np.random.default_rng(self.seed)
+        if self._size > points_per_list * nlist:
+            data = data[np.sort(rng.choice(self._size, points_per_list * nlist, replace=False))]
+        centroids = data[rng.choice(len(data), nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            counts = np.bincount(labels, minlength=nlist)
+            order = np.argsort(labels, kind="stable")
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            filled = counts > 0
+            sums = np.empty_like(centroids)
+            sums[filled] = np.add.reduceat(data[order], starts[filled], axis=0)
+            # Re-seed empty lists from random points
+            sums[~filled] = data[rng.choice(len(data), int((~filled).sum()))]
+            centroids = _normalize(sums)
+
+        self._centroids = centroids.astype(np.float32)
+        self._assign[: self._size] = self._nearest_centroids(self._vectors[: self._size])
+        self._trained_size = self._size
+        self._postings = None
+        logger.debug(f"Trained IVF index: {self._size} vectors, {nlist} lists")
+
+    def _nearest_centroids(self, vectors: np.ndarray, block: int = 65536) -> np.ndarray:
+        out = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), block):
+            out[start : start + block] = np.argmax(vectors[start : start + block] @ self._centroids.T, axis=1)
+        return out
+
+    def _get_postings(self) -> list[np.ndarray]:
+        if self._postings is None:
+            assign = self._assign[: self._size]
+            order = np.argsort(assign, kind="stable")
+            bounds = np.searchsorted(assign[order], np.arange(len(self._centroids) + 1))
+            self._postings = [order[bounds[i] : bounds[i + 1]] for i in range(len(self._centroids))]
+        return self._postings
+
+    # ------------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------------
+
+    def search(self, query: Any, k: int, nprobe: Optional[int] = None, exact: bool = False) -> list[tuple[str, float]]:
+        """
+        Top-k ids by cosine similarity.
+
+        Args:
+            query: Query vector (dim,)
+            k: Results to return
+            nprobe: Override lists scanned (IVF only)
+            exact: Force brute force even when IVF is trained
+        """
+        if self._size == 0 or k <= 0:
+            return []
+        q = _normalize(_as_matrix(query, self.dim))[0]
+
+        if self._centroids is None or exact:
+            scores = self._vectors[: self._size] @ q
+            top = _top_k(scores, k)
+            return [(self._ids[i], float(scores[i])) for i in top]
+
+        probe = min(nprobe or self.nprobe, len(self._centroids))
+        lists = _top_k(self._centroids @ q, probe)
+        postings = self._get_postings()
+        rows = np.concatenate([postings[i] for i in lists])
+        if len(rows) == 0:
+            return []
+        scores = self._vectors[rows] @ q
+        top = _top_k(scores, k)
+        return [(self._ids[rows[i]], float(scores[i])) for i in top]
+
+    def search_many(self, queries: Any, k: int) -> list[list[tuple[str, float]]]:
+        """Brute-force top-k for a batch of queries with one (m x dim) @ (dim x n) matmul."""
+        if self._size == 0:
+            return [[] for _ in range(len(queries))]
+        scores = _normalize(_as_matrix(queries, self.dim)) @ self._vectors[: self._size].T
+        results = []
+        for row in scores:
+            top = _top_k(row, k)
+            results.append([(self._ids[i], float(row[i])) for i in top])
+        return results
+
+    # ------------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        """
+        Write vectors.npy, ids.json, IVF arrays and meta.json to path.
+
+        Each file is written to a temp name and renamed; meta.json goes last,
+        so a reader never sees a half-written index.
+        """
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        _atomic_save_npy(directory / "vectors.npy", self._vectors[: self._size])
+        _atomic_write(directory / "ids.json", json.dumps(self._ids).encode("utf-8"))
+        if self._centroids is not None:
+            _atomic_save_npy(directory / "centroids.npy", self._centroids)
+            _atomic_save_npy(directory / "assign.npy", self._assign[: self._size])
+        meta = {
+            "dim": self.dim,
+            "size": self._size,
+            "ivf": self._centroids is not None,
+            "trained_size": self._trained_size,
+            "ivf_threshold": self.ivf_threshold,
+            "nprobe": self.nprobe,
+            "nlist": self.nlist,
+        }
+        _atomic_write(directory / "meta.json", json.dumps(meta).encode("utf-8"))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "NumpyVectorIndex":
+        """Open a saved index; with mmap=True arrays are memory-mapped read-only until the first write."""
+        directory = Path(path)
+        meta = json.loads((directory / "meta.json").read_text())
+        mode = "r" if mmap else None
+        index = cls(meta["dim"], ivf_threshold=meta["ivf_threshold"], nprobe=meta["nprobe"], nlist=meta.get("nlist"))
+        index._vectors = np.load(directory / "vectors.npy", mmap_mode=mode)
+        index._ids = json.loads((directory / "ids.json").read_text())
+        index._rows = {vector_id: row for row, vector_id in enumerate(index._ids)}
+        index._size = meta["size"]
+        if meta["ivf"]:
+            index._centroids = np.load(directory / "centroids.npy")
+            index._assign = np.load(directory / "assign.npy", mmap_mode=mode)
+            index._trained_size = meta["trained_size"]
+        else:
+            index._assign = np.zeros(index._size, dtype=np.int32)
+        return index
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _atomic_save_npy(path: Path, array: np.ndarray) -> None:
+    tmp = path.with_name(f".{path.stem}.tmp.npy")
+    np.save(tmp, array)
+    os.replace(tmp, path)
+
+
+def vectors_from_pgvector(blobs: Sequence[bytes]) -> np.ndarray:
+    """
+    Decode vector_send(embedding) values into an (n, dim) float32 matrix.
+
+    Selecting ``vector_send(embedding)`` returns pgvector's binary form as
+    bytea (uint16 dim, uint16 unused, big-endian float32s), which avoids
+    materializing every component as a Python float when loading a tenant.
+    """
+    if not blobs:
+        return np.empty((0, 0), dtype=np.float32)
+    dim = int.from_bytes(blobs[0][:2], "big")
+    matrix = np.empty((len(blobs), dim), dtype=np.float32)
+    for row, blob in enumerate(blobs):
+        matrix[row] = np.frombuffer(blob, dtype=">f4", count=dim, offset=4)
+    return matrix
+
+
+# ============================================================================
+# Tenant partitions
+# ============================================================================
+
+
+def _check_tenant(user_hash: str) -> str:
+    if not user_hash or not _TENANT_RE.fullmatch(user_hash):
+        raise ValueError("user_hash is required and must be alphanumeric")
+    return user_hash
+
+
+class TenantVectorIndex:
+    """
+    One NumpyVectorIndex per user_hash.
+
+    There is no cross-tenant search: every method takes the user_hash and only
+    touches that partition, mirroring the RLS policy. Partitions persist under
+    root/<user_hash>/ and load memory-mapped.
+    """
+
+    def __init__(self, dim: int, root: Optional[str] = None, **index_kwargs):
+        self.dim = dim
+        self.root = Path(root) if root else None
+        self.index_kwargs = index_kwargs
+        self._partitions: dict[str, NumpyVectorIndex] = {}
+
+    def partition(self, user_hash: str, create: bool = False) -> Optional[NumpyVectorIndex]:
+        """The tenant's index: in memory, else loaded from root, else new if create."""
+        _check_tenant(user_hash)
+        index = self._partitions.get(user_hash)
+        if index is None and self.root is not None and (self.root / user_hash / "meta.json").exists():
+            index = NumpyVectorIndex.load(str(self.root / user_hash))
+            self._partitions[user_hash] = index
+        if index is None and create:
+            index = NumpyVectorIndex(self.dim, **self.index_kwargs)
+            self._partitions[user_hash] = index
+        return index
+
+    def add(self, user_hash: str, ids: Sequence[str], vectors: Any) -> None:
+        self.partition(user_hash, create=True).add(ids, vectors)
+
+    def remove(self, user_hash: str, ids: Sequence[str]) -> int:
+        index = self.partition(user_hash)
+        return index.remove(ids) if index is not None else 0
+
+    def search(self, user_hash: str, query: Any, k: int, **kwargs) -> list[tuple[str, float]]:
+        index = self.partition(user_hash)
+        return index.search(query, k, **kwargs) if index is not None else []
+
+    def drop(self, user_hash: str) -> None:
+        """Forget a tenant's partition (in memory only; saved files are left alone)."""
+        self._partitions.pop(_check_tenant(user_hash), None)
+
+    def save(self, user_hash: Optional[str] = None) -> None:
+        """Persist one tenant (or all loaded tenants) under root."""
+        if self.root is None:
+            raise ValueError("TenantVectorIndex has no root directory")
+        tenants = [_check_tenant(user_hash)] if user_hash else list(self._partitions)
+        for tenant in tenants:
+            if tenant in self._partitions:
+                self._partitions[tenant].save(str(self.root / tenant))
+
+    def __len__(self) -> int:
+        return sum(len(index) for index in self._partitions.values())
+
+
+# ============================================================================
+# Hot per-user cache in front of pgvector
+# ============================================================================
+
+
+class _CacheEntry:
+    __slots__ = ("index", "loaded_at", "too_large")
+
+    def __init__(self, index: Optional[NumpyVectorIndex], loaded_at: float, too_large: bool = False):
+        self.index = index
+        self.loaded_at = loaded_at
+        self.too_large = too_large
+
+
+class HotVectorCache:
+    """
+    LRU of per-user NumpyVectorIndex partitions filled from pgvector.
+
+    get() returns the tenant's partition, loading it with the caller's loader
+    on a miss or after ttl_sec (one load per tenant at a time). Tenants with
+    more than max_tenant_vectors rows are not cached (get() returns None and
+    the caller queries pgvector). Writers call add() (write-through when the
+    tenant is loaded) or invalidate(). Writes that land while a load is in
+    flight are buffered and re-applied to the new partition; an invalidate()
+    during a load keeps that snapshot out of the cache.
+
+    Args:
+        max_tenants: Partitions kept
+        max_bytes: float32 vector payload kept across partitions
+        max_tenant_vectors: Largest tenant worth caching
+        ttl_sec: Reload after this long (bounds staleness from other workers' writes)
+        clock: Time source (tests)
+    """
+
+    def __init__(
+        self,
+        max_tenants: int = VECTOR_CACHE_MAX_TENANTS,
+        max_bytes: int = VECTOR_CACHE_MAX_MB * 1024 * 1024,
+        max_tenant_vectors: int = VECTOR_CACHE_MAX_TENANT_VECTORS,
+        ttl_sec: float = VECTOR_CACHE_TTL_SEC,
+        clock: Callable[[], float] = time.monotonic,
+        **index_kwargs,
+    ):
+        self.max_tenants = max_tenants
+        self.max_bytes = max_bytes
+        self.max_tenant_vectors = max_tenant_vectors
+        self.ttl_sec = ttl_sec
+        self.clock = clock
+        self.index_kwargs = index_kwargs
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._locks: dict[str, asyncio.Lock] = {}
+        # Tenant -> adds made during its in-flight load (None once invalidated)
+        self._pending: dict[str, Optional[list[tuple[list[str], np.ndarray]]]] = {}
+        self._bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "loads": 0, "bypass": 0, "evictions": 0, "invalidations": 0}
+
+    async def get(self, user_hash: str, loader: TenantLoader) -> Optional[NumpyVectorIndex]:
+        """The tenant's cached partition, or None if the tenant is too large to cache."""
+        _check_tenant(user_hash)
+        entry = self._fresh(user_hash)
+        if entry is not None:
+            return self._hit(user_hash, entry)
+
+        lock = self._locks.setdefault(user_hash, asyncio.Lock())
+        async with lock:
+            entry = self._fresh(user_hash)  # Loaded while we waited
+            if entry is not None:
+                return self._hit(user_hash, entry)
+
+            self.stats["misses"] += 1
+            self._pending[user_hash] = []
+            try:
+                ids, vectors = await loader(self.max_tenant_vectors)
+                self.stats["loads"] += 1
+                too_large = len(ids) > self.max_tenant_vectors
+                index = None
+                if len(ids) and not too_large:
+                    # Normalizing (and IVF training for large tenants) is CPU-bound; keep it off the event loop
+                    index = await asyncio.to_thread(self._build, ids, vectors)
+            finally:
+                writes = self._pending.pop(user_hash)
+            self._discard(user_hash)
+
+            if too_large:
+                self.stats["bypass"] += 1
+                self._entries[user_hash] = _CacheEntry(None, self.clock(), too_large=True)
+                return None
+            if writes is None:
+                # Invalidated mid-load: the snapshot may predate the change, so serve it once uncached
+                return index if index is not None else NumpyVectorIndex(0)
+
+            self._entries[user_hash] = _CacheEntry(index, self.clock())
+            self._bytes += index.nbytes if index is not None else 0
+            for write_ids, matrix in writes:
+                self.add(user_hash, write_ids, matrix)  # The loader may have missed it; add() upserts
+            self._evict()
+            entry = self._entries.get(user_hash)
+            if entry is not None:
+                index = entry.index
+            return index if index is not None else NumpyVectorIndex(0)
+
+    def add(self, user_hash: str, ids: Sequence[str], vectors: Any) -> None:
+        """Write-through for a loaded tenant; otherwise nothing to do (next get() loads fresh)."""
+        pending = self._pending.get(_check_tenant(user_hash))
+        if pending is not None:
+            pending.append((list(ids), np.asarray(vectors, dtype=np.float32)))  # Applied when the load finishes
+            return
+        entry = self._entries.get(user_hash)
+        if entry is None or entry.too_large:
+            return
+        matrix = np.asarray(vectors, dtype=np.float32)
+        size = len(entry.index) if entry.index is not None else 0
+        if size + len(ids) > self.max_tenant_vectors or (
+            entry.index is not None and matrix.shape[1] != entry.index.dim
+        ):
+            # Outgrew the cache (or the embedding model changed): next get() reloads from the database
+            self.invalidate(user_hash)
+            return
+        if entry.index is None:
+            entry.index = NumpyVectorIndex(matrix.shape[1], **self.index_kwargs)
+        before = entry.index.nbytes
+        entry.index.add(ids, matrix)
+        self._bytes += entry.index.nbytes - before
+        self._evict()
+
+    def _build(self, ids: Sequence[str], vectors: Any) -> NumpyVectorIndex:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        index = NumpyVectorIndex(matrix.shape[1], **self.index_kwargs)
+        index.add(ids, matrix)
+        return index
+
+    def invalidate(self, user_hash: str) -> None:
+        """Drop a tenant so the next get() reloads from the database."""
+        if _check_tenant(user_hash) in self._pending:
+            self._pending[user_hash] = None
+        if self._discard(user_hash):
+            self.stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        self._pending.update(dict.fromkeys(self._pending))
+        self._entries.clear()
+        self._bytes = 0
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "tenants": len(self._entries),
+            "vectors": sum(len(e.index) for e in self._entries.values() if e.index is not None),
+            "megabytes": round(self._bytes / (1024 * 1024), 1),
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+        }
+
+    def _fresh(self, user_hash: str) -> Optional[_CacheEntry]:
+        entry = self._entries.get(user_hash)
+        if entry is None:
+            return None
+        if self.clock() - entry.loaded_at > self.ttl_sec:
+            self._discard(user_hash)
+            return None
+        return entry
+
+    def _hit(self, user_hash: str, entry: _CacheEntry) -> Optional[NumpyVectorIndex]:
+        if entry.too_large:
+            self.stats["bypass"] += 1
+            return None
+        self.stats["hits"] += 1
+        self._entries.move_to_end(user_hash)
+        return entry.index if entry.index is not None else NumpyVectorIndex(0)
+
+    def _discard(self, user_hash: str) -> bool:
+        entry = self._entries.pop(user_hash, None)
+        if entry is None:
+            return False
+        if entry.index is not None:
+            self._bytes -= entry.index.nbytes
+        return True
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_tenants or self._bytes > self.max_bytes):
+            user_hash = next(iter(self._entries))
+            self._discard(user_hash)
+            self.stats["evictions"] += 1
+            lock = self._locks.get(user_hash)
+            if lock is not None and not lock.locked():
+                del self._locks[user_hash]
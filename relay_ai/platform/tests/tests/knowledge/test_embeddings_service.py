@@ -0,0 +1,271 @@
+"""Tests for the knowledge embedding service: content-addressed cache and request coalescing."""
+
+import asyncio
+import hashlib
+import os
+
+import pytest
+
+from relay_ai.platform.api.knowledge.embeddings import client
+from relay_ai.platform.api.knowledge.embeddings.service import (
+    EmbeddingCache,
+    EmbeddingService,
+    EmbeddingUnavailableError,
+    LocalEmbeddingBackend,
+    OpenAIEmbeddingBackend,
+    content_key,
+    set_embedding_service,
+)
+
+
+class FakeEncoder:
+    """Offline stand-in for a SentenceTransformer: deterministic 8-dim vectors."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False):
+        self.calls.append(list(texts))
+        return [[b / 255 for b in hashlib.sha256(text.encode()).digest()[:8]] for text in texts]
+
+
+class FailingBackend:
+    name = "openai"
+
+    def model_name(self, model):
+        return model
+
+    async def embed(self, texts, model):
+        raise RuntimeError("provider down")
+
+
+@pytest.fixture
+def encoder():
+    return FakeEncoder()
+
+
+def make_service(encoder, **kwargs):
+    kwargs.setdefault("cache", EmbeddingCache())
+    kwargs.setdefault("batch_window_ms", 5)
+    return EmbeddingService(backend=LocalEmbeddingBackend("fake-local", encoder=encoder), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_normalized_duplicates_hit_cache(encoder):
+    """Whitespace/Unicode-normalized duplicates are embedded once."""
+    service = make_service(encoder)
+
+    first = await service.embed("Employee  handbook\n", "m")
+    second = await service.embed(" Employee handbook", "m")
+
+    assert first == second
+    assert len(encoder.calls) == 1
+    assert service.stats["hits_memory"] == 1
+    assert service.hit_rate == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_coalesce_into_one_batch(encoder):
+    """Concurrent embed calls within the window become one provider call."""
+    service = make_service(encoder)
+
+    results = await asyncio.gather(*(service.embed(f"text {i}", "m") for i in range(5)))
+
+    assert len(encoder.calls) == 1
+    assert sorted(encoder.calls[0]) == [f"text {i}" for i in range(5)]
+    assert len({tuple(r) for r in results}) == 5
+
+
+@pytest.mark.asyncio
+async def test_identical_inflight_texts_share_request(encoder):
+    """The same text requested concurrently is sent to the provider once."""
+    service = make_service(encoder)
+
+    results = await asyncio.gather(*(service.embed("same", "m") for _ in range(3)))
+
+    assert encoder.calls == [["same"]]
+    assert results[0] == results[1] == results[2]
+    assert service.stats["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_batches_split_at_max_batch(encoder):
+    """A large batch is split into provider calls of max_batch texts."""
+    service = make_service(encoder, max_batch=4)
+
+    vectors = await service.embed_many([f"t{i}" for i in range(10)], "m")
+
+    assert len(vectors) == 10
+    assert sorted(len(call) for call in encoder.calls) == [2, 4, 4]
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_new_process(encoder, tmp_path):
+    """A fresh memory cache is refilled from the disk tier without re-embedding."""
+    await make_service(encoder, cache=EmbeddingCache(disk_dir=str(tmp_path))).embed_many(["a", "b"], "m")
+    assert list(tmp_path.rglob("*.f32"))
+
+    other = FakeEncoder()
+    service = make_service(other, cache=EmbeddingCache(disk_dir=str(tmp_path)))
+    vectors = await service.embed_many(["a", "b"], "m")
+
+    assert other.calls == []
+    assert service.stats["hits_disk"] == 2
+    assert vectors[0] == pytest.approx(FakeEncoder().encode(["a"])[0], rel=1e-6)
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_shared_between_services(encoder):
+    """Vectors written to Redis by one worker are served to another."""
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis()
+
+    await make_service(encoder, cache=EmbeddingCache(redis_client=redis_client)).embed("shared doc", "m")
+
+    other = FakeEncoder()
+    service = make_service(other, cache=EmbeddingCache(redis_client=redis_client))
+    await service.embed("shared doc", "m")
+
+    assert other.calls == []
+    assert service.stats["hits_redis"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fallback_to_other_model_refused(encoder):
+    """A fallback serving another model (and dimension) raises instead of returning its vectors."""
+    cache = EmbeddingCache()
+    service = EmbeddingService(
+        backend=FailingBackend(),
+        fallback=LocalEmbeddingBackend("fake-local", encoder=encoder),
+        cache=cache,
+        batch_window_ms=0,
+    )
+
+    with pytest.raises(EmbeddingUnavailableError, match="serves fake-local, not text-embedding-ada-002"):
+        await service.embed("hello", "text-embedding-ada-002")
+    assert encoder.calls == []
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_fallback_vectors_cached_under_fallback_backend(encoder):
+    """A same-model fallback is used, and its vectors are not cached as the primary backend's."""
+    cache = EmbeddingCache()
+    service = EmbeddingService(
+        backend=FailingBackend(),
+        fallback=LocalEmbeddingBackend("all-MiniLM-L6-v2", encoder=encoder),
+        cache=cache,
+        batch_window_ms=0,
+    )
+
+    vector = await service.embed("hello", "all-MiniLM-L6-v2")
+
+    assert len(vector) == 8
+    assert service.stats["fallback_batches"] == 1
+    assert content_key("local:all-MiniLM-L6-v2", "hello") in cache._memory
+    assert content_key("openai:all-MiniLM-L6-v2", "hello") not in cache._memory
+
+
+def test_local_backend_is_opt_in(monkeypatch):
+    """Without an API key the default backend is still OpenAI, and it fails loudly."""
+    if os.getenv("EMBEDDING_BACKEND"):
+        pytest.skip("EMBEDDING_BACKEND set in the environment")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    service = EmbeddingService(cache=EmbeddingCache(), batch_window_ms=0)
+
+    assert service.backend.name == "openai"
+    assert service.fallback is None
+    with pytest.raises(EmbeddingUnavailableError, match="EMBEDDING_BACKEND=local"):
+        asyncio.run(service.embed("x", "text-embedding-ada-002"))
+
+
+def test_openai_timeout_scales_with_batch_size():
+    """The provider timeout covers the whole batch, not just one text."""
+    backend = OpenAIEmbeddingBackend(api_key="k", timeout_ms=250, timeout_per_text_ms=20)
+
+    assert backend.timeout_for(1) == pytest.approx(0.27)
+    assert backend.timeout_for(256) == pytest.approx(5.37)
+
+
+@pytest.mark.asyncio
+async def test_flush_tasks_are_retained_until_done(encoder):
+    """Flush tasks are strongly referenced while running and dropped afterwards."""
+    service = make_service(encoder)
+
+    pending = asyncio.ensure_future(service.embed("held", "m"))
+    await asyncio.sleep(0.02)  # Window closes; the flush task is running or done
+    await pending
+
+    assert service._flush_tasks == set()
+
+
+@pytest.mark.asyncio
+async def test_client_returns_none_when_unavailable():
+    """embed_text keeps its contract: None when no backend can embed."""
+    set_embedding_service(EmbeddingService(backend=FailingBackend(), cache=EmbeddingCache(), batch_window_ms=0))
+    try:
+        assert await client.embed_text("hello") is None
+        assert await client.embed_batch(["a", "b"]) is None
+    finally:
+        set_embedding_service(None)
+
+
+@pytest.mark.asyncio
+async def test_client_uses_shared_service(encoder):
+    """embed_text/embed_batch go through the shared cached service."""
+    set_embedding_service(make_service(encoder))
+    try:
+        await client.embed_batch(["x", "y"])
+        await client.embed_text("x")
+        stats = client.get_embedding_stats()
+    finally:
+        set_embedding_service(None)
+
+    assert len(encoder.calls) == 1
+    assert stats["hits_memory"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unavailable_error_without_fallback():
+    """The service raises EmbeddingUnavailableError when the only backend fails."""
+    service = EmbeddingService(backend=FailingBackend(), cache=EmbeddingCache(), batch_window_ms=0)
+
+    with pytest.raises(EmbeddingUnavailableError):
+        await service.embed("x", "m")
+    assert service._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_local_sentence_transformers_backend():
+    """Real local model (skipped unless sentence-transformers and the model are available)."""
+    pytest.importorskip("sentence_transformers")
+    backend = LocalEmbeddingBackend("all-MiniLM-L6-v2")
+    try:
+        vectors = await backend.embed(["hello world"], "ignored")
+    except Exception as e:  # Model not cached and no network
+        pytest.skip(f"local model unavailable: {e}")
+    assert len(vectors[0]) == 384
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_coalesced_callers(encoder):
+    """One caller timing out leaves the shared request running for the others."""
+    release = asyncio.Event()
+
+    class SlowBackend(LocalEmbeddingBackend):
+        async def embed(self, texts, model):
+            await release.wait()
+            return await super().embed(texts, model)
+
+    service = EmbeddingService(
+        backend=SlowBackend("fake-local", encoder=encoder), cache=EmbeddingCache(), batch_window_ms=0
+    )
+
+    waiter = asyncio.ensure_future(service.embed("shared", "m"))
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(service.embed("shared", "m"), timeout=0.01)
+    release.set()
+
+    assert len(await waiter) == 8
+    assert service.stats["coalesced"] == 1
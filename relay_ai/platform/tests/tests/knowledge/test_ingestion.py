@@ -0,0 +1,255 @@
+"""Tests for the streaming knowledge ingestion pipeline (extract → chunk → embed → store)."""
+
+import asyncio
+import uuid
+
+import pytest
+
+from relay_ai.platform.api.knowledge.ingestion import (
+    IngestionConflictError,
+    IngestionPipeline,
+    IngestionQueueFullError,
+    IngestJob,
+    TokenChunker,
+    UnsupportedFileTypeError,
+    count_tokens,
+    iter_segments,
+)
+
+
+class MemoryStore:
+    """In-memory stand-in for PostgresVectorStore."""
+
+    def __init__(self, delay: float = 0.0):
+        self.rows = {}
+        self.statuses = []
+        self.delay = delay
+
+    async def reset(self, job):
+        self.rows = {k: v for k, v in self.rows.items() if k[0] != job.file_id}
+
+    async def stored_chunks(self, job):
+        return {index for file_id, index in self.rows if file_id == job.file_id}
+
+    async def store(self, job, rows):
+        await asyncio.sleep(self.delay)
+        for chunk, vector in rows:
+            self.rows[(job.file_id, chunk.index)] = (chunk.text, vector)
+        return len(rows)
+
+    async def update_status(self, job):
+        self.statuses.append(job.status)
+
+
+class FakeEmbedder:
+    """Records embedded texts; optionally fails the Nth call once."""
+
+    def __init__(self, fail_on_call=None, delay: float = 0.0):
+        self.texts = []
+        self.calls = 0
+        self.fail_on_call = fail_on_call
+        self.delay = delay
+
+    async def embed_many(self, texts, model):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise RuntimeError("provider down")
+        await asyncio.sleep(self.delay)
+        self.texts.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def make_document(sentences: int) -> bytes:
+    return "\n".join(f"Sentence number {i} talks about policy {i % 7}." for i in range(sentences)).encode()
+
+
+def make_pipeline(store, embedder, data, **kwargs):
+    async def loader(job):
+        return data
+
+    kwargs.setdefault("chunk_tokens", 40)
+    kwargs.setdefault("embed_batch", 4)
+    kwargs.setdefault("retry_backoff_sec", 0)
+    return IngestionPipeline(store=store, loader=loader, embedder=embedder, **kwargs)
+
+
+def make_job(**kwargs):
+    kwargs.setdefault("chunk_overlap", 10)
+    return IngestJob(file_id=uuid.uuid4(), user_hash="user_hash_1", mime_type="text/plain", **kwargs)
+
+
+def job_with(job, chunk_overlap):
+    return IngestJob(file_id=job.file_id, user_hash=job.user_hash, mime_type=job.mime_type, chunk_overlap=chunk_overlap)
+
+
+class TestChunking:
+    def test_chunks_respect_token_limit_and_overlap(self):
+        """Chunks stay under max_tokens and repeat trailing context from the previous chunk."""
+        chunker = TokenChunker(max_tokens=40, overlap_tokens=15)
+        chunks = chunker.feed(make_document(50).decode()) + chunker.finish()
+
+        assert len(chunks) > 5
+        assert [c.index for c in chunks] == list(range(len(chunks)))
+        assert all(c.tokens <= 40 for c in chunks)
+        last_sentence = chunks[0].text.rsplit(". ", 1)[-1]
+        assert chunks[1].text.startswith(last_sentence)
+
+    def test_segmented_feed_matches_single_feed(self):
+        """Chunk boundaries do not depend on how text was split into segments (stable indexes)."""
+        text = make_document(60).decode()
+        whole = TokenChunker(40, 10)
+        expected = [c.text for c in whole.feed(text) + whole.finish()]
+
+        pieces = TokenChunker(40, 10)
+        got = []
+        for start in range(0, len(text), 97):
+            got.extend(c.text for c in pieces.feed(text[start : start + 97]))
+        got.extend(c.text for c in pieces.finish())
+
+        assert got == expected
+
+    def test_oversized_sentence_is_split(self):
+        """A sentence longer than max_tokens is split on words."""
+        chunker = TokenChunker(max_tokens=20, overlap_tokens=0)
+        chunks = chunker.feed("word " * 100) + chunker.finish()
+
+        assert all(count_tokens(c.text) <= 20 for c in chunks)
+        assert sum(len(c.text.split()) for c in chunks) == 100
+
+    def test_text_segments_cut_at_line_breaks(self, monkeypatch):
+        """Plain text is extracted in bounded segments ending on line breaks."""
+        monkeypatch.setattr("relay_ai.platform.api.knowledge.ingestion.INGEST_TEXT_SEGMENT_BYTES", 100)
+        data = make_document(20)
+
+        segments = list(iter_segments(data, "text/plain"))
+
+        assert len(segments) > 3
+        assert "".join(text for _, text in segments) == data.decode()
+        assert all(text.endswith("\n") for _, text in segments[:-1])
+
+    def test_images_are_unsupported(self):
+        with pytest.raises(UnsupportedFileTypeError):
+            iter_segments(b"\x89PNG", "image/png")
+
+
+class TestPipeline:
+    @pytest.mark.asyncio
+    async def test_file_is_chunked_embedded_and_stored(self):
+        """A queued file ends with every chunk stored and status completed."""
+        store, embedder = MemoryStore(), FakeEmbedder()
+        pipeline = make_pipeline(store, embedder, make_document(80))
+        job = make_job()
+
+        result = await asyncio.wait_for(await pipeline.submit(job), timeout=5)
+        await pipeline.close()
+
+        assert result.status == "completed"
+        assert result.chunks_created == result.vectors_stored == len(store.rows) > 5
+        assert sorted(index for _, index in store.rows) == list(range(result.chunks_created))
+        assert result.tokens_processed > 0
+        assert store.statuses[0] == "processing" and store.statuses[-1] == "completed"
+        stages = pipeline.get_stats()["stages"]
+        assert stages["store"]["items"] == result.vectors_stored
+        assert stages["embed"]["batches"] >= result.chunks_created / 4
+
+    @pytest.mark.asyncio
+    async def test_retry_resumes_at_chunk_level(self):
+        """After a failed embed batch, the retry only embeds chunks not yet stored."""
+        store, embedder = MemoryStore(), FakeEmbedder(fail_on_call=3)
+        pipeline = make_pipeline(store, embedder, make_document(80), concurrency={"embed": 1, "store": 1})
+        job = make_job()
+
+        result = await asyncio.wait_for(await pipeline.submit(job), timeout=5)
+        await pipeline.close()
+
+        assert result.status == "completed"
+        assert result.attempts == 2
+        assert result.chunks_skipped > 0
+        assert len(store.rows) == result.chunks_created
+        # Each chunk embedded once: stored chunks were not re-embedded on retry
+        assert len(embedder.texts) == result.chunks_created
+
+    @pytest.mark.asyncio
+    async def test_backpressure_blocks_upstream(self):
+        """With a slow store, producers wait on full channels instead of buffering the whole file."""
+        store, embedder = MemoryStore(delay=0.01), FakeEmbedder()
+        pipeline = make_pipeline(
+            store,
+            embedder,
+            make_document(200),
+            channel_size=1,
+            embed_batch=1,
+            store_batch=1,
+            concurrency={"embed": 1, "store": 1},
+        )
+
+        await asyncio.wait_for(await pipeline.submit(make_job()), timeout=10)
+        await pipeline.close()
+
+        stages = pipeline.get_stats()["stages"]
+        assert stages["embed"]["blocked_ms"] > 0
+        assert stages["chunk"]["blocked_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_unsupported_type_fails_without_retry(self):
+        store = MemoryStore()
+        pipeline = make_pipeline(store, FakeEmbedder(), b"\x89PNG")
+        job = IngestJob(file_id=uuid.uuid4(), user_hash="user_hash_1", mime_type="image/png")
+
+        future = await pipeline.submit(job)
+        with pytest.raises(UnsupportedFileTypeError):
+            await asyncio.wait_for(future, timeout=5)
+        await pipeline.close()
+
+        assert job.attempts == 1
+        assert store.statuses[-1] == "failed"
+        assert pipeline.get_stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_duplicate_submit_joins_inflight_job(self):
+        """Submitting a file that is already queued returns the same future."""
+        pipeline = make_pipeline(MemoryStore(), FakeEmbedder(delay=0.01), make_document(20))
+        job = make_job()
+
+        first = await pipeline.submit(job)
+        second = await pipeline.submit(
+            IngestJob(file_id=job.file_id, user_hash="user_hash_1", mime_type="text/plain", chunk_overlap=10)
+        )
+        await asyncio.wait_for(first, timeout=5)
+        await pipeline.close()
+
+        assert first is second
+        assert pipeline.get_stats()["submitted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_submit_with_other_parameters_conflicts(self):
+        """A file in flight is not silently joined by a request with different chunking/model."""
+        pipeline = make_pipeline(MemoryStore(), FakeEmbedder(delay=0.01), make_document(20))
+        job = make_job()
+
+        first = await pipeline.submit(job)
+        with pytest.raises(IngestionConflictError, match="chunk_overlap=10"):
+            await pipeline.submit(job_with(job, 50))
+        await asyncio.wait_for(first, timeout=5)
+
+        # Once the first job is done, the new parameters are accepted
+        rerun = await pipeline.submit(job_with(job, 50))
+        result = await asyncio.wait_for(rerun, timeout=5)
+        await pipeline.close()
+
+        assert result.chunk_overlap == 50
+        assert pipeline.get_stats()["submitted"] == 2
+
+    @pytest.mark.asyncio
+    async def test_queue_full_rejects(self):
+        """submit() raises once queue_size files are waiting."""
+        pipeline = make_pipeline(MemoryStore(), FakeEmbedder(delay=0.05), make_document(20), workers=1, queue_size=1)
+
+        await pipeline.submit(make_job())
+        await asyncio.sleep(0)  # Worker takes the first job
+        await pipeline.submit(make_job())
+        with pytest.raises(IngestionQueueFullError):
+            await pipeline.submit(make_job())
+        await pipeline.close()
+
+        assert pipeline.get_stats()["rejected"] == 1
@@ -0,0 +1,138 @@
+"""Tests for knowledge vector search (hot cache path, pgvector fallback, AAD checks)."""
+
+import json
+import os
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("MEMORY_ENCRYPTION_KEY", "ZGV2LWVuY3J5cHRpb24ta2V5LTMyYnl0ZXMxMjM0NTY=")
+os.environ.setdefault("MEMORY_TENANT_HMAC_KEY", "dev-hmac-key-for-testing-1234567890")
+
+from relay_ai.platform.api.knowledge import search  # noqa: E402
+from relay_ai.platform.security.memory.rls import hmac_user  # noqa: E402
+from relay_ai.platform.security.memory.security import seal  # noqa: E402
+from relay_ai.platform.security.memory.vector_index import HotVectorCache  # noqa: E402
+
+USER = "user_hash_1"
+
+
+class FakeConn:
+    """Answers the three queries search.py issues from an in-memory file_embeddings table."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    async def fetch(self, query, *args):
+        if "vector_send" in query:
+            self.queries.append("load")
+            return [
+                {
+                    "id": str(r["id"]),
+                    "embedding": len(r["vec"]).to_bytes(2, "big") + b"\0\0" + r["vec"].astype(">f4").tobytes(),
+                }
+                for r in self.rows
+            ]
+        if "ANY" in query:
+            self.queries.append("by_id")
+            wanted = set(args[0])
+            return [r for r in self.rows if str(r["id"]) in wanted]
+        self.queries.append("pgvector")
+        query_vec = np.array(json.loads(args[0]), dtype=np.float32)
+        scored = sorted(
+            (
+                {**r, "score": float(r["vec"] @ query_vec / np.linalg.norm(r["vec"]) / np.linalg.norm(query_vec))}
+                for r in self.rows
+            ),
+            key=lambda r: -r["score"],
+        )
+        return [r for r in scored[: args[1]] if r["score"] >= args[2]]
+
+
+def make_row(vec, tags=("policy",), aad_user=USER, created_at=None):
+    file_id = uuid.uuid4()
+    aad = hmac_user(f"{aad_user}:{file_id}")
+    metadata = {"title": "Handbook", "source": "upload", "tags": list(tags), "page": 2}
+    return {
+        "id": uuid.uuid4(),
+        "file_id": file_id,
+        "chunk_index": 0,
+        "text_content": f"chunk {vec.tolist()}",
+        "metadata_encrypted": seal(json.dumps(metadata).encode(), aad.encode()),
+        "metadata_aad": aad,
+        "created_at": created_at or datetime(2025, 6, 1, tzinfo=timezone.utc),
+        "vec": np.asarray(vec, dtype=np.float32),
+    }
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    rows = [make_row(np.eye(4)[i] + 0.1) for i in range(4)]
+    fake = FakeConn(rows)
+
+    @asynccontextmanager
+    async def fake_with_user_conn(user_hash):
+        yield fake
+
+    monkeypatch.setattr(search, "with_user_conn", fake_with_user_conn)
+    monkeypatch.setattr(search, "_cache", HotVectorCache())
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_cache_path_loads_once_and_ranks(conn):
+    query = [1.0, 0.0, 0.0, 0.0]
+
+    results, cache_hit = await search.search_chunks(USER, query, top_k=2)
+    again, _ = await search.search_chunks(USER, query, top_k=2)
+
+    assert cache_hit
+    assert conn.queries == ["load", "by_id", "by_id"]
+    assert [r["rank"] for r in results] == [1, 2]
+    assert results[0]["chunk_id"] == conn.rows[0]["id"]
+    assert results[0]["similarity_score"] >= results[1]["similarity_score"]
+    assert results[0]["file_title"] == "Handbook" and results[0]["position_in_file"] == {"page": 2}
+    assert [r["chunk_id"] for r in again] == [r["chunk_id"] for r in results]
+
+
+@pytest.mark.asyncio
+async def test_cache_and_pgvector_agree(conn, monkeypatch):
+    query = [0.2, 1.0, 0.1, 0.0]
+    cached, _ = await search.search_chunks(USER, query, top_k=3, similarity_threshold=0.1)
+
+    monkeypatch.setattr(search, "KNOWLEDGE_VECTOR_CACHE", False)
+    direct, cache_hit = await search.search_chunks(USER, query, top_k=3, similarity_threshold=0.1)
+
+    assert not cache_hit and conn.queries[-1] == "pgvector"
+    assert [r["chunk_id"] for r in direct] == [r["chunk_id"] for r in cached]
+    assert [r["similarity_score"] for r in direct] == pytest.approx([r["similarity_score"] for r in cached], abs=1e-5)
+
+
+@pytest.mark.asyncio
+async def test_filters_applied_after_decrypt(conn):
+    conn.rows.append(make_row(np.array([1.0, 0.05, 0.0, 0.0]), tags=("finance",)))
+
+    results, _ = await search.search_chunks(USER, [1.0, 0.0, 0.0, 0.0], top_k=2, filters={"tags": ["finance"]})
+
+    assert [r["metadata"]["tags"] for r in results] == [["finance"]]
+
+
+@pytest.mark.asyncio
+async def test_aad_mismatch_fails_closed(conn):
+    conn.rows[0] = make_row(np.eye(4)[0] + 0.1, aad_user="someone_else")
+
+    with pytest.raises(search.ChunkMetadataIntegrityError):
+        await search.search_chunks(USER, [1.0, 0.0, 0.0, 0.0], top_k=1)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_reloads(conn):
+    await search.search_chunks(USER, [1.0, 0.0, 0.0, 0.0], top_k=1)
+    search.invalidate_knowledge_vectors(USER)
+    await search.search_chunks(USER, [1.0, 0.0, 0.0, 0.0], top_k=1)
+
+    assert conn.queries.count("load") == 2
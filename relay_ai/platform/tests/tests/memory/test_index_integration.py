@@ -134,19 +134,21 @@ def test_metadata_encryption_in_write(self):
         assert json.loads(recovered.decode("utf-8")) == metadata
 
     def test_embedding_encryption_in_write(self):
-        """Embedding is encrypted as comma-separated floats"""
+        """Embedding is encrypted as packed float32"""
+        from relay_ai.platform.security.memory.index import pack_embedding, unpack_embedding
+
         user_hash = hmac_user("user_789")
         embedding = [0.1, 0.2, 0.3, 0.4, 0.5]
         aad = user_hash.encode()
 
         # Simulate write path
-        embedding_bytes = ",".join(str(x) for x in embedding).encode("utf-8")
+        embedding_bytes = pack_embedding(embedding)
         emb_cipher = seal(embedding_bytes, aad=aad)
 
         # Verify can decrypt
         recovered = open_sealed(emb_cipher, aad=aad)
-        embedding_recovered = [float(x) for x in recovered.decode("utf-8").split(",")]
-        assert embedding_recovered == embedding
+        assert len(recovered) == 4 * len(embedding)
+        assert unpack_embedding(recovered) == pytest.approx(embedding, rel=1e-6)
 
     def test_multiple_fields_cross_user_isolation(self):
         """Multiple encrypted fields are isolated per user"""
@@ -313,5 +315,160 @@ def test_large_plaintext_roundtrip(self):
         assert recovered == plaintext
 
 
+# ============================================================================
+# TEST SUITE 6: Bulk Indexing
+# ============================================================================
+
+
+class RecordingConnection(MockConnection):
+    """Mock connection that records statements, COPYs and transactions"""
+
+    def __init__(self):
+        super().__init__()
+        self.statements = []
+        self.copies = []
+        self.executemany_calls = []
+        self.transactions = 0
+        self.codecs = []
+
+    def transaction(self):
+        self.transactions += 1
+        return self
+
+    async def execute(self, query, *args):
+        self.statements.append((query, args))
+
+    async def executemany(self, query, args):
+        self.executemany_calls.append((query, list(args)))
+
+    async def copy_records_to_table(self, table_name, *, records, columns=None):
+        self.copies.append((table_name, list(columns), list(records)))
+
+    async def set_type_codec(self, typename, **kwargs):
+        self.codecs.append(typename)
+
+    async def reset_type_codec(self, typename, **kwargs):
+        self.codecs.remove(typename)
+
+
+def _bulk_chunks(count=5, dim=8):
+    return [
+        {
+            "doc_id": "doc_bulk",
+            "source": "upload",
+            "text": f"Chunk {i} text",
+            "embedding": [i + j / 10 for j in range(dim)],
+            "metadata": {"page": i},
+            "tags": ["bulk"],
+        }
+        for i in range(count)
+    ]
+
+
+class TestBulkIndexing:
+    """index_memory_chunks_bulk: one RLS context, parallel sealing, one COPY"""
+
+    @pytest.mark.asyncio
+    async def test_bulk_uses_single_copy_and_rls_context(self):
+        """All rows go in one COPY inside one transaction with RLS set once"""
+        from relay_ai.platform.security.memory.index import BULK_COLUMNS, index_memory_chunks_bulk
+
+        conn = RecordingConnection()
+        results = await index_memory_chunks_bulk(conn, "user_bulk", _bulk_chunks(5), max_workers=3)
+
+        assert conn.transactions == 1
+        assert conn.codecs == []  # Binary codec scoped to the COPY, not left on the pooled connection
+        assert len(conn.copies) == 1
+        table, columns, records = conn.copies[0]
+        assert table == "memory_chunks"
+        assert columns == list(BULK_COLUMNS)
+        assert len(records) == 5
+        assert sum("set_config" in query for query, _ in conn.statements) == 1
+        assert [r["id"] for r in results] == [record[0] for record in records]
+        assert [record[8] for record in records] == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_bulk_ciphers_roundtrip_with_aad(self):
+        """Sealed text/metadata/embedding decrypt with the user's AAD only"""
+        from relay_ai.platform.security.memory.index import (
+            BULK_COLUMNS,
+            decode_vector,
+            index_memory_chunks_bulk,
+            unpack_embedding,
+        )
+
+        chunks = _bulk_chunks(4)
+        conn = RecordingConnection()
+        await index_memory_chunks_bulk(conn, "user_bulk", chunks)
+
+        aad = hmac_user("user_bulk").encode()
+        col = {name: i for i, name in enumerate(BULK_COLUMNS)}
+        for chunk, record in zip(chunks, conn.copies[0][2]):
+            assert open_sealed(record[col["text_cipher"]], aad=aad).decode() == chunk["text"]
+            assert json.loads(open_sealed(record[col["meta_cipher"]], aad=aad)) == chunk["metadata"]
+            embedding = unpack_embedding(open_sealed(record[col["emb_cipher"]], aad=aad))
+            assert embedding == pytest.approx(chunk["embedding"], rel=1e-6)
+            assert decode_vector(record[col["embedding"]]) == pytest.approx(chunk["embedding"], rel=1e-6)
+            with pytest.raises(InvalidTag):
+                open_sealed(record[col["text_cipher"]], aad=hmac_user("other_user").encode())
+
+    @pytest.mark.asyncio
+    async def test_bulk_insert_fallback(self):
+        """use_copy=False sends one executemany INSERT"""
+        from relay_ai.platform.security.memory.index import index_memory_chunks_bulk
+
+        conn = RecordingConnection()
+        await index_memory_chunks_bulk(conn, "user_bulk", _bulk_chunks(3), use_copy=False)
+
+        assert conn.copies == []
+        assert len(conn.executemany_calls) == 1
+        query, rows = conn.executemany_calls[0]
+        assert query.startswith("INSERT INTO memory_chunks")
+        assert len(rows) == 3
+
+    @pytest.mark.asyncio
+    async def test_bulk_validates_before_writing(self):
+        """A chunk missing required fields fails the batch before any SQL"""
+        from relay_ai.platform.security.memory.index import index_memory_chunks_bulk
+
+        chunks = _bulk_chunks(3)
+        chunks[1]["text"] = ""
+        conn = RecordingConnection()
+
+        with pytest.raises(ValueError, match="Chunk 1"):
+            await index_memory_chunks_bulk(conn, "user_bulk", chunks)
+        assert conn.statements == [] and conn.copies == []
+
+    @pytest.mark.asyncio
+    async def test_single_row_insert_after_bulk_on_same_connection(self):
+        """index_memory_chunk still works on a connection that already ran a bulk COPY"""
+        from relay_ai.platform.security.memory.index import index_memory_chunk, index_memory_chunks_bulk
+
+        conn = RecordingConnection()
+        fetchrow_args = []
+        original_fetchrow = conn.fetchrow
+
+        async def fetchrow(query, *args):
+            fetchrow_args.append((query, args))
+            return await original_fetchrow(query, *args)
+
+        conn.fetchrow = fetchrow
+        await index_memory_chunks_bulk(conn, "user_bulk", _bulk_chunks(2))
+        await index_memory_chunk(conn, "user_bulk", "doc1", "upload", "text", [0.5, 0.25])
+
+        query, args = fetchrow_args[0]
+        assert "$6::real[]::vector" in query
+        assert args[5] == [0.5, 0.25]
+
+    def test_vector_binary_format(self):
+        """pgvector binary format: >HH header then big-endian float32"""
+        from relay_ai.platform.security.memory.index import decode_vector, encode_vector, pack_embedding
+
+        data = encode_vector([1.0, -2.5])
+        assert data == b"\x00\x02\x00\x00" + b"\x3f\x80\x00\x00" + b"\xc0\x20\x00\x00"
+        assert decode_vector(data) == [1.0, -2.5]
+        assert pack_embedding([1.0]) == b"\x00\x00\x80\x3f"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,182 @@
+"""Unit tests for memory metrics histograms
+
+Tests cover:
+- Log-linear histogram percentile accuracy and constant memory
+- Histogram merging
+- Per-minute window rotation
+- Trailing-minute rate alerts and SSE TTFV
+"""
+
+import random
+import threading
+
+import pytest
+
+from relay_ai.platform.security.memory.metrics import (
+    AnomalyType,
+    LogLinearHistogram,
+    MemoryMetricsCollector,
+    WindowedCounter,
+    WindowedHistogram,
+)
+
+
+@pytest.fixture
+def clock():
+    """Mutable clock for window rotation"""
+    now = {"time": 1_000_000.0}
+    return now
+
+
+class TestLogLinearHistogram:
+    """Percentile accuracy, memory bound and merging"""
+
+    def test_percentiles_within_relative_error(self):
+        """Percentiles stay within 2**-sub_bucket_bits of the exact value"""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(4, 1) for _ in range(50_000)]
+        histogram = LogLinearHistogram()
+        for value in values:
+            histogram.record(value)
+
+        exact = sorted(values)
+        result = histogram.percentiles((0.5, 0.95, 0.99))
+        for q, value in result.items():
+            expected = exact[int(len(exact) * q)]
+            assert abs(value - expected) / expected < 2**-histogram.sub_bucket_bits
+
+    def test_memory_is_constant(self):
+        """Bucket count does not grow with samples; out-of-range values clamp"""
+        histogram = LogLinearHistogram(max_value_ms=1000.0)
+        buckets = histogram.num_buckets
+        for value in (0.0, 0.0005, 1.0, 999.0, 10_000_000.0):
+            histogram.record(value)
+
+        assert histogram.num_buckets == buckets
+        assert histogram.count == 5
+        assert histogram.percentiles((0.0,))[0.0] < histogram.unit_ms
+        assert histogram.percentiles((1.0,))[1.0] == pytest.approx(1000.0, rel=0.05)
+
+    def test_empty_histogram_returns_zeros(self):
+        """No samples → zero percentiles (matches previous behavior)"""
+        assert LogLinearHistogram().percentiles((0.5, 0.99)) == {0.5: 0.0, 0.99: 0.0}
+
+    def test_merge_equals_combined_recording(self):
+        """Merging two histograms matches recording all values into one"""
+        a, b, combined = LogLinearHistogram(), LogLinearHistogram(), LogLinearHistogram()
+        for i in range(1, 1001):
+            (a if i % 2 else b).record(float(i))
+            combined.record(float(i))
+
+        merged = LogLinearHistogram().merge(a).merge(b)
+
+        assert merged.count == 1000
+        assert merged.percentiles() == combined.percentiles()
+
+    def test_merge_rejects_different_layout(self):
+        """Histograms with different precision cannot be merged"""
+        with pytest.raises(ValueError):
+            LogLinearHistogram(sub_bucket_bits=5).merge(LogLinearHistogram(sub_bucket_bits=3))
+
+    def test_concurrent_recording_counts_every_sample(self):
+        """Sharded recording from many threads loses no samples"""
+        histogram = LogLinearHistogram(shards=4)
+
+        def worker():
+            for i in range(5000):
+                histogram.record(float(i % 100))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert histogram.count == 40_000
+
+
+class TestWindows:
+    """Per-minute rotation for recent percentiles and rates"""
+
+    def test_window_drops_old_minutes(self, clock):
+        """Recent percentiles forget intervals older than the window"""
+        histogram = WindowedHistogram(interval_sec=60, intervals=5, clock=lambda: clock["time"])
+        histogram.record(1000.0)
+        clock["time"] += 6 * 60
+        histogram.record(10.0)
+
+        assert histogram.window().count == 1
+        assert histogram.window().percentiles((0.99,))[0.99] == pytest.approx(10.0, rel=0.05)
+        assert histogram.total.count == 2
+
+    def test_counter_trailing_minute(self, clock):
+        """WindowedCounter counts only the last window_sec seconds"""
+        counter = WindowedCounter(window_sec=60, clock=lambda: clock["time"])
+        counter.add(3)
+        clock["time"] += 30
+        counter.add(2)
+        assert counter.count() == 5
+
+        clock["time"] += 45
+        assert counter.count() == 2
+
+
+class TestCollector:
+    """MemoryMetricsCollector percentiles, alerts and export"""
+
+    def test_query_percentiles_not_truncated_at_10k(self, clock):
+        """p99 reflects all recent samples, not just the last 10k"""
+        collector = MemoryMetricsCollector(clock=lambda: clock["time"])
+        for _ in range(1000):
+            collector.record_query_latency(900.0)
+        for _ in range(20_000):
+            collector.record_query_latency(50.0)
+
+        pcts = collector.get_query_percentiles()
+
+        assert pcts["p50_ms"] == pytest.approx(50.0, rel=0.05)
+        assert pcts["p99_ms"] == pytest.approx(900.0, rel=0.05)
+
+    def test_ttfv_alert_and_export(self, clock):
+        """SSE TTFV feeds its own histogram, alert and Prometheus lines"""
+        collector = MemoryMetricsCollector(clock=lambda: clock["time"])
+        for _ in range(100):
+            collector.record_ttfv(2000.0, user_id="user_123456789")
+
+        status = collector.get_alert_status()
+        exported = collector.export_prometheus()
+
+        assert "ttfv_regression" in [a["name"] for a in status["alerts"]]
+        assert 'memory_sse_ttfv_ms{quantile="p95"}' in exported
+        assert "memory_sse_ttfv_ms_count 100" in exported
+
+    def test_rerank_skip_rate_is_per_minute(self, clock):
+        """Rerank skip alert uses the trailing-minute rate, not the lifetime total"""
+        collector = MemoryMetricsCollector(clock=lambda: clock["time"])
+        for _ in range(11):
+            collector.record_rerank_latency(250.0, skipped=True)
+        assert "rerank_skips_high" in [a["name"] for a in collector.get_alert_status()["alerts"]]
+
+        clock["time"] += 120
+        assert collector.get_rates()["rerank_skips_per_min"] == 0
+        assert "rerank_skips_high" not in [a["name"] for a in collector.get_alert_status()["alerts"]]
+        assert collector.get_counters()["memory_rerank_skipped_total"] == 11
+
+    def test_rls_block_rate_alert(self, clock):
+        """RLS blocks above the per-minute threshold raise an alert"""
+        collector = MemoryMetricsCollector(clock=lambda: clock["time"])
+        for _ in range(6):
+            collector.record_security_event(AnomalyType.RLS_POLICY_VIOLATION, user_id="u1")
+
+        assert "rls_blocks_high" in [a["name"] for a in collector.get_alert_status()["alerts"]]
+
+    def test_reset_buffers_clears_histograms(self, clock):
+        """reset_buffers empties histograms and rates"""
+        collector = MemoryMetricsCollector(clock=lambda: clock["time"])
+        collector.record_query_latency(100.0)
+        collector.record_rerank_latency(10.0, skipped=True)
+
+        collector.reset_buffers()
+
+        assert collector.get_query_percentiles(window=False) == {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+        assert collector.get_rates()["rerank_skips_per_min"] == 0
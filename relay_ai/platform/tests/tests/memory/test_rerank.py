@@ -11,6 +11,7 @@
 
 import asyncio
 import os
+import threading
 import time
 from unittest.mock import patch
 
@@ -267,6 +268,164 @@ def test_reranked_result_repr(self):
         assert "0.950" in repr_str
 
 
+class TestRerankService:
+    """Micro-batching, score cache and stale-request dropping"""
+
+    @staticmethod
+    def _service(scorer, **kwargs):
+        from relay_ai.platform.security.memory.rerank import RerankService
+
+        kwargs.setdefault("batch_window_ms", 20)
+        return RerankService(scorer=scorer, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_share_one_batch(self):
+        """Pairs from concurrent queries are scored in a single model call"""
+        calls = []
+
+        def scorer(pairs):
+            calls.append(list(pairs))
+            return [float(len(passage)) for _, passage in pairs]
+
+        service = self._service(scorer)
+        try:
+            results = await asyncio.gather(
+                service.rerank("q1", ["a", "ccc", "bb"]),
+                service.rerank("q2", ["dddd", "e"]),
+            )
+        finally:
+            service.close()
+
+        assert len(calls) == 1
+        assert len(calls[0]) == 5
+        assert [r.candidate for r in results[0]] == ["ccc", "bb", "a"]
+        assert [r.original_index for r in results[1]] == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_batches_split_at_max_pairs(self):
+        """A batch never exceeds max_batch_pairs"""
+        sizes = []
+
+        def scorer(pairs):
+            sizes.append(len(pairs))
+            return [0.0] * len(pairs)
+
+        service = self._service(scorer, max_batch_pairs=4)
+        try:
+            await asyncio.gather(*(service.rerank(f"q{i}", ["x", "y", "z"]) for i in range(3)))
+        finally:
+            service.close()
+
+        assert sizes == [3, 3, 3]
+
+    @pytest.mark.asyncio
+    async def test_score_cache_skips_model(self):
+        """Repeated (query, passage) pairs are served from the LRU cache"""
+        calls = []
+
+        def scorer(pairs):
+            calls.append(len(pairs))
+            return [float(len(passage)) for _, passage in pairs]
+
+        service = self._service(scorer, batch_window_ms=0)
+        try:
+            await service.rerank("q", ["a", "bb"])
+            second = await service.rerank("q", ["bb", "a", "ccc"])
+            stats = service.get_stats()
+        finally:
+            service.close()
+
+        assert calls == [2, 1]
+        assert [r.candidate for r in second] == ["ccc", "bb", "a"]
+        assert stats["cache_hits"] == 2
+
+    def test_score_cache_evicts_least_recent(self):
+        """Cache holds at most max_entries, evicting least recently used"""
+        from relay_ai.platform.security.memory.rerank import ScoreCache
+
+        cache = ScoreCache(max_entries=2)
+        cache.put_many([("q", "a"), ("q", "b")], [1.0, 2.0])
+        cache.get_many([("q", "a")])
+        cache.put_many([("q", "c")], [3.0])
+
+        assert cache.get_many([("q", "a"), ("q", "b"), ("q", "c")]) == [1.0, None, 3.0]
+
+    @pytest.mark.asyncio
+    async def test_timed_out_request_never_reaches_model(self):
+        """Requests that time out while queued are dropped, not scored"""
+        release = threading.Event()
+        scored = []
+
+        def scorer(pairs):
+            scored.extend(query for query, _ in pairs)
+            release.wait(5)
+            return [0.0] * len(pairs)
+
+        service = self._service(scorer, batch_window_ms=0, max_workers=1)
+        try:
+            busy = asyncio.ensure_future(service.rerank("busy", ["a", "b"], timeout_ms=5000))
+            await asyncio.sleep(0.05)  # Worker is now occupied
+
+            result = await service.rerank("late", ["c", "d"], timeout_ms=50)
+            assert [r.candidate for r in result] == ["c", "d"]  # ANN order
+
+            release.set()
+            await busy
+            await asyncio.sleep(0.05)
+            stats = service.get_stats()
+        finally:
+            release.set()
+            service.close()
+
+        assert "late" not in scored
+        assert stats["dropped_stale"] == 1
+        assert stats["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_queue_fails_open(self):
+        """Requests beyond max_queue_pairs are rejected with ANN order"""
+        release = threading.Event()
+
+        def scorer(pairs):
+            release.wait(5)
+            return [1.0] * len(pairs)
+
+        service = self._service(scorer, batch_window_ms=0, max_workers=1, max_queue_pairs=2)
+        try:
+            busy = asyncio.ensure_future(service.rerank("busy", ["a", "b"], timeout_ms=5000))
+            await asyncio.sleep(0.05)
+            queued = asyncio.ensure_future(service.rerank("queued", ["c", "d"], timeout_ms=5000))
+            await asyncio.sleep(0.01)
+
+            result = await service.rerank("rejected", ["e", "f"])
+
+            release.set()
+            await asyncio.gather(busy, queued)
+            stats = service.get_stats()
+        finally:
+            release.set()
+            service.close()
+
+        assert [r.score for r in result] == [0.0, 0.0]
+        assert stats["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_scorer_error_fails_open(self):
+        """Scorer exceptions return ANN order for every request in the batch"""
+
+        def scorer(pairs):
+            raise RuntimeError("boom")
+
+        service = self._service(scorer)
+        try:
+            results = await asyncio.gather(service.rerank("q1", ["a", "b"]), service.rerank("q2", ["c", "d"]))
+        finally:
+            service.close()
+
+        assert [[r.candidate for r in res] for res in results] == [["a", "b"], ["c", "d"]]
+        assert service.get_stats()["errors"] == 2
+
+
 # ============================================================================
 # INTEGRATION TEST MARKERS (Skip by default, run with GPU)
 # ============================================================================
@@ -0,0 +1,242 @@
+"""Tests for the in-process vector index and per-tenant hot cache."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from relay_ai.platform.security.memory.vector_index import (
+    HotVectorCache,
+    NumpyVectorIndex,
+    TenantVectorIndex,
+    vectors_from_pgvector,
+)
+
+
+def clustered(n: int, dim: int = 32, clusters: int = 20, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim))
+    return (centers[rng.integers(0, clusters, n)] + 0.3 * rng.standard_normal((n, dim))).astype(np.float32)
+
+
+def ids_for(n: int, prefix: str = "v") -> list[str]:
+    return [f"{prefix}{i}" for i in range(n)]
+
+
+class TestNumpyVectorIndex:
+    def test_brute_force_matches_exact_cosine(self):
+        vectors = clustered(500)
+        index = NumpyVectorIndex(32)
+        index.add(ids_for(500), vectors)
+        query = vectors[7] + 0.01
+
+        results = index.search(query, 5)
+
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+        assert [vector_id for vector_id, _ in results] == [f"v{i}" for i in expected]
+        assert results[0][1] == pytest.approx(1.0, abs=1e-3)
+        assert not index.uses_ivf
+
+    def test_ivf_recall_against_brute_force(self):
+        """Above the threshold the IVF index keeps recall@10 high while scanning a fraction of lists."""
+        vectors = clustered(6000)
+        index = NumpyVectorIndex(32, ivf_threshold=2000, nprobe=8)
+        index.add(ids_for(6000), vectors)
+        assert index.uses_ivf
+
+        queries = clustered(50, seed=1)
+        recall = []
+        for query in queries:
+            exact = {vector_id for vector_id, _ in index.search(query, 10, exact=True)}
+            approx = {vector_id for vector_id, _ in index.search(query, 10)}
+            recall.append(len(exact & approx) / 10)
+        assert np.mean(recall) >= 0.9
+
+    def test_upsert_and_remove(self):
+        index = NumpyVectorIndex(4)
+        index.add(["a", "b", "c"], np.eye(4, dtype=np.float32)[:3])
+        index.add(["a"], [[0, 0, 0, 1]])  # Replace, not duplicate
+
+        assert len(index) == 3
+        assert index.search([0, 0, 0, 1], 1)[0][0] == "a"
+        assert index.remove(["b", "missing"]) == 1
+        assert len(index) == 2 and "b" not in index
+        assert {vector_id for vector_id, _ in index.search([1, 1, 1, 1], 5)} == {"a", "c"}
+
+    def test_dimension_mismatch_raises(self):
+        index = NumpyVectorIndex(4)
+        with pytest.raises(ValueError):
+            index.add(["a"], [[1.0, 2.0]])
+
+    def test_save_and_mmap_load(self, tmp_path):
+        """A saved index loads memory-mapped with identical results and stays writable."""
+        vectors = clustered(3000)
+        index = NumpyVectorIndex(32, ivf_threshold=1000)
+        index.add(ids_for(3000), vectors)
+        index.save(str(tmp_path))
+
+        loaded = NumpyVectorIndex.load(str(tmp_path), mmap=True)
+
+        assert len(loaded) == 3000 and loaded.uses_ivf
+        assert isinstance(loaded._vectors, np.memmap)
+        assert loaded.search(vectors[3], 5) == index.search(vectors[3], 5)
+        loaded.add(["new"], vectors[:1] * -1)
+        assert loaded.search(vectors[0] * -1, 1)[0][0] == "new"
+
+
+class TestTenantVectorIndex:
+    def test_tenants_are_isolated(self, tmp_path):
+        index = TenantVectorIndex(4, root=str(tmp_path))
+        index.add("tenant_a", ["a1"], [[1, 0, 0, 0]])
+        index.add("tenant_b", ["b1"], [[1, 0, 0, 0]])
+
+        assert [vector_id for vector_id, _ in index.search("tenant_a", [1, 0, 0, 0], 10)] == ["a1"]
+        assert index.search("tenant_c", [1, 0, 0, 0], 10) == []
+
+        index.save()
+        reopened = TenantVectorIndex(4, root=str(tmp_path))
+        assert [vector_id for vector_id, _ in reopened.search("tenant_b", [1, 0, 0, 0], 10)] == ["b1"]
+
+    def test_rejects_path_like_tenant(self):
+        index = TenantVectorIndex(4)
+        with pytest.raises(ValueError):
+            index.add("../other", ["x"], [[1, 0, 0, 0]])
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_loader(rows: dict[str, tuple[list[str], np.ndarray]], calls: list[str], user_hash: str):
+    async def loader(limit):
+        calls.append(user_hash)
+        ids, vectors = rows[user_hash]
+        return ids[: limit + 1], vectors[: limit + 1]
+
+    return loader
+
+
+class TestHotVectorCache:
+    @pytest.mark.asyncio
+    async def test_loads_once_then_hits_until_ttl(self):
+        clock, calls = FakeClock(), []
+        rows = {"user_a": (ids_for(10), clustered(10))}
+        cache = HotVectorCache(ttl_sec=60, clock=clock)
+
+        first = await cache.get("user_a", make_loader(rows, calls, "user_a"))
+        second = await cache.get("user_a", make_loader(rows, calls, "user_a"))
+        clock.now = 61
+        await cache.get("user_a", make_loader(rows, calls, "user_a"))
+
+        assert first is second and len(first) == 10
+        assert calls == ["user_a", "user_a"]
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_large_tenant_bypasses_cache(self):
+        calls = []
+        rows = {"big": (ids_for(50), clustered(50))}
+        cache = HotVectorCache(max_tenant_vectors=20)
+
+        assert await cache.get("big", make_loader(rows, calls, "big")) is None
+        assert await cache.get("big", make_loader(rows, calls, "big")) is None
+        assert calls == ["big"]  # Not reloaded on every query
+        assert cache.get_stats()["bypass"] == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_by_tenant_count(self):
+        calls = []
+        rows = {user: (ids_for(5), clustered(5)) for user in ("u1", "u2", "u3")}
+        cache = HotVectorCache(max_tenants=2)
+
+        for user in ("u1", "u2", "u1", "u3"):
+            await cache.get(user, make_loader(rows, calls, user))
+
+        stats = cache.get_stats()
+        assert stats["tenants"] == 2 and stats["evictions"] == 1
+        await cache.get("u1", make_loader(rows, calls, "u1"))
+        assert calls.count("u1") == 1  # u2 (least recently used) was evicted, not u1
+
+    @pytest.mark.asyncio
+    async def test_write_through_and_invalidate(self):
+        calls = []
+        rows = {"user_a": (ids_for(3), np.eye(4, dtype=np.float32)[:3])}
+        cache = HotVectorCache(max_tenant_vectors=5)
+        index = await cache.get("user_a", make_loader(rows, calls, "user_a"))
+
+        cache.add("user_a", ["new"], [[0, 0, 0, 1]])
+        assert index.search([0, 0, 0, 1], 1)[0][0] == "new"
+
+        cache.add("user_a", ids_for(5, "more"), np.ones((5, 4)))  # Would exceed max_tenant_vectors
+        await cache.get("user_a", make_loader(rows, calls, "user_a"))
+        assert calls == ["user_a", "user_a"]
+        assert cache.get_stats()["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_tenant_is_cached(self):
+        calls = []
+        rows = {"empty": ([], np.empty((0, 0), dtype=np.float32))}
+        cache = HotVectorCache()
+
+        index = await cache.get("empty", make_loader(rows, calls, "empty"))
+
+        assert index is not None and index.search([1.0, 0.0], 3) == []
+        cache.add("empty", ["first"], [[1.0, 0.0]])
+        assert (await cache.get("empty", make_loader(rows, calls, "empty"))).search([1.0, 0.0], 1)[0][0] == "first"
+        assert calls == ["empty"]
+
+    @pytest.mark.asyncio
+    async def test_add_during_slow_load_is_not_lost(self):
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_loader(limit):
+            snapshot = (["old"], np.eye(4, dtype=np.float32)[:1])  # Read before the concurrent add commits
+            started.set()
+            await release.wait()
+            return snapshot
+
+        cache = HotVectorCache(max_tenant_vectors=5)
+        reader = asyncio.create_task(cache.get("user_a", slow_loader))
+        await started.wait()
+        cache.add("user_a", ["new"], [[0, 0, 0, 1]])
+        release.set()
+        index = await reader
+
+        assert index.search([0, 0, 0, 1], 1)[0][0] == "new"
+        assert (await cache.get("user_a", slow_loader)) is index and len(index) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_during_slow_load_skips_caching(self):
+        calls, started, release = [], asyncio.Event(), asyncio.Event()
+        rows = {"user_a": (ids_for(3), clustered(3))}
+
+        async def slow_loader(limit):
+            started.set()
+            await release.wait()
+            return await make_loader(rows, calls, "user_a")(limit)
+
+        cache = HotVectorCache()
+        reader = asyncio.create_task(cache.get("user_a", slow_loader))
+        await started.wait()
+        cache.invalidate("user_a")
+        release.set()
+        assert len(await reader) == 3
+
+        await cache.get("user_a", make_loader(rows, calls, "user_a"))
+        assert calls == ["user_a", "user_a"]  # The racing snapshot was not cached
+
+
+def test_vectors_from_pgvector_binary():
+    """vector_send() output (uint16 dim, uint16 unused, big-endian float32) decodes to a float32 matrix."""
+    vectors = np.array([[1.5, -2.0, 0.25], [0.0, 3.0, -1.0]], dtype=np.float32)
+    blobs = [len(v).to_bytes(2, "big") + b"\x00\x00" + v.astype(">f4").tobytes() for v in vectors]
+
+    decoded = vectors_from_pgvector(blobs)
+
+    assert decoded.dtype == np.float32
+    np.testing.assert_array_equal(decoded, vectors)
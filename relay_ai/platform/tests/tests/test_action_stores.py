@@ -0,0 +1,245 @@
+"""Tests for the bounded in-memory and Redis-backed action stores."""
+
+import asyncio
+
+import pytest
+
+from relay_ai.actions.stores import (
+    MemoryIdempotencyStore,
+    MemoryPreviewStore,
+    RedisIdempotencyStore,
+    RedisPreviewStore,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def redis_client():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # fakeredis needs it to run Lua scripts
+    return fakeredis.FakeStrictRedis(decode_responses=True)
+
+
+def test_memory_preview_store_expires_and_stays_bounded(clock):
+    store = MemoryPreviewStore(max_entries=3, clock=clock)
+
+    store.save("short", {"action": "a"}, ttl_seconds=10)
+    for i in range(3):
+        store.save(f"p{i}", {"action": "a"}, ttl_seconds=100 + i)
+    assert len(store) == 3
+    assert store.get("short") is None  # Over capacity: soonest-expiring evicted first
+    assert store.get("p0")["expires_at"] == "2023-11-14T22:15:00"
+
+    clock.now += 100.5
+    store.save("p3", {"action": "a"})
+    assert len(store) == 3  # p0 (expired) swept on write
+    clock.now += 1
+    assert store.get("p1") is None  # Expired on read
+    assert store.get("p2")["action"] == "a"
+
+    store.delete("p2")
+    assert store.get("p2") is None
+
+
+def test_memory_idempotency_index_tracks_eviction(clock):
+    store = MemoryIdempotencyStore(max_entries=2, ttl_seconds=60, clock=clock)
+
+    first = store.save("ws", "webhook.save", "k1", {"run_id": "r1"})
+    assert store.save("ws", "webhook.save", "k1", {"run_id": "r2"}) == first  # First writer wins
+    store.save("ws", "smtp.send", "k1", {"run_id": "r3"})
+
+    assert store.check_by_key("ws", "k1")["run_id"] == "r1"
+    assert store.check("ws", "smtp.send", "k1")["run_id"] == "r3"
+    assert store.check_by_key("other", "k1") is None
+
+    clock.now += 30
+    store.save("ws", "webhook.save", "k2", {"run_id": "r4"})  # Evicts r1, the soonest to expire
+    assert store.check_by_key("ws", "k1")["run_id"] == "r3"
+
+    clock.now += 61
+    assert store.check_by_key("ws", "k1") is None
+    assert store.check("ws", "webhook.save", "k2") is None
+    assert store._actions == {}
+
+
+def test_memory_idempotency_reservation(clock):
+    store = MemoryIdempotencyStore(ttl_seconds=60, clock=clock)
+
+    assert store.reserve("ws", "webhook.save", "k1", "r1") is None
+    assert store.reserve("ws", "webhook.save", "k1", "r2") == {"pending": True, "run_id": "r1"}
+    assert store.check_by_key("ws", "k1") == {"pending": True, "run_id": "r1"}
+
+    store.release("ws", "webhook.save", "k1", "r2")  # Not the holder: no-op
+    stored = store.save("ws", "webhook.save", "k1", {"run_id": "r1"})
+    assert store.check("ws", "webhook.save", "k1") == stored
+    assert store.reserve("ws", "webhook.save", "k1", "r3") == stored
+    assert store._actions == {("ws", "k1"): ["webhook.save"]}
+
+    assert store.reserve("ws", "smtp.send", "k1", "r4", ttl_seconds=10) is None
+    store.release("ws", "smtp.send", "k1", "r4")
+    assert store.check("ws", "smtp.send", "k1") is None
+    assert store._actions == {("ws", "k1"): ["webhook.save"]}
+
+
+def test_redis_preview_store_shared_across_instances(redis_client):
+    writer, reader = RedisPreviewStore(redis_client), RedisPreviewStore(redis_client)
+
+    writer.save("p1", {"action": "webhook.save", "params": {"url": "x"}}, ttl_seconds=60)
+
+    assert reader.get("p1")["params"] == {"url": "x"}
+    assert 0 < redis_client.pttl("actions:preview:p1") <= 60_000
+    reader.delete("p1")
+    assert writer.get("p1") is None
+
+
+def test_redis_idempotency_check_and_set(redis_client):
+    worker_a, worker_b = RedisIdempotencyStore(redis_client), RedisIdempotencyStore(redis_client)
+
+    stored = worker_a.save("ws", "webhook.save", "k1", {"run_id": "r1", "status": "success"})
+    assert worker_b.save("ws", "webhook.save", "k1", {"run_id": "r2", "status": "success"}) == stored
+    worker_b.save("ws", "smtp.send", "k1", {"run_id": "r3"})
+
+    assert worker_b.check_by_key("ws", "k1")["run_id"] == "r1"
+    assert worker_a.check("ws", "smtp.send", "k1")["run_id"] == "r3"
+    assert worker_a.check_by_key("ws", "missing") is None
+
+    # An expired result is skipped and dropped from the index
+    redis_client.delete("actions:idem:{ws:k1}:webhook.save")
+    assert worker_a.check_by_key("ws", "k1")["run_id"] == "r3"
+    assert redis_client.lrange("actions:idem:{ws:k1}", 0, -1) == ["smtp.send"]
+    assert 0 < redis_client.pttl("actions:idem:{ws:k1}:smtp.send") <= 86_400_000
+
+
+def test_redis_idempotency_reservation(redis_client):
+    worker_a, worker_b = RedisIdempotencyStore(redis_client), RedisIdempotencyStore(redis_client)
+
+    assert worker_a.reserve("ws", "webhook.save", "k1", "r1", ttl_seconds=30) is None
+    assert worker_b.reserve("ws", "webhook.save", "k1", "r2") == {"pending": True, "run_id": "r1"}
+    assert 0 < redis_client.pttl("actions:idem:{ws:k1}:webhook.save") <= 30_000
+    assert worker_b.check_by_key("ws", "k1") == {"pending": True, "run_id": "r1"}
+
+    worker_b.release("ws", "webhook.save", "k1", "r2")  # Not the holder: no-op
+    stored = worker_a.save("ws", "webhook.save", "k1", {"run_id": "r1"})
+    assert worker_b.save("ws", "webhook.save", "k1", {"run_id": "r2"}) == stored
+    assert worker_b.reserve("ws", "webhook.save", "k1", "r3") == stored
+    assert 30_000 < redis_client.pttl("actions:idem:{ws:k1}:webhook.save") <= 86_400_000
+    assert redis_client.lrange("actions:idem:{ws:k1}", 0, -1) == ["webhook.save"]
+
+    assert worker_a.reserve("ws", "smtp.send", "k1", "r4") is None
+    worker_a.release("ws", "smtp.send", "k1", "r4")
+    assert worker_a.check("ws", "smtp.send", "k1") is None
+    assert redis_client.lrange("actions:idem:{ws:k1}", 0, -1) == ["webhook.save"]
+
+
+def test_redis_check_by_key_declares_every_key(redis_client, monkeypatch):
+    store = RedisIdempotencyStore(redis_client)
+    store.save("ws", "webhook.save", "k1", {"run_id": "r1"})
+    store.save("ws", "smtp.send", "k1", {"run_id": "r2"})
+    calls = []
+    script = store._check_by_key
+
+    def check_by_key(keys, args):
+        calls.append(keys)
+        return script(keys=keys, args=args)
+
+    monkeypatch.setattr(store, "_check_by_key", check_by_key)
+
+    assert store.check_by_key("ws", "k1")["run_id"] == "r1"
+    assert calls == [["actions:idem:{ws:k1}", "actions:idem:{ws:k1}:webhook.save", "actions:idem:{ws:k1}:smtp.send"]]
+
+
+@pytest.mark.anyio
+async def test_executor_replays_from_shared_store(redis_client, monkeypatch):
+    from relay_ai.actions.execution import ActionExecutor
+
+    workers = []
+    for _ in range(2):
+        executor = ActionExecutor()
+        executor.preview_store = RedisPreviewStore(redis_client)
+        executor.idempotency_store = RedisIdempotencyStore(redis_client)
+        workers.append(executor)
+
+    calls = []
+
+    async def execute(action, params):
+        calls.append(action)
+        return {"ok": True}
+
+    monkeypatch.setattr(workers[0].adapters["independent"], "execute", execute)
+    workers[0].preview_store.save("p1", {"action": "webhook.save", "provider": "independent", "params": {}})
+
+    first = await workers[0].execute("p1", idempotency_key="k1", workspace_id="ws")
+    replay = await workers[1].execute("p1", idempotency_key="k1", workspace_id="ws")
+
+    assert calls == ["webhook.save"]
+    assert replay.run_id == first.run_id and replay.status == first.status
+    assert workers[1].preview_store.get("p1") is None
+
+
+def make_workers(redis_client, count=2):
+    from relay_ai.actions.execution import ActionExecutor
+
+    workers = []
+    for _ in range(count):
+        executor = ActionExecutor()
+        executor.preview_store = RedisPreviewStore(redis_client)
+        executor.idempotency_store = RedisIdempotencyStore(redis_client)
+        workers.append(executor)
+    return workers
+
+
+@pytest.mark.anyio
+async def test_concurrent_executions_run_action_once(redis_client, monkeypatch):
+    workers = make_workers(redis_client, 3)
+    calls = []
+
+    async def execute(action, params):
+        calls.append(action)
+        await asyncio.sleep(0.1)
+        return {"ok": True}
+
+    for worker in workers:
+        monkeypatch.setattr(worker.adapters["independent"], "execute", execute)
+    workers[0].preview_store.save("p1", {"action": "webhook.save", "provider": "independent", "params": {}})
+
+    responses = await asyncio.gather(
+        *[worker.execute("p1", idempotency_key="k1", workspace_id="ws") for worker in workers]
+    )
+
+    assert calls == ["webhook.save"]
+    assert len({r.run_id for r in responses}) == 1
+    assert all(r.result == {"ok": True} for r in responses)
+
+
+@pytest.mark.anyio
+async def test_interrupted_execution_releases_key(redis_client, monkeypatch):
+    worker = make_workers(redis_client, 1)[0]
+    calls = []
+
+    async def execute(action, params):
+        calls.append(action)
+        if len(calls) == 1:
+            raise asyncio.CancelledError  # e.g. client disconnected mid-request
+        return {"ok": True}
+
+    monkeypatch.setattr(worker.adapters["independent"], "execute", execute)
+    worker.preview_store.save("p1", {"action": "webhook.save", "provider": "independent", "params": {}})
+
+    with pytest.raises(asyncio.CancelledError):
+        await worker.execute("p1", idempotency_key="k1", workspace_id="ws")
+    assert worker.idempotency_store.check_by_key("ws", "k1") is None
+
+    retried = await worker.execute("p1", idempotency_key="k1", workspace_id="ws")
+    assert retried.result == {"ok": True} and calls == ["webhook.save", "webhook.save"]
@@ -0,0 +1,138 @@
+"""Tests for the pure-ASGI telemetry, body-limit and security-header middlewares."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from relay_ai.common.middleware.body_limit import BodySizeLimitMiddleware
+from relay_ai.common.middleware.security_headers import SecurityHeadersMiddleware
+from relay_ai.telemetry import prom
+from relay_ai.telemetry.middleware import TelemetryMiddleware
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    calls = []
+    monkeypatch.setattr(prom, "record_http_request", lambda **kwargs: calls.append(kwargs))
+    return calls
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+
+    @app.get("/workflows/{workflow_id}")
+    def get_workflow(workflow_id: str, request: Request):
+        return {"id": workflow_id, "request_id": request.state.request_id}
+
+    @app.get("/boom")
+    def boom():
+        raise ValueError("boom")
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return {"size": len(await request.body())}
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            for i in range(3):
+                yield f"data: {i}\n\n"
+                await asyncio.sleep(0)
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    app.add_middleware(TelemetryMiddleware)
+    app.add_middleware(BodySizeLimitMiddleware, max_body_bytes=1024)
+    app.add_middleware(SecurityHeadersMiddleware)
+    return app
+
+
+def test_telemetry_labels_with_route_template(app, recorded):
+    client = TestClient(app)
+
+    response = client.get("/workflows/abc123")
+
+    assert response.status_code == 200
+    assert response.headers["X-Request-ID"] == response.json()["request_id"]
+    assert recorded == [
+        {
+            "method": "GET",
+            "endpoint": "/workflows/{workflow_id}",
+            "status_code": 200,
+            "duration_seconds": recorded[0]["duration_seconds"],
+        }
+    ]
+
+    client.get("/nothing/here/42")
+    assert recorded[-1]["endpoint"] == "/nothing/here/{id}"
+    assert recorded[-1]["status_code"] == 404
+
+
+def test_telemetry_records_500_when_handler_raises(app, recorded):
+    response = TestClient(app, raise_server_exceptions=False).get("/boom")
+
+    assert response.status_code == 500
+    assert recorded[-1]["endpoint"] == "/boom" and recorded[-1]["status_code"] == 500
+
+
+def test_body_limit_counts_streamed_bytes(app, recorded):
+    client = TestClient(app)
+
+    assert client.post("/echo", content=b"x" * 1024).json() == {"size": 1024}
+
+    # Declared length over the limit: rejected before the app runs
+    response = client.post("/echo", content=b"x" * 2048)
+    assert response.status_code == 413
+    assert response.text == "Request body too large (max 512 KiB)"
+
+    # Chunked body with no Content-Length: rejected once the count passes the limit
+    response = client.post("/echo", content=iter([b"x" * 600, b"x" * 600, b"x" * 600]))
+    assert response.status_code == 413
+    assert response.text == "Request body too large (max 512 KiB)"
+    assert "strict-transport-security" in response.headers
+
+
+def test_body_limit_ignores_understated_content_length(app):
+    messages = [{"type": "http.request", "body": b"x" * 800, "more_body": True}] * 2
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/echo",
+        "raw_path": b"/echo",
+        "root_path": "",
+        "scheme": "http",
+        "query_string": b"",
+        "headers": [(b"content-length", b"10")],
+        "server": ("test", 80),
+        "client": ("test", 1),
+        "http_version": "1.1",
+    }
+    asyncio.run(app(scope, receive, send))
+
+    assert sent[0]["status"] == 413
+    assert [m["type"] for m in sent] == ["http.response.start", "http.response.body"]
+
+
+def test_security_headers_and_sse_pass_through(app, recorded):
+    client = TestClient(app)
+
+    with client.stream("GET", "/stream") as response:
+        chunks = list(response.iter_raw())
+
+    assert response.headers["x-frame-options"] == "DENY"
+    assert response.headers["content-security-policy"].startswith("default-src 'self'")
+    assert "X-Request-ID" in response.headers
+    assert b"".join(chunks) == b"data: 0\n\ndata: 1\n\ndata: 2\n\n"
+    assert recorded[-1]["endpoint"] == "/stream"
@@ -160,3 +160,133 @@ def test_global_audit_logger():
     logger2 = get_audit_logger()
 
     assert logger1 is logger2  # Same instance
+
+
+def _legacy_segment(audit_dir: Path, date: str, rows: list[tuple[str, str, str, str]]) -> None:
+    """Write a pre-index segment (no sidecar) the way the old synchronous logger did."""
+    with open(audit_dir / f"audit-{date}.jsonl", "w", encoding="utf-8") as f:
+        for tenant, user, action, result in rows:
+            event = {
+                "timestamp": f"{date}T12:00:00",
+                "tenant_id": tenant,
+                "user_id": user,
+                "action": action,
+                "resource_type": "workflow",
+                "resource_id": "wf",
+                "result": result,
+            }
+            f.write(json.dumps(event) + "\n")
+
+
+def test_audit_query_date_range_uses_only_matching_segments(tmp_path):
+    """Segments outside the date range are never opened; legacy segments get a sidecar on first query."""
+    _legacy_segment(tmp_path, "2025-01-01", [("tenant1", "user1", "run_workflow", "success")] * 3)
+    _legacy_segment(tmp_path, "2025-01-02", [("tenant1", "user2", "login", "denied")] * 2)
+    (tmp_path / "audit-2025-01-03.jsonl").write_text("not json\n")  # Outside range: must not matter
+    logger = AuditLogger(audit_dir=str(tmp_path))
+
+    events = logger.query(tenant_id="tenant1", start_date="2025-01-01", end_date="2025-01-02", limit=10)
+
+    assert [e.user_id for e in events] == ["user1"] * 3 + ["user2"] * 2
+    assert (tmp_path / "audit-2025-01-01.jsonl.idx").exists()
+    assert not (tmp_path / "audit-2025-01-03.jsonl.idx").exists()
+
+
+def test_audit_query_filters_and_offset_pushdown(tmp_path):
+    """Multiple filters intersect index postings; offset/limit page through matches in order."""
+    rows = [("tenant1", f"user{i % 3}", "run_workflow" if i % 2 else "login", "success") for i in range(30)]
+    _legacy_segment(tmp_path, "2025-02-01", rows[:15])
+    _legacy_segment(tmp_path, "2025-02-02", rows[15:])
+    logger = AuditLogger(audit_dir=str(tmp_path))
+    kwargs = {"user_id": "user1", "action": AuditAction.RUN_WORKFLOW, "start_date": "2025-02-01"}
+
+    everything = logger.query(limit=100, **kwargs)
+    page = logger.query(limit=2, offset=3, **kwargs)
+
+    expected = [r for r in rows if r[1] == "user1" and r[2] == "run_workflow"]
+    assert len(everything) == len(expected) == 5
+    assert [(e.timestamp, e.user_id) for e in page] == [(e.timestamp, e.user_id) for e in everything[3:5]]
+
+
+def test_audit_index_sees_new_writes(tmp_path):
+    """Events written after a query are found by the next query (sidecar read incrementally)."""
+    logger = AuditLogger(audit_dir=str(tmp_path))
+    logger.log_success("tenant1", "user1", AuditAction.LOGIN, "session", "s1")
+    assert len(logger.query(tenant_id="tenant1")) == 1
+
+    logger.log_success("tenant1", "user1", AuditAction.LOGOUT, "session", "s1")
+    events = logger.query(tenant_id="tenant1")
+
+    assert [e.action for e in events] == [AuditAction.LOGIN, AuditAction.LOGOUT]
+
+
+def test_audit_writer_group_commits(tmp_path):
+    """Queued events are written in batches, not one write per event."""
+    from relay_ai.security.audit_store import AuditStore
+
+    store = AuditStore(tmp_path, fsync="always")
+    store._ensure_writer = lambda: None  # Hold the writer until everything is queued
+    for i in range(50):
+        store.append("2025-03-01", json.dumps({"i": i}), {"tenant_id": "t"})
+    AuditStore._ensure_writer(store)
+    assert store.flush()
+    store.close()
+
+    assert store.stats["written"] == 50
+    assert store.stats["batches"] == 1
+    assert store.stats["fsyncs"] >= 1
+    assert len((tmp_path / "audit-2025-03-01.jsonl").read_text().splitlines()) == 50
+
+
+def test_audit_full_queue_waits_then_drops(tmp_path, capsys, monkeypatch):
+    from relay_ai.security import audit_store
+
+    monkeypatch.setattr(audit_store, "AUDIT_ENQUEUE_TIMEOUT_SEC", 0.01)
+    store = audit_store.AuditStore(tmp_path, queue_size=1)
+    store._ensure_writer = lambda: None
+
+    assert store.append("2025-03-01", '{"n":1}', {}) is True
+    assert store.append("2025-03-01", '{"n":2}', {}) is False
+    assert store.stats["dropped"] == 1
+    assert 'AUDIT_DROPPED: {"n":2}' in capsys.readouterr().out
+
+
+def test_audit_writer_does_not_recreate_removed_dir(tmp_path, capsys):
+    from relay_ai.security.audit_store import AuditStore
+
+    audit_dir = tmp_path / "audit"
+    audit_dir.mkdir()
+    store = AuditStore(audit_dir)
+    store.append("2025-03-01", '{"n":1}', {})
+    store.close()  # Stop the writer so the next event stays queued
+
+    store._ensure_writer = lambda: None
+    store.append("2025-03-01", '{"n":2}', {})
+    for path in audit_dir.iterdir():
+        path.unlink()
+    audit_dir.rmdir()
+    AuditStore._ensure_writer(store)
+    assert store.flush()
+    store.close()
+
+    assert not audit_dir.exists()
+    assert store.stats["errors"] == 1
+    assert 'AUDIT_EVENT: {"n":2}' in capsys.readouterr().out
+
+
+def test_audit_store_registry_is_bounded(tmp_path, monkeypatch):
+    from relay_ai.security import audit_store
+
+    monkeypatch.setattr(audit_store, "AUDIT_STORE_CACHE", 2)
+    monkeypatch.setattr(audit_store, "_stores", {})
+    (tmp_path / "a").mkdir()
+    first = audit_store.get_audit_store(tmp_path / "a")
+    first.append("2025-03-01", '{"n":1}', {})
+    assert audit_store.get_audit_store(tmp_path / "a") is first
+    audit_store.get_audit_store(tmp_path / "b")
+    audit_store.get_audit_store(tmp_path / "c")
+
+    assert len(audit_store._stores) == 2
+    assert first._thread is None  # Evicted stores are drained and stopped
+    assert (tmp_path / "a" / "audit-2025-03-01.jsonl").read_text() == '{"n":1}\n'
+    assert audit_store.get_audit_store(tmp_path / "a") is not first
@@ -0,0 +1,206 @@
+"""
+Tests for content-addressed blob storage (Sprint 26).
+
+Tests cover:
+- Dedup of identical payloads with reference counting
+- Tier files holding references; reads resolving through the blob store
+- Purge/overwrite releasing references, blob deletion at zero
+- Per-tenant namespaces and encryption at rest
+- Run artifact dedup via hard links
+"""
+
+import time
+from datetime import datetime
+
+import pytest
+
+from relay_ai.storage.blob_store import BlobStore, content_digest, get_blob_store
+from relay_ai.storage.lifecycle import purge_expired_from_cold
+from relay_ai.storage.tiered_store import (
+    TIER_COLD,
+    TIER_HOT,
+    TIER_WARM,
+    get_artifact_path,
+    promote_artifact,
+    purge_artifact,
+    read_artifact,
+    write_artifact,
+)
+
+
+class FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 1, 1, 12, 0)
+
+
+@pytest.fixture
+def dedup_env(temp_tier_paths, monkeypatch):
+    """Enable dedup on isolated tier directories."""
+    monkeypatch.setenv("STORAGE_DEDUP_ENABLED", "true")
+    monkeypatch.setenv("ENCRYPTION_ENABLED", "false")
+    return temp_tier_paths
+
+
+def test_identical_payloads_stored_once(dedup_env):
+    """Test three artifacts with the same content share one blob."""
+    content = b"debate output " * 200
+    for i in range(3):
+        write_artifact(TIER_HOT, "tenant1", f"workflow{i}", "out.md", content)
+
+    store = get_blob_store()
+    digest = content_digest(content)
+    assert store.refcount("tenant1", digest) == 3
+    assert store.get_stats()["blob_count"] == 1
+    assert store.get_stats()["bytes_deduped"] == 2 * len(content)
+
+    path = get_artifact_path(TIER_HOT, "tenant1", "workflow0", "out.md")
+    assert path.read_bytes() == f"sha256:{digest}".encode()
+
+    read_content, metadata = read_artifact(TIER_HOT, "tenant1", "workflow2", "out.md")
+    assert read_content == content
+    assert metadata["_blob_digest"] == digest
+
+
+def test_purge_deletes_blob_only_at_zero_refs(dedup_env):
+    """Test blob survives until its last reference is purged."""
+    content = b"shared"
+    write_artifact(TIER_HOT, "tenant1", "workflow1", "a.txt", content)
+    write_artifact(TIER_HOT, "tenant1", "workflow1", "b.txt", content)
+
+    store = get_blob_store()
+    blob_path = store.blob_path("tenant1", content_digest(content))
+
+    purge_artifact(TIER_HOT, "tenant1", "workflow1", "a.txt")
+    assert blob_path.exists()
+    assert read_artifact(TIER_HOT, "tenant1", "workflow1", "b.txt")[0] == content
+
+    purge_artifact(TIER_HOT, "tenant1", "workflow1", "b.txt")
+    assert not blob_path.exists()
+    assert store.refcount("tenant1", content_digest(content)) == 0
+
+
+def test_overwrite_releases_previous_blob(dedup_env):
+    """Test rewriting an artifact drops its reference to the old payload."""
+    write_artifact(TIER_HOT, "tenant1", "workflow1", "a.txt", b"v1")
+    write_artifact(TIER_HOT, "tenant1", "workflow1", "a.txt", b"v2")
+
+    store = get_blob_store()
+    assert store.refcount("tenant1", content_digest(b"v1")) == 0
+    assert store.refcount("tenant1", content_digest(b"v2")) == 1
+
+
+def test_references_move_across_tiers_and_lifecycle_purge(dedup_env, lifecycle_env, fake_clock):
+    """Test promotion moves only the reference and lifecycle purge releases it."""
+    content = b'{"rows": []}' * 100
+    write_artifact(TIER_WARM, "tenant1", "workflow1", "a.json", content)
+    write_artifact(TIER_HOT, "tenant1", "workflow1", "b.json", content)
+
+    promote_artifact("tenant1", "workflow1", "a.json", TIER_WARM, TIER_COLD)
+    read_content, metadata = read_artifact(TIER_COLD, "tenant1", "workflow1", "a.json")
+    assert read_content == content
+    assert "_compression" not in metadata
+
+    fake_clock["time"] = time.time() + (100 * 86400)
+    results = purge_expired_from_cold(dry_run=False, fake_clock=fake_clock["time"])
+
+    assert results["purged"] == 1
+    store = get_blob_store()
+    assert store.refcount("tenant1", content_digest(content)) == 1
+    assert read_artifact(TIER_HOT, "tenant1", "workflow1", "b.json")[0] == content
+
+
+def test_tenants_use_separate_namespaces(dedup_env):
+    """Test identical content from two tenants is not shared."""
+    write_artifact(TIER_HOT, "tenant1", "workflow1", "a.txt", b"same")
+    write_artifact(TIER_HOT, "tenant2", "workflow1", "a.txt", b"same")
+
+    store = get_blob_store()
+    digest = content_digest(b"same")
+    assert store.refcount("tenant1", digest) == 1
+    assert store.refcount("tenant2", digest) == 1
+    assert store.blob_path("tenant1", digest) != store.blob_path("tenant2", digest)
+
+
+def test_encrypted_blobs(dedup_env, tmp_path, monkeypatch):
+    """Test blobs are encrypted at rest and still deduplicated."""
+    monkeypatch.setenv("ENCRYPTION_ENABLED", "true")
+    monkeypatch.setenv("KEYRING_PATH", str(tmp_path / "keyring.jsonl"))
+    content = b"confidential payload " * 50
+
+    write_artifact(TIER_HOT, "tenant1", "workflow1", "a.txt", content)
+    write_artifact(TIER_HOT, "tenant1", "workflow2", "a.txt", content)
+
+    store = get_blob_store()
+    digest = content_digest(content)
+    assert store.refcount("tenant1", digest) == 2
+    assert b"confidential" not in store.blob_path("tenant1", digest).read_bytes()
+    assert read_artifact(TIER_HOT, "tenant1", "workflow2", "a.txt")[0] == content
+
+
+def test_blob_store_link_materializes_plaintext(tmp_path):
+    """Test link() hard-links plaintext blobs and refuses encrypted ones."""
+    store = BlobStore(tmp_path / "blobs", encrypt=False)
+    digest = store.put("runs", b"{}")
+
+    dest = tmp_path / "run.json"
+    assert store.link("runs", digest, dest)
+    assert dest.read_bytes() == b"{}"
+    assert dest.stat().st_nlink == 2
+
+
+def test_save_run_artifact_dedup(tmp_path, monkeypatch):
+    """Test identical run artifacts share storage when dedup is enabled."""
+    from relay_ai.artifacts import save_run_artifact
+
+    monkeypatch.setenv("STORAGE_DEDUP_ENABLED", "true")
+    monkeypatch.setattr("relay_ai.artifacts.validate_artifact", lambda artifact: True)
+    runs_dir = tmp_path / "runs"
+
+    path = save_run_artifact({"run_metadata": {"task": "x"}}, runs_dir=str(runs_dir))
+
+    store = BlobStore(runs_dir / ".blobs", encrypt=False)
+    assert store.get_stats()["blob_count"] == 1
+    assert (runs_dir / path.split("/")[-1]).stat().st_nlink == 2
+
+
+def test_blob_written_before_reference_and_read_only(tmp_path, monkeypatch):
+    """Test a failed blob write commits no reference, and stored blobs are read-only."""
+    store = BlobStore(tmp_path / "blobs", encrypt=False)
+
+    def fail_write(path, stored):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "_write_blob", fail_write)
+    with pytest.raises(OSError):
+        store.put("runs", b"payload")
+    assert store.refcount("runs", content_digest(b"payload")) == 0
+
+    monkeypatch.undo()
+    digest = store.put("runs", b"payload")
+    assert store.refcount("runs", digest) == 1
+    assert store.blob_path("runs", digest).stat().st_mode & 0o222 == 0
+
+
+def test_save_run_artifact_failed_link_releases_reference(tmp_path, monkeypatch):
+    """Test a run file that could not be linked holds no reference and never writes through a link."""
+    from relay_ai.artifacts import save_run_artifact
+
+    monkeypatch.setenv("STORAGE_DEDUP_ENABLED", "true")
+    monkeypatch.setattr("relay_ai.artifacts.validate_artifact", lambda artifact: True)
+    monkeypatch.setattr("relay_ai.artifacts.datetime", FixedDatetime)
+    runs_dir = tmp_path / "runs"
+    store = BlobStore(runs_dir / ".blobs", encrypt=False)
+
+    first = save_run_artifact({"run_metadata": {"task": "x"}}, runs_dir=str(runs_dir))
+    digest = content_digest((runs_dir / first.split("/")[-1]).read_bytes())
+    blob = store.blob_path("runs", digest).read_bytes()
+
+    # Same-minute overwrite where linking fails: the linked file is replaced, not written through
+    monkeypatch.setattr(BlobStore, "link", lambda self, namespace, digest, dest: False)
+    second = save_run_artifact({"run_metadata": {"task": "y"}}, runs_dir=str(runs_dir))
+
+    assert second == first  # Same minute, same file name
+    assert b'"y"' in (runs_dir / second.split("/")[-1]).read_bytes()
+    assert store.get_stats()["reference_count"] == 0  # Old link released, failed link released
+    assert not store.blob_path("runs", digest).exists() or store.blob_path("runs", digest).read_bytes() == blob
@@ -0,0 +1,174 @@
+"""
+Tests for the streaming compliance engine
+
+Covers the per-tenant index, compressed export, single-rewrite deletion,
+and segment-level retention.
+"""
+
+import gzip
+import json
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from relay_ai.compliance import engine
+from relay_ai.compliance.api import delete_tenant, enforce_retention, export_tenant
+
+
+def write_events(path, events):
+    with open(path, "a", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+
+def read_events(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    """Point every event store at tmp_path; orchestrator events get some tenant-a records."""
+    paths = {}
+    for source in engine.EVENT_SOURCES:
+        paths[source.key] = tmp_path / f"{source.key}.jsonl"
+        monkeypatch.setenv(source.env_var, str(paths[source.key]))
+    monkeypatch.setenv("STORAGE_BASE_PATH", str(tmp_path / "artifacts"))
+    monkeypatch.setenv("LOGS_LEGAL_HOLDS_PATH", str(tmp_path / "legal_holds.jsonl"))
+    monkeypatch.setenv("USER_RBAC_ROLE", "Admin")
+
+    write_events(
+        paths["orch_events"],
+        [{"event": "noise", "tenant": "tenant-b", "n": i} for i in range(50)]
+        + [{"event": "dag_start", "tenant": "tenant-a", "n": 50}, {"event": "dag_done", "tenant": "tenant-a", "n": 51}]
+        + [{"event": "noise", "tenant": "tenant-b", "n": 52 + i} for i in range(50)],
+    )
+    return paths
+
+
+def test_index_skips_files_without_tenant(stores):
+    index = engine.load_index(stores["orch_events"])
+
+    assert index.tenants["tenant-a"][0] == 2
+    assert index.lines == 102
+    assert engine.index_path(stores["orch_events"]).exists()
+    # The span for tenant-a covers only its two lines, not the whole file
+    count, first, stop = index.tenants["tenant-a"]
+    assert first > 0 and stop < stores["orch_events"].stat().st_size
+    assert engine._tenant_range(stores["orch_events"], "tenant-z") is None
+
+
+def test_index_catches_up_appends_and_detects_rewrites(stores):
+    path = stores["orch_events"]
+    engine.load_index(path)
+
+    write_events(path, [{"event": "late", "tenant": "tenant-c"}])
+    assert engine.load_index(path).tenants["tenant-c"][0] == 1
+
+    # Rewriting in place (same inode, larger file) must not be mistaken for an append
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(200):
+            f.write(json.dumps({"event": "fresh", "tenant": "tenant-d", "n": i}) + "\n")
+    index = engine.load_index(path)
+    assert set(index.tenants) == {"tenant-d"} and index.lines == 200
+
+
+def test_compressed_export(stores, tmp_path):
+    result = export_tenant("tenant-a", tmp_path / "exports", compress=True)
+
+    with gzip.open(Path(result["export_path"]) / "orchestrator_events.jsonl.gz") as f:
+        events = [json.loads(line) for line in f]
+    assert [e["n"] for e in events] == [50, 51]
+    assert result["counts"]["orch_events"] == 2
+    assert result["files"] == ["orchestrator_events.jsonl.gz"]
+
+
+def test_delete_rewrites_once_and_keeps_index_usable(stores):
+    path = stores["orch_events"]
+    assert delete_tenant("tenant-a", dry_run=True)["counts"]["orch_events"] == 2
+
+    result = delete_tenant("tenant-a")
+
+    assert result["counts"]["orch_events"] == 2
+    events = read_events(path)
+    assert len(events) == 100 and {e["tenant"] for e in events} == {"tenant-b"}
+    assert not list(path.parent.glob(".*.tmp"))
+
+    # The shifted index still finds every surviving record
+    index = engine.load_index(path)
+    assert "tenant-a" not in index.tenants and index.tenants["tenant-b"][0] == 100
+    write_events(path, [{"event": "again", "tenant": "tenant-a"}])
+    assert delete_tenant("tenant-a")["counts"]["orch_events"] == 1
+    assert delete_tenant("tenant-b")["counts"]["orch_events"] == 100
+    assert read_events(path) == []
+
+
+def test_retention_drops_expired_segments_whole(stores):
+    now = datetime(2025, 6, 1, tzinfo=UTC)
+    live = stores["queue_events"]
+    old_segment = live.with_name("queue_events-2025-03-01.jsonl")
+    boundary_segment = live.with_name("queue_events-2025-04-02.jsonl")
+    write_events(old_segment, [{"timestamp": "2025-03-01T10:00:00Z", "n": i} for i in range(5)] + [{"no": "ts"}])
+    write_events(
+        boundary_segment,
+        [{"timestamp": "2025-04-01T23:00:00Z", "n": 1}, {"timestamp": "2025-04-02T12:00:00Z", "n": 2}],
+    )
+    write_events(live, [{"timestamp": (now - timedelta(days=1)).isoformat(), "n": 3}])
+    recent_mtime = live.stat().st_mtime_ns
+
+    result = enforce_retention(now=now)  # 60 day window: cutoff 2025-04-02T00:00
+
+    assert result["counts"]["RETAIN_QUEUE_EVENTS_DAYS"] == 7
+    assert not old_segment.exists()
+    assert [e["n"] for e in read_events(boundary_segment)] == [2]
+    assert live.stat().st_mtime_ns == recent_mtime  # Entirely inside the window: not rewritten
+
+
+def test_artifacts_scoped_to_tenant_directory(stores, tmp_path):
+    for tenant in ("tenant-a", "tenant-a2"):
+        (tmp_path / "artifacts" / "hot" / tenant / "wf1").mkdir(parents=True)
+        (tmp_path / "artifacts" / "hot" / tenant / "wf1" / "out.md").write_text("x")
+
+    assert delete_tenant("tenant-a")["counts"]["artifacts"] == 1
+    assert (tmp_path / "artifacts" / "hot" / "tenant-a2" / "wf1" / "out.md").exists()
+
+
+def test_artifact_export_and_delete_go_through_blob_store(stores, tmp_path, monkeypatch):
+    from relay_ai.storage.blob_store import get_blob_store
+    from relay_ai.storage.tiered_store import write_artifact
+
+    monkeypatch.setenv("STORAGE_DEDUP_ENABLED", "true")
+    write_artifact("hot", "tenant-a", "wf1", "out.md", b"shared payload", {"label": "Internal"})
+    write_artifact("warm", "tenant-a", "wf2", "copy.md", b"shared payload", {"label": "Internal"})
+    digest = json.loads((tmp_path / "artifacts" / "hot" / "tenant-a" / "wf1" / "out.md.metadata.json").read_text())[
+        "_blob_digest"
+    ]
+    assert get_blob_store().refcount("tenant-a", digest) == 2
+
+    monkeypatch.setenv("USER_CLEARANCE", "Internal")
+    manifest = export_tenant("tenant-a", tmp_path / "exports")
+    refs = json.loads((Path(manifest["export_path"]) / "artifacts.json").read_text())
+    assert sorted(ref["path"] for ref in refs) == ["hot/tenant-a/wf1/out.md", "warm/tenant-a/wf2/copy.md"]
+    assert all(ref["size_bytes"] == len(b"shared payload") and ref["blob_digest"] == digest for ref in refs)
+
+    assert delete_tenant("tenant-a")["counts"]["artifacts"] == 2
+    assert get_blob_store().refcount("tenant-a", digest) == 0
+    assert not get_blob_store().blob_path("tenant-a", digest).exists()
+
+
+def test_artifact_delete_drops_manifest_rows(stores, tmp_path):
+    from relay_ai.storage import manifest
+    from relay_ai.storage.tiered_store import list_artifacts, write_artifact
+
+    write_artifact("hot", "tenant-a", "wf1", "out.md", b"x")
+    write_artifact("hot", "tenant-a", "wf1", "gone.md", b"y")
+    write_artifact("hot", "tenant-b", "wf1", "out.md", b"z")
+    (tmp_path / "artifacts" / "hot" / "tenant-a" / "wf1" / "gone.md").unlink()  # Row outlives its file
+
+    assert delete_tenant("tenant-a", dry_run=True)["counts"]["artifacts"] == 2
+    assert len(manifest.query_artifacts("hot", tenant_id="tenant-a")) == 2
+
+    assert delete_tenant("tenant-a")["counts"]["artifacts"] == 2
+    assert manifest.query_artifacts("hot", tenant_id="tenant-a") == []
+    assert [a["tenant_id"] for a in list_artifacts("hot")] == ["tenant-b"]
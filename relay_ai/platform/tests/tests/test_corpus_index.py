@@ -0,0 +1,227 @@
+"""Tests for the persistent BM25 corpus index."""
+
+import os
+import time
+
+import pytest
+
+from relay_ai.corpus import CorpusManager, get_corpus_stats, load_corpus, search_corpus
+from relay_ai.corpus_index import CorpusIndex, get_index_dir, tokenize
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path_factory, monkeypatch):
+    """Keep default-location indexes out of the real ~/.cache."""
+    cache = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache))
+    monkeypatch.delenv("CORPUS_INDEX_DIR", raising=False)
+    return cache
+
+
+@pytest.fixture
+def corpus_dir(tmp_path, monkeypatch):
+    """Small corpus with the index enabled."""
+    monkeypatch.setenv("CORPUS_INDEX_ENABLED", "true")
+    docs = {
+        "machine_learning.txt": "# Machine Learning\n\nMachine learning lets computers learn from data.",
+        "data_science.md": "## Data Science\n\nData science combines statistics and programming.",
+        "ethics.txt": "AI Ethics\n\nAI systems need fairness, accountability, and transparency.",
+    }
+    for name, text in docs.items():
+        (tmp_path / name).write_text(text, encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def extract_calls(monkeypatch):
+    """Record which files have their text extracted."""
+    calls = []
+    original = CorpusManager._extract_text
+
+    def tracking(self, file_path):
+        calls.append(file_path.name)
+        return original(self, file_path)
+
+    monkeypatch.setattr(CorpusManager, "_extract_text", tracking)
+    return calls
+
+
+def test_tokenize_drops_stopwords():
+    """Test tokenizer lowercases and removes stopwords and single characters."""
+    assert tokenize("The Quick brown fox, a fox!") == ["quick", "brown", "fox", "fox"]
+
+
+def test_load_builds_index_and_bm25_search(corpus_dir):
+    """Test loading builds a persisted index and search ranks by BM25."""
+    docs = load_corpus(str(corpus_dir))
+
+    assert len(docs) == 3
+    assert get_corpus_stats()["has_bm25_index"] is True
+    assert (get_index_dir(corpus_dir) / "manifest.json").exists()
+
+    results = search_corpus("machine learning", k=2)
+    assert results[0].title == "Machine Learning"
+    assert search_corpus("quantum physics", k=5) == []
+
+
+def test_unchanged_corpus_is_not_reparsed(corpus_dir, extract_calls):
+    """Test a second load serves all documents from the index cache."""
+    load_corpus(str(corpus_dir))
+    assert sorted(extract_calls) == ["data_science.md", "ethics.txt", "machine_learning.txt"]
+
+    extract_calls.clear()
+    docs = load_corpus(str(corpus_dir))
+
+    assert extract_calls == []
+    assert {doc.title for doc in docs} == {"Machine Learning", "Data Science", "AI Ethics"}
+
+
+def test_incremental_update_extracts_only_changed_files(corpus_dir, extract_calls):
+    """Test added and modified files are extracted; others come from cache."""
+    load_corpus(str(corpus_dir))
+    extract_calls.clear()
+
+    (corpus_dir / "quantum.txt").write_text("Quantum Computing\n\nQubits and entanglement.", encoding="utf-8")
+    ethics = corpus_dir / "ethics.txt"
+    ethics.write_text("AI Ethics\n\nAI systems need fairness and auditing.", encoding="utf-8")
+    os.utime(ethics, ns=(time.time_ns(), time.time_ns() + 10**9))
+
+    docs = load_corpus(str(corpus_dir))
+
+    assert sorted(extract_calls) == ["ethics.txt", "quantum.txt"]
+    assert len(docs) == 4
+    assert search_corpus("qubits entanglement", k=1)[0].title == "Quantum Computing"
+    assert search_corpus("auditing", k=1)[0].title == "AI Ethics"
+    assert search_corpus("transparency", k=5) == []
+
+
+def test_touched_file_with_same_content_is_not_reextracted(corpus_dir, extract_calls):
+    """Test an mtime change alone triggers a rehash but no extraction."""
+    manager = CorpusManager()
+    manager.load_corpus(str(corpus_dir))
+    extract_calls.clear()
+
+    os.utime(corpus_dir / "ethics.txt", ns=(time.time_ns(), time.time_ns() + 10**9))
+    manager.load_corpus(str(corpus_dir))
+
+    assert extract_calls == []
+    assert manager.index.stats["rehashed"] == 1
+
+
+def test_removed_file_dropped_from_index(corpus_dir):
+    """Test deleting a file removes it from results."""
+    load_corpus(str(corpus_dir))
+    (corpus_dir / "data_science.md").unlink()
+
+    docs = load_corpus(str(corpus_dir))
+
+    assert len(docs) == 2
+    assert search_corpus("statistics", k=5) == []
+
+
+def test_superseded_generation_kept_for_open_readers(corpus_dir, monkeypatch):
+    """Test an old generation survives the swap and is removed by a refresh after the grace period."""
+    load_corpus(str(corpus_dir))
+    reader = CorpusIndex(get_index_dir(corpus_dir)).load()
+    (corpus_dir / "data_science.md").unlink()
+
+    load_corpus(str(corpus_dir))
+
+    assert sorted(d.name for d in get_index_dir(corpus_dir).glob("gen-*")) == ["gen-1", "gen-2"]
+    assert reader.get_text(0)  # Still readable through its mapping
+
+    monkeypatch.setattr("relay_ai.corpus_index.GC_GRACE_SEC", 0)
+    load_corpus(str(corpus_dir))  # Unchanged corpus: refresh only collects
+
+    assert [d.name for d in get_index_dir(corpus_dir).glob("gen-*")] == ["gen-2"]
+
+
+def test_prebuilt_index_loads_memory_mapped(corpus_dir):
+    """Test a built index can be opened directly with memory-mapped postings."""
+    load_corpus(str(corpus_dir))
+
+    index = CorpusIndex(get_index_dir(corpus_dir)).load()
+
+    assert index.num_docs == 3
+    assert index._postings_doc.__class__.__name__ == "memmap"
+    assert index._texts.__class__.__name__ == "memmap"
+    (doc_idx, score), *_ = index.search("fairness", k=3)
+    assert index.docs[doc_idx]["title"] == "AI Ethics"
+    assert score > 0
+
+
+def test_search_top_k_orders_by_score(tmp_path, monkeypatch):
+    """Test top-k selection returns the k best documents in score order."""
+    monkeypatch.setenv("CORPUS_INDEX_ENABLED", "true")
+    for i in range(20):
+        (tmp_path / f"doc{i:02d}.txt").write_text(f"Doc {i}\n\n" + "signal " * i + "noise " * 5, encoding="utf-8")
+
+    load_corpus(str(tmp_path))
+    results = search_corpus("signal", k=3)
+
+    assert [doc.title for doc in results] == ["Doc 19", "Doc 18", "Doc 17"]
+
+
+def test_index_dir_override(corpus_dir, tmp_path, monkeypatch):
+    """Test CORPUS_INDEX_DIR keeps the index out of the corpus directory."""
+    index_root = tmp_path / "indexes"
+    monkeypatch.setenv("CORPUS_INDEX_DIR", str(index_root))
+
+    load_corpus(str(corpus_dir))
+
+    assert not (corpus_dir / ".corpus_index").exists()
+    assert get_index_dir(corpus_dir).parent == index_root
+
+
+def test_index_defaults_to_cache_dir(corpus_dir, cache_home):
+    """Test the default index location is under the user cache dir, not the corpus."""
+    load_corpus(str(corpus_dir))
+    load_corpus([str(p) for p in corpus_dir.glob("*.*")])
+
+    assert not (corpus_dir / ".corpus_index").exists()
+    assert get_index_dir(corpus_dir).parent == cache_home / "relay_ai" / "corpus_index"
+    assert (get_index_dir(corpus_dir) / "manifest.json").exists()
+
+
+def test_corrupt_index_is_rebuilt(corpus_dir, extract_calls):
+    """Test a truncated generation is rebuilt from the text cache instead of failing the load."""
+    load_corpus(str(corpus_dir))
+    gen_dir = get_index_dir(corpus_dir) / "gen-1"
+    (gen_dir / "docs.json").write_text('[{"id": ', encoding="utf-8")
+    (gen_dir / "offsets.npy").write_bytes(b"\x93NUMPY")
+
+    manager = CorpusManager()
+    docs = manager.load_corpus(str(corpus_dir))
+
+    assert len(docs) == 3
+    assert manager.index is not None
+    assert manager.index.search("fairness", k=1)
+    assert len(extract_calls) == 3  # Only the first build extracted; the rebuild used the cache
+
+
+def test_index_disabled_falls_back_to_tfidf_or_keywords(corpus_dir, monkeypatch):
+    """Test CORPUS_INDEX_ENABLED=false keeps the in-memory path."""
+    monkeypatch.setenv("CORPUS_INDEX_ENABLED", "false")
+
+    docs = load_corpus(str(corpus_dir))
+
+    assert len(docs) == 3
+    assert get_corpus_stats()["has_bm25_index"] is False
+    assert not (corpus_dir / ".corpus_index").exists()
+
+
+def test_batch_corpus_cache_reuses_loaded_docs(corpus_dir, extract_calls):
+    """Test batch runs load a file-list corpus once and reuse it across tasks."""
+    from relay_ai import batch
+
+    batch._CORPUS_CACHE.clear()
+    paths = [str(p) for p in sorted(corpus_dir.glob("*.*"))]
+
+    first = batch.load_corpus_cached(paths)
+    second = batch.load_corpus_cached(paths)
+
+    assert len(first) == 3
+    assert second is first
+    assert len(extract_calls) == 3
@@ -1,8 +1,13 @@
 """Tests for DLQ (Sprint 29)."""
 
 import os
+from datetime import UTC, datetime
 
-from relay_ai.queue.dlq import append_to_dlq, list_dlq, replay_job
+from relay_ai.queue.backends.memory import MemoryQueue
+from relay_ai.queue.dlq import append_to_dlq, list_dlq, replay_bulk, replay_job
+from relay_ai.queue.dlq_store import DLQStore, reverse_lines
+from relay_ai.queue.persistent_queue import JobStatus
+from relay_ai.scale.signals import compute_dlq_rate
 
 
 def test_dlq_append_and_list(tmp_path):
@@ -73,3 +78,190 @@ def test_dlq_replay_nonexistent(tmp_path):
 
     replayed = replay_job("nonexistent")
     assert replayed is None
+
+
+def test_dlq_list_filters(tmp_path):
+    """Test list_dlq filters by reason, tenant, and dag."""
+    os.environ["DLQ_PATH"] = str(tmp_path / "test_dlq.jsonl")
+
+    for i in range(6):
+        job_dict = {"id": f"job-{i}", "dag_path": f"dag-{i % 2}.yaml", "tenant_id": f"tenant-{i % 3}"}
+        append_to_dlq(job_dict, reason="max_retries" if i < 3 else "worker_exception")
+
+    assert [e["job"]["id"] for e in list_dlq(reason="max_retries")] == ["job-2", "job-1", "job-0"]
+    assert [e["job"]["id"] for e in list_dlq(tenant_id="tenant-0")] == ["job-3", "job-0"]
+    assert [e["job"]["id"] for e in list_dlq(dag_path="dag-1.yaml", reason="worker_exception")] == ["job-5", "job-3"]
+
+
+def test_dlq_segment_rotation_and_index(tmp_path):
+    """Test segments rotate by size, get indexed, and read newest first across segments."""
+    dlq_path = tmp_path / "test_dlq.jsonl"
+    os.environ["DLQ_PATH"] = str(dlq_path)
+    os.environ["DLQ_SEGMENT_MAX_BYTES"] = "400"
+
+    try:
+        for i in range(20):
+            append_to_dlq(
+                {"id": f"job-{i}", "dag_path": "test.yaml", "tenant_id": f"tenant-{i // 10}"}, reason="max_retries"
+            )
+
+        store = DLQStore(dlq_path)
+        sealed = store.sealed_segments()
+        assert len(sealed) >= 2
+
+        index = store.load_index(sealed[0])
+        assert index["count"] > 0
+        assert "max_retries" in index["reasons"]
+        assert "tenant-0" in index["tenants"]
+
+        entries = list_dlq(limit=20)
+        assert [e["job"]["id"] for e in entries] == [f"job-{i}" for i in range(19, -1, -1)]
+
+        assert [e["job"]["id"] for e in list_dlq(limit=3, tenant_id="tenant-0")] == ["job-9", "job-8", "job-7"]
+        assert replay_job("job-0")["id"] == "job-0"
+        assert store.stats()["total"] == 20
+    finally:
+        del os.environ["DLQ_SEGMENT_MAX_BYTES"]
+
+
+def test_reverse_lines_spans_blocks(tmp_path):
+    """Test reverse reads handle lines straddling block boundaries."""
+    path = tmp_path / "lines.jsonl"
+    lines = [f"line-{i}-" + "x" * (i % 7) for i in range(100)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    assert list(reverse_lines(path, block_size=16)) == lines[::-1]
+
+
+def test_dlq_replay_bulk(tmp_path):
+    """Test bulk replay re-enqueues matching jobs once each."""
+    os.environ["DLQ_PATH"] = str(tmp_path / "test_dlq.jsonl")
+
+    for i in range(10):
+        job_dict = {
+            "id": f"job-{i}",
+            "dag_path": "test.yaml",
+            "tenant_id": "tenant-a" if i % 2 else "tenant-b",
+            "schedule_id": None,
+            "status": "failed",
+            "enqueued_at": "2025-01-01T00:00:00+00:00",
+            "attempts": 3,
+            "error": "boom",
+        }
+        append_to_dlq(job_dict, reason="max_retries")
+    # Same job failing twice should only be replayed once
+    append_to_dlq(
+        {
+            "id": "job-1",
+            "dag_path": "test.yaml",
+            "tenant_id": "tenant-a",
+            "status": "failed",
+            "schedule_id": None,
+            "enqueued_at": "x",
+        },
+        reason="max_retries",
+    )
+
+    queue = MemoryQueue()
+    summary = replay_bulk(queue, tenant_id="tenant-a", batch_size=2, workers=3, rate_per_sec=0)
+
+    assert summary["matched"] == 5
+    assert summary["replayed"] == 5
+    assert summary["failed"] == 0
+    assert queue.count(JobStatus.PENDING) == 5
+
+    job = queue.get_job("job-3")
+    assert job.attempts == 0
+    assert job.error is None
+
+
+def test_dlq_replay_bulk_dry_run(tmp_path):
+    """Test bulk replay dry run does not enqueue."""
+    os.environ["DLQ_PATH"] = str(tmp_path / "test_dlq.jsonl")
+    append_to_dlq({"id": "job-1", "dag_path": "test.yaml"}, reason="max_retries")
+
+    queue = MemoryQueue()
+    summary = replay_bulk(queue, dry_run=True)
+
+    assert summary["matched"] == 1
+    assert summary["replayed"] == 0
+    assert queue.count(JobStatus.PENDING) == 0
+
+
+def test_dlq_rate_uses_counters(tmp_path):
+    """Test compute_dlq_rate reads counters rather than entries."""
+    dlq_path = tmp_path / "test_dlq.jsonl"
+    os.environ["DLQ_PATH"] = str(dlq_path)
+
+    for i in range(12):
+        append_to_dlq({"id": f"job-{i}"}, reason="max_retries")
+
+    assert compute_dlq_rate(dlq_path, window_hours=24) == 12 / 24
+
+    # Counters are authoritative; truncating the segment doesn't change the rate
+    dlq_path.write_text("", encoding="utf-8")
+    assert compute_dlq_rate(dlq_path, window_hours=24) == 12 / 24
+    assert compute_dlq_rate(tmp_path / "missing.jsonl", window_hours=24) == 0.0
+
+
+def _append_many(dlq_path, start, count):
+    store = DLQStore(dlq_path, segment_max_bytes=2000)
+    for i in range(start, start + count):
+        store.append({"timestamp": datetime.now(UTC).isoformat(), "reason": "max_retries", "job": {"id": f"job-{i}"}})
+
+
+def test_dlq_counters_consistent_across_processes(tmp_path, monkeypatch):
+    """Test concurrent writer processes neither lose counter updates nor double-rotate."""
+    import multiprocessing
+
+    monkeypatch.setattr("relay_ai.queue.dlq_store.COUNTER_JOURNAL_MAX_BYTES", 500)
+    dlq_path = tmp_path / "test_dlq.jsonl"
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_append_many, args=(dlq_path, i * 50, 50)) for i in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    store = DLQStore(dlq_path)
+    assert store.get_counters()["total"] == 200
+    assert len(list(store.iter_entries())) == 200
+    assert (
+        sum(store.load_index(s)["count"] for s in store.sealed_segments()) + len(list(reverse_lines(dlq_path))) == 200
+    )
+
+
+def test_dlq_count_since_filters_boundary_hour(tmp_path):
+    """Test count_since counts only the part of the cutoff's hour after the cutoff."""
+    store = DLQStore(tmp_path / "test_dlq.jsonl")
+    for minute in (5, 20, 40):
+        store.append({"timestamp": f"2025-01-01T10:{minute:02d}:00+00:00", "reason": "r", "job": {}})
+    store.append({"timestamp": "2025-01-01T11:05:00+00:00", "reason": "r", "job": {}})
+    store.rotate()
+    store.append({"timestamp": "2025-01-01T10:50:00+00:00", "reason": "r", "job": {}})  # Late arrival
+
+    assert store.count_since(datetime(2025, 1, 1, 10, 30, tzinfo=UTC)) == 3
+    assert store.count_since(datetime(2025, 1, 1, 10, 0, tzinfo=UTC)) == 5
+    assert store.count_since(datetime(2025, 1, 1, 11, 30, tzinfo=UTC)) == 0
+
+
+def test_dlq_reads_create_nothing_on_disk(tmp_path):
+    """Test read-only store calls leave a missing store untouched."""
+    dlq_path = tmp_path / "logs" / "test_dlq.jsonl"
+    store = DLQStore(dlq_path)
+
+    assert store.list_entries() == []
+    assert store.count_since(datetime(2025, 1, 1, tzinfo=UTC)) == 0
+    assert store.stats()["total"] == 0
+    assert store.find_job("job-1") is None
+    assert compute_dlq_rate(dlq_path, window_hours=24) == 0.0
+    assert not dlq_path.parent.exists()
+
+    # Reads of a sealed segment without a sidecar index don't write one back
+    store.append({"timestamp": "2025-01-01T10:00:00+00:00", "reason": "r", "job": {"id": "job-1"}})
+    segment = store.rotate()
+    store._index_path(segment).unlink()
+    before = sorted(p.name for p in dlq_path.parent.iterdir())
+    assert store.find_job("job-1") == {"id": "job-1"}
+    assert store.count_since(datetime(2025, 1, 1, tzinfo=UTC)) == 1
+    assert sorted(p.name for p in dlq_path.parent.iterdir()) == before
@@ -6,7 +6,7 @@
 
 import pytest
 
-from relay_ai.crypto.envelope import decrypt, encrypt
+from relay_ai.crypto.envelope import decrypt, decrypt_many, decrypt_with_aad, encrypt, encrypt_many
 from relay_ai.crypto.keyring import active_key, get_key, rotate_key
 
 
@@ -216,3 +216,43 @@ def test_tag_length(temp_keyring):
 
     tag = base64.b64decode(envelope["tag"])
     assert len(tag) == 16  # 128 bits
+
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_encrypt_many_roundtrip(temp_keyring, max_workers):
+    """Batch encrypt/decrypt preserves order, with or without threads."""
+    plaintexts = [f"artifact {i}".encode() for i in range(200)]
+
+    envelopes = encrypt_many(plaintexts, max_workers=max_workers)
+
+    assert len({e["nonce"] for e in envelopes}) == 200
+    assert decrypt_many(envelopes, max_workers=max_workers) == plaintexts
+    assert decrypt(envelopes[17]) == plaintexts[17]
+
+
+def test_decrypt_many_mixed_keys(temp_keyring):
+    """Envelopes from before and after a rotation decrypt in one call."""
+    old = encrypt_many([b"old"])
+    rotate_key()
+    new = encrypt_many([b"new"])
+
+    assert new[0]["key_id"] != old[0]["key_id"]
+    assert decrypt_many(old + new) == [b"old", b"new"]
+
+
+def test_batch_with_aad_matches_single_api(temp_keyring):
+    """encrypt_many(aad=...) envelopes open with decrypt_with_aad and fail on another AAD."""
+    envelopes = encrypt_many([b"a", b"b"], aad=b"user_hash_1")
+
+    assert decrypt_with_aad(envelopes[0], aad=b"user_hash_1") == b"a"
+    assert envelopes[1]["aad_bound_to"] == "user_hash_1"
+    with pytest.raises(ValueError):
+        decrypt_many(envelopes, aad=b"user_hash_2")
+
+
+def test_decrypt_many_tampered_fails(temp_keyring):
+    envelopes = encrypt_many([b"x" * 32] * 3)
+    envelopes[1]["tag"] = envelopes[0]["tag"]
+
+    with pytest.raises(ValueError):
+        decrypt_many(envelopes)
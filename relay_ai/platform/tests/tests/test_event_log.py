@@ -0,0 +1,156 @@
+"""Tests for the segmented orchestrator event log."""
+
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from relay_ai.orchestrator import event_log
+from relay_ai.orchestrator.analytics import (
+    per_tenant_load,
+    per_tenant_load_from_log,
+    summarize_tasks,
+    summarize_tasks_from_log,
+)
+from relay_ai.orchestrator.state_store import last_runs
+
+
+@pytest.fixture
+def small_segments(monkeypatch):
+    """Roll every ~2 KB and on any new day."""
+    monkeypatch.setattr(event_log, "EVENT_LOG_SEGMENT_MAX_MB", 2 / 1024)
+    monkeypatch.setattr(event_log, "EVENT_LOG_MIN_ROLL_KB", 0)
+
+
+def make_events(start: datetime, count: int, step: timedelta) -> list[dict]:
+    kinds = ["dag_start", "task_start", "task_ok", "task_start", "task_fail", "task_retry"]
+    return [
+        {
+            "timestamp": (start + i * step).isoformat(),
+            "event": kinds[i % len(kinds)],
+            "dag_name": f"dag{i % 3}",
+            "tenant": f"tenant{i % 4}",
+            "n": i,
+        }
+        for i in range(count)
+    ]
+
+
+def test_read_reverse_matches_forward_order(tmp_path):
+    path = tmp_path / "events.jsonl"
+    lines = [json.dumps({"n": i, "pad": "x" * (i % 37)}) for i in range(500)]
+    path.write_text("\n".join(lines) + "\n\n" + '{"partial": ', encoding="utf-8")
+
+    reversed_lines = list(event_log.read_reverse(path, block_size=64))
+
+    assert reversed_lines[0] == b'{"partial": '
+    assert [line.decode() for line in reversed_lines[1:]] == lines[::-1]
+
+
+def test_rolls_by_size_and_tail_spans_segments(tmp_path, small_segments):
+    path = tmp_path / "events.jsonl"
+    events = make_events(datetime(2025, 6, 1, tzinfo=UTC), 200, timedelta(seconds=1))
+    for event in events:
+        event_log.append_event(event, path)
+
+    segments = event_log.sealed_segments(path)
+    assert len(segments) > 5
+    assert all(s.stat().st_size <= 2048 for s in segments)
+    assert [s.name for s in segments[:2]] == ["events-2025-06-01.0.jsonl", "events-2025-06-01.1.jsonl"]
+
+    assert [e["n"] for e in event_log.tail(path, 150)] == list(range(199, 49, -1))
+    assert [e["n"] for e in last_runs(limit=3, path=str(path))] == [199, 198, 197]
+
+
+def test_rolls_on_new_day(tmp_path, monkeypatch):
+    monkeypatch.setattr(event_log, "EVENT_LOG_MIN_ROLL_KB", 0)
+    path = tmp_path / "events.jsonl"
+    for day in (1, 1, 2, 3):
+        event_log.append_event({"timestamp": f"2025-06-0{day}T12:00:00+00:00", "event": "x"}, path)
+
+    assert [s.name for s in event_log.sealed_segments(path)] == [
+        "events-2025-06-01.0.jsonl",
+        "events-2025-06-02.0.jsonl",
+    ]
+    assert len(event_log.tail(path, 10)) == 4
+
+
+def test_window_queries_skip_old_segments(tmp_path, small_segments, monkeypatch):
+    path = tmp_path / "events.jsonl"
+    for event in make_events(datetime(2025, 6, 1, tzinfo=UTC), 300, timedelta(minutes=10)):
+        event_log.append_event(event, path)
+
+    opened = []
+    real_read_reverse = event_log.read_reverse
+    monkeypatch.setattr(event_log, "read_reverse", lambda p: opened.append(p) or real_read_reverse(p))
+
+    since = datetime(2025, 6, 3, tzinfo=UTC).isoformat()
+    recent = list(event_log.iter_events(path, since=since))
+
+    assert recent and all(e["timestamp"] >= since for e in recent)
+    assert len(recent) == sum(1 for i in range(300) if i * 10 >= 2 * 24 * 60)
+    assert len(opened) < len(event_log.sealed_segments(path)) / 2
+    assert all(e["tenant"] == "tenant1" for e in event_log.iter_events(path, tenant="tenant1"))
+
+
+def test_rolling_counters_match_full_scan(tmp_path, small_segments):
+    path = tmp_path / "events.jsonl"
+    now = datetime.now(UTC)
+    events = make_events(now - timedelta(hours=48), 400, timedelta(minutes=7))
+    for event in events:
+        event_log.append_event(event, path)
+    newest_first = events[::-1]
+
+    from_log = summarize_tasks_from_log(path, window_hours=24)
+    scanned = summarize_tasks(newest_first, window_hours=24)
+
+    assert from_log["last_24h"] == scanned["last_24h"]
+    assert from_log["all_time"]["tasks_started"] == scanned["all_time"]["tasks_started"]
+    assert from_log["all_time"]["tasks_retry"] == scanned["all_time"]["tasks_retry"]
+    assert sorted(per_tenant_load_from_log(path, window_hours=24), key=lambda t: t["tenant"]) == sorted(
+        per_tenant_load(newest_first, window_hours=24), key=lambda t: t["tenant"]
+    )
+
+
+def test_sealed_segment_meta_persisted_and_revalidated(tmp_path, small_segments):
+    path = tmp_path / "events.jsonl"
+    for event in make_events(datetime(2025, 6, 1, tzinfo=UTC), 60, timedelta(seconds=1)):
+        event_log.append_event(event, path)
+    segment = event_log.sealed_segments(path)[0]
+
+    meta = event_log.segment_meta(segment)
+    sidecar = segment.with_name(segment.name + event_log.META_SUFFIX)
+    assert sidecar.exists() and not path.with_name(path.name + event_log.META_SUFFIX).exists()
+    assert meta.count == len(segment.read_text().splitlines())
+    assert meta.min_ts.startswith("2025-06-01T00:00:00")
+
+    with open(segment, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"timestamp": "2025-06-01T23:00:00+00:00", "event": "late", "tenant": "tenant9"}) + "\n")
+    event_log._meta_cache.clear()
+
+    meta = event_log.segment_meta(segment)
+    assert "tenant9" in meta.tenants and meta.max_ts.startswith("2025-06-01T23")
+
+
+def test_task_durations_pair_start_and_finish_across_segments(tmp_path, small_segments):
+    path = tmp_path / "events.jsonl"
+    start = datetime.now(UTC).replace(minute=0, second=0, microsecond=0) - timedelta(hours=3)
+    for i in range(20):
+        began = start + timedelta(minutes=5 * i)
+        task = {"dag_run_id": f"run{i}", "task_id": "t1", "tenant": f"tenant{i % 2}", "dag_name": "dag"}
+        event_log.append_event({**task, "event": "task_start", "timestamp": began.isoformat()}, path)
+        for pad in range(10):  # Pushes the finish into a later segment
+            event_log.append_event({"event": "noise", "timestamp": began.isoformat(), "pad": "x" * 100}, path)
+        finished = began + timedelta(seconds=10 if i % 2 == 0 else 30)
+        kind = "task_ok" if i % 5 else "task_fail"
+        event_log.append_event({**task, "event": kind, "timestamp": finished.isoformat()}, path)
+    assert len(event_log.sealed_segments(path)) > 5
+
+    stats = summarize_tasks_from_log(path, window_hours=24)
+
+    assert stats["all_time"]["avg_duration"] == pytest.approx(20.0)
+    assert 28 <= stats["all_time"]["p95_duration"] <= 32
+    assert stats["last_24h"]["avg_duration"] == pytest.approx(20.0)
+    latency = {t["tenant"]: t["avg_latency"] for t in per_tenant_load_from_log(path, window_hours=24)}
+    assert latency == {"tenant0": pytest.approx(10.0), "tenant1": pytest.approx(30.0)}
+    assert summarize_tasks_from_log(path, window_hours=1)["last_1h"]["avg_duration"] < 20.0
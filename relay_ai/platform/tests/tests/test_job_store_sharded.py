@@ -0,0 +1,198 @@
+"""Tests for the sharded in-memory and Redis-backed AI job stores."""
+
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from relay_ai.ai.job_store import JobStore, RedisJobStore
+from relay_ai.schemas.job import JobStatus
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def redis_client():
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeAsyncRedis()
+
+
+@pytest.mark.anyio
+async def test_snapshots_are_immutable_and_shared():
+    store = JobStore(shards=4)
+    job = await store.create(user_id="u1", action_id="gmail.send")
+
+    assert await store.get(job.job_id) is job  # No copy on read
+    with pytest.raises(ValidationError):
+        job.status = JobStatus.RUNNING
+
+    started = await store.start(job.job_id)
+    assert started is not job and job.status == JobStatus.PENDING
+    assert (await store.get(job.job_id)).status == JobStatus.RUNNING
+
+    result = {"thread": {"labels": ["sent"]}}
+    done = await store.finish_ok(job.job_id, result=result)
+    result["thread"]["labels"].append("edited")  # The caller's dict is not shared
+    assert done.result == {"thread": {"labels": ["sent"]}}
+    with pytest.raises(TypeError):
+        done.result["thread"]["labels"].append("x")
+    with pytest.raises(TypeError):
+        done.result["extra"] = 1
+
+
+@pytest.mark.anyio
+async def test_list_jobs_uses_user_and_status_indexes():
+    store = JobStore(shards=4)
+    jobs = [await store.create(user_id=f"u{i % 2}", action_id="gmail.send") for i in range(6)]
+    await store.start(jobs[0].job_id)
+    await store.finish_ok(jobs[2].job_id, result={"id": "m1"})
+    await store.finish_err(jobs[3].job_id, error="boom")
+
+    u0 = await store.list_jobs(user_id="u0")
+    assert [j.job_id for j in u0] == [jobs[4].job_id, jobs[2].job_id, jobs[0].job_id]
+    assert [j.job_id for j in await store.list_jobs(user_id="u0", limit=1)] == [jobs[4].job_id]
+    assert [j.job_id for j in await store.list_jobs(user_id="u0", status=JobStatus.SUCCESS)] == [jobs[2].job_id]
+    assert {j.job_id for j in await store.list_jobs(status=JobStatus.PENDING)} == {jobs[i].job_id for i in (1, 4, 5)}
+    assert len(await store.list_jobs()) == 6
+    assert store.get_stats()["by_status"] == {"pending": 3, "running": 1, "success": 1, "failed": 1}
+
+
+@pytest.mark.anyio
+async def test_list_jobs_walks_only_the_newest_entries():
+    store = JobStore(shards=2)
+    jobs = [await store.create(user_id="u1", action_id="gmail.send") for _ in range(1000)]
+    for job in reversed(jobs[:10]):  # Started newest first: status order differs from creation order
+        await store.start(job.job_id)
+    visited = []
+    expired = store._expired
+    store._expired = lambda shard, job_id: visited.append(job_id) or expired(shard, job_id)
+
+    assert [j.job_id for j in await store.list_jobs(status=JobStatus.PENDING, limit=5)] == [
+        j.job_id for j in jobs[:-6:-1]
+    ]
+    assert len(visited) <= 10
+    visited.clear()
+    assert [j.job_id for j in await store.list_jobs(status=JobStatus.RUNNING, limit=3)] == [
+        jobs[9].job_id,
+        jobs[8].job_id,
+        jobs[7].job_id,
+    ]
+    visited.clear()
+    assert [j.job_id for j in await store.list_jobs(user_id="u1", limit=5)] == [j.job_id for j in jobs[:-6:-1]]
+    assert len(visited) <= 10
+    assert await store.list_jobs(limit=0) == []
+
+
+@pytest.mark.anyio
+async def test_finished_jobs_evicted_by_ttl_and_count():
+    clock = FakeClock()
+    store = JobStore(shards=1, max_finished=2, finished_ttl_sec=60, clock=clock)
+    running = await store.create(user_id="u1", action_id="gmail.send")
+    await store.start(running.job_id)
+    done = [await store.create(user_id="u1", action_id="gmail.send") for _ in range(3)]
+    for job in done:
+        await store.finish_ok(job.job_id)
+
+    assert await store.get(done[0].job_id) is None  # Over max_finished: oldest finished dropped
+    assert store.stats["evicted_count"] == 1
+
+    clock.now += 60
+    assert await store.get(done[1].job_id) is None  # Past the TTL on read
+    assert await store.list_jobs(user_id="u1") == [await store.get(running.job_id)]
+
+    await store.create(user_id="u2", action_id="gmail.send")  # Writes sweep expired jobs
+    assert store.stats["evicted_ttl"] == 2
+    assert store.get_stats()["jobs"] == 2  # Running jobs are never evicted
+
+
+@pytest.mark.anyio
+async def test_concurrent_pollers_see_transitions():
+    store = JobStore(shards=8)
+    jobs = [await store.create(user_id="u1", action_id="gmail.send") for _ in range(50)]
+
+    async def worker(job):
+        await store.start(job.job_id)
+        await asyncio.sleep(0)
+        await store.finish_ok(job.job_id, result={"ok": True})
+
+    async def poller(job):
+        while (current := await store.get(job.job_id)).status not in (JobStatus.SUCCESS, JobStatus.FAILED):
+            await asyncio.sleep(0)
+        return current
+
+    polled = await asyncio.gather(*[poller(j) for j in jobs for _ in range(10)], *[worker(j) for j in jobs])
+
+    assert all(job.result == {"ok": True} for job in polled[:500])
+    assert len(await store.list_jobs(status=JobStatus.SUCCESS)) == 50
+
+
+@pytest.mark.anyio
+async def test_redis_job_store_shared_across_workers(redis_client):
+    worker_a = RedisJobStore(redis_client, max_finished=2, finished_ttl_sec=60)
+    worker_b = RedisJobStore(redis_client, max_finished=2, finished_ttl_sec=60)
+
+    job = await worker_a.create(user_id="u1", action_id="gmail.send", plan_id="p1")
+    assert await worker_b.get(job.job_id) == job
+
+    await worker_b.start(job.job_id)
+    done = await worker_b.finish_ok(job.job_id, result={"id": "m1"})
+    assert await worker_a.get(job.job_id) == done
+    assert done.status == JobStatus.SUCCESS and done.result == {"id": "m1"} and done.started_at
+    assert 0 < await redis_client.ttl(f"ai:jobs:job:{job.job_id}") <= 60
+    assert await worker_a.start("missing") is None
+
+    others = [await worker_a.create(user_id="u1", action_id="slack.post") for _ in range(3)]
+    for other in others[:2]:
+        await worker_b.finish_err(other.job_id, error="boom")
+
+    # max_finished=2: the first finished job is evicted along with its index entries
+    assert await worker_a.get(job.job_id) is None
+    assert [j.job_id for j in await worker_a.list_jobs(user_id="u1")] == [o.job_id for o in reversed(others)]
+    assert [j.job_id for j in await worker_b.list_jobs(status=JobStatus.PENDING)] == [others[2].job_id]
+    assert len(await worker_b.list_jobs(user_id="u1", status=JobStatus.FAILED)) == 2
+
+    await redis_client.delete(f"ai:jobs:job:{others[2].job_id}")  # e.g. expired by Redis
+    assert await worker_a.list_jobs(status=JobStatus.PENDING) == []
+    assert await redis_client.zrange("ai:jobs:status:pending", 0, -1) == []
+
+
+@pytest.mark.anyio
+async def test_redis_concurrent_transitions_leave_one_status(redis_client):
+    workers = [RedisJobStore(redis_client) for _ in range(2)]
+    jobs = [await workers[0].create(user_id="u1", action_id="gmail.send") for _ in range(20)]
+
+    await asyncio.gather(
+        *[workers[0].start(job.job_id) for job in jobs],
+        *[workers[1].finish_err(job.job_id, error="boom") for job in jobs],
+    )
+
+    for job in jobs:
+        stored = await workers[0].get(job.job_id)
+        member_of = [
+            s for s in JobStatus if await redis_client.zscore(f"ai:jobs:status:{s.value}", job.job_id) is not None
+        ]
+        assert member_of == [stored.status]
+
+
+@pytest.mark.anyio
+async def test_backends_accept_same_list_filters(redis_client):
+    for store in (JobStore(shards=4), RedisJobStore(redis_client)):
+        jobs = [await store.create(user_id=f"u{i % 2}", action_id="gmail.send") for i in range(4)]
+        done = await store.finish_ok(jobs[1].job_id, result={"id": "m1"})
+
+        assert [j.job_id for j in await store.list_jobs()] == [j.job_id for j in reversed(jobs)]
+        assert [j.job_id for j in await store.list_jobs(limit=2)] == [jobs[3].job_id, jobs[2].job_id]
+        assert await store.list_jobs(status=JobStatus.SUCCESS) == [done]
+        assert [j.job_id for j in await store.list_jobs(status=JobStatus.PENDING, limit=2)] == [
+            jobs[3].job_id,
+            jobs[2].job_id,
+        ]
+        assert done.result == {"id": "m1"}
+        with pytest.raises(TypeError):
+            done.result["id"] = "m2"
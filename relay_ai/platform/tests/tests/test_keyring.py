@@ -170,3 +170,41 @@ def test_key_material_present(temp_keyring):
 
     # Should be 32 bytes (256 bits) for AES-256
     assert len(key_bytes) == 32
+
+
+def test_keyring_parsed_once_until_file_changes(temp_keyring, monkeypatch):
+    """Lookups reuse the parsed keyring until the file's identity changes."""
+    from relay_ai.crypto import keyring
+
+    active_key()
+    parses = []
+    original = keyring._parse_keyring
+    monkeypatch.setattr(keyring, "_parse_keyring", lambda path: parses.append(path) or original(path))
+
+    for _ in range(5):
+        active_key()
+        get_key("key-001")
+    assert parses == []
+
+    rotate_key()
+    assert active_key()["key_id"] == "key-002"
+    assert get_key("key-001")["status"] == "retired"
+    assert len(parses) >= 1
+
+
+def test_cache_follows_keyring_path(tmp_path, monkeypatch):
+    """Switching KEYRING_PATH never serves the previous file's keys."""
+    monkeypatch.setenv("KEYRING_PATH", str(tmp_path / "a.jsonl"))
+    first = active_key()
+    monkeypatch.setenv("KEYRING_PATH", str(tmp_path / "b.jsonl"))
+    second = active_key()
+
+    assert first["key_material_base64"] != second["key_material_base64"]
+
+
+def test_returned_records_are_copies(temp_keyring):
+    """Mutating a returned record does not alter the cached keyring."""
+    key = active_key()
+    key["status"] = "tampered"
+
+    assert active_key()["status"] == "active"
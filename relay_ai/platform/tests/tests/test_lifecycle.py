@@ -10,6 +10,7 @@
 - Fake clock time travel
 - Error handling and recovery
 - Complete lifecycle job execution
+- Parallel execution with cold tier compression reporting
 """
 
 import time
@@ -35,6 +36,7 @@
     TIER_WARM,
     artifact_exists,
     list_artifacts,
+    read_artifact,
     write_artifact,
 )
 
@@ -580,3 +582,54 @@ def test_fake_clock_in_complete_lifecycle(self, lifecycle_env, fake_clock):
 
         # Artifact should have been promoted
         assert results["promoted_to_warm"] > 0
+
+
+class TestParallelCompression:
+    """Tests for the parallel executor and cold tier compression."""
+
+    def test_parallel_promote_to_cold_reports_bytes_saved(self, lifecycle_env, fake_clock):
+        """Test warm→cold with a worker pool compresses and reports savings."""
+        content = b'{"status": "ok", "notes": "' + b"markdown " * 500 + b'"}'
+        for i in range(8):
+            write_artifact(TIER_WARM, "tenant1", "workflow1", f"doc{i}.json", content)
+
+        fake_clock["time"] = time.time() + (35 * 86400)
+        results = promote_expired_to_cold(dry_run=False, fake_clock=fake_clock["time"], workers=4)
+
+        assert results["promoted"] == 8
+        assert results["errors"] == 0
+        assert results["workers"] == 4
+        assert results["artifacts"] == [f"doc{i}.json" for i in range(8)]
+        assert results["bytes_in"] == 8 * len(content)
+        assert results["bytes_saved"] > results["bytes_in"] // 2
+        assert results["artifacts_per_second"] > 0
+
+        read_content, metadata = read_artifact(TIER_COLD, "tenant1", "workflow1", "doc0.json")
+        assert read_content == content
+        assert metadata["_compression"] in ("gzip", "zstd")
+        assert metadata["_size_bytes"] == len(content)
+
+    def test_restore_from_cold_decompresses(self, lifecycle_env):
+        """Test restoring a compressed cold artifact yields raw content in hot."""
+        content = b"# Report\n" + b"| col | val |\n" * 200
+        write_artifact(TIER_COLD, "tenant1", "workflow1", "report.md", content)
+
+        restore_artifact("tenant1", "workflow1", "report.md", from_tier=TIER_COLD, to_tier=TIER_HOT)
+
+        read_content, metadata = read_artifact(TIER_HOT, "tenant1", "workflow1", "report.md")
+        assert read_content == content
+        assert "_compression" not in metadata
+        hot_entry = list_artifacts(TIER_HOT)[0]
+        assert hot_entry["size_bytes"] == len(content)
+
+    def test_lifecycle_job_summarizes_savings(self, lifecycle_env, fake_clock, monkeypatch):
+        """Test run_lifecycle_job aggregates bytes saved across steps."""
+        monkeypatch.setenv("LIFECYCLE_WORKERS", "2")
+        write_artifact(TIER_WARM, "tenant1", "workflow1", "big.txt", b"a" * 10000)
+
+        fake_clock["time"] = time.time() + (35 * 86400)
+        results = run_lifecycle_job(dry_run=False, fake_clock=fake_clock["time"])
+
+        assert results["promoted_to_cold"] == 1
+        assert results["cold_details"]["workers"] == 2
+        assert results["bytes_saved"] > 9000
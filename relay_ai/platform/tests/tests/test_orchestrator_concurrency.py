@@ -0,0 +1,140 @@
+"""Tests for concurrent plan-step execution in the AI orchestrator."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pydantic import ValidationError
+
+from relay_ai.ai.job_store import JobStore
+from relay_ai.ai.orchestrator import AIOrchestrator
+from relay_ai.schemas.ai_plan import PlannedAction, PlanResult
+from relay_ai.schemas.job import JobStatus
+from relay_ai.schemas.permissions import EffectivePermissions, RBACRegistry
+
+
+def _rbac(allowed=lambda action_id: True):
+    rbac = MagicMock(spec=RBACRegistry)
+    rbac.get_user_permissions = MagicMock(
+        return_value=MagicMock(spec=EffectivePermissions, can_execute=MagicMock(side_effect=allowed))
+    )
+    return rbac
+
+
+def _plan(*steps: PlannedAction) -> PlanResult:
+    return PlanResult(prompt="p", intent="test", steps=list(steps), confidence=1.0, explanation="test")
+
+
+def _step(action_id: str, params=None, depends_on=None) -> PlannedAction:
+    return PlannedAction(action_id=action_id, description=action_id, params=params or {}, depends_on=depends_on)
+
+
+class FakeExecutor:
+    """Executor whose steps sleep for params["delay"] and record peak concurrency."""
+
+    def __init__(self):
+        self.params = {}
+        self.running = 0
+        self.peak = 0
+
+    def preview(self, action_id, params):
+        preview_id = f"preview-{len(self.params)}"
+        self.params[preview_id] = (action_id, params)
+        return MagicMock(preview_id=preview_id)
+
+    async def execute(self, preview_id, workspace_id, actor_id):
+        action_id, params = self.params[preview_id]
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(params.get("delay", 0.05))
+            if params.get("fail"):
+                raise RuntimeError("provider error")
+            return {"status": "success", "result": {"id": f"{action_id}-id", "echo": params}}
+        finally:
+            self.running -= 1
+
+
+@pytest.mark.anyio
+async def test_independent_steps_run_concurrently():
+    orchestrator = AIOrchestrator(rbac=_rbac(), job_store=JobStore())
+    executor = FakeExecutor()
+    plan = _plan(*[_step("gmail.send", {"n": i}) for i in range(3)], _step("calendar.create_event"))
+
+    result = await orchestrator.execute_plan("u1", plan, executor, plan_id="plan-1")
+
+    assert executor.peak == 4
+    assert result["duration_seconds"] < 0.15  # One step's time, not four
+    assert 0.04 < result["critical_path_seconds"] < 0.15
+    assert [r["step_index"] for r in result["results"]] == [0, 1, 2, 3]
+    assert [r["result"]["echo"].get("n") for r in result["results"]] == [0, 1, 2, None]
+
+
+@pytest.mark.anyio
+async def test_provider_limit_caps_concurrency():
+    orchestrator = AIOrchestrator(rbac=_rbac(), job_store=JobStore(), provider_limits={"gmail": 1})
+    executor = FakeExecutor()
+    plan = _plan(*[_step("gmail.send", {"delay": 0.02}) for _ in range(3)])
+
+    result = await orchestrator.execute_plan("u1", plan, executor, plan_id="plan-1")
+
+    assert executor.peak == 1
+    assert result["duration_seconds"] >= 0.06
+    assert result["critical_path_seconds"] < 0.05  # Queueing is not part of the critical path
+
+
+@pytest.mark.anyio
+async def test_dependencies_pass_data_and_skip_after_failure():
+    job_store = JobStore()
+    orchestrator = AIOrchestrator(rbac=_rbac(), job_store=job_store)
+    executor = FakeExecutor()
+    plan = _plan(
+        _step("calendar.create_event", {"delay": 0.02}),
+        _step("gmail.send", {"fail": True}),
+        _step("gmail.send", {"text": "Invite: {{steps.0.result.id}}", "event": "{{steps.0.result.echo}}"}),
+        _step("slack.post", depends_on=[1]),
+        _step("slack.post", depends_on=[3]),
+    )
+
+    result = await orchestrator.execute_plan("u1", plan, executor, plan_id="plan-1")
+
+    statuses = [r["status"] for r in result["results"]]
+    assert statuses == ["success", "failed", "success", "skipped", "skipped"]
+    assert result["steps_executed"] == 3 and result["steps_skipped"] == 2
+    assert result["results"][2]["result"]["echo"] == {
+        "text": "Invite: calendar.create_event-id",
+        "event": {"delay": 0.02},
+    }
+    assert result["results"][4]["error"] == "Skipped: depends on failed step 3"
+
+    skipped_job = await job_store.get(result["results"][3]["job_id"])
+    assert skipped_job.status == JobStatus.FAILED and skipped_job.started_at is None
+    # Step 2 waited for step 0 only, overlapping the failing step 1 (0.02 + 0.05 rather than 0.12)
+    assert result["duration_seconds"] < 0.11
+
+
+@pytest.mark.anyio
+async def test_guard_drops_dependents_and_renumbers():
+    orchestrator = AIOrchestrator(rbac=_rbac(lambda action_id: action_id != "drive.share"), job_store=JobStore())
+    plan = _plan(
+        _step("drive.share"),
+        _step("gmail.send", {"link": "{{steps.0.result.url}}"}),
+        _step("calendar.create_event"),
+        _step("gmail.send", {"event": "{{steps.2.result.id}}"}, depends_on=[2]),
+    )
+
+    guarded, _ = await orchestrator.plan("u1", "p", MagicMock(plan=AsyncMock(return_value=plan)))
+
+    assert [s.action_id for s in guarded.steps] == ["calendar.create_event", "gmail.send"]
+    assert guarded.steps[1].depends_on == [0]
+    assert guarded.steps[1].params == {"event": "{{steps.0.result.id}}"}
+    assert guarded.step_dependencies() == [[], [0]]
+
+
+def test_references_infer_dependencies_and_must_point_back():
+    step = _step("gmail.send", {"to": ["{{ steps.1.result.email }}"], "body": "{{steps.0.result.id}}"}, [0])
+
+    assert step.referenced_steps() == {0, 1}
+    assert step.dependencies() == [0, 1]
+    with pytest.raises(ValidationError, match="dependencies must reference earlier steps"):
+        _plan(_step("gmail.send", {"to": "{{steps.1.result.email}}"}), _step("contacts.lookup"))
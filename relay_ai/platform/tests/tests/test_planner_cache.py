@@ -0,0 +1,164 @@
+"""Tests for the AI planner plan cache and per-catalog system prompt."""
+
+import pytest
+
+from relay_ai import actions
+from relay_ai.ai import planner as planner_module
+from relay_ai.ai.planner import ActionPlanner, PlanCache, normalize_prompt
+
+CATALOG = [
+    {"id": "gmail.send", "description": "Send email", "schema": {"required": ["to", "subject"]}},
+    {"id": "calendar.create_event", "description": "Create event", "schema": {"required": ["title"]}},
+]
+
+PLAN_JSON = {
+    "intent": "send_report",
+    "steps": [
+        {
+            "action_id": "gmail.send",
+            "description": "Send weekly report",
+            "params": {"to": "team@example.com", "subject": "Weekly report"},
+            "depends_on": None,
+        }
+    ],
+    "confidence": 0.9,
+    "explanation": "Clear request",
+}
+
+
+class FakeExecutor:
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def list_actions(self):
+        return self.catalog
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    current = [dict(action) for action in CATALOG]
+    monkeypatch.setattr(actions, "get_executor", lambda: FakeExecutor(current))
+    monkeypatch.setattr(planner_module, "_SYSTEM_PROMPTS", type(planner_module._SYSTEM_PROMPTS)())
+    return current
+
+
+def make_planner(cache, responses):
+    """Planner whose LLM returns responses in order and records the calls."""
+    planner = ActionPlanner(cache=cache)
+    planner.llm_calls = []
+
+    async def call_llm(system_prompt, user_message):
+        planner.llm_calls.append((system_prompt, user_message))
+        return responses[min(len(planner.llm_calls), len(responses)) - 1]
+
+    planner._call_llm = call_llm
+    return planner
+
+
+def test_normalize_prompt():
+    assert normalize_prompt("  Send the weekly\n report to the TEAM. ") == "send the weekly report to the team"
+
+
+@pytest.mark.anyio
+async def test_repeated_prompt_served_from_cache(catalog):
+    cache = PlanCache()
+    planner = make_planner(cache, [PLAN_JSON])
+
+    first = await planner.plan("Send the weekly report to the team")
+    second = await make_planner(cache, [PLAN_JSON]).plan("send the weekly report to the team!")
+    third = await planner.plan("Send the weekly report to the team", context={"calendar": {"free_slots": ["9am"]}})
+
+    assert second.prompt == "send the weekly report to the team!"
+    assert second.steps == first.steps
+    assert len(planner.llm_calls) == 2  # First call and the new context
+    stats = cache.get_stats()
+    assert (stats["hits_memory"], stats["misses"], stats["cache_entries"]) == (1, 2, 2)
+    assert stats["hit_rate"] == pytest.approx(1 / 3)
+    assert stats["saved_llm_seconds"] > 0
+    assert third.steps == first.steps
+
+
+@pytest.mark.anyio
+async def test_catalog_change_renders_prompt_once_per_version(catalog):
+    cache = PlanCache()
+    planners = [make_planner(cache, [PLAN_JSON]) for _ in range(2)]
+    await planners[0].plan("send the weekly report")
+    await planners[1].plan("send the weekly report")
+    assert planner_module._SYSTEM_PROMPTS == {planners[0].catalog_version: planners[0].llm_calls[0][0]}
+    assert "  Required: to, subject" in planners[0].llm_calls[0][0]
+
+    catalog.append({"id": "slack.post", "description": "Post to Slack", "schema": {"required": ["channel"]}})
+    changed = make_planner(cache, [PLAN_JSON])
+    await changed.plan("send the weekly report")
+
+    assert len(changed.llm_calls) == 1  # New catalog version: cached plan not reused
+    assert "slack.post" in changed.llm_calls[0][0]
+    assert len(planner_module._SYSTEM_PROMPTS) == 2
+
+
+@pytest.mark.anyio
+async def test_cached_plan_revalidated_against_catalog(catalog):
+    cache = PlanCache()
+    await make_planner(cache, [PLAN_JSON]).plan("send the weekly report")
+
+    # Same catalog version, but the cached entry no longer fits (e.g. written by another release)
+    planner = make_planner(cache, [PLAN_JSON])
+    key = next(iter(cache._memory))
+    stale, _ = await cache.get(key)
+    stale.plan_json["steps"][0]["params"].pop("subject")
+    assert (await cache.get(key))[0].plan_json == PLAN_JSON  # Hits are copies
+    await cache.put(key, stale)
+
+    plan = await planner.plan("send the weekly report")
+
+    assert plan.steps[0].params["subject"] == "Weekly report"
+    assert len(planner.llm_calls) == 1
+    assert cache.stats["invalid"] == 1
+
+
+@pytest.mark.anyio
+async def test_failed_or_empty_plans_not_cached(catalog):
+    cache = PlanCache()
+    error_plan = {"intent": "error", "steps": [], "confidence": 0.0, "explanation": "Error calling LLM: timeout"}
+    planner = make_planner(cache, [error_plan, PLAN_JSON])
+
+    assert (await planner.plan("send the weekly report")).steps == []
+    assert len(cache) == 0
+    assert (await planner.plan("send the weekly report")).intent == "send_report"
+    assert len(planner.llm_calls) == 2
+
+
+@pytest.mark.anyio
+async def test_redis_tier_shared_across_workers(catalog):
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis()
+    worker_a = make_planner(PlanCache(redis_client=redis_client, ttl_sec=60), [PLAN_JSON])
+    worker_b_cache = PlanCache(redis_client=redis_client, ttl_sec=60)
+    worker_b = make_planner(worker_b_cache, [PLAN_JSON])
+
+    await worker_a.plan("send the weekly report")
+    plan = await worker_b.plan("Send the weekly report")
+
+    assert plan.intent == "send_report"
+    assert worker_b.llm_calls == []
+    assert worker_b_cache.stats["hits_redis"] == 1
+    keys = await redis_client.keys("plan:*")
+    assert len(keys) == 1 and 0 < await redis_client.ttl(keys[0]) <= 60
+
+    await worker_b.plan("send the weekly report")  # Promoted to the memory tier
+    assert worker_b_cache.stats["hits_memory"] == 1
+
+
+@pytest.mark.anyio
+async def test_memory_tier_bounded_and_expires(catalog):
+    cache = PlanCache(max_entries=2)
+    planner = make_planner(cache, [PLAN_JSON])
+    for prompt in ("report a", "report b", "report c"):
+        await planner.plan(prompt)
+    assert len(cache) == 2
+
+    expired = PlanCache(ttl_sec=0)
+    planner = make_planner(expired, [PLAN_JSON])
+    await planner.plan("report a")
+    await planner.plan("report a")
+    assert len(planner.llm_calls) == 2
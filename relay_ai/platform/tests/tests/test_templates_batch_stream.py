@@ -0,0 +1,155 @@
+"""Tests for the streaming batch template engine."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from relay_ai.template_batch import BatchError, get_checkpoint_path, iter_csv_rows, run_batch
+from relay_ai.templates import InputDef, TemplateDef
+
+
+def create_test_template() -> TemplateDef:
+    """Helper to create a test template."""
+    return TemplateDef(
+        path=Path("test.yaml"),
+        name="Test Template",
+        version="1.0",
+        description="Test",
+        context="markdown",
+        inputs=[
+            InputDef(id="name", label="Name", type="string", required=True),
+            InputDef(id="email", label="Email", type="email", required=False),
+        ],
+        body="Hello {{name}}{% if email %} ({{email}}){% endif %}",
+    )
+
+
+def write_csv(path: Path, num_rows: int, bad_rows: tuple = ()) -> Path:
+    lines = ["name,email"]
+    for i in range(num_rows):
+        email = "not-an-email" if i in bad_rows else f"user{i}@example.com"
+        lines.append(f"User{i},{email}")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def read_jsonl(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_iter_csv_rows_is_lazy_and_checks_columns(tmp_path):
+    """Should yield rows one at a time and reject missing required columns."""
+    template = create_test_template()
+    rows = iter_csv_rows(write_csv(tmp_path / "in.csv", 3), template)
+    assert next(rows) == (2, {"name": "User0", "email": "user0@example.com"})
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text("email\nx@example.com\n", encoding="utf-8")
+    with pytest.raises(BatchError, match="Missing required columns: name"):
+        list(iter_csv_rows(bad, template))
+
+
+def test_process_pool_preserves_order(tmp_path):
+    """Should write rows in CSV order when rendering across worker processes."""
+    csv_path = write_csv(tmp_path / "in.csv", 200, bad_rows=(7,))
+    output = tmp_path / "out.jsonl"
+
+    summary = run_batch(create_test_template(), csv_path, output, workers=2, chunk_size=16, checkpoint_every=50)
+
+    records = read_jsonl(output)
+    assert [r["row"] for r in records] == list(range(2, 202))
+    assert records[0]["rendered_output"] == "Hello User0 (user0@example.com)"
+    assert records[7]["status"] == "error"
+    assert records[7]["error"].startswith("Row 9:")
+    assert summary["rows_ok"] == 199
+    assert summary["rows_failed"] == 1
+    assert summary["complete"] is True
+    assert json.loads(get_checkpoint_path(output).read_text())["complete"] is True
+
+
+def test_cost_estimate_folded_into_pass(tmp_path):
+    """Should report per-row and total cost estimates from the render pass."""
+    csv_path = write_csv(tmp_path / "in.csv", 5)
+
+    summary = run_batch(create_test_template(), csv_path, dry_run=True, workers=0)
+
+    assert summary["rows_processed"] == 5
+    assert summary["total_tokens"] > 0
+    assert summary["total_cost_usd"] > 0
+    assert summary["output_path"] is None
+
+
+def test_resume_from_checkpoint(tmp_path):
+    """Should discard output past the last checkpoint and continue from it."""
+    template = create_test_template()
+    csv_path = write_csv(tmp_path / "in.csv", 30)
+    output = tmp_path / "out.jsonl"
+
+    # Stop partway: the token budget trips on the first row
+    first = run_batch(template, csv_path, output, workers=0, checkpoint_every=10, budget_tokens=1)
+    assert first["complete"] is False
+    with open(output, "ab") as f:
+        f.write(b'{"row": 999, "partial": tru')  # Simulate a crash mid-write
+
+    second = run_batch(template, csv_path, output, workers=0, checkpoint_every=10)
+
+    assert second["resumed_from"] == first["rows_processed"]
+    assert second["complete"] is True
+    assert [r["row"] for r in read_jsonl(output)] == list(range(2, 32))
+
+
+def test_checkpoint_from_other_batch_rejected(tmp_path):
+    """Should refuse to resume a checkpoint written for a different CSV."""
+    template = create_test_template()
+    output = tmp_path / "out.jsonl"
+    run_batch(template, write_csv(tmp_path / "a.csv", 3), output, workers=0)
+
+    with pytest.raises(BatchError, match="different batch"):
+        run_batch(template, write_csv(tmp_path / "b.csv", 3), output, workers=0)
+
+    summary = run_batch(template, tmp_path / "b.csv", output, workers=0, resume=False)
+    assert summary["rows_processed"] == 3
+
+
+def test_budget_stop(tmp_path):
+    """Should stop once the running estimate exceeds the budget."""
+    csv_path = write_csv(tmp_path / "in.csv", 50)
+
+    summary = run_batch(create_test_template(), csv_path, tmp_path / "out.jsonl", workers=0, budget_usd=0.0001)
+
+    assert summary["within_budget"] is False
+    assert "exceeds budget" in summary["budget_error"]
+    assert summary["rows_processed"] < 50
+
+
+def test_budget_stop_never_overshoots_on_resume(tmp_path):
+    """The row that would cross the budget is neither written nor checkpointed."""
+    csv_path = write_csv(tmp_path / "in.csv", 50)
+    output = tmp_path / "out.jsonl"
+    per_row = run_batch(create_test_template(), csv_path, None, workers=0, dry_run=True)["total_tokens"] / 50
+    budget = int(per_row * 10.5)
+
+    first = run_batch(create_test_template(), csv_path, output, workers=0, budget_tokens=budget)
+    second = run_batch(create_test_template(), csv_path, output, workers=0, budget_tokens=budget)
+
+    for summary in (first, second):
+        assert summary["within_budget"] is False
+        assert summary["total_tokens"] <= budget
+    assert first["rows_processed"] == second["rows_processed"] == second["resumed_from"] == 10
+    assert len(read_jsonl(output)) == 10
+
+
+def test_parquet_output(tmp_path):
+    """Should write one Parquet part per checkpoint interval."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    csv_path = write_csv(tmp_path / "in.csv", 25)
+    output = tmp_path / "out.parquet"
+
+    summary = run_batch(create_test_template(), csv_path, output, workers=0, checkpoint_every=10)
+
+    assert summary["complete"] is True
+    assert len(list(output.glob("part-*.parquet"))) == 3
+    table = pq.read_table(output)
+    assert table.num_rows == 25
+    assert sorted(table.column("row").to_pylist()) == list(range(2, 27))
@@ -1,16 +1,43 @@
-"""Tests for template compilation caching."""
+"""Tests for template compilation and catalog caching."""
 
+import os
 from pathlib import Path
 
+import yaml
+
+import relay_ai.templates as templates_mod
 from relay_ai.templates import (
     InputDef,
+    TemplateCatalogCache,
     TemplateDef,
     clear_template_cache,
     get_cache_stats,
+    list_templates,
     render_template,
 )
 
 
+def _write_template(path: Path, name: str, body: str = "Hello {{name}}") -> None:
+    data = {
+        "name": name,
+        "version": "1.0",
+        "description": "Test",
+        "context": "markdown",
+        "inputs": [{"id": "name", "label": "Name", "type": "string"}],
+        "rendering": {"body": body},
+    }
+    path.write_text(yaml.dump(data), encoding="utf-8")
+
+
+def _use_template_dirs(tmp_path, monkeypatch) -> Path:
+    builtin = tmp_path / "templates"
+    custom = builtin / "custom"
+    custom.mkdir(parents=True)
+    monkeypatch.setattr(templates_mod, "TEMPLATES_DIR", builtin)
+    monkeypatch.setattr(templates_mod, "CUSTOM_TEMPLATES_DIR", custom)
+    return builtin
+
+
 def test_cache_miss_on_first_render():
     """First render should be a cache miss."""
     clear_template_cache()
@@ -197,3 +224,104 @@ def test_cache_with_complex_template():
     stats = get_cache_stats()
     assert stats["misses"] == 1
     assert stats["hits"] == 1
+
+
+def test_catalog_skips_reparse_when_unchanged(tmp_path, monkeypatch):
+    """Unchanged files should be served from the catalog without re-parsing."""
+    builtin = _use_template_dirs(tmp_path, monkeypatch)
+    _write_template(builtin / "a.yaml", "A")
+    _write_template(builtin / "b.yaml", "B")
+    clear_template_cache()
+
+    parse_calls = []
+    real_parse = templates_mod._parse_template
+    monkeypatch.setattr(templates_mod, "_parse_template", lambda p: parse_calls.append(p) or real_parse(p))
+
+    assert [t.name for t in list_templates()] == ["A", "B"]
+    assert [t.name for t in list_templates()] == ["A", "B"]
+
+    assert len(parse_calls) == 2
+    stats = get_cache_stats()
+    assert stats["catalog_misses"] == 2
+    assert stats["catalog_hits"] == 2
+    assert stats["catalog_hit_rate"] == 0.5
+
+
+def test_catalog_reparses_on_mtime_change(tmp_path, monkeypatch):
+    """Editing a template file should invalidate its catalog entry."""
+    builtin = _use_template_dirs(tmp_path, monkeypatch)
+    path = builtin / "a.yaml"
+    _write_template(path, "A")
+    clear_template_cache()
+
+    assert list_templates()[0].name == "A"
+
+    _write_template(path, "A2")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert list_templates()[0].name == "A2"
+
+
+def test_listed_templates_are_copies(tmp_path, monkeypatch):
+    """Mutating a listed template must not poison the cache."""
+    builtin = _use_template_dirs(tmp_path, monkeypatch)
+    _write_template(builtin / "a.yaml", "A")
+    clear_template_cache()
+
+    listed = list_templates()[0]
+    listed.body = "mutated"
+    listed.inputs[0].label = "mutated"
+    listed.inputs[0].validators["max_length"] = 1
+    listed.inputs.append(listed.inputs[0])
+
+    fresh = list_templates()[0]
+    assert fresh.body == "Hello {{name}}"
+    assert len(fresh.inputs) == 1
+    assert fresh.inputs[0].label == "Name"
+    assert fresh.inputs[0].validators == {}
+
+
+def test_catalog_lru_eviction(tmp_path):
+    """Catalog should stay bounded and evict least recently used entries."""
+    cache = TemplateCatalogCache(max_entries=2)
+    for name in ("a", "b", "c"):
+        _write_template(tmp_path / f"{name}.yaml", name.upper())
+
+    cache.list((tmp_path,))
+
+    assert cache.stats["evictions"] == 1
+    assert len(cache._entries) == 2
+
+
+def test_catalog_watcher_serves_listing_without_stat(tmp_path):
+    """With a watcher active, listing is reused until a change event arrives."""
+    cache = TemplateCatalogCache()
+    _write_template(tmp_path / "a.yaml", "A")
+
+    if not cache.start_watching((tmp_path,)):
+        return  # watchdog not installed
+    try:
+        cache.list((tmp_path,))
+        hits_before = cache.stats["hits"]
+        cache.list((tmp_path,))
+        assert cache.stats["hits"] == hits_before + 1
+
+        cache.invalidate(tmp_path / "a.yaml")  # what the watcher does on change
+        assert [t.name for t in cache.list((tmp_path,))] == ["A"]
+    finally:
+        cache.stop_watching()
+
+
+def test_compile_cache_keyed_by_context():
+    """Same body in different contexts must compile separately (autoescape differs)."""
+    clear_template_cache()
+
+    common = {"path": Path("test.yaml"), "name": "T", "version": "1.0", "description": "T"}
+    inputs = [InputDef(id="name", label="Name", type="string")]
+    md = TemplateDef(context="markdown", inputs=inputs, body="{{name}}", **common)
+    html = TemplateDef(context="html", inputs=inputs, body="{{name}}", **common)
+
+    assert render_template(md, {"name": "<b>"}) == "<b>"
+    assert render_template(html, {"name": "<b>"}) == "&lt;b&gt;"
+    assert get_cache_stats()["misses"] == 2
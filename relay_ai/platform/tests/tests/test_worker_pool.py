@@ -1,9 +1,14 @@
 """Tests for worker pool management."""
 
+import asyncio
 import threading
 import time
 
-from relay_ai.scale.worker_pool import Job, WorkerPool
+import pytest
+from relay_ai.queue_strategy import TaskClass
+from relay_ai.scale.async_pool import AsyncWorkerPool
+from relay_ai.scale.autoscaler import ScaleDirection, engine_state_from_stats
+from relay_ai.scale.worker_pool import Job, WeightedLanePicker, WorkerPool, load_lane_weights
 
 
 def test_initial_worker_spawn():
@@ -416,3 +421,188 @@ def test_empty_pool_shutdown():
 
     stats = pool.get_stats()
     assert stats.total_workers == 0
+
+
+def test_realtime_lane_not_starved_by_bulk_burst():
+    """Realtime jobs are served ahead of a bulk backlog."""
+    pool = WorkerPool(initial_workers=0)
+    order = []
+    lock = threading.Lock()
+
+    def record(name):
+        with lock:
+            order.append(name)
+
+    for i in range(20):
+        pool.submit_job(Job(job_id=f"bulk-{i}", task=record, args=(f"bulk-{i}",), kwargs={}, task_class=TaskClass.BULK))
+    for i in range(4):
+        pool.submit_job(Job(job_id=f"rt-{i}", task=record, args=(f"rt-{i}",), kwargs={}, task_class=TaskClass.REALTIME))
+
+    assert pool.get_stats().lane_depths == {"realtime": 4, "bulk": 20}
+
+    pool.scale_to(1)
+    pool.shutdown(timeout_s=5)
+
+    assert len(order) == 24
+    # With realtime=4,bulk=1 weights, all realtime jobs finish within the first 5 picks
+    assert {name for name in order[:5] if name.startswith("rt-")} == {"rt-0", "rt-1", "rt-2", "rt-3"}
+
+
+def test_weighted_lane_picker_shares_by_weight():
+    """Lane picker serves lanes in proportion to their weights."""
+    picker = WeightedLanePicker({TaskClass.REALTIME: 3, TaskClass.BULK: 1})
+    picks = [picker.pick([TaskClass.REALTIME, TaskClass.BULK]) for _ in range(8)]
+
+    assert picks.count(TaskClass.REALTIME) == 6
+    assert picks.count(TaskClass.BULK) == 2
+    assert picker.pick([TaskClass.BULK]) == TaskClass.BULK
+    assert picker.pick([]) is None
+
+
+def test_lane_weights_from_env(monkeypatch):
+    """Lane weights are configurable via environment."""
+    monkeypatch.setenv("WORKER_LANE_WEIGHTS", "realtime=10, bulk=2, bogus=5")
+
+    assert load_lane_weights() == {TaskClass.REALTIME: 10, TaskClass.BULK: 2}
+
+
+def test_idle_workers_steal_queued_jobs():
+    """Jobs queued behind a blocked worker are stolen by idle workers."""
+    pool = WorkerPool(initial_workers=2)
+    release = threading.Event()
+    done = []
+
+    def blocker():
+        release.wait(timeout=5)
+
+    # Round-robin assignment puts every other job on the blocked worker's deque
+    pool.submit_job(Job(job_id="block", task=blocker, args=(), kwargs={}))
+    for i in range(6):
+        pool.submit_job(Job(job_id=f"quick-{i}", task=done.append, args=(i,), kwargs={}))
+
+    deadline = time.time() + 3
+    while len(done) < 6 and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert sorted(done) == list(range(6))
+    assert pool.get_stats().steals >= 1
+
+    release.set()
+    pool.shutdown(timeout_s=2)
+
+
+def test_latency_histograms_recorded():
+    """Queue wait and run time histograms feed stats and autoscaler state."""
+    pool = WorkerPool(initial_workers=1)
+
+    for i in range(5):
+        pool.submit_job(Job(job_id=f"sleep-{i}", task=time.sleep, args=(0.02,), kwargs={}))
+
+    pool.shutdown(timeout_s=5)
+
+    histograms = pool.get_lane_histograms()
+    assert histograms["bulk"]["run_time"]["count"] == 5
+    assert histograms["bulk"]["queue_wait"]["count"] == 5
+
+    stats = pool.get_stats()
+    assert stats.run_time_p95_ms >= 10
+    assert stats.queue_wait_p95_ms > 0
+
+    state = engine_state_from_stats(stats)
+    assert state.p95_latency_ms == stats.run_time_p95_ms
+    assert state.queue_wait_p95_ms == stats.queue_wait_p95_ms
+
+
+def test_queue_wait_p95_is_windowed(monkeypatch):
+    """Stats p95 covers the recent window only, not lifetime history."""
+    pool = WorkerPool(initial_workers=0)
+    clock = {"now": 1000.0}
+    for histogram in pool.queue_wait.values():
+        histogram.clock = lambda: clock["now"]
+
+    for _ in range(20):
+        pool.queue_wait[TaskClass.BULK].record(5000)
+    assert pool.get_stats().queue_wait_p95_ms >= 4000
+
+    clock["now"] += 120  # Backlog long gone
+    pool.queue_wait[TaskClass.BULK].record(2)
+    assert pool.get_stats().queue_wait_p95_ms < 10
+    assert pool.get_lane_histograms()["bulk"]["queue_wait"]["count"] == 21
+    pool.shutdown(timeout_s=1)
+
+
+def test_autoscale_applies_decision(monkeypatch):
+    """autoscale() feeds pool stats to the autoscaler and scales the pool."""
+    monkeypatch.setenv("TARGET_QUEUE_DEPTH", "2")
+    monkeypatch.setenv("SCALE_UP_STEP", "2")
+    release = threading.Event()
+    pool = WorkerPool(initial_workers=1)
+    for i in range(6):
+        pool.submit_job(Job(job_id=f"block-{i}", task=release.wait, args=(5,), kwargs={}))
+
+    decision = pool.autoscale()
+
+    assert decision.direction == ScaleDirection.UP
+    assert pool.get_stats().total_workers == 3
+    release.set()
+    pool.shutdown(timeout_s=5)
+
+
+@pytest.mark.anyio
+async def test_async_pool_runs_coroutines_and_sync_jobs():
+    """Async pool awaits coroutine jobs and offloads sync ones."""
+    pool = AsyncWorkerPool(initial_workers=3)
+    await pool.start()
+    results = []
+
+    async def fetch(value):
+        await asyncio.sleep(0.01)
+        results.append(value)
+
+    for i in range(6):
+        await pool.submit_job(Job(job_id=f"io-{i}", task=fetch, args=(i,), kwargs={}, task_class=TaskClass.REALTIME))
+    await pool.submit_job(Job(job_id="sync", task=results.append, args=("sync",), kwargs={}))
+
+    await pool.join()
+
+    assert sorted(results, key=str) == sorted([*range(6), "sync"], key=str)
+    stats = pool.get_stats()
+    assert stats.jobs_completed == 7
+    assert stats.queue_depth == 0
+    assert pool.get_stats().total_workers == 3
+    await pool.shutdown(timeout_s=5)
+
+
+@pytest.mark.anyio
+async def test_async_pool_scale_down():
+    """Async pool retires idle workers on scale-down."""
+    pool = AsyncWorkerPool(initial_workers=4)
+    await pool.start()
+
+    assert await pool.scale_to(2)
+    assert pool.get_stats().total_workers == 2
+
+    await pool.shutdown(timeout_s=2)
+    assert pool.get_stats().total_workers == 0
+
+
+@pytest.mark.anyio
+async def test_run_batch_uses_async_pool(tmp_path):
+    """run_batch executes every task through the async pool with bounded concurrency."""
+    from relay_ai.batch import run_batch
+
+    running = {"now": 0, "peak": 0}
+
+    async def run_once(task, corpus_paths, cfg):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        return {"status": "ok", "text": task.upper(), "usage": []}
+
+    tasks = [{"id": str(i), "task": f"t{i}"} for i in range(8)]
+    out = await run_batch(tasks, run_once, None, {}, concurrency=2, save_dir=str(tmp_path))
+
+    assert sorted(r["text"] for r in out["results"]) == sorted(f"T{i}" for i in range(8))
+    assert out["summary"]["totals"]["runs"] == 8
+    assert running["peak"] == 2
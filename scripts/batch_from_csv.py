@@ -9,6 +9,7 @@
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from relay_ai.template_batch import BatchError, run_batch
 from relay_ai.templates import (
     estimate_batch_cost,
     list_templates,
@@ -26,6 +27,16 @@ def main():
     parser.add_argument("--budget-usd", type=float, help="Maximum USD budget for batch")
     parser.add_argument("--budget-tokens", type=int, help="Maximum token budget for batch")
     parser.add_argument("--output-dir", default="runs/ui/templates/batch", help="Output directory for artifacts")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream rows through a process pool to a single JSONL/Parquet file (for large CSVs)",
+    )
+    parser.add_argument("--output", help="Streaming output path (.jsonl file or .parquet directory)")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], help="Streaming output format (default: from suffix)")
+    parser.add_argument("--workers", type=int, help="Streaming worker processes (default: CPU count, 0 = in-process)")
+    parser.add_argument("--checkpoint-every", type=int, default=1000, help="Rows between streaming checkpoints")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore an existing streaming checkpoint")
 
     args = parser.parse_args()
 
@@ -47,6 +58,9 @@ def main():
     print(f"CSV: {args.csv_path}")
     print()
 
+    if args.stream:
+        sys.exit(run_stream(template, args))
+
     # Load and validate CSV
     print("Loading CSV...")
     rows, errors = load_csv_for_batch(args.csv_path, template)
@@ -149,5 +163,56 @@ def main():
     print(f"Artifacts saved to: {batch_dir}")
 
 
+def run_stream(template, args) -> int:
+    """Run the streaming engine: validation, rendering, and costing in one pass."""
+    output = args.output
+    if not output and not args.dry_run:
+        suffix = ".parquet" if args.format == "parquet" else ".jsonl"
+        output = str(Path(args.output_dir) / f"{template.key}-{Path(args.csv_path).stem}{suffix}")
+
+    def on_progress(totals):
+        print(
+            f"  {totals['rows_processed']:,} rows, ${totals['total_cost_usd']:.4f}, {totals['total_tokens']:,} tokens"
+        )
+
+    print("Streaming batch..." if not args.dry_run else "Estimating costs (streaming)...")
+    try:
+        summary = run_batch(
+            template,
+            args.csv_path,
+            output_path=output,
+            output_format=args.format,
+            workers=args.workers,
+            checkpoint_every=args.checkpoint_every,
+            resume=not args.no_resume,
+            budget_usd=args.budget_usd,
+            budget_tokens=args.budget_tokens,
+            dry_run=args.dry_run,
+            on_progress=on_progress,
+        )
+    except BatchError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if summary["resumed_from"]:
+        print(f"Resumed after {summary['resumed_from']:,} rows")
+    for error in summary["errors"]:
+        print(f"  - {error}", file=sys.stderr)
+
+    print()
+    print(f"Rows: {summary['rows_ok']:,} ok, {summary['rows_failed']:,} failed ({summary['duration_s']}s)")
+    print(f"Estimated cost: ${summary['total_cost_usd']:.4f}")
+    print(f"Estimated tokens: {summary['total_tokens']:,}")
+
+    if not summary["within_budget"]:
+        print(f"❌ ERROR: {summary['budget_error']}", file=sys.stderr)
+        print("Batch stopped at budget; rerun with a higher budget to resume", file=sys.stderr)
+        return 1
+
+    if summary["output_path"]:
+        print(f"Output: {summary['output_path']}")
+    return 0
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Benchmark the action preview/idempotency stores.
+
+Usage:
+    python scripts/bench_action_stores.py --previews 2000000
+    python scripts/bench_action_stores.py --previews 200000 --redis-ops 20000
+
+Compares copies of the previous unbounded dict stores with the bounded
+in-memory stores (and the Redis stores against fakeredis, if installed):
+- preview save/get throughput and live entries after saving N previews with
+  a short TTL (the old store only dropped an expired preview when it was read)
+- check_by_key latency with many stored idempotency keys (the old store
+  scanned every key)
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from relay_ai.actions.stores import (  # noqa: E402
+    MemoryIdempotencyStore,
+    MemoryPreviewStore,
+    RedisIdempotencyStore,
+    RedisPreviewStore,
+)
+
+
+class LegacyPreviewStore:
+    def __init__(self):
+        self._store = {}
+
+    def save(self, preview_id, data, ttl_seconds=86400):
+        expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
+        self._store[preview_id] = {**data, "expires_at": expires_at.isoformat()}
+
+    def get(self, preview_id):
+        data = self._store.get(preview_id)
+        if not data:
+            return None
+        if datetime.utcnow() > datetime.fromisoformat(data["expires_at"]):
+            del self._store[preview_id]
+            return None
+        return data
+
+    def __len__(self):
+        return len(self._store)
+
+
+class LegacyIdempotencyStore:
+    def __init__(self):
+        self._store = {}
+
+    def check_by_key(self, workspace_id, idempotency_key):
+        prefix, suffix = f"{workspace_id}:", f":{idempotency_key}"
+        for store_key, data in list(self._store.items()):
+            if store_key.startswith(prefix) and store_key.endswith(suffix):
+                if datetime.utcnow() - datetime.fromisoformat(data["created_at"]) > timedelta(hours=24):
+                    del self._store[store_key]
+                    continue
+                return data
+        return None
+
+    def save(self, workspace_id, action, idempotency_key, result):
+        self._store[f"{workspace_id}:{action}:{idempotency_key}"] = {
+            **result,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+
+
+class StepClock:
+    """Simulated time: advances a fixed step per call so TTLs expire during the run."""
+
+    def __init__(self, step: float):
+        self.now = time.time()
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+def bench_previews(store, count: int, ttl: int) -> tuple[float, float, int]:
+    data = {"action": "webhook.save", "provider": "independent", "params": {"url": "https://example.com"}}
+    start = time.perf_counter()
+    for i in range(count):
+        store.save(f"p{i}", data, ttl_seconds=ttl)
+    save_s = time.perf_counter() - start
+    live = len(store)
+
+    sample = range(count - min(count, 100_000), count)
+    start = time.perf_counter()
+    for i in sample:
+        store.get(f"p{i}")
+    get_s = time.perf_counter() - start
+    return count / save_s, len(sample) / get_s, live
+
+
+def bench_check_by_key(store, keys: int, lookups: int) -> float:
+    for i in range(keys):
+        store.save(f"ws{i % 50}", "webhook.save", f"k{i}", {"run_id": f"r{i}"})
+    start = time.perf_counter()
+    for i in range(lookups):
+        store.check_by_key(f"ws{i % 50}", f"k{(i * 7919) % keys}")
+    return (time.perf_counter() - start) / lookups
+
+
+class _Sized:
+    """Give a Redis store a len() for bench_previews."""
+
+    def __init__(self, store):
+        self.save, self.get = store.save, store.get
+
+    def __len__(self):
+        return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--previews", type=int, default=1_000_000, help="Previews to save")
+    parser.add_argument("--max-entries", type=int, default=100_000, help="Bound for the in-memory stores")
+    parser.add_argument("--keys", type=int, default=20_000, help="Idempotency keys stored before lookups")
+    parser.add_argument("--lookups", type=int, default=200, help="check_by_key calls to time")
+    parser.add_argument("--redis-ops", type=int, default=10_000, help="Operations against fakeredis (0 to skip)")
+    args = parser.parse_args()
+
+    # Each store call advances the simulated clock 1 ms, so a 60 s TTL keeps ~60k live
+    ttl = 60
+    print(f"{args.previews:,} previews, TTL {ttl}s at 1 ms/save (simulated), bound {args.max_entries:,}")
+    for label, store in (
+        ("legacy dict", LegacyPreviewStore()),
+        ("bounded memory", MemoryPreviewStore(args.max_entries, clock=StepClock(0.001))),
+    ):
+        saves, gets, live = bench_previews(store, args.previews, ttl)
+        print(f"  {label:<16} save {saves:>10,.0f}/s  get {gets:>10,.0f}/s  entries held {live:>10,}")
+
+    print(f"\ncheck_by_key with {args.keys:,} stored keys")
+    for label, store in (
+        ("legacy scan", LegacyIdempotencyStore()),
+        ("indexed memory", MemoryIdempotencyStore(args.max_entries)),
+    ):
+        lookups = args.lookups if label == "legacy scan" else args.lookups * 100
+        print(f"  {label:<16} {bench_check_by_key(store, args.keys, lookups) * 1e6:10.1f} us/lookup")
+
+    if args.redis_ops:
+        try:
+            import fakeredis
+        except ImportError:
+            print("\nfakeredis not installed; skipping Redis stores")
+            return 0
+        client = fakeredis.FakeStrictRedis(decode_responses=True)
+        print(f"\nRedis stores on fakeredis ({args.redis_ops:,} ops; in-process, no network)")
+        saves, gets, _ = bench_previews(_Sized(RedisPreviewStore(client)), args.redis_ops, ttl)
+        print(f"  {'preview':<16} save {saves:>10,.0f}/s  get {gets:>10,.0f}/s")
+        per_lookup = bench_check_by_key(RedisIdempotencyStore(client), args.redis_ops, args.redis_ops)
+        print(f"  {'check_by_key':<16} {per_lookup * 1e6:10.1f} us/lookup (Lua)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
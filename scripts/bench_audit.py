@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Benchmark audit logging and querying.
+
+Usage:
+    python scripts/bench_audit.py --days 90 --events-per-day 5000
+    python scripts/bench_audit.py --log-events 50000 --fsync always
+
+Reports:
+- log(): per-call latency seen by the handler (enqueue only) and time to drain
+- query(): a selective tenant + action query over all days, cold (sidecars
+  built from legacy segments) and warm, against a full JSONL scan
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from relay_ai.security.audit import AuditAction, AuditLogger  # noqa: E402
+
+ACTIONS = [a.value for a in AuditAction]
+
+
+def write_days(audit_dir: Path, days: int, per_day: int, tenants: int) -> None:
+    rng = random.Random(0)
+    for day in range(days):
+        date = time.strftime("%Y-%m-%d", time.gmtime(1735689600 + day * 86400))
+        with open(audit_dir / f"audit-{date}.jsonl", "w", encoding="utf-8") as f:
+            for i in range(per_day):
+                event = {
+                    "timestamp": f"{date}T00:00:{i % 60:02d}",
+                    "tenant_id": f"tenant{rng.randrange(tenants)}",
+                    "user_id": f"user{rng.randrange(tenants * 20)}",
+                    "action": rng.choice(ACTIONS),
+                    "resource_type": "workflow",
+                    "resource_id": f"wf{i}",
+                    "result": rng.choice(["success", "success", "success", "failure", "denied"]),
+                }
+                f.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+
+def full_scan(audit_dir: Path, tenant: str, action: str, limit: int) -> list[dict]:
+    """What query() used to do: parse every line of every file."""
+    found = []
+    for path in sorted(audit_dir.glob("audit-*.jsonl")):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                data = json.loads(line)
+                if data["tenant_id"] == tenant and data["action"] == action:
+                    found.append(data)
+                    if len(found) >= limit:
+                        return found
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark audit logging and querying")
+    parser.add_argument("--days", type=int, default=90, help="Daily segments to generate")
+    parser.add_argument("--events-per-day", type=int, default=5000, help="Events per segment")
+    parser.add_argument("--tenants", type=int, default=200, help="Distinct tenants")
+    parser.add_argument("--log-events", type=int, default=20000, help="Events for the log() benchmark")
+    parser.add_argument("--fsync", default="interval", help="AUDIT_FSYNC policy for the log() benchmark")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["AUDIT_FSYNC"] = args.fsync
+        logger = AuditLogger(audit_dir=str(Path(tmp) / "live"))
+        start = time.perf_counter()
+        for i in range(args.log_events):
+            logger.log_success(f"tenant{i % 50}", f"user{i}", AuditAction.RUN_WORKFLOW, "workflow", f"wf{i}")
+        enqueue_sec = time.perf_counter() - start
+        logger.flush()
+        drain_sec = time.perf_counter() - start
+        stats = logger._store.stats
+        print(
+            f"log(): {enqueue_sec / args.log_events * 1e6:.1f} us/call in handler, "
+            f"{args.log_events / drain_sec:.0f} events/s on disk, {stats['batches']} batches"
+        )
+
+        audit_dir = Path(tmp) / "history"
+        audit_dir.mkdir()
+        write_days(audit_dir, args.days, args.events_per_day, args.tenants)
+        total = args.days * args.events_per_day
+        logger = AuditLogger(audit_dir=str(audit_dir))
+        query = {"tenant_id": "tenant7", "action": AuditAction.LOGIN, "start_date": "2025-01-01", "limit": 100}
+
+        start = time.perf_counter()
+        full_scan(audit_dir, "tenant7", "login", 100_000)
+        scan_sec = time.perf_counter() - start
+
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            events = logger.query(**query)
+            timings.append(time.perf_counter() - start)
+
+        print(f"{total} events over {args.days} days; tenant + action query returned {len(events)}")
+        print(f"{'full scan':16s} {scan_sec * 1000:10.1f} ms")
+        print(f"{'indexed (cold)':16s} {timings[0] * 1000:10.1f} ms  (builds sidecars for legacy segments)")
+        print(f"{'indexed (warm)':16s} {min(timings[1:]) * 1000:10.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
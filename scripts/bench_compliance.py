@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Benchmark compliance export and deletion on large event logs.
+
+Usage:
+    python scripts/bench_compliance.py --events 1000000 --tenants 500
+    python scripts/bench_compliance.py --events 200000 --compress
+
+Reports, for one tenant out of --tenants:
+- list-based: what export/delete used to do (load each file into a list, rewrite it)
+- streaming (cold): first run, which also builds the per-tenant index sidecars
+- streaming (warm): later runs that scan only the tenant's byte span
+- dry-run delete, answered from the index
+and, with --trace-memory, peak traced memory for each.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from relay_ai.compliance import delete_tenant, export_tenant  # noqa: E402
+from relay_ai.compliance.engine import EVENT_SOURCES  # noqa: E402
+
+
+def write_logs(root: Path, events: int, tenants: int) -> dict[str, Path]:
+    rng = random.Random(0)
+    paths = {}
+    per_source = events // len(EVENT_SOURCES)
+    for source in EVENT_SOURCES:
+        path = root / f"{source.key}.jsonl"
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(per_source):
+                # Tenants are active in bursts, as in production logs
+                tenant = f"tenant{(i * tenants // per_source + rng.randrange(3)) % tenants}"
+                event = {"timestamp": f"2025-06-01T00:00:{i % 60:02d}Z", "tenant": tenant, "event": source.key, "n": i}
+                f.write(json.dumps(event) + "\n")
+        os.environ[source.env_var] = str(path)
+        paths[source.key] = path
+    return paths
+
+
+def list_based(paths: dict[str, Path], tenant: str, out_dir: Path) -> int:
+    """Export then delete the way the list-based helpers did: whole files in memory."""
+    total = 0
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for key, path in paths.items():
+        keep, matched = [], []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                entry = json.loads(line)
+                (matched if entry.get("tenant") == tenant else keep).append(line)
+        with open(out_dir / f"{key}.jsonl", "w", encoding="utf-8") as f:
+            for line in matched:
+                f.write(line + "\n")
+        total += len(matched)
+    return total
+
+
+def measure(label: str, fn, trace_memory: bool) -> None:
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    line = f"{label:24s} {elapsed * 1000:10.1f} ms"
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += f"  peak {peak / 1e6:8.1f} MB"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compliance export/delete")
+    parser.add_argument("--events", type=int, default=500_000, help="Total events across all stores")
+    parser.add_argument("--tenants", type=int, default=500, help="Distinct tenants")
+    parser.add_argument("--compress", action="store_true", help="Export event files as .jsonl.gz")
+    parser.add_argument("--trace-memory", action="store_true", help="Report peak traced memory (slows every path)")
+    args = parser.parse_args()
+
+    os.environ["USER_RBAC_ROLE"] = "Admin"
+    tenant = f"tenant{args.tenants // 2}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        os.environ["STORAGE_BASE_PATH"] = str(root / "artifacts")
+        os.environ["LOGS_LEGAL_HOLDS_PATH"] = str(root / "legal_holds.jsonl")
+        paths = write_logs(root, args.events, args.tenants)
+        size_mb = sum(p.stat().st_size for p in paths.values()) / 1e6
+        print(f"{args.events} events ({size_mb:.0f} MB) in {len(paths)} stores, exporting {tenant}")
+
+        measure("export list-based", lambda: list_based(paths, tenant, root / "old"), args.trace_memory)
+        measure(
+            "export stream (cold)",
+            lambda: export_tenant(tenant, root / "cold", compress=args.compress),
+            args.trace_memory,
+        )
+        measure(
+            "export stream (warm)",
+            lambda: export_tenant(tenant, root / "warm", compress=args.compress),
+            args.trace_memory,
+        )
+        measure("delete dry-run", lambda: delete_tenant(tenant, dry_run=True), args.trace_memory)
+        measure("delete", lambda: delete_tenant(tenant), args.trace_memory)
+        measure("export missing tenant", lambda: export_tenant("tenant-none", root / "none"), args.trace_memory)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Benchmark envelope encryption throughput for many small artifacts.
+
+Usage:
+    python scripts/bench_envelope.py --blobs 5000 --size 512
+    python scripts/bench_envelope.py --blobs 20000 --size 4096 --workers 8
+
+Compares, per blob:
+- uncached: keyring reread and AESGCM rebuilt for every blob (the old path)
+- per-blob: encrypt(data, active_key()) / decrypt(env) with the cached keyring
+- batch: encrypt_many / decrypt_many on the calling thread
+- batch xN: encrypt_many / decrypt_many spread over --workers threads
+
+Uses a throwaway keyring under a temp directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from relay_ai.crypto.envelope import (  # noqa: E402
+    clear_cipher_cache,
+    decrypt,
+    decrypt_many,
+    encrypt,
+    encrypt_many,
+)
+from relay_ai.crypto.keyring import active_key, clear_keyring_cache  # noqa: E402
+
+
+def uncached_encrypt(blobs: list[bytes]) -> list[dict]:
+    envelopes = []
+    for blob in blobs:
+        clear_keyring_cache()
+        clear_cipher_cache()
+        envelopes.append(encrypt(blob, active_key()))
+    return envelopes
+
+
+def uncached_decrypt(envelopes: list[dict]) -> list[bytes]:
+    plaintexts = []
+    for envelope in envelopes:
+        clear_keyring_cache()
+        clear_cipher_cache()
+        plaintexts.append(decrypt(envelope))
+    return plaintexts
+
+
+def best_of(fn, arg, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark envelope encryption")
+    parser.add_argument("--blobs", type=int, default=5000, help="Artifacts per run")
+    parser.add_argument("--size", type=int, default=512, help="Bytes per artifact")
+    parser.add_argument("--workers", type=int, default=4, help="Threads for the parallel batch")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["KEYRING_PATH"] = str(Path(tmp) / "keyring.jsonl")
+        active_key()
+        blobs = [os.urandom(args.size) for _ in range(args.blobs)]
+        envelopes = encrypt_many(blobs)
+
+        paths = [
+            ("uncached", uncached_encrypt, uncached_decrypt),
+            ("per-blob", lambda b: [encrypt(x, active_key()) for x in b], lambda e: [decrypt(x) for x in e]),
+            ("batch", encrypt_many, decrypt_many),
+            (
+                f"batch x{args.workers}",
+                lambda b: encrypt_many(b, max_workers=args.workers),
+                lambda e: decrypt_many(e, max_workers=args.workers),
+            ),
+        ]
+
+        print(f"{args.blobs} blobs x {args.size} bytes")
+        print(f"{'path':12s} {'enc us/blob':>12s} {'dec us/blob':>12s}")
+        for label, enc, dec in paths:
+            enc_sec = best_of(enc, blobs, args.repeat)
+            dec_sec = best_of(dec, envelopes, args.repeat)
+            print(f"{label:12s} {enc_sec / args.blobs * 1e6:12.1f} {dec_sec / args.blobs * 1e6:12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
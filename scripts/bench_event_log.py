@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Benchmark orchestrator event log reads on a large, segmented log.
+
+Usage:
+    python scripts/bench_event_log.py --events 1000000 --days 30
+    python scripts/bench_event_log.py --events 200000 --append 20000
+
+Reports:
+- full scan: what load_events/summarize_tasks used to do (parse the whole log)
+- tail: the last N events via reverse block reads of the newest segments
+- window query: events from the last day, skipping older segments by their index
+- counters (cold): 24h summary on first run, which builds the segment indexes
+- counters (warm): later runs answered from the hourly counters
+- append: per-event cost of append_event, including the roll check
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from relay_ai.orchestrator import event_log  # noqa: E402
+from relay_ai.orchestrator.analytics import (  # noqa: E402
+    per_tenant_load,
+    per_tenant_load_from_log,
+    summarize_tasks,
+    summarize_tasks_from_log,
+)
+
+KINDS = ["dag_start", "task_start", "task_ok", "task_start", "task_ok", "task_fail", "task_retry", "dag_done"]
+
+
+def write_log(path: Path, events: int, days: int, tenants: int) -> datetime:
+    """Write events spread over days as one daily segment per day plus a live file for today."""
+    now = datetime.now(UTC)
+    start = now - timedelta(days=days)
+    step = (now - start) / events
+    out = None
+    current_day = None
+    for i in range(events):
+        ts = start + i * step
+        day = ts.date()
+        if day != current_day:
+            if out:
+                out.close()
+            target = path if day == now.date() else path.with_name(f"{path.stem}-{day.isoformat()}.0{path.suffix}")
+            out = open(target, "w", encoding="utf-8")
+            current_day = day
+        event = {
+            "timestamp": ts.isoformat(),
+            "event": KINDS[i % len(KINDS)],
+            "dag_name": f"dag{i % 20}",
+            "tenant": f"tenant{i % tenants}",
+        }
+        out.write(json.dumps(event) + "\n")
+    if out:
+        out.close()
+    return now
+
+
+def full_scan(path: Path) -> list[dict]:
+    """Parse every segment front to back, newest event first, like the old load_events."""
+    events = []
+    for file in [*event_log.sealed_segments(path), path]:
+        with open(file, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    events.append(json.loads(line))
+    return events[::-1]
+
+
+def measure(label: str, fn, repeat: int = 1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<28} {elapsed * 1000:10.1f} ms")
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=500000, help="Total events in the log")
+    parser.add_argument("--days", type=int, default=30, help="Days of history the events span")
+    parser.add_argument("--tenants", type=int, default=50, help="Distinct tenants")
+    parser.add_argument("--tail", type=int, default=1000, help="Events to read with tail()")
+    parser.add_argument("--append", type=int, default=10000, help="Events to append for the write benchmark")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "orchestrator_events.jsonl"
+        now = write_log(path, args.events, args.days, args.tenants)
+        segments = event_log.sealed_segments(path)
+        size_mb = sum(p.stat().st_size for p in [*segments, path]) / 1e6
+        print(f"{args.events} events ({size_mb:.0f} MB) in {len(segments)} sealed segments + live")
+
+        def old_summary():
+            events = full_scan(path)
+            return summarize_tasks(events), per_tenant_load(events)
+
+        old = measure("full scan + summarize", old_summary)
+        measure(f"full scan, last {args.tail}", lambda: full_scan(path)[: args.tail])
+        measure(f"tail {args.tail}", lambda: event_log.tail(path, args.tail), repeat=10)
+
+        def new_summary():
+            return summarize_tasks_from_log(path), per_tenant_load_from_log(path)
+
+        new = measure("counters (cold)", new_summary)
+        measure("counters (warm)", new_summary, repeat=10)
+        since = (now - timedelta(days=1)).isoformat()
+        measure("window query (1 day)", lambda: sum(1 for _ in event_log.iter_events(path, since=since)))
+        if old[0]["last_24h"] != new[0]["last_24h"]:
+            print("WARNING: 24h summaries differ", old[0]["last_24h"], new[0]["last_24h"])
+
+        event = {"timestamp": now.isoformat(), "event": "task_ok", "dag_name": "bench", "tenant": "tenant0"}
+        start = time.perf_counter()
+        for _ in range(args.append):
+            event_log.append_event(event, path)
+        per_event = (time.perf_counter() - start) / max(args.append, 1)
+        print(f"{'append_event':<28} {per_event * 1e6:10.1f} us/event")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
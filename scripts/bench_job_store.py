@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Benchmark AI job stores under concurrent pollers.
+
+Usage:
+    python scripts/bench_job_store.py
+    python scripts/bench_job_store.py --jobs 2000 --pollers 5000 --history 200000
+
+Compares a copy of the previous single-lock store (model_dump copy on every
+transition, list by full scan) with the sharded JobStore (and RedisJobStore
+against fakeredis, if installed):
+- N jobs run start -> finish while --pollers tasks poll get() on them until
+  they finish; reports wall time, poll throughput and poll latency
+- start/finish transitions per second
+- list_jobs for one user with --history finished jobs from other users
+- finished jobs still held after the run (the old store never evicted)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import random
+import statistics
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from relay_ai.ai.job_store import JobStore, RedisJobStore  # noqa: E402
+from relay_ai.schemas.job import JobRecord, JobStatus  # noqa: E402
+
+TERMINAL = (JobStatus.SUCCESS, JobStatus.FAILED)
+
+
+class LegacyJobStore:
+    def __init__(self):
+        self._jobs: dict[str, JobRecord] = {}
+        self._lock = asyncio.Lock()
+
+    async def create(self, user_id: str, action_id: str, plan_id: str | None = None) -> JobRecord:
+        async with self._lock:
+            job = JobRecord(
+                job_id=str(uuid4()),
+                user_id=user_id,
+                action_id=action_id,
+                plan_id=plan_id,
+                status=JobStatus.PENDING,
+                created_at=datetime.now(UTC),
+            )
+            self._jobs[job.job_id] = job
+            return job
+
+    async def _update(self, job_id: str, **changes) -> JobRecord | None:
+        async with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                job = JobRecord(**{**job.model_dump(), **changes})
+                self._jobs[job_id] = job
+            return job
+
+    async def start(self, job_id):
+        return await self._update(job_id, status=JobStatus.RUNNING, started_at=datetime.now(UTC))
+
+    async def finish_ok(self, job_id, result=None):
+        return await self._update(job_id, status=JobStatus.SUCCESS, finished_at=datetime.now(UTC), result=result)
+
+    async def get(self, job_id):
+        async with self._lock:
+            return self._jobs.get(job_id)
+
+    async def list_jobs(self, user_id=None, status=None, limit=100):
+        async with self._lock:
+            matches = [j for j in self._jobs.values() if j.user_id == user_id]
+        return sorted(matches, key=lambda j: j.created_at, reverse=True)[:limit]
+
+    def held(self) -> int:
+        return len(self._jobs)
+
+
+async def bench_pollers(store, jobs: int, pollers: int, step_ms: float) -> tuple[float, int, list[float]]:
+    created = [await store.create(user_id=f"user{i % 100}", action_id="gmail.send") for i in range(jobs)]
+    result = {"message_id": "m1", "thread": {"labels": ["sent"] * 10}}
+    latencies: list[float] = []
+    polls = 0
+
+    async def worker(job):
+        await asyncio.sleep(random.random() * step_ms / 1000)
+        await store.start(job.job_id)
+        await asyncio.sleep(step_ms / 1000)
+        await store.finish_ok(job.job_id, result=result)
+
+    async def poller(job):
+        nonlocal polls
+        while True:
+            started = time.perf_counter()
+            current = await store.get(job.job_id)
+            latencies.append(time.perf_counter() - started)
+            polls += 1
+            if current is None or current.status in TERMINAL:
+                return
+            await asyncio.sleep(0.001)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[poller(created[i % jobs]) for i in range(pollers)], *[worker(job) for job in created])
+    return time.perf_counter() - start, polls, latencies
+
+
+async def bench_transitions(store, jobs: int) -> float:
+    result = {"message_id": "m1", "thread": {"labels": ["sent"] * 10}}
+    created = [await store.create(user_id=f"user{i % 100}", action_id="gmail.send") for i in range(jobs)]
+    start = time.perf_counter()
+    for job in created:
+        await store.start(job.job_id)
+        await store.finish_ok(job.job_id, result=result)
+    return 2 * jobs / (time.perf_counter() - start)
+
+
+async def bench_list(store, history: int, lookups: int) -> float:
+    for i in range(history):
+        job = await store.create(user_id=f"other{i % 1000}", action_id="gmail.send")
+        await store.finish_ok(job.job_id)
+    for _ in range(20):
+        await store.create(user_id="me", action_id="gmail.send")
+    start = time.perf_counter()
+    for _ in range(lookups):
+        await store.list_jobs(user_id="me", limit=20)
+    return (time.perf_counter() - start) / lookups
+
+
+def held(store) -> int:
+    return store.held() if isinstance(store, LegacyJobStore) else store.get_stats()["jobs"]
+
+
+async def run(args) -> None:
+    print(f"{args.jobs:,} jobs, {args.pollers:,} pollers, {args.step_ms:.0f} ms per step")
+    for label, store in (("legacy", LegacyJobStore()), ("sharded", JobStore(max_finished=args.max_finished))):
+        wall, polls, latencies = await bench_pollers(store, args.jobs, args.pollers, args.step_ms)
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        print(
+            f"  {label:<8} wall {wall * 1000:7.0f} ms  polls {polls / wall:>10,.0f}/s"
+            f"  get p50 {statistics.median(latencies) * 1e6:6.1f} us  p99 {p99 * 1e6:6.1f} us"
+        )
+
+    print(f"\nstart + finish_ok on {args.jobs * 10:,} jobs")
+    for label, store in (("legacy", LegacyJobStore()), ("sharded", JobStore(max_finished=args.max_finished))):
+        gc.collect()
+        print(f"  {label:<8} {await bench_transitions(store, args.jobs * 10):>10,.0f} transitions/s")
+
+    print(f"\nlist_jobs(user) with {args.history:,} finished jobs from other users")
+    for label, store in (("legacy", LegacyJobStore()), ("sharded", JobStore(max_finished=args.max_finished))):
+        per_call = await bench_list(store, args.history, 20 if label == "legacy" else 2000)
+        print(f"  {label:<8} {per_call * 1e6:10.1f} us/call  jobs held {held(store):>8,}")
+
+    if args.redis_jobs:
+        try:
+            import fakeredis
+        except ImportError:
+            print("\nfakeredis not installed; skipping RedisJobStore")
+            return
+        store = RedisJobStore(fakeredis.FakeAsyncRedis(max_connections=100_000), max_finished=args.max_finished)
+        pollers = args.redis_jobs * args.pollers // args.jobs
+        print(f"\nRedisJobStore on fakeredis ({args.redis_jobs:,} jobs, {pollers:,} pollers; in-process, no network)")
+        wall, polls, latencies = await bench_pollers(store, args.redis_jobs, pollers, args.step_ms)
+        print(f"  {'redis':<8} wall {wall * 1000:7.0f} ms  polls {polls / wall:>10,.0f}/s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=1000, help="Jobs run concurrently")
+    parser.add_argument("--pollers", type=int, default=5000, help="Concurrent get() pollers")
+    parser.add_argument("--step-ms", type=float, default=50, help="Simulated step duration")
+    parser.add_argument("--history", type=int, default=100_000, help="Finished jobs before list_jobs")
+    parser.add_argument("--max-finished", type=int, default=10_000, help="Finished jobs kept by the new store")
+    parser.add_argument("--redis-jobs", type=int, default=200, help="Jobs against fakeredis (0 to skip)")
+    args = parser.parse_args()
+
+    random.seed(0)
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Benchmark memory chunk indexing throughput.
+
+Usage:
+    python scripts/bench_memory_index.py --chunks 500 --dim 1536 --rtt-ms 0.5
+    python scripts/bench_memory_index.py --dsn postgresql://localhost/relay_test
+
+Compares, for one document's worth of chunks:
+- per-chunk (index_memory_batch: RLS + 3 seals + INSERT per chunk)
+- bulk insert (index_memory_chunks_bulk, use_copy=False)
+- bulk copy (index_memory_chunks_bulk, COPY)
+
+Without --dsn the rows go to StandInConnection, a local Postgres stand-in
+that charges --rtt-ms per client/server round trip (BEGIN, each statement,
+COMMIT, one COPY) and keeps rows in memory, so the numbers isolate client
+CPU (sealing, embedding formatting) plus round-trip count. With --dsn the
+memory_chunks table (with pgvector) must already exist.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+os.environ.setdefault("MEMORY_ENCRYPTION_KEY", "ZGV2LWVuY3J5cHRpb24ta2V5LTMyYnl0ZXMxMjM0NTY=")
+os.environ.setdefault("MEMORY_TENANT_HMAC_KEY", "dev-hmac-key-for-testing-1234567890")
+
+from relay_ai.platform.security.memory.index import (  # noqa: E402
+    index_memory_batch,
+    index_memory_chunks_bulk,
+)
+
+
+class _StandInTransaction:
+    def __init__(self, conn: StandInConnection):
+        self.conn = conn
+
+    async def __aenter__(self):
+        await self.conn._round_trip()  # BEGIN
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.conn._round_trip()  # COMMIT / ROLLBACK
+        return False
+
+
+class StandInConnection:
+    """In-memory asyncpg.Connection stand-in that charges a fixed round-trip cost."""
+
+    def __init__(self, rtt_ms: float = 0.5):
+        self.rtt = rtt_ms / 1000.0
+        self.rows: list[tuple] = []
+        self.round_trips = 0
+
+    async def _round_trip(self) -> None:
+        self.round_trips += 1
+        await asyncio.sleep(self.rtt)
+
+    def transaction(self) -> _StandInTransaction:
+        return _StandInTransaction(self)
+
+    async def execute(self, query: str, *args) -> str:
+        await self._round_trip()
+        return "SELECT 1"
+
+    async def fetchrow(self, query: str, *args) -> dict:
+        await self._round_trip()
+        self.rows.append(args)
+        return {
+            "id": len(self.rows),
+            "user_hash": args[0],
+            "doc_id": args[1],
+            "source": args[2],
+            "created_at": None,
+            "updated_at": None,
+        }
+
+    async def executemany(self, query: str, args) -> None:
+        await self._round_trip()  # asyncpg pipelines all binds before one Sync
+        self.rows.extend(args)
+
+    async def copy_records_to_table(self, table_name: str, *, records, columns=None, **kwargs) -> str:
+        await self._round_trip()
+        self.rows.extend(records)
+        return f"COPY {len(records)}"
+
+    async def set_type_codec(self, typename: str, **kwargs) -> None:
+        await self._round_trip()  # Type introspection
+
+
+def make_chunks(count: int, dim: int, seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "doc_id": "bench_doc",
+            "source": "upload",
+            "text": " ".join(rng.choice(["memory", "chunk", "tenant", "vector", "policy"]) for _ in range(120)),
+            "embedding": [rng.uniform(-1, 1) for _ in range(dim)],
+            "metadata": {"page": i // 10, "section": i},
+            "tags": ["bench"],
+        }
+        for i in range(count)
+    ]
+
+
+async def _connect(dsn: str | None, rtt_ms: float):
+    if dsn:
+        import asyncpg
+
+        return await asyncpg.connect(dsn)
+    return StandInConnection(rtt_ms)
+
+
+async def run(chunks: list[dict], dsn: str | None, rtt_ms: float, repeat: int) -> list[tuple[str, float, int]]:
+    """Time each path; returns (label, best seconds, round trips)."""
+    paths = [
+        ("per-chunk", lambda conn: index_memory_batch(conn, "bench_user", chunks)),
+        ("bulk insert", lambda conn: index_memory_chunks_bulk(conn, "bench_user", chunks, use_copy=False)),
+        ("bulk copy", lambda conn: index_memory_chunks_bulk(conn, "bench_user", chunks)),
+    ]
+    results = []
+    for label, fn in paths:
+        best = float("inf")
+        round_trips = 0
+        for _ in range(repeat):
+            conn = await _connect(dsn, rtt_ms)
+            try:
+                start = time.perf_counter()
+                await fn(conn)
+                best = min(best, time.perf_counter() - start)
+                round_trips = getattr(conn, "round_trips", 0)
+            finally:
+                if dsn:
+                    await conn.execute("DELETE FROM memory_chunks WHERE doc_id = 'bench_doc'")
+                    await conn.close()
+        results.append((label, best, round_trips))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory chunk indexing")
+    parser.add_argument("--chunks", type=int, default=500, help="Chunks per document")
+    parser.add_argument("--dim", type=int, default=1536, help="Embedding dimension")
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="Stand-in round-trip latency")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path (best is reported)")
+    parser.add_argument("--dsn", help="Benchmark against a real Postgres instead of the stand-in")
+    args = parser.parse_args()
+
+    chunks = make_chunks(args.chunks, args.dim)
+    target = args.dsn or f"stand-in (rtt {args.rtt_ms}ms)"
+    print(f"{args.chunks} chunks x {args.dim} dims -> {target}")
+    print(f"{'path':12s} {'seconds':>9s} {'chunks/s':>10s} {'round trips':>12s}")
+    for label, seconds, round_trips in asyncio.run(run(chunks, args.dsn, args.rtt_ms, args.repeat)):
+        print(f"{label:12s} {seconds:9.3f} {args.chunks / seconds:10.0f} {round_trips or '-':>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
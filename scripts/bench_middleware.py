@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Benchmark the HTTP middleware stack: BaseHTTPMiddleware vs pure ASGI.
+
+Usage:
+    python scripts/bench_middleware.py --requests 5000
+    python scripts/bench_middleware.py --requests 2000 --events 200
+
+Builds the same small app twice, once behind call_next-style copies of the
+previous telemetry/body-limit/security-header middlewares and once behind the
+pure-ASGI ones, and drives both in-process with raw ASGI messages (no HTTP
+client in the measurement). Reports:
+- per-request latency for a JSON GET and a small POST
+- SSE pass-through: time to first event, events delivered, and how far the
+  generator runs ahead of a slow consumer (backpressure)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import StreamingResponse  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.responses import Response  # noqa: E402
+
+from relay_ai.common.middleware.body_limit import MAX_BODY_BYTES, BodySizeLimitMiddleware  # noqa: E402
+from relay_ai.common.middleware.security_headers import SECURITY_HEADERS, SecurityHeadersMiddleware  # noqa: E402
+from relay_ai.telemetry.middleware import TelemetryMiddleware  # noqa: E402
+from relay_ai.telemetry.prom import record_http_request  # noqa: E402
+
+
+class LegacyTelemetry(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        request_id = str(uuid4())
+        request.state.request_id = request_id
+        start = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            response.headers["X-Request-ID"] = request_id
+            return response
+        finally:
+            record_http_request(
+                method=request.method,
+                endpoint=TelemetryMiddleware._normalize_endpoint(request.url.path),
+                status_code=status_code,
+                duration_seconds=time.perf_counter() - start,
+            )
+
+
+class LegacyBodyLimit(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        body = await request.body()
+        if len(body) > MAX_BODY_BYTES:
+            return Response("Request body too large (max 512 KiB)", status_code=413)
+
+        # The original also swapped in a receive() that returned the body
+        # forever; on this Starlette the cached request already replays it,
+        # and the swap made StreamingResponse's disconnect listener raise.
+        # Left out so the SSE comparison can run at all.
+        return await call_next(request)
+
+
+class LegacySecurityHeaders(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        for name, value in SECURITY_HEADERS:
+            response.headers[name.decode()] = value.decode()
+        return response
+
+
+def build_app(legacy: bool, produced: list[int], events: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: str):
+        return {"id": item_id}
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return {"size": len(await request.body())}
+
+    @app.get("/stream")
+    async def stream():
+        async def generate():
+            for i in range(events):
+                produced[0] = i + 1
+                yield f"data: {i}\n\n"
+
+        return StreamingResponse(generate(), media_type="text/event-stream")
+
+    if legacy:
+        app.add_middleware(LegacyTelemetry)
+        app.add_middleware(LegacyBodyLimit)
+        app.add_middleware(LegacySecurityHeaders)
+    else:
+        app.add_middleware(TelemetryMiddleware)
+        app.add_middleware(BodySizeLimitMiddleware)
+        app.add_middleware(SecurityHeadersMiddleware)
+    return app
+
+
+def make_scope(method: str, path: str, body: bytes = b"") -> dict:
+    headers = [(b"host", b"bench")]
+    if body:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "server": ("bench", 80),
+        "client": ("bench", 1),
+    }
+
+
+async def call(app, scope: dict, body: bytes = b"", on_body=None) -> list[dict]:
+    messages = []
+    sent_request = False
+
+    async def receive():
+        nonlocal sent_request
+        if not sent_request:
+            sent_request = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()  # Client stays connected
+
+    async def send(message):
+        messages.append(message)
+        if on_body is not None and message["type"] == "http.response.body":
+            await on_body(message)
+
+    await app(dict(scope), receive, send)
+    return messages
+
+
+async def per_request(app, method: str, path: str, body: bytes, count: int) -> list[float]:
+    scope = make_scope(method, path, body)
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        messages = await call(app, scope, body)
+        timings.append(time.perf_counter() - start)
+        assert messages[0]["status"] == 200, messages[0]
+    return timings
+
+
+async def sse(app, produced: list[int], events: int, delay: float) -> tuple[float, int, int]:
+    """Time to first event, events received, max events produced ahead of the consumer."""
+    received = 0
+    first = None
+    lead = 0
+    start = time.perf_counter()
+
+    async def on_body(message):
+        nonlocal received, first, lead
+        if message.get("body"):
+            received += 1
+            if first is None:
+                first = time.perf_counter() - start
+            lead = max(lead, produced[0] - received)
+            await asyncio.sleep(delay)  # Slow client
+
+    produced[0] = 0
+    await call(app, make_scope("GET", "/stream"), on_body=on_body)
+    return first or 0.0, received, lead
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000, help="Requests per scenario")
+    parser.add_argument("--events", type=int, default=100, help="Events in the SSE stream")
+    parser.add_argument("--delay-ms", type=float, default=1.0, help="Slow-client delay per SSE event")
+    args = parser.parse_args()
+
+    body = b'{"prompt": "' + b"x" * 2000 + b'"}'
+
+    async def run():
+        for label, legacy in (("BaseHTTPMiddleware", True), ("pure ASGI", False)):
+            produced = [0]
+            app = build_app(legacy, produced, args.events)
+            await per_request(app, "GET", "/items/1", b"", 200)  # Warm up
+            for name, method, path, payload in (("GET", "GET", "/items/42", b""), ("POST", "POST", "/echo", body)):
+                timings = await per_request(app, method, path, payload, args.requests)
+                print(
+                    f"{label:<20} {name:<5} mean {statistics.mean(timings) * 1e6:7.0f} us"
+                    f"  p99 {sorted(timings)[int(len(timings) * 0.99)] * 1e6:7.0f} us"
+                )
+            first, received, lead = await sse(app, produced, args.events, args.delay_ms / 1000)
+            print(
+                f"{label:<20} SSE   first event {first * 1e3:6.2f} ms, {received}/{args.events} events, "
+                f"producer ahead by up to {lead}"
+            )
+
+    asyncio.run(run())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
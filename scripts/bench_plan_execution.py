@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Benchmark AI plan execution: sequential steps vs dependency-aware concurrency.
+
+Usage:
+    python scripts/bench_plan_execution.py
+    python scripts/bench_plan_execution.py --emails 10 --step-ms 200 --gmail-limit 4
+
+Executes a plan of N emails plus a calendar event and a follow-up email that
+references the event, against an executor that sleeps --step-ms per step.
+The "sequential" run chains every step on the previous one (the old
+execute_plan behaviour); the "concurrent" run uses the plan's real
+dependencies. Reports wall time and critical-path time for both.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from relay_ai.ai.job_store import JobStore  # noqa: E402
+from relay_ai.ai.orchestrator import AIOrchestrator  # noqa: E402
+from relay_ai.schemas.ai_plan import PlannedAction, PlanResult  # noqa: E402
+
+
+class SleepExecutor:
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.previews = {}
+
+    def preview(self, action_id, params):
+        preview_id = str(len(self.previews))
+        self.previews[preview_id] = action_id
+        return MagicMock(preview_id=preview_id)
+
+    async def execute(self, preview_id, workspace_id, actor_id):
+        await asyncio.sleep(self.seconds)
+        return {"status": "success", "result": {"id": f"{self.previews[preview_id]}-{preview_id}"}}
+
+
+def build_plan(emails: int, sequential: bool) -> PlanResult:
+    steps = [
+        PlannedAction(action_id="gmail.send", description=f"Email {i}", params={"to": f"user{i}@example.com"})
+        for i in range(emails)
+    ]
+    steps.append(PlannedAction(action_id="calendar.create_event", description="Event", params={"title": "Sync"}))
+    steps.append(
+        PlannedAction(
+            action_id="gmail.send",
+            description="Invite",
+            params={"to": "team@example.com", "text": f"Event: {{{{steps.{emails}.result.id}}}}"},
+        )
+    )
+    if sequential:
+        steps = [
+            step.model_copy(update={"depends_on": sorted(set(step.dependencies()) | {i - 1})}) if i else step
+            for i, step in enumerate(steps)
+        ]
+    return PlanResult(prompt="bench", intent="bench", steps=steps, confidence=1.0, explanation="bench")
+
+
+async def run(args) -> None:
+    rbac = MagicMock()
+    rbac.get_user_permissions.return_value.can_execute.return_value = True
+    for label, sequential in (("sequential", True), ("concurrent", False)):
+        orchestrator = AIOrchestrator(rbac=rbac, job_store=JobStore(), provider_limits={"gmail": args.gmail_limit})
+        plan = build_plan(args.emails, sequential)
+        result = await orchestrator.execute_plan("bench", plan, SleepExecutor(args.step_ms / 1000), plan_id="bench")
+        print(
+            f"{label:<11} {len(plan.steps)} steps  wall {result['duration_seconds'] * 1000:7.0f} ms"
+            f"  critical path {result['critical_path_seconds'] * 1000:7.0f} ms"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=5, help="Independent emails in the plan")
+    parser.add_argument("--step-ms", type=float, default=100, help="Simulated provider latency per step")
+    parser.add_argument("--gmail-limit", type=int, default=4, help="Concurrent gmail steps")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark the AI planner plan cache.
+
+Usage:
+    python scripts/bench_planner_cache.py
+    python scripts/bench_planner_cache.py --requests 500 --distinct 20 --llm-ms 800
+
+Replays --requests prompts drawn from --distinct phrasings (with case,
+whitespace and punctuation variations) through ActionPlanner against a fake
+LLM that sleeps --llm-ms per call. Runs once with the cache disabled and
+once enabled, and reports LLM calls, wall time, hit rate and saved LLM time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from relay_ai.ai.planner import ActionPlanner, PlanCache  # noqa: E402
+
+PLAN_JSON = {
+    "intent": "send_email",
+    "steps": [
+        {
+            "action_id": "gmail.send",
+            "description": "Send the weekly report",
+            "params": {"to": "team@example.com", "subject": "Weekly report", "text": "Attached."},
+            "depends_on": None,
+        }
+    ],
+    "confidence": 0.9,
+    "explanation": "bench",
+}
+
+
+def variants(prompt: str, rng: random.Random) -> str:
+    prompt = prompt.upper() if rng.random() < 0.2 else prompt
+    return f"  {prompt.replace(' ', '  ')}{rng.choice(['', '.', '!', ' '])}"
+
+
+async def run(planner: ActionPlanner, prompts: list[str], llm_seconds: float) -> tuple[int, float]:
+    calls = 0
+
+    async def call_llm(system_prompt, user_message):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(llm_seconds)
+        return PLAN_JSON
+
+    planner._call_llm = call_llm
+    start = time.perf_counter()
+    for prompt in prompts:
+        await planner.plan(prompt)
+    return calls, time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Prompts to plan")
+    parser.add_argument("--distinct", type=int, default=10, help="Distinct prompts behind the variations")
+    parser.add_argument("--llm-ms", type=float, default=20, help="Simulated LLM latency per call")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    base = [f"send the weekly report {i} to the team" for i in range(args.distinct)]
+    prompts = [variants(rng.choice(base), rng) for _ in range(args.requests)]
+
+    for label, cache in (("no cache", PlanCache(max_entries=0)), ("plan cache", PlanCache())):
+        calls, wall = asyncio.run(run(ActionPlanner(cache=cache), prompts, args.llm_ms / 1000))
+        stats = cache.get_stats()
+        print(
+            f"{label:<10} {args.requests} plans  LLM calls {calls:>5}  wall {wall * 1000:8.0f} ms"
+            f"  hit rate {stats['hit_rate']:6.1%}  saved LLM {stats['saved_llm_seconds'] * 1000:8.0f} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -36,7 +36,7 @@ def cmd_export(args):
     """Export tenant data."""
     try:
         out_dir = Path(args.out)
-        result = export_tenant(args.tenant, out_dir)
+        result = export_tenant(args.tenant, out_dir, compress=args.compress or None)
         print(json.dumps(result, indent=2))
         return 0
     except PermissionError as e:
@@ -178,6 +178,7 @@ def main():
     export_parser = subparsers.add_parser("export", help="Export tenant data")
     export_parser.add_argument("--tenant", required=True, help="Tenant ID")
     export_parser.add_argument("--out", required=True, help="Output directory")
+    export_parser.add_argument("--compress", action="store_true", help="Write event files as .jsonl.gz")
 
     # Delete command
     delete_parser = subparsers.add_parser("delete", help="Delete tenant data")
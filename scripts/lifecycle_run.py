@@ -10,6 +10,7 @@
     python scripts/lifecycle_run.py --live
     python scripts/lifecycle_run.py --summary
     python scripts/lifecycle_run.py --live --verbose
+    python scripts/lifecycle_run.py --rebuild-manifest
 """
 
 import argparse
@@ -28,6 +29,7 @@
     get_retention_days,
     run_lifecycle_job,
 )
+from relay_ai.storage.manifest import get_manifest_path, rebuild_manifest  # noqa: E402
 from relay_ai.storage.tiered_store import TIER_COLD, TIER_HOT, TIER_WARM, get_all_tier_stats  # noqa: E402
 
 
@@ -55,6 +57,14 @@ def print_summary_table(results: dict[str, Any]) -> None:
     print(f"  Cold -> Purge:{results.get('purged', 0):4d} artifacts")
     print()
 
+    # Storage efficiency
+    mb = 1024 * 1024
+    print("Storage:")
+    print(f"  Saved by cold compression: {results.get('bytes_saved', 0) / mb:10.2f} MB")
+    print(f"  Freed by purge:            {results.get('bytes_freed', 0) / mb:10.2f} MB")
+    print(f"  Throughput:                {results.get('mb_per_second', 0):10.2f} MB/s")
+    print()
+
     # Errors
     errors = results.get("total_errors", 0)
     if errors > 0:
@@ -159,11 +169,17 @@ def main():
   # Run with verbose output
   python scripts/lifecycle_run.py --live --verbose
 
+  # Re-index artifacts after out-of-band changes to the tier directories
+  python scripts/lifecycle_run.py --rebuild-manifest
+
 Environment Variables:
   HOT_RETENTION_DAYS=7    # Days before hot � warm
   WARM_RETENTION_DAYS=30  # Days before warm � cold
   COLD_RETENTION_DAYS=90  # Days before cold � purge
   STORAGE_BASE_PATH=artifacts
+  STORAGE_MANIFEST_PATH=artifacts/.manifest.db
+  LIFECYCLE_WORKERS=4     # Parallel promotions/purges per step
+  COLD_TIER_COMPRESSION=auto  # auto|zstd|gzip|none
   LOG_DIR=logs
         """,
     )
@@ -174,15 +190,30 @@ def main():
     )
     mode_group.add_argument("--live", action="store_true", help="Live mode - execute lifecycle operations")
     mode_group.add_argument("--summary", action="store_true", help="Show current state without running lifecycle job")
+    mode_group.add_argument(
+        "--rebuild-manifest", action="store_true", help="Rebuild the artifact manifest index from disk and exit"
+    )
 
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output with detailed statistics")
 
+    parser.add_argument(
+        "--workers", type=int, default=None, metavar="N", help="Worker pool size (default: LIFECYCLE_WORKERS or 4)"
+    )
+
     parser.add_argument(
         "--show-events", type=int, default=0, metavar="N", help="Show N recent lifecycle events (default: 0)"
     )
 
     args = parser.parse_args()
 
+    # Rebuild mode - re-index tiers from disk
+    if args.rebuild_manifest:
+        counts = rebuild_manifest()
+        print(f"Rebuilt manifest: {get_manifest_path()}")
+        for tier in [TIER_HOT, TIER_WARM, TIER_COLD]:
+            print(f"{tier.upper():5s} Tier: {counts.get(tier, 0):5d} artifacts indexed")
+        return 0
+
     # Summary mode - just show state
     if args.summary:
         print_retention_policies()
@@ -216,7 +247,7 @@ def main():
     start_time = time.time()
 
     try:
-        results = run_lifecycle_job(dry_run=dry_run)
+        results = run_lifecycle_job(dry_run=dry_run, workers=args.workers)
         elapsed = time.time() - start_time
         results["job_duration_seconds"] = elapsed
 
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Profile the cold-start import of a module and report the slowest imports.
+
+Usage:
+    python scripts/profile_imports.py
+    python scripts/profile_imports.py --module src.webapi --top 30
+    python scripts/profile_imports.py --repeat 5 --budget 1.5
+
+Imports the module in a fresh interpreter with ``-X importtime`` (after
+installing the src.* import redirect, as the app entrypoints do) and prints:
+- wall time of the import and the number of modules loaded
+- the modules with the highest self time
+- the module's direct imports with the highest cumulative time
+
+Exits 1 when --budget is given and the median import time exceeds it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_CHILD = """
+import json, sys, time
+from relay_ai.compat.import_redirect import install_src_redirect
+install_src_redirect()
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+class ImportTiming(NamedTuple):
+    """One line of ``-X importtime`` output."""
+
+    self_us: int
+    cumulative_us: int
+    depth: int
+    name: str
+
+
+class StartupProfile(NamedTuple):
+    """Result of one cold import."""
+
+    seconds: float
+    modules: list[str]
+    timings: list[ImportTiming]
+
+
+def parse_importtime(lines: list[str]) -> list[ImportTiming]:
+    """Parse ``import time: self [us] | cumulative | imported package`` lines.
+
+    Args:
+        lines: stderr lines of a ``python -X importtime`` run
+
+    Returns:
+        One ImportTiming per imported module, in import order
+    """
+    timings = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        timings.append(ImportTiming(int(fields[0]), int(fields[1]), depth, stripped))
+    return timings
+
+
+def profile_import(module: str, cwd: Path = ROOT) -> StartupProfile:
+    """Import module in a fresh interpreter and collect its import timings.
+
+    Args:
+        module: Dotted module name to import
+        cwd: Working directory for the child (the repo root by default)
+
+    Returns:
+        StartupProfile with wall time, loaded module names and per-module timings
+
+    Raises:
+        RuntimeError: If the import fails in the child interpreter
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD.format(module=module)],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    data = json.loads(result.stdout.strip().splitlines()[-1])
+    return StartupProfile(data["seconds"], data["modules"], parse_importtime(result.stderr.splitlines()))
+
+
+def top_imports(timings: list[ImportTiming], module: str, top: int) -> tuple[list[ImportTiming], list[ImportTiming]]:
+    """Return (slowest by self time, slowest direct imports of module by cumulative time)."""
+    by_self = sorted(timings, key=lambda t: t.self_us, reverse=True)[:top]
+
+    # importtime prints a module after its children, so the direct imports of
+    # module are the depth+1 entries immediately preceding it
+    children = []
+    for index, timing in enumerate(timings):
+        if timing.name == module:
+            for child in reversed(timings[:index]):
+                if child.depth <= timing.depth:
+                    break
+                if child.depth == timing.depth + 1:
+                    children.append(child)
+            break
+    by_cumulative = sorted(children, key=lambda t: t.cumulative_us, reverse=True)[:top]
+    return by_self, by_cumulative
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="src.webapi", help="Module to import (default: src.webapi)")
+    parser.add_argument("--top", type=int, default=20, help="Rows per table")
+    parser.add_argument("--repeat", type=int, default=1, help="Cold imports to run; the median is reported")
+    parser.add_argument("--budget", type=float, help="Fail if the median import time exceeds this many seconds")
+    args = parser.parse_args()
+
+    profiles = [profile_import(args.module) for _ in range(args.repeat)]
+    median = statistics.median(p.seconds for p in profiles)
+    profile = profiles[0]
+
+    print(f"import {args.module}: {median * 1000:.0f} ms (median of {args.repeat}), {len(profile.modules)} modules")
+    by_self, by_cumulative = top_imports(profile.timings, args.module, args.top)
+
+    print(f"\nSlowest modules by self time (top {args.top}):")
+    for timing in by_self:
+        print(f"  {timing.self_us / 1000:8.1f} ms  {timing.name}")
+
+    print(f"\nSlowest direct imports of {args.module} by cumulative time:")
+    for timing in by_cumulative:
+        print(f"  {timing.cumulative_us / 1000:8.1f} ms  {timing.name}")
+
+    if args.budget is not None and median > args.budget:
+        print(f"\nFAIL: {median:.3f}s exceeds budget of {args.budget:.3f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
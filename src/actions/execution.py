@@ -4,6 +4,7 @@
 Sprint 54: Rollout gate integration for gradual feature rollout.
 """
 
+import asyncio
 import os
 import time
 from datetime import datetime, timedelta
@@ -13,95 +14,11 @@
 from .adapters.google import GoogleAdapter
 from .adapters.independent import IndependentAdapter
 from .contracts import ActionStatus, ExecuteResponse, PreviewResponse, Provider
+from .stores import ACTIONS_STORE_BACKEND, IdempotencyStore, PreviewStore, create_stores, is_pending
 
-
-class PreviewStore:
-    """In-memory store for preview data (24h TTL)."""
-
-    def __init__(self):
-        """Initialize preview store."""
-        self._store: dict[str, dict[str, Any]] = {}
-
-    def save(self, preview_id: str, data: dict[str, Any], ttl_seconds: int = 86400):
-        """Save preview data with TTL."""
-        expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
-        self._store[preview_id] = {
-            **data,
-            "expires_at": expires_at.isoformat(),
-        }
-
-    def get(self, preview_id: str) -> Optional[dict[str, Any]]:
-        """Get preview data if not expired."""
-        data = self._store.get(preview_id)
-        if not data:
-            return None
-
-        # Check expiry
-        expires_at = datetime.fromisoformat(data["expires_at"])
-        if datetime.utcnow() > expires_at:
-            del self._store[preview_id]
-            return None
-
-        return data
-
-    def delete(self, preview_id: str):
-        """Delete preview data."""
-        if preview_id in self._store:
-            del self._store[preview_id]
-
-
-class IdempotencyStore:
-    """In-memory store for idempotency keys (24h TTL)."""
-
-    def __init__(self):
-        """Initialize idempotency store."""
-        self._store: dict[str, dict[str, Any]] = {}
-
-    def check_by_key(self, workspace_id: str, idempotency_key: str) -> Optional[dict[str, Any]]:
-        """Check idempotency by workspace and key only (Sprint 50 idempotency-first).
-
-        This allows replay even if we don't know the action yet.
-        Returns the first matching cached result within 24h TTL.
-        """
-        prefix = f"{workspace_id}:"
-        suffix = f":{idempotency_key}"
-
-        for store_key, data in list(self._store.items()):
-            if store_key.startswith(prefix) and store_key.endswith(suffix):
-                # Check expiry (24h)
-                created_at = datetime.fromisoformat(data["created_at"])
-                if datetime.utcnow() - created_at > timedelta(hours=24):
-                    del self._store[store_key]
-                    continue
-
-                # Return first match
-                return data
-
-        return None
-
-    def check(self, workspace_id: str, action: str, idempotency_key: str) -> Optional[dict[str, Any]]:
-        """Check if idempotency key was already used for a specific action."""
-        key = f"{workspace_id}:{action}:{idempotency_key}"
-        data = self._store.get(key)
-
-        if not data:
-            return None
-
-        # Check expiry (24h)
-        created_at = datetime.fromisoformat(data["created_at"])
-        if datetime.utcnow() - created_at > timedelta(hours=24):
-            del self._store[key]
-            return None
-
-        return data
-
-    def save(self, workspace_id: str, action: str, idempotency_key: str, result: dict[str, Any]):
-        """Save execution result for idempotency key."""
-        key = f"{workspace_id}:{action}:{idempotency_key}"
-        self._store[key] = {
-            **result,
-            "created_at": datetime.utcnow().isoformat(),
-        }
+# How long a request waits for another worker running the same idempotency key
+ACTIONS_IDEMPOTENCY_WAIT_SEC = float(os.getenv("ACTIONS_IDEMPOTENCY_WAIT_SEC", "30"))
+IDEMPOTENCY_POLL_SEC = 0.05
 
 
 class ActionExecutor:
@@ -109,8 +26,9 @@ class ActionExecutor:
 
     def __init__(self):
         """Initialize action executor with rollout gate support."""
-        self.preview_store = PreviewStore()
-        self.idempotency_store = IdempotencyStore()
+        self.preview_store: PreviewStore
+        self.idempotency_store: IdempotencyStore
+        self.preview_store, self.idempotency_store = create_stores(self._init_store_redis())
 
         # Initialize rollout gate (Sprint 54)
         rollout_gate = self._init_rollout_gate()
@@ -120,6 +38,32 @@ def __init__(self):
             "google": GoogleAdapter(rollout_gate=rollout_gate),
         }
 
+    def _init_store_redis(self):
+        """Connect the preview/idempotency stores to Redis when configured.
+
+        Returns:
+            Redis client, or None for per-process in-memory stores
+        """
+        if ACTIONS_STORE_BACKEND != "redis":
+            return None
+
+        redis_url = os.getenv("REDIS_URL")
+        if not redis_url:
+            print("[WARN] Action stores: ACTIONS_STORE_BACKEND=redis but no REDIS_URL, using memory")
+            return None
+
+        try:
+            import redis
+
+            redis_client = redis.from_url(redis_url, decode_responses=True, socket_connect_timeout=2)
+            redis_client.ping()
+            print("[INFO] Action stores: Shared via Redis")
+            return redis_client
+
+        except Exception as e:
+            print(f"[WARN] Action stores: Redis unavailable ({e}), using memory")
+            return None
+
     def _init_rollout_gate(self):
         """Initialize rollout gate with Redis backing (if available).
 
@@ -250,6 +194,14 @@ async def execute(
 
         Sprint 50: Idempotency-first flow - check dedupe before preview validation.
         This allows retries to succeed even after preview TTL expires.
+
+        The idempotency key is reserved before the adapter runs, so concurrent
+        requests with the same key run the action once; the others wait for
+        that result and replay it.
+
+        Raises:
+            TimeoutError: If another request holding the key does not finish
+                within ACTIONS_IDEMPOTENCY_WAIT_SEC
         """
         # CHECK IDEMPOTENCY FIRST (Sprint 50 reliability fix)
         # This allows retries within 24h even if preview expired (1h TTL)
@@ -257,7 +209,9 @@ async def execute(
             # Try to get cached result by idempotency key alone
             # The store key format is workspace_id:action:idempotency_key
             # But we don't have action yet, so we check all possible matches
-            cached_result = self.idempotency_store.check_by_key(workspace_id, idempotency_key)
+            cached_result = await self._wait_while_pending(
+                lambda: self.idempotency_store.check_by_key(workspace_id, idempotency_key), idempotency_key
+            )
             if cached_result:
                 # Return cached result with idempotent_replay indicator
                 cached_response = ExecuteResponse(**cached_result)
@@ -267,23 +221,82 @@ async def execute(
         # Validate preview ID (only if not replaying from idempotency cache)
         preview_data = self.preview_store.get(preview_id)
         if not preview_data:
+            # A concurrent request with the same key may have just run it and deleted the preview
+            cached_result = idempotency_key and self.idempotency_store.check_by_key(workspace_id, idempotency_key)
+            if cached_result and not is_pending(cached_result):
+                return ExecuteResponse(**cached_result)
             raise ValueError("Invalid or expired preview_id")
 
         action = preview_data["action"]
         provider = preview_data["provider"]
         params = preview_data["params"]
 
-        # Verify idempotency key hasn't been used for a DIFFERENT action
-        # (Conflict detection - same key, different action = 409)
-        if idempotency_key:
-            cached_result = self.idempotency_store.check(workspace_id, action, idempotency_key)
-            if cached_result:
-                # This should have been caught above, but double-check
-                return ExecuteResponse(**cached_result)
-
         # Generate run ID
         run_id = str(uuid4())
 
+        # Reserve the key before running the action; if another request holds
+        # it, wait for its result (or for its reservation to lapse and retry)
+        if idempotency_key:
+            while True:
+                cached_result = self.idempotency_store.reserve(workspace_id, action, idempotency_key, run_id)
+                if cached_result is None:
+                    break
+                cached_result = await self._wait_while_pending(
+                    lambda: self.idempotency_store.check(workspace_id, action, idempotency_key), idempotency_key
+                )
+                if cached_result:
+                    return ExecuteResponse(**cached_result)
+
+        try:
+            response = await self._run(action, provider, params, workspace_id, actor_id, run_id, request_id)
+        except BaseException:
+            # Nothing was saved: free the key so a retry can run the action
+            if idempotency_key:
+                self.idempotency_store.release(workspace_id, action, idempotency_key, run_id)
+            raise
+
+        # Save for idempotency (replaces the reservation)
+        if idempotency_key:
+            stored = self.idempotency_store.save(
+                workspace_id,
+                action,
+                idempotency_key,
+                response.model_dump(mode="json"),
+            )
+            if stored["run_id"] != run_id:
+                response = ExecuteResponse(**stored)
+
+        # Delete preview after execution
+        self.preview_store.delete(preview_id)
+
+        return response
+
+    async def _wait_while_pending(self, lookup, idempotency_key: str) -> Optional[dict[str, Any]]:
+        """Poll an idempotency lookup until it is not a pending reservation.
+
+        Returns:
+            The stored result, or None if nothing (or an expired reservation) is stored
+        """
+        deadline = time.monotonic() + ACTIONS_IDEMPOTENCY_WAIT_SEC
+        record = lookup()
+        while is_pending(record):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Idempotency key '{idempotency_key}' is still being executed")
+            await asyncio.sleep(IDEMPOTENCY_POLL_SEC)
+            record = lookup()
+        return record
+
+    async def _run(
+        self,
+        action: str,
+        provider: str,
+        params: dict[str, Any],
+        workspace_id: str,
+        actor_id: str,
+        run_id: str,
+        request_id: Optional[str],
+    ) -> ExecuteResponse:
+        """Run the action through its adapter and record metrics."""
         # Execute action
         start_time = time.time()
         exception_type = None
@@ -339,18 +352,6 @@ async def execute(
             request_id=request_id or str(uuid4()),
         )
 
-        # Save for idempotency
-        if idempotency_key:
-            self.idempotency_store.save(
-                workspace_id,
-                action,
-                idempotency_key,
-                response.model_dump(),
-            )
-
-        # Delete preview after execution
-        self.preview_store.delete(preview_id)
-
         return response
 
 
@@ -0,0 +1,428 @@
+"""Preview and idempotency stores for the action executor.
+
+Two backends behind the PreviewStore / IdempotencyStore interfaces:
+
+- Memory: per-process, bounded. Entries live in a dict (O(1) lookup) with a
+  min-heap of expiry times, so expired entries are evicted on write without
+  scanning, and the entry closest to expiry is evicted first when full.
+- Redis: shared by every worker. TTLs are native (SET PX); the idempotency
+  reservation is SET NX and the save a Lua check-and-set, so only one
+  worker runs an action for a key and every other one replays its result.
+
+Before running an action the executor reserves its idempotency key with a
+pending marker ({"pending": true, "run_id": ...}, expiring after
+ACTIONS_IDEMPOTENCY_PENDING_TTL_SECONDS). Lookups return the marker as-is so
+callers can wait for the result instead of running the action again.
+
+Select with ACTIONS_STORE_BACKEND=memory|redis (redis uses REDIS_URL).
+"""
+
+import heapq
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Hashable
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+ACTIONS_STORE_BACKEND = os.getenv("ACTIONS_STORE_BACKEND", "memory").lower()
+ACTIONS_PREVIEW_MAX_ENTRIES = int(os.getenv("ACTIONS_PREVIEW_MAX_ENTRIES", "100000"))
+ACTIONS_IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("ACTIONS_IDEMPOTENCY_MAX_ENTRIES", "100000"))
+ACTIONS_IDEMPOTENCY_PENDING_TTL_SECONDS = int(os.getenv("ACTIONS_IDEMPOTENCY_PENDING_TTL_SECONDS", "300"))
+
+PREVIEW_TTL_SECONDS = 86400
+IDEMPOTENCY_TTL_SECONDS = 86400
+
+
+class PreviewStore(ABC):
+    """Preview data keyed by preview_id, expiring after a TTL."""
+
+    @abstractmethod
+    def save(self, preview_id: str, data: dict[str, Any], ttl_seconds: int = PREVIEW_TTL_SECONDS) -> None:
+        """Save preview data with TTL (adds an ``expires_at`` ISO timestamp)."""
+
+    @abstractmethod
+    def get(self, preview_id: str) -> Optional[dict[str, Any]]:
+        """Get preview data if not expired."""
+
+    @abstractmethod
+    def delete(self, preview_id: str) -> None:
+        """Delete preview data."""
+
+
+class IdempotencyStore(ABC):
+    """Execution results keyed by (workspace_id, action, idempotency_key), 24h TTL."""
+
+    @abstractmethod
+    def check_by_key(self, workspace_id: str, idempotency_key: str) -> Optional[dict[str, Any]]:
+        """Return the first live record (result or pending marker) under workspace and key, for any action."""
+
+    @abstractmethod
+    def check(self, workspace_id: str, action: str, idempotency_key: str) -> Optional[dict[str, Any]]:
+        """Return the live record (result or pending marker) for this exact action, if any."""
+
+    @abstractmethod
+    def reserve(
+        self,
+        workspace_id: str,
+        action: str,
+        idempotency_key: str,
+        run_id: str,
+        ttl_seconds: int = ACTIONS_IDEMPOTENCY_PENDING_TTL_SECONDS,
+    ) -> Optional[dict[str, Any]]:
+        """Atomically claim the key for this action with a pending marker.
+
+        Returns:
+            None if the caller now holds the reservation, otherwise the record
+            already stored (another caller's marker or a finished result)
+        """
+
+    @abstractmethod
+    def release(self, workspace_id: str, action: str, idempotency_key: str, run_id: str) -> None:
+        """Drop the pending marker for run_id (if still held) so another caller can run the action."""
+
+    @abstractmethod
+    def save(self, workspace_id: str, action: str, idempotency_key: str, result: dict[str, Any]) -> dict[str, Any]:
+        """Save result, replacing a pending marker, unless a result is already stored for the key and action.
+
+        Returns:
+            The stored record: this result (with ``created_at``), or the one
+            another caller saved first
+        """
+
+
+def _pending_marker(run_id: str) -> dict[str, Any]:
+    return {"pending": True, "run_id": run_id}
+
+
+def is_pending(record: Optional[dict[str, Any]]) -> bool:
+    """True if record is a reservation whose action has not finished yet."""
+    return record is not None and record.get("pending") is True
+
+
+class _ExpiringDict:
+    """Bounded dict whose entries expire, evicted via a min-heap of expiry times.
+
+    Not thread-safe; callers hold their own lock. Overwritten and deleted keys
+    leave stale heap items, which are skipped when popped and compacted away
+    once they outnumber the live entries.
+    """
+
+    def __init__(self, max_entries: int, on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        self.max_entries = max_entries
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._counter = 0  # Tie-breaker so keys never get compared
+        self._on_evict = on_evict
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, now: float) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del self._entries[key]
+            if self._on_evict:
+                self._on_evict(key, entry[1])
+            return None
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, expires_at: float, now: float) -> None:
+        self._entries[key] = (expires_at, value)
+        self._counter += 1
+        heapq.heappush(self._heap, (expires_at, self._counter, key))
+        self.evict(now)
+
+    def pop(self, key: Hashable) -> Any:
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def evict(self, now: float) -> None:
+        """Drop expired entries, then the soonest-expiring ones while over capacity."""
+        heap, entries = self._heap, self._entries
+        while heap and (heap[0][0] <= now or len(entries) > self.max_entries):
+            expires_at, _, key = heapq.heappop(heap)
+            entry = entries.get(key)
+            if entry is not None and entry[0] == expires_at:
+                del entries[key]
+                if self._on_evict:
+                    self._on_evict(key, entry[1])
+
+        if len(heap) > 2 * len(entries) + 1024:
+            self._heap = [(entry[0], i, key) for i, (key, entry) in enumerate(entries.items())]
+            heapq.heapify(self._heap)
+            self._counter = len(self._heap)
+
+
+class MemoryPreviewStore(PreviewStore):
+    """In-process preview store, bounded to max_entries."""
+
+    def __init__(self, max_entries: int = ACTIONS_PREVIEW_MAX_ENTRIES, clock: Callable[[], float] = time.time):
+        self._entries = _ExpiringDict(max_entries)
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def save(self, preview_id: str, data: dict[str, Any], ttl_seconds: int = PREVIEW_TTL_SECONDS) -> None:
+        now = self._clock()
+        record = {**data, "expires_at": (datetime.utcfromtimestamp(now) + timedelta(seconds=ttl_seconds)).isoformat()}
+        with self._lock:
+            self._entries.set(preview_id, record, now + ttl_seconds, now)
+
+    def get(self, preview_id: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            return self._entries.get(preview_id, self._clock())
+
+    def delete(self, preview_id: str) -> None:
+        with self._lock:
+            self._entries.pop(preview_id)
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """In-process idempotency store, bounded to max_entries.
+
+    A (workspace_id, idempotency_key) -> [action, ...] index makes
+    check_by_key a dict lookup instead of a scan over every stored key.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = ACTIONS_IDEMPOTENCY_MAX_ENTRIES,
+        ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._entries = _ExpiringDict(max_entries, on_evict=self._unindex)
+        self._actions: dict[tuple[str, str], list[str]] = {}
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _unindex(self, entry_key: tuple[str, str, str], _record: Any) -> None:
+        workspace_id, action, idempotency_key = entry_key
+        actions = self._actions.get((workspace_id, idempotency_key))
+        if actions is not None:
+            actions.remove(action)
+            if not actions:
+                del self._actions[(workspace_id, idempotency_key)]
+
+    def check_by_key(self, workspace_id: str, idempotency_key: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            now = self._clock()
+            for action in list(self._actions.get((workspace_id, idempotency_key), ())):
+                record = self._entries.get((workspace_id, action, idempotency_key), now)
+                if record is not None:
+                    return record
+            return None
+
+    def check(self, workspace_id: str, action: str, idempotency_key: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            return self._entries.get((workspace_id, action, idempotency_key), self._clock())
+
+    def reserve(
+        self,
+        workspace_id: str,
+        action: str,
+        idempotency_key: str,
+        run_id: str,
+        ttl_seconds: int = ACTIONS_IDEMPOTENCY_PENDING_TTL_SECONDS,
+    ) -> Optional[dict[str, Any]]:
+        entry_key = (workspace_id, action, idempotency_key)
+        with self._lock:
+            now = self._clock()
+            existing = self._entries.get(entry_key, now)
+            if existing is not None:
+                return existing
+            self._actions.setdefault((workspace_id, idempotency_key), []).append(action)
+            self._entries.set(entry_key, _pending_marker(run_id), now + ttl_seconds, now)
+            return None
+
+    def release(self, workspace_id: str, action: str, idempotency_key: str, run_id: str) -> None:
+        entry_key = (workspace_id, action, idempotency_key)
+        with self._lock:
+            if self._entries.get(entry_key, self._clock()) == _pending_marker(run_id):
+                self._entries.pop(entry_key)
+                self._unindex(entry_key, None)
+
+    def save(self, workspace_id: str, action: str, idempotency_key: str, result: dict[str, Any]) -> dict[str, Any]:
+        entry_key = (workspace_id, action, idempotency_key)
+        with self._lock:
+            now = self._clock()
+            existing = self._entries.get(entry_key, now)
+            if existing is not None and not is_pending(existing):
+                return existing
+            record = {**result, "created_at": datetime.utcfromtimestamp(now).isoformat()}
+            if existing is None:
+                self._actions.setdefault((workspace_id, idempotency_key), []).append(action)
+            self._entries.set(entry_key, record, now + self._ttl_seconds, now)
+            return record
+
+
+class RedisPreviewStore(PreviewStore):
+    """Preview store shared across workers; expiry is Redis's own (SET PX).
+
+    Size is bounded by Redis maxmemory (use a volatile-* eviction policy).
+    """
+
+    def __init__(self, redis_client: Any, key_prefix: str = "actions"):
+        """
+        Initialize Redis preview store.
+
+        Args:
+            redis_client: Redis client instance (redis.Redis or compatible)
+            key_prefix: Redis key prefix for namespacing
+        """
+        self._redis = redis_client
+        self._prefix = f"{key_prefix}:preview:"
+
+    def save(self, preview_id: str, data: dict[str, Any], ttl_seconds: int = PREVIEW_TTL_SECONDS) -> None:
+        expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
+        record = {**data, "expires_at": expires_at.isoformat()}
+        self._redis.set(self._prefix + preview_id, json.dumps(record, default=str), px=ttl_seconds * 1000)
+
+    def get(self, preview_id: str) -> Optional[dict[str, Any]]:
+        raw = self._redis.get(self._prefix + preview_id)
+        return json.loads(raw) if raw else None
+
+    def delete(self, preview_id: str) -> None:
+        self._redis.delete(self._prefix + preview_id)
+
+
+# KEYS[1] = result key, KEYS[2] = action index list
+# ARGV[1] = pending marker JSON, ARGV[2] = marker TTL ms, ARGV[3] = action, ARGV[4] = result TTL ms
+_RESERVE_LUA = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+    redis.call('RPUSH', KEYS[2], ARGV[3])
+    redis.call('PEXPIRE', KEYS[2], ARGV[4])
+    return false
+end
+return redis.call('GET', KEYS[1])
+"""
+
+# KEYS[1] = result key, KEYS[2] = action index list
+# ARGV[1] = pending marker JSON, ARGV[2] = action
+_RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    redis.call('LREM', KEYS[2], 0, ARGV[2])
+end
+return false
+"""
+
+# KEYS[1] = result key, KEYS[2] = action index list
+# ARGV[1] = record JSON, ARGV[2] = TTL ms, ARGV[3] = action
+_SAVE_LUA = """
+local existing = redis.call('GET', KEYS[1])
+if existing and not cjson.decode(existing).pending then
+    return existing
+end
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+if not existing then
+    redis.call('RPUSH', KEYS[2], ARGV[3])
+end
+redis.call('PEXPIRE', KEYS[2], ARGV[2])
+return ARGV[1]
+"""
+
+# KEYS[1] = action index list, KEYS[2..n] = result keys for ARGV[1..n-1] actions.
+# Returns the first live record; expired actions are dropped from the index.
+_CHECK_BY_KEY_LUA = """
+for i, action in ipairs(ARGV) do
+    local value = redis.call('GET', KEYS[i + 1])
+    if value then
+        return value
+    end
+    redis.call('LREM', KEYS[1], 0, action)
+end
+return false
+"""
+
+
+class RedisIdempotencyStore(IdempotencyStore):
+    """Idempotency store shared across workers.
+
+    Layout, with {workspace:key} as a hash tag so one script touches one slot:
+        <prefix>:idem:{workspace:key}          list of actions, in save order
+        <prefix>:idem:{workspace:key}:<action> pending marker or result JSON, expires after TTL
+    """
+
+    def __init__(self, redis_client: Any, key_prefix: str = "actions", ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS):
+        """
+        Initialize Redis idempotency store.
+
+        Args:
+            redis_client: Redis client instance (redis.Redis or compatible)
+            key_prefix: Redis key prefix for namespacing
+            ttl_seconds: How long a saved result is replayed
+        """
+        self._redis = redis_client
+        self._prefix = f"{key_prefix}:idem:"
+        self._ttl_ms = ttl_seconds * 1000
+        self._reserve = redis_client.register_script(_RESERVE_LUA)
+        self._release = redis_client.register_script(_RELEASE_LUA)
+        self._save = redis_client.register_script(_SAVE_LUA)
+        self._check_by_key = redis_client.register_script(_CHECK_BY_KEY_LUA)
+
+    def _index_key(self, workspace_id: str, idempotency_key: str) -> str:
+        return f"{self._prefix}{{{workspace_id}:{idempotency_key}}}"
+
+    def check_by_key(self, workspace_id: str, idempotency_key: str) -> Optional[dict[str, Any]]:
+        # The script only touches keys it is given (Redis Cluster), so list the actions first;
+        # one saved after the LRANGE is newer than those listed and seen by the next call
+        index_key = self._index_key(workspace_id, idempotency_key)
+        actions = [a.decode() if isinstance(a, bytes) else a for a in self._redis.lrange(index_key, 0, -1)]
+        if not actions:
+            return None
+        raw = self._check_by_key(keys=[index_key, *(f"{index_key}:{action}" for action in actions)], args=actions)
+        return json.loads(raw) if raw else None
+
+    def check(self, workspace_id: str, action: str, idempotency_key: str) -> Optional[dict[str, Any]]:
+        raw = self._redis.get(f"{self._index_key(workspace_id, idempotency_key)}:{action}")
+        return json.loads(raw) if raw else None
+
+    def reserve(
+        self,
+        workspace_id: str,
+        action: str,
+        idempotency_key: str,
+        run_id: str,
+        ttl_seconds: int = ACTIONS_IDEMPOTENCY_PENDING_TTL_SECONDS,
+    ) -> Optional[dict[str, Any]]:
+        index_key = self._index_key(workspace_id, idempotency_key)
+        raw = self._reserve(
+            keys=[f"{index_key}:{action}", index_key],
+            args=[json.dumps(_pending_marker(run_id)), ttl_seconds * 1000, action, self._ttl_ms],
+        )
+        return json.loads(raw) if raw else None
+
+    def release(self, workspace_id: str, action: str, idempotency_key: str, run_id: str) -> None:
+        index_key = self._index_key(workspace_id, idempotency_key)
+        self._release(keys=[f"{index_key}:{action}", index_key], args=[json.dumps(_pending_marker(run_id)), action])
+
+    def save(self, workspace_id: str, action: str, idempotency_key: str, result: dict[str, Any]) -> dict[str, Any]:
+        index_key = self._index_key(workspace_id, idempotency_key)
+        record = json.dumps({**result, "created_at": datetime.utcnow().isoformat()}, default=str)
+        raw = self._save(keys=[f"{index_key}:{action}", index_key], args=[record, self._ttl_ms, action])
+        return json.loads(raw)
+
+
+def create_stores(redis_client: Any = None) -> tuple[PreviewStore, IdempotencyStore]:
+    """Build the preview and idempotency stores.
+
+    Args:
+        redis_client: Redis client for the shared backend; None for in-memory
+
+    Returns:
+        (preview_store, idempotency_store)
+    """
+    if redis_client is not None:
+        return RedisPreviewStore(redis_client), RedisIdempotencyStore(redis_client)
+    return MemoryPreviewStore(), MemoryIdempotencyStore()
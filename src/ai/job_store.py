@@ -1,36 +1,57 @@
-"""In-memory job store - Sprint 58 Slice 6.
+"""Job stores - Sprint 58 Slice 6.
 
 Manages job record lifecycle (create, start, finish).
-Thread-safe via asyncio.Lock.
-Designed to be swappable with DB implementation later.
+
+JobStore keeps jobs in memory, split across shards that each have their own
+asyncio.Lock, so writers to different jobs do not queue behind each other.
+Records are immutable (frozen JobRecord, with a frozen result) snapshots:
+readers get the stored object without copying or locking, and every
+transition stores a new record. list_jobs walks an insertion-ordered index
+(per user, per status, or all jobs) backwards and stops after limit matches
+per shard, so it costs O(shards * limit) rather than O(jobs held). Finished (success/failed) jobs are
+evicted after a TTL and beyond a maximum count; pending and running jobs
+are never evicted.
+
+RedisJobStore keeps each job in a Redis hash (plus sorted-set indexes scored
+by created_at, paged with ZREVRANGE) so job status is visible across workers; transitions run as one Lua script, so concurrent
+workers never leave a job in two status sets. The two backends accept the
+same list_jobs filters. get_job_store() uses Redis when
+AI_JOB_STORE_REDIS_URL is set.
 """
 
 import asyncio
+import heapq
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
 from datetime import UTC, datetime
-from typing import Optional
+from itertools import chain
+from typing import Any, Optional
 from uuid import uuid4
 
-from relay_ai.schemas.job import JobRecord, JobStatus
+from pydantic_core import to_jsonable_python
 
+from relay_ai.schemas.job import JobRecord, JobStatus, freeze
 
-class JobStore:
-    """In-memory job store with lifecycle management.
+logger = logging.getLogger(__name__)
 
-    Provides create, start, finish_ok, finish_err, and get operations.
-    Thread-safe using asyncio.Lock for concurrent access.
-    """
+AI_JOB_STORE_SHARDS = int(os.getenv("AI_JOB_STORE_SHARDS", "16"))
+AI_JOB_STORE_MAX_FINISHED = int(os.getenv("AI_JOB_STORE_MAX_FINISHED", "10000"))
+AI_JOB_STORE_FINISHED_TTL_SEC = int(os.getenv("AI_JOB_STORE_FINISHED_TTL_SEC", "3600"))
+AI_JOB_STORE_REDIS_URL = os.getenv("AI_JOB_STORE_REDIS_URL", "")
 
-    def __init__(self):
-        """Initialize store with empty job map."""
-        self._jobs: dict[str, JobRecord] = {}
-        self._lock = asyncio.Lock()
+TERMINAL_STATUSES = frozenset({JobStatus.SUCCESS, JobStatus.FAILED})
 
-    async def create(
-        self,
-        user_id: str,
-        action_id: str,
-        plan_id: Optional[str] = None,
-    ) -> JobRecord:
+
+class BaseJobStore(ABC):
+    """Job record lifecycle: create, start, finish_ok, finish_err, get, list_jobs."""
+
+    @abstractmethod
+    async def create(self, user_id: str, action_id: str, plan_id: Optional[str] = None) -> JobRecord:
         """Create a new job record in PENDING state.
 
         Args:
@@ -41,18 +62,8 @@ async def create(
         Returns:
             Created JobRecord
         """
-        async with self._lock:
-            job = JobRecord(
-                job_id=str(uuid4()),
-                user_id=user_id,
-                action_id=action_id,
-                plan_id=plan_id,
-                status=JobStatus.PENDING,
-                created_at=datetime.now(UTC),
-            )
-            self._jobs[job.job_id] = job
-            return job
 
+    @abstractmethod
     async def start(self, job_id: str) -> Optional[JobRecord]:
         """Transition job to RUNNING state.
 
@@ -62,14 +73,8 @@ async def start(self, job_id: str) -> Optional[JobRecord]:
         Returns:
             Updated JobRecord, or None if not found
         """
-        async with self._lock:
-            job = self._jobs.get(job_id)
-            if job:
-                # Create updated record with started_at timestamp
-                job = JobRecord(**{**job.model_dump(), "status": JobStatus.RUNNING, "started_at": datetime.now(UTC)})
-                self._jobs[job_id] = job
-            return job
 
+    @abstractmethod
     async def finish_ok(self, job_id: str, result: Optional[dict] = None) -> Optional[JobRecord]:
         """Transition job to SUCCESS state with result.
 
@@ -80,20 +85,8 @@ async def finish_ok(self, job_id: str, result: Optional[dict] = None) -> Optiona
         Returns:
             Updated JobRecord, or None if not found
         """
-        async with self._lock:
-            job = self._jobs.get(job_id)
-            if job:
-                job = JobRecord(
-                    **{
-                        **job.model_dump(),
-                        "status": JobStatus.SUCCESS,
-                        "finished_at": datetime.now(UTC),
-                        "result": result,
-                    }
-                )
-                self._jobs[job_id] = job
-            return job
 
+    @abstractmethod
     async def finish_err(self, job_id: str, error: str) -> Optional[JobRecord]:
         """Transition job to FAILED state with error message.
 
@@ -104,20 +97,8 @@ async def finish_err(self, job_id: str, error: str) -> Optional[JobRecord]:
         Returns:
             Updated JobRecord, or None if not found
         """
-        async with self._lock:
-            job = self._jobs.get(job_id)
-            if job:
-                job = JobRecord(
-                    **{
-                        **job.model_dump(),
-                        "status": JobStatus.FAILED,
-                        "finished_at": datetime.now(UTC),
-                        "error": error,
-                    }
-                )
-                self._jobs[job_id] = job
-            return job
 
+    @abstractmethod
     async def get(self, job_id: str) -> Optional[JobRecord]:
         """Retrieve job record by ID.
 
@@ -127,24 +108,427 @@ async def get(self, job_id: str) -> Optional[JobRecord]:
         Returns:
             JobRecord if found, None otherwise
         """
-        async with self._lock:
-            return self._jobs.get(job_id)
+
+    @abstractmethod
+    async def list_jobs(
+        self,
+        user_id: Optional[str] = None,
+        status: Optional[JobStatus] = None,
+        limit: int = 100,
+    ) -> list[JobRecord]:
+        """List jobs, newest first.
+
+        Args:
+            user_id: Only this user's jobs
+            status: Only jobs in this status
+            limit: Maximum jobs returned
+
+        Returns:
+            Matching JobRecords ordered by created_at, newest first
+        """
+
+
+def _new_job(user_id: str, action_id: str, plan_id: Optional[str]) -> JobRecord:
+    return JobRecord(
+        job_id=str(uuid4()),
+        user_id=user_id,
+        action_id=action_id,
+        plan_id=plan_id,
+        status=JobStatus.PENDING,
+        created_at=datetime.now(UTC),
+    )
+
+
+def _newest(jobs: list[JobRecord], limit: int) -> list[JobRecord]:
+    return heapq.nlargest(limit, jobs, key=lambda job: job.created_at)
+
+
+class _Shard:
+    """One lock's worth of jobs, with its indexes and finish-ordered eviction queue."""
+
+    __slots__ = ("lock", "jobs", "by_user", "by_status", "finished")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.jobs: dict[str, JobRecord] = {}
+        # Dicts used as insertion-ordered sets (creation order)
+        self.by_user: dict[str, dict[str, None]] = {}
+        # job_id -> time it entered the status, in that order
+        self.by_status: dict[JobStatus, dict[str, datetime]] = {status: {} for status in JobStatus}
+        # job_id -> clock time it finished, oldest first
+        self.finished: OrderedDict[str, float] = OrderedDict()
+
+    def remove(self, job_id: str) -> None:
+        job = self.jobs.pop(job_id)
+        self.by_status[job.status].pop(job_id, None)
+        user_jobs = self.by_user[job.user_id]
+        user_jobs.pop(job_id, None)
+        if not user_jobs:
+            del self.by_user[job.user_id]
+        self.finished.pop(job_id, None)
+
+
+class JobStore(BaseJobStore):
+    """Sharded in-memory job store with secondary indexes and eviction.
+
+    Writers take their shard's lock; get and list_jobs read without locking
+    (records are immutable and no await happens mid-update).
+    """
+
+    def __init__(
+        self,
+        shards: int = AI_JOB_STORE_SHARDS,
+        max_finished: int = AI_JOB_STORE_MAX_FINISHED,
+        finished_ttl_sec: float = AI_JOB_STORE_FINISHED_TTL_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize store with empty shards.
+
+        Args:
+            shards: Number of independently locked shards
+            max_finished: Finished jobs kept (split evenly across shards)
+            finished_ttl_sec: Seconds a finished job stays readable
+            clock: Monotonic time source (injectable for tests)
+        """
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+        self._max_finished_per_shard = max(1, max_finished // len(self._shards))
+        self.finished_ttl_sec = finished_ttl_sec
+        self._clock = clock
+        self.stats = {"evicted_ttl": 0, "evicted_count": 0}
+
+    def _shard(self, job_id: str) -> _Shard:
+        return self._shards[hash(job_id) % len(self._shards)]
+
+    def _expired(self, shard: _Shard, job_id: str) -> bool:
+        finished_at = shard.finished.get(job_id)
+        return finished_at is not None and self._clock() - finished_at >= self.finished_ttl_sec
+
+    def _evict(self, shard: _Shard) -> None:
+        """Drop finished jobs past the TTL or beyond the shard's share of max_finished."""
+        cutoff = self._clock() - self.finished_ttl_sec
+        while shard.finished:
+            job_id, finished_at = next(iter(shard.finished.items()))
+            if finished_at <= cutoff:
+                self.stats["evicted_ttl"] += 1
+            elif len(shard.finished) > self._max_finished_per_shard:
+                self.stats["evicted_count"] += 1
+            else:
+                break
+            shard.remove(job_id)
+
+    async def create(self, user_id: str, action_id: str, plan_id: Optional[str] = None) -> JobRecord:
+        job = _new_job(user_id, action_id, plan_id)
+        shard = self._shard(job.job_id)
+        async with shard.lock:
+            shard.jobs[job.job_id] = job
+            shard.by_user.setdefault(user_id, {})[job.job_id] = None
+            shard.by_status[JobStatus.PENDING][job.job_id] = job.created_at
+            self._evict(shard)
+            return job
+
+    async def _transition(self, job_id: str, status: JobStatus, **changes: Any) -> Optional[JobRecord]:
+        shard = self._shard(job_id)
+        async with shard.lock:
+            job = shard.jobs.get(job_id)
+            if job is None or self._expired(shard, job_id):
+                return None
+            # Shallow copy: only the changed fields are new
+            updated = job.model_copy(update={"status": status, **changes})
+            shard.jobs[job_id] = updated
+            if job.status != status:
+                shard.by_status[job.status].pop(job_id, None)
+                shard.by_status[status][job_id] = datetime.now(UTC)
+            if status in TERMINAL_STATUSES:
+                shard.finished.pop(job_id, None)
+                shard.finished[job_id] = self._clock()
+                self._evict(shard)
+            return updated
+
+    async def start(self, job_id: str) -> Optional[JobRecord]:
+        return await self._transition(job_id, JobStatus.RUNNING, started_at=datetime.now(UTC))
+
+    async def finish_ok(self, job_id: str, result: Optional[dict] = None) -> Optional[JobRecord]:
+        # model_copy skips validation, so freeze (and detach from the caller) here
+        return await self._transition(job_id, JobStatus.SUCCESS, finished_at=datetime.now(UTC), result=freeze(result))
+
+    async def finish_err(self, job_id: str, error: str) -> Optional[JobRecord]:
+        return await self._transition(job_id, JobStatus.FAILED, finished_at=datetime.now(UTC), error=error)
+
+    async def get(self, job_id: str) -> Optional[JobRecord]:
+        shard = self._shard(job_id)
+        job = shard.jobs.get(job_id)
+        if job is None or self._expired(shard, job_id):
+            return None
+        return job
+
+    async def list_jobs(
+        self,
+        user_id: Optional[str] = None,
+        status: Optional[JobStatus] = None,
+        limit: int = 100,
+    ) -> list[JobRecord]:
+        if limit <= 0:
+            return []
+        matches = []
+        for shard in self._shards:
+            if user_id is None and status is not None:
+                matches.extend(self._newest_in_status(shard, status, limit))
+            else:
+                matches.extend(self._newest_in_index(shard, user_id, status, limit))
+        return _newest(matches, limit)
+
+    def _newest_in_index(
+        self, shard: _Shard, user_id: Optional[str], status: Optional[JobStatus], limit: int
+    ) -> list[JobRecord]:
+        """Walk a creation-ordered index (the user's jobs, or all jobs) newest first."""
+        job_ids = shard.by_user.get(user_id, {}) if user_id is not None else shard.jobs
+        jobs = []
+        for job_id in reversed(job_ids):
+            job = shard.jobs[job_id]
+            if (status is None or job.status == status) and not self._expired(shard, job_id):
+                jobs.append(job)
+                if len(jobs) == limit:
+                    break
+        return jobs
+
+    def _newest_in_status(self, shard: _Shard, status: JobStatus, limit: int) -> list[JobRecord]:
+        """Walk a status index newest entry first, keeping the limit newest by created_at.
+
+        A job enters a status no earlier than it was created, so once the heap
+        is full and entries predate its oldest created_at, nothing older can
+        qualify. PENDING is in creation order and stops after limit jobs.
+        """
+        heap: list[tuple[datetime, str, JobRecord]] = []
+        for job_id, entered in reversed(shard.by_status[status].items()):
+            if len(heap) == limit and entered < heap[0][0]:
+                break
+            if self._expired(shard, job_id):
+                continue
+            job = shard.jobs[job_id]
+            if len(heap) < limit:
+                heapq.heappush(heap, (job.created_at, job_id, job))
+            elif job.created_at > heap[0][0]:
+                heapq.heapreplace(heap, (job.created_at, job_id, job))
+        return [job for _, _, job in heap]
+
+    def get_stats(self) -> dict[str, Any]:
+        """Job counts per status plus eviction counters."""
+        counts = {status.value: sum(len(shard.by_status[status]) for shard in self._shards) for status in JobStatus}
+        return {"jobs": sum(counts.values()), "by_status": counts, "shards": len(self._shards), **self.stats}
+
+
+# KEYS[1] = job hash, KEYS[2] = finished zset, KEYS[3] = all-jobs zset (created_at scores),
+# KEYS[4] = new status zset, KEYS[5..] = other status zsets
+# ARGV[1] = job id, ARGV[2] = finish time ('' unless terminal), ARGV[3] = finished TTL sec,
+# ARGV[4..] = field, JSON value pairs. Returns the updated hash, or false if the job is gone.
+_TRANSITION_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 4))
+local created = redis.call('ZSCORE', KEYS[3], ARGV[1]) or 0
+redis.call('ZADD', KEYS[4], created, ARGV[1])
+for i = 5, #KEYS do
+    redis.call('ZREM', KEYS[i], ARGV[1])
+end
+if ARGV[2] ~= '' then
+    redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+return redis.call('HGETALL', KEYS[1])
+"""
+
+
+class RedisJobStore(BaseJobStore):
+    """Job store shared across workers via Redis (redis.asyncio client).
+
+    Layout under key_prefix:
+    - job:<job_id>: hash of JobRecord fields (JSON-encoded values)
+    - jobs: sorted set of all job ids scored by created_at
+    - user:<user_id>: sorted set of job ids scored by created_at
+    - status:<status>: sorted set of job ids scored by created_at
+    - finished: sorted set of finished job ids scored by finish time
+
+    Finished jobs beyond max_finished or older than finished_ttl_sec are
+    removed after each finish; job hashes also get a Redis TTL, so index
+    entries left by a crashed worker are dropped lazily by list_jobs.
+    Multi-key transactions need a single Redis node (or Sentinel), as for
+    the Redis queue backend.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        key_prefix: str = "ai:jobs",
+        max_finished: int = AI_JOB_STORE_MAX_FINISHED,
+        finished_ttl_sec: int = AI_JOB_STORE_FINISHED_TTL_SEC,
+    ):
+        """Initialize store.
+
+        Args:
+            redis_client: redis.asyncio client (or compatible)
+            key_prefix: Redis key prefix for namespacing
+            max_finished: Finished jobs kept
+            finished_ttl_sec: Seconds a finished job stays readable
+        """
+        self._redis = redis_client
+        self._prefix = key_prefix
+        self.max_finished = max_finished
+        self.finished_ttl_sec = finished_ttl_sec
+        self._transition_script = redis_client.register_script(_TRANSITION_LUA)
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self._prefix}:job:{job_id}"
+
+    def _user_key(self, user_id: str) -> str:
+        return f"{self._prefix}:user:{user_id}"
+
+    def _status_key(self, status: JobStatus) -> str:
+        return f"{self._prefix}:status:{status.value}"
+
+    @staticmethod
+    def _encode(job: JobRecord) -> dict[str, str]:
+        data = job.model_dump(mode="json")
+        return {name: json.dumps(value) for name, value in data.items()}
+
+    @staticmethod
+    def _ids(values: Any) -> list[str]:
+        return [value.decode("utf-8") if isinstance(value, bytes) else value for value in values]
+
+    @classmethod
+    def _decode(cls, data: dict) -> Optional[JobRecord]:
+        if not data:
+            return None
+        return JobRecord.model_validate(dict(zip(cls._ids(data), map(json.loads, data.values()), strict=True)))
+
+    async def create(self, user_id: str, action_id: str, plan_id: Optional[str] = None) -> JobRecord:
+        job = _new_job(user_id, action_id, plan_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._job_key(job.job_id), mapping=self._encode(job))
+            pipe.zadd(f"{self._prefix}:jobs", {job.job_id: job.created_at.timestamp()})
+            pipe.zadd(self._user_key(user_id), {job.job_id: job.created_at.timestamp()})
+            pipe.zadd(self._status_key(JobStatus.PENDING), {job.job_id: job.created_at.timestamp()})
+            await pipe.execute()
+        return job
+
+    async def _transition(self, job_id: str, status: JobStatus, **changes: Any) -> Optional[JobRecord]:
+        # Read-modify-write in one script: a concurrent transition cannot interleave
+        fields = {name: json.dumps(to_jsonable_python(value)) for name, value in {"status": status, **changes}.items()}
+        terminal = status in TERMINAL_STATUSES
+        others = [self._status_key(other) for other in JobStatus if other != status]
+        data = await self._transition_script(
+            keys=[
+                self._job_key(job_id),
+                f"{self._prefix}:finished",
+                f"{self._prefix}:jobs",
+                self._status_key(status),
+                *others,
+            ],
+            args=[job_id, time.time() if terminal else "", self.finished_ttl_sec, *chain.from_iterable(fields.items())],
+        )
+        if not data:
+            return None
+        if terminal:
+            await self._evict()
+        return self._decode(dict(zip(data[::2], data[1::2], strict=True)))
+
+    async def _evict(self) -> None:
+        """Remove finished jobs past the TTL or beyond max_finished."""
+        finished_key = f"{self._prefix}:finished"
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zrangebyscore(finished_key, "-inf", time.time() - self.finished_ttl_sec)
+            pipe.zrange(finished_key, 0, -self.max_finished - 1)
+            expired, excess = await pipe.execute()
+        job_ids = list(dict.fromkeys(self._ids([*expired, *excess])))
+        if not job_ids:
+            return
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.hget(self._job_key(job_id), "user_id")
+            users = await pipe.execute()
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(finished_key, *job_ids)
+            pipe.zrem(f"{self._prefix}:jobs", *job_ids)
+            for job_id, user_id in zip(job_ids, users, strict=True):
+                pipe.delete(self._job_key(job_id))
+                for terminal in TERMINAL_STATUSES:
+                    pipe.zrem(self._status_key(terminal), job_id)
+                if user_id is not None:
+                    pipe.zrem(self._user_key(json.loads(user_id)), job_id)
+            await pipe.execute()
+
+    async def start(self, job_id: str) -> Optional[JobRecord]:
+        return await self._transition(job_id, JobStatus.RUNNING, started_at=datetime.now(UTC))
+
+    async def finish_ok(self, job_id: str, result: Optional[dict] = None) -> Optional[JobRecord]:
+        return await self._transition(job_id, JobStatus.SUCCESS, finished_at=datetime.now(UTC), result=result)
+
+    async def finish_err(self, job_id: str, error: str) -> Optional[JobRecord]:
+        return await self._transition(job_id, JobStatus.FAILED, finished_at=datetime.now(UTC), error=error)
+
+    async def get(self, job_id: str) -> Optional[JobRecord]:
+        return self._decode(await self._redis.hgetall(self._job_key(job_id)))
+
+    async def list_jobs(
+        self,
+        user_id: Optional[str] = None,
+        status: Optional[JobStatus] = None,
+        limit: int = 100,
+    ) -> list[JobRecord]:
+        if limit <= 0:
+            return []
+        # Newest first from a created_at index; with both filters the user's jobs are scanned
+        if user_id is not None:
+            index_key = self._user_key(user_id)
+        elif status is not None:
+            index_key = self._status_key(status)
+        else:
+            index_key = f"{self._prefix}:jobs"
+        scan_all = user_id is not None and status is not None
+        job_ids = await self._redis.zrevrange(index_key, 0, -1 if scan_all else limit - 1)
+
+        job_ids = self._ids(job_ids)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.hgetall(self._job_key(job_id))
+            records = await pipe.execute()
+
+        jobs, dangling = [], []
+        for job_id, data in zip(job_ids, records, strict=True):
+            job = self._decode(data)
+            if job is None:
+                dangling.append(job_id)
+            elif status is None or job.status == status:
+                jobs.append(job)
+        if dangling:
+            await self._redis.zrem(index_key, *dangling)
+        return _newest(jobs, limit)
 
 
 # Global job store singleton (lazy-initialized)
-_JOB_STORE: Optional[JobStore] = None
+_JOB_STORE: Optional[BaseJobStore] = None
 
 
-def get_job_store() -> JobStore:
+def get_job_store() -> BaseJobStore:
     """Get or create the global job store singleton.
 
-    Lazy-initializes on first call. For testing, can be overridden
+    Lazy-initializes on first call: RedisJobStore when AI_JOB_STORE_REDIS_URL
+    is set, otherwise the in-memory JobStore. For testing, can be overridden
     by passing job_store parameter to AIOrchestrator.__init__.
 
     Returns:
-        Global JobStore instance
+        Global job store instance
     """
     global _JOB_STORE
     if _JOB_STORE is None:
-        _JOB_STORE = JobStore()
+        if AI_JOB_STORE_REDIS_URL:
+            try:
+                import redis.asyncio as redis_async
+
+                _JOB_STORE = RedisJobStore(redis_async.from_url(AI_JOB_STORE_REDIS_URL))
+            except ImportError:
+                logger.warning("redis not available; using in-memory job store")
+        if _JOB_STORE is None:
+            _JOB_STORE = JobStore()
     return _JOB_STORE
@@ -1,37 +1,62 @@
 """AI Orchestrator with permissions guards + job tracking - Sprint 58 Slice 6.
 
 Manages action plan execution with role-based permission filtering and job lifecycle tracking.
+Independent plan steps execute concurrently under per-provider limits.
 """
 
+import asyncio
+import os
 import re
+import time
 from collections.abc import Mapping
 from typing import Any, Optional
 from uuid import uuid4
 
-from relay_ai.ai.job_store import JobStore, get_job_store
-from relay_ai.schemas.ai_plan import PlanResult
+from relay_ai.ai.job_store import BaseJobStore, get_job_store
+from relay_ai.schemas.ai_plan import STEP_REFERENCE_PATTERN, PlannedAction, PlanResult
+from relay_ai.schemas.job import JobRecord
 from relay_ai.schemas.permissions import RBACRegistry, default_rbac
 from relay_ai.telemetry import jobs as job_metrics
 
+# Max concurrently executing steps per provider (e.g. gmail, calendar), across plans
+AI_PROVIDER_CONCURRENCY = int(os.getenv("AI_PROVIDER_CONCURRENCY", "4"))
+
 
 class AIOrchestrator:
     """Orchestrator for AI-planned action execution with RBAC + job tracking."""
 
-    def __init__(self, rbac: Optional[RBACRegistry] = None, job_store: Optional[JobStore] = None):
+    def __init__(
+        self,
+        rbac: Optional[RBACRegistry] = None,
+        job_store: Optional[BaseJobStore] = None,
+        provider_limits: Optional[dict[str, int]] = None,
+    ):
         """Initialize orchestrator with optional RBAC registry and job store.
 
         Args:
             rbac: RBAC registry (defaults to built-in roles if None)
             job_store: Job store (defaults to global singleton if None; useful for testing)
+            provider_limits: Per-provider step concurrency (others use AI_PROVIDER_CONCURRENCY)
         """
         self.rbac = rbac or default_rbac()
         self.job_store = job_store or get_job_store()
+        self.provider_limits = provider_limits or {}
+        self._provider_semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def _provider_semaphore(self, action_id: str) -> asyncio.Semaphore:
+        """Concurrency limiter shared by all steps of one provider."""
+        provider = action_id.split(".", 1)[0]
+        semaphore = self._provider_semaphores.get(provider)
+        if semaphore is None:
+            limit = self.provider_limits.get(provider, AI_PROVIDER_CONCURRENCY)
+            semaphore = self._provider_semaphores[provider] = asyncio.Semaphore(limit)
+        return semaphore
 
     def _guard_plan_steps(self, user_id: str, plan: PlanResult) -> PlanResult:
         """Filter plan steps based on user permissions.
 
-        Removes disallowed actions and returns filtered plan.
-        If all steps are filtered, returns empty plan with explanation.
+        Removes disallowed actions (and steps depending on them) and returns
+        filtered plan. If all steps are filtered, returns empty plan with explanation.
 
         Args:
             user_id: User UUID
@@ -43,14 +68,19 @@ def _guard_plan_steps(self, user_id: str, plan: PlanResult) -> PlanResult:
         # Get user permissions
         user_perms = self.rbac.get_user_permissions(user_id)
 
-        # Filter steps
-        allowed_steps = [step for step in plan.steps if user_perms.can_execute(step.action_id)]
+        # Filter steps; a step that depends on a removed step is removed too
+        dependencies = plan.step_dependencies()
+        kept: dict[int, int] = {}  # Original index -> index in filtered plan
+        for idx, step in enumerate(plan.steps):
+            if user_perms.can_execute(step.action_id) and all(dep in kept for dep in dependencies[idx]):
+                kept[idx] = len(kept)
 
         # Return filtered plan (or original if all allowed)
-        if len(allowed_steps) == len(plan.steps):
+        if len(kept) == len(plan.steps):
             return plan
 
-        # Create new plan with allowed steps only
+        # Create new plan with allowed steps only (dependency indices renumbered)
+        allowed_steps = [plan.steps[idx].renumbered(kept) for idx in kept]
         return PlanResult(
             prompt=plan.prompt,
             intent=plan.intent,
@@ -97,6 +127,12 @@ async def execute_plan(
     ) -> dict[str, Any]:
         """Execute plan with pre-execute permission re-check + job tracking.
 
+        Steps run as soon as their dependencies (explicit depends_on, or
+        {{steps.N...}} references in params) have finished, so independent
+        steps run concurrently, limited per provider. A failed step does not
+        stop the plan; only the steps depending on it are skipped. Results are
+        always returned in step order.
+
         Args:
             user_id: User UUID
             plan: Action plan (should be pre-guarded)
@@ -105,7 +141,8 @@ async def execute_plan(
             workspace_id: Workspace UUID
 
         Returns:
-            Execution results per step with job IDs and plan_id
+            Execution results per step with job IDs and plan_id, plus wall and
+            critical-path durations
         """
         # Re-guard: final permission check before execute
         guarded_plan = self._guard_plan_steps(user_id, plan)
@@ -120,95 +157,212 @@ async def execute_plan(
                 "plan_id": plan_id,
             }
 
-        # Execute guarded steps with job tracking
-        results = []
-        for idx, step in enumerate(guarded_plan.steps):
-            # Create job record for this step
-            job = await self.job_store.create(
-                user_id=user_id,
-                action_id=step.action_id,
-                plan_id=plan_id,
+        steps = guarded_plan.steps
+        dependencies = guarded_plan.step_dependencies()
+
+        # One job per step up front, so queued steps are visible as PENDING
+        jobs = [
+            await self.job_store.create(user_id=user_id, action_id=step.action_id, plan_id=plan_id) for step in steps
+        ]
+
+        # Each step waits for its dependencies, then runs under its provider's
+        # concurrency limit; independent steps overlap
+        durations = [0.0] * len(steps)
+        start = time.perf_counter()
+        tasks: list[asyncio.Task] = []
+        for idx, step in enumerate(steps):
+            upstream = [tasks[dep] for dep in dependencies[idx]]
+            tasks.append(
+                asyncio.create_task(
+                    self._run_step(idx, step, jobs[idx], upstream, executor, user_id, workspace_id, durations)
+                )
             )
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
 
-            try:
-                # Mark job as running
-                await self.job_store.start(job.job_id)
-
-                # Execute step
-                preview = executor.preview(step.action_id, step.params)
-                raw_result = await executor.execute(
-                    preview_id=preview.preview_id,
-                    workspace_id=workspace_id,
-                    actor_id=user_id,
-                )
-
-                # Normalize result to dict
-                normalized_result = _normalize_result(raw_result)
-
-                # Emit metrics BEFORE job store mutation (for resilience)
-                job_metrics.inc_job("success")
-                try:
-                    provider = job_metrics._provider_from_action_id(step.action_id)
-                    job_metrics.inc_job_by_provider(provider, "success")
-                except ValueError:
-                    # Skip provider metrics if action_id format is invalid
-                    provider = None
-
-                # Mark job as success with normalized result
-                updated_job = await self.job_store.finish_ok(job.job_id, result=normalized_result)
-
-                # Record latency after job state updated
-                if provider and updated_job and updated_job.started_at and updated_job.finished_at:
-                    latency = (updated_job.finished_at - updated_job.started_at).total_seconds()
-                    job_metrics.observe_job_latency(provider, max(0.0, latency))
-
-                results.append(
-                    {
-                        "step_index": idx,
-                        "action_id": step.action_id,
-                        "job_id": job.job_id,
-                        "status": normalized_result.get("status", "success"),
-                        "result": normalized_result.get("result"),
-                    }
-                )
-            except Exception as e:
-                # Safe error string (regex-based PII scrubbing)
-                error_msg = _safe_error_str(e)
-
-                # Emit metrics BEFORE job store mutation (for resilience)
-                job_metrics.inc_job("failed")
-                try:
-                    provider = job_metrics._provider_from_action_id(step.action_id)
-                    job_metrics.inc_job_by_provider(provider, "failed")
-                except ValueError:
-                    # Skip provider metrics if action_id format is invalid
-                    provider = None
-
-                # Mark job as failed
-                updated_job = await self.job_store.finish_err(job.job_id, error=error_msg)
-
-                # Record latency after job state updated
-                if provider and updated_job and updated_job.started_at and updated_job.finished_at:
-                    latency = (updated_job.finished_at - updated_job.started_at).total_seconds()
-                    job_metrics.observe_job_latency(provider, max(0.0, latency))
-
-                results.append(
-                    {
-                        "step_index": idx,
-                        "action_id": step.action_id,
-                        "job_id": job.job_id,
-                        "status": "failed",
-                        "error": error_msg,
-                    }
-                )
+        duration = time.perf_counter() - start
+        critical_path = _critical_path(durations, dependencies)
+        job_metrics.observe_plan_duration(duration, critical_path)
 
+        results = list(outcomes)  # gather keeps step order
+        skipped = sum(1 for r in results if r["status"] == "skipped")
         return {
             "success": True,
-            "steps_executed": len(results),
+            "steps_executed": len(results) - skipped,
+            "steps_skipped": skipped,
             "results": results,
             "plan_id": plan_id,
+            "duration_seconds": duration,
+            "critical_path_seconds": critical_path,
         }
 
+    async def _run_step(
+        self,
+        idx: int,
+        step: PlannedAction,
+        job: JobRecord,
+        upstream: list[asyncio.Task],
+        executor: Any,
+        user_id: str,
+        workspace_id: str,
+        durations: list[float],
+    ) -> dict[str, Any]:
+        """Run one plan step once its dependencies finish.
+
+        Skipped (job marked failed, nothing executed) if any dependency failed
+        or was skipped. Records the step's execution time in durations[idx].
+
+        Returns:
+            Result entry for the step
+        """
+        upstream_results = {r["step_index"]: r for r in await asyncio.gather(*upstream)}
+        failed = [i for i, r in upstream_results.items() if r["status"] in ("failed", "skipped")]
+        if failed:
+            error_msg = f"Skipped: depends on failed step {', '.join(map(str, failed))}"
+            await self.job_store.finish_err(job.job_id, error=error_msg)
+            return {
+                "step_index": idx,
+                "action_id": step.action_id,
+                "job_id": job.job_id,
+                "status": "skipped",
+                "error": error_msg,
+            }
+
+        async with self._provider_semaphore(step.action_id):
+            started = time.perf_counter()
+            try:
+                return await self._execute_step(idx, step, job, upstream_results, executor, user_id, workspace_id)
+            finally:
+                durations[idx] = time.perf_counter() - started
+
+    async def _execute_step(
+        self,
+        idx: int,
+        step: PlannedAction,
+        job: JobRecord,
+        upstream_results: dict[int, dict[str, Any]],
+        executor: Any,
+        user_id: str,
+        workspace_id: str,
+    ) -> dict[str, Any]:
+        """Execute one step with job tracking and metrics; failures are returned, not raised."""
+        try:
+            # Mark job as running
+            await self.job_store.start(job.job_id)
+
+            # Execute step, filling in references to earlier steps' output
+            params = _resolve_step_references(step.params, upstream_results)
+            preview = executor.preview(step.action_id, params)
+            raw_result = await executor.execute(
+                preview_id=preview.preview_id,
+                workspace_id=workspace_id,
+                actor_id=user_id,
+            )
+
+            # Normalize result to dict
+            normalized_result = _normalize_result(raw_result)
+
+            # Emit metrics BEFORE job store mutation (for resilience)
+            job_metrics.inc_job("success")
+            try:
+                provider = job_metrics._provider_from_action_id(step.action_id)
+                job_metrics.inc_job_by_provider(provider, "success")
+            except ValueError:
+                # Skip provider metrics if action_id format is invalid
+                provider = None
+
+            # Mark job as success with normalized result
+            updated_job = await self.job_store.finish_ok(job.job_id, result=normalized_result)
+
+            # Record latency after job state updated
+            if provider and updated_job and updated_job.started_at and updated_job.finished_at:
+                latency = (updated_job.finished_at - updated_job.started_at).total_seconds()
+                job_metrics.observe_job_latency(provider, max(0.0, latency))
+
+            return {
+                "step_index": idx,
+                "action_id": step.action_id,
+                "job_id": job.job_id,
+                "status": normalized_result.get("status", "success"),
+                "result": normalized_result.get("result"),
+            }
+        except Exception as e:
+            # Safe error string (regex-based PII scrubbing)
+            error_msg = _safe_error_str(e)
+
+            # Emit metrics BEFORE job store mutation (for resilience)
+            job_metrics.inc_job("failed")
+            try:
+                provider = job_metrics._provider_from_action_id(step.action_id)
+                job_metrics.inc_job_by_provider(provider, "failed")
+            except ValueError:
+                # Skip provider metrics if action_id format is invalid
+                provider = None
+
+            # Mark job as failed
+            updated_job = await self.job_store.finish_err(job.job_id, error=error_msg)
+
+            # Record latency after job state updated
+            if provider and updated_job and updated_job.started_at and updated_job.finished_at:
+                latency = (updated_job.finished_at - updated_job.started_at).total_seconds()
+                job_metrics.observe_job_latency(provider, max(0.0, latency))
+
+            return {
+                "step_index": idx,
+                "action_id": step.action_id,
+                "job_id": job.job_id,
+                "status": "failed",
+                "error": error_msg,
+            }
+
+
+def _critical_path(durations: list[float], dependencies: list[list[int]]) -> float:
+    """Longest sum of step durations along any dependency chain.
+
+    Dependencies always point to earlier steps, so one pass in step order suffices.
+    """
+    finish: list[float] = []
+    for idx, duration in enumerate(durations):
+        finish.append(duration + max((finish[dep] for dep in dependencies[idx]), default=0.0))
+    return max(finish, default=0.0)
+
+
+def _resolve_step_references(params: Any, upstream_results: dict[int, dict[str, Any]]) -> Any:
+    """Substitute {{steps.N.path}} references with values from earlier step results.
+
+    A param that is exactly one reference takes the referenced value as-is
+    (any type); references embedded in longer strings are formatted with str().
+
+    Raises:
+        ValueError: If a referenced step or field is missing
+    """
+    if isinstance(params, dict):
+        return {k: _resolve_step_references(v, upstream_results) for k, v in params.items()}
+    if isinstance(params, list):
+        return [_resolve_step_references(v, upstream_results) for v in params]
+    if not isinstance(params, str) or "{{" not in params:
+        return params
+
+    def lookup(match: re.Match) -> Any:
+        value: Any = upstream_results.get(int(match.group(1)))
+        for field in match.group(2).split(".")[1:]:
+            if isinstance(value, Mapping) and field in value:
+                value = value[field]
+            elif isinstance(value, list) and field.isdigit() and int(field) < len(value):
+                value = value[int(field)]
+            else:
+                raise ValueError(f"Unresolved reference {match.group(0)}")
+        if value is None:
+            raise ValueError(f"Unresolved reference {match.group(0)}")
+        return value
+
+    whole = STEP_REFERENCE_PATTERN.fullmatch(params.strip())
+    if whole:
+        return lookup(whole)
+    return STEP_REFERENCE_PATTERN.sub(lambda m: str(lookup(m)), params)
+
 
 def _normalize_result(raw: Any) -> dict[str, Any]:
     """Normalize executor result to dict.
@@ -3,39 +3,45 @@
 Converts natural language prompts into structured action plans.
 Uses LLM to extract intent, parameters, and action sequences.
 
+Plans are cached, keyed by (normalized prompt, context fingerprint, action
+catalog version):
+- Tier 1: in-process LRU with TTL
+- Tier 2 (optional): Redis, shared across workers (PLANNER_CACHE_REDIS_URL)
+Cache hits are re-validated against the current action catalog before use.
+The system prompt is rendered once per catalog version.
+
 Pipeline test: Verifying GitHub → djp-workflow → Relay deployment flow.
 """
 
-from typing import Any, Optional
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional
+
+from pydantic import ValidationError
 
 from relay_ai.schemas.ai_plan import ActionPlan
 from relay_ai.schemas.ai_plan import PlannedAction as ActionStep
 
+logger = logging.getLogger(__name__)
 
-class ActionPlanner:
-    """Plans action sequences from natural language prompts."""
+try:
+    from relay_ai.telemetry.prom import record_ai_planner_cache
+except ImportError:  # Telemetry package unavailable
+    record_ai_planner_cache = None
 
-    def __init__(self):
-        """Initialize planner with available actions."""
-        from relay_ai.actions import get_executor
+PLANNER_CACHE_SIZE = int(os.getenv("PLANNER_CACHE_SIZE", "1000"))
+PLANNER_CACHE_TTL_SEC = int(os.getenv("PLANNER_CACHE_TTL_SEC", "3600"))
+PLANNER_CACHE_REDIS_URL = os.getenv("PLANNER_CACHE_REDIS_URL", "")
 
-        self.executor = get_executor()
-        self.available_actions = self.executor.list_actions()
-
-    async def plan(self, prompt: str, context: Optional[dict[str, Any]] = None) -> ActionPlan:
-        """Generate action plan from natural language prompt.
-
-        Args:
-            prompt: Natural language description of what to do
-            context: Optional context (calendar, email history, etc.)
-
-        Returns:
-            Structured action plan with steps and parameters
-        """
-        # Build system prompt with available actions
-        actions_description = self._format_available_actions()
+_WHITESPACE_RE = re.compile(r"\s+")
 
-        system_prompt = f"""You are an AI assistant that converts natural language requests into structured action plans.
+_SYSTEM_PROMPT_TEMPLATE = """You are an AI assistant that converts natural language requests into structured action plans.
 
 Available actions:
 {actions_description}
@@ -53,6 +59,8 @@ async def plan(self, prompt: str, context: Optional[dict[str, Any]] = None) -> A
 - For email addresses, validate format
 - For dates/times, use ISO 8601 format
 - For multi-step workflows, specify dependencies
+- Leave depends_on null for steps that can run at the same time as the others
+- To use an earlier step's output in a param, write {{{{steps.N.result.<field>}}}} (N = step index)
 
 Output format (JSON):
 {{
@@ -74,13 +82,238 @@ async def plan(self, prompt: str, context: Optional[dict[str, Any]] = None) -> A
 }}
 """
 
+# Rendered system prompts by catalog version (catalogs rarely change; keep a few)
+_SYSTEM_PROMPTS: OrderedDict[str, str] = OrderedDict()
+_MAX_SYSTEM_PROMPTS = 8
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize a prompt for cache keys: NFC, case-folded, collapsed whitespace, no trailing punctuation."""
+    text = _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", prompt).casefold()).strip()
+    return text.rstrip(".!? ")
+
+
+def context_fingerprint(context: Optional[dict[str, Any]]) -> str:
+    """Stable digest of the planning context (empty string when there is none)."""
+    if not context:
+        return ""
+    encoded = json.dumps(context, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def catalog_version(actions: list[dict[str, Any]]) -> str:
+    """Content version of an action catalog; changes whenever any action definition does."""
+    encoded = json.dumps(actions, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def plan_cache_key(prompt: str, context: Optional[dict[str, Any]], version: str) -> str:
+    """Cache key for a plan: catalog version plus a digest of the normalized prompt and context."""
+    digest = hashlib.sha256(f"{normalize_prompt(prompt)}\x00{context_fingerprint(context)}".encode())
+    return f"{version}:{digest.hexdigest()}"
+
+
+class CachedPlan(NamedTuple):
+    """LLM plan output plus what it cost to produce."""
+
+    plan_json: dict[str, Any]
+    llm_seconds: float
+
+
+class PlanCache:
+    """Plan cache: in-memory LRU with TTL over an optional Redis tier.
+
+    Entries are kept serialized in both tiers, so a caller mutating a returned
+    plan never changes what later hits see.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = PLANNER_CACHE_SIZE,
+        ttl_sec: int = PLANNER_CACHE_TTL_SEC,
+        redis_client: Any = None,
+    ):
+        """Initialize cache.
+
+        Args:
+            max_entries: In-memory LRU capacity (0 disables the memory tier)
+            ttl_sec: Expiry for entries in every tier
+            redis_client: redis.asyncio client for the shared tier (None disables)
+        """
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.redis = redis_client
+        self._memory: OrderedDict[str, tuple[float, str | bytes]] = OrderedDict()
+        self.stats = {
+            "requests": 0,
+            "hits_memory": 0,
+            "hits_redis": 0,
+            "misses": 0,
+            "invalid": 0,
+            "saved_llm_seconds": 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    @property
+    def hit_rate(self) -> float:
+        hits = self.stats["hits_memory"] + self.stats["hits_redis"]
+        return hits / self.stats["requests"] if self.stats["requests"] else 0.0
+
+    def get_stats(self) -> dict[str, Any]:
+        return {**self.stats, "hit_rate": self.hit_rate, "cache_entries": len(self._memory)}
+
+    def _remember(self, key: str, value: str | bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = (time.monotonic() + self.ttl_sec, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def get(self, key: str) -> tuple[Optional[CachedPlan], str]:
+        """Look up key tier by tier.
+
+        Returns:
+            (entry, tier) where tier is "memory" or "redis"; (None, "miss") if absent.
+            Redis hits are promoted to memory.
+        """
+        item = self._memory.get(key)
+        if item is not None:
+            if item[0] > time.monotonic():
+                self._memory.move_to_end(key)
+                return CachedPlan(**json.loads(item[1])), "memory"
+            del self._memory[key]
+
+        if self.redis is not None:
+            try:
+                value = await self.redis.get(f"plan:{key}")
+            except Exception as e:
+                logger.warning(f"Planner Redis cache read failed: {e}")
+                value = None
+            if value:
+                self._remember(key, value)
+                return CachedPlan(**json.loads(value)), "redis"
+
+        return None, "miss"
+
+    async def put(self, key: str, entry: CachedPlan) -> None:
+        """Store a plan in every configured tier."""
+        value = json.dumps(entry._asdict(), default=str)
+        self._remember(key, value)
+        if self.redis is not None:
+            try:
+                await self.redis.set(f"plan:{key}", value, ex=self.ttl_sec)
+            except Exception as e:
+                logger.warning(f"Planner Redis cache write failed: {e}")
+
+    async def discard(self, key: str) -> None:
+        """Drop a key from every tier (e.g. a cached plan that no longer validates)."""
+        self._memory.pop(key, None)
+        if self.redis is not None:
+            try:
+                await self.redis.delete(f"plan:{key}")
+            except Exception as e:
+                logger.warning(f"Planner Redis cache delete failed: {e}")
+
+    def record(self, result: str, saved_seconds: float = 0.0) -> None:
+        """Count one lookup: result is "memory", "redis", "miss" or "invalid"."""
+        self.stats["requests"] += 1
+        self.stats["misses" if result == "miss" else "invalid" if result == "invalid" else f"hits_{result}"] += 1
+        self.stats["saved_llm_seconds"] += saved_seconds
+        if record_ai_planner_cache is not None:
+            record_ai_planner_cache(result, self.hit_rate, saved_seconds)
+
+    def clear(self) -> None:
+        self._memory.clear()
+
+
+_plan_cache: Optional[PlanCache] = None
+
+
+def get_plan_cache() -> PlanCache:
+    """Get (or create) the shared plan cache configured from env."""
+    global _plan_cache
+    if _plan_cache is None:
+        redis_client = None
+        if PLANNER_CACHE_REDIS_URL:
+            try:
+                import redis.asyncio as redis_async
+
+                redis_client = redis_async.from_url(PLANNER_CACHE_REDIS_URL)
+            except ImportError:
+                logger.warning("redis not available; planner cache Redis tier disabled")
+        _plan_cache = PlanCache(redis_client=redis_client)
+    return _plan_cache
+
+
+def set_plan_cache(cache: Optional[PlanCache]) -> None:
+    """Replace the shared cache (e.g. with a fresh one in tests)."""
+    global _plan_cache
+    _plan_cache = cache
+
+
+class ActionPlanner:
+    """Plans action sequences from natural language prompts."""
+
+    def __init__(self, cache: Optional[PlanCache] = None):
+        """Initialize planner with available actions.
+
+        Args:
+            cache: Plan cache (defaults to the shared one configured from env)
+        """
+        from relay_ai.actions import get_executor
+
+        self.executor = get_executor()
+        self.available_actions = self.executor.list_actions()
+        self.catalog_version = catalog_version(self.available_actions)
+        self.cache = cache if cache is not None else get_plan_cache()
+
+    @property
+    def system_prompt(self) -> str:
+        """System prompt for the current catalog, rendered once per catalog version."""
+        prompt = _SYSTEM_PROMPTS.get(self.catalog_version)
+        if prompt is None:
+            prompt = _SYSTEM_PROMPT_TEMPLATE.format(actions_description=self._format_available_actions())
+            _SYSTEM_PROMPTS[self.catalog_version] = prompt
+            while len(_SYSTEM_PROMPTS) > _MAX_SYSTEM_PROMPTS:
+                _SYSTEM_PROMPTS.popitem(last=False)
+        return prompt
+
+    async def plan(self, prompt: str, context: Optional[dict[str, Any]] = None) -> ActionPlan:
+        """Generate action plan from natural language prompt.
+
+        Serves repeated prompts from the plan cache when the cached plan
+        still validates against the current action catalog.
+
+        Args:
+            prompt: Natural language description of what to do
+            context: Optional context (calendar, email history, etc.)
+
+        Returns:
+            Structured action plan with steps and parameters
+        """
+        key = plan_cache_key(prompt, context, self.catalog_version)
+        cached, tier = await self.cache.get(key)
+        if cached is not None:
+            plan = self._validated_plan(prompt, cached.plan_json)
+            if plan is not None:
+                self.cache.record(tier, cached.llm_seconds)
+                return plan
+            await self.cache.discard(key)
+            tier = "invalid"
+        self.cache.record(tier)
+
         user_message = f"User request: {prompt}"
 
         if context:
             user_message += f"\n\nContext:\n{self._format_context(context)}"
 
         # Call LLM (using existing DJP infrastructure)
-        plan_json = await self._call_llm(system_prompt, user_message)
+        start = time.perf_counter()
+        plan_json = await self._call_llm(self.system_prompt, user_message)
+        llm_seconds = time.perf_counter() - start
 
         # Parse and validate
         plan = ActionPlan(
@@ -91,15 +324,46 @@ async def plan(self, prompt: str, context: Optional[dict[str, Any]] = None) -> A
             explanation=plan_json["explanation"],
         )
 
+        # Cache only usable plans (not empty or error fallbacks)
+        if plan.steps and self._fits_catalog(plan):
+            await self.cache.put(key, CachedPlan(plan_json, llm_seconds))
+
         return plan
 
+    def _validated_plan(self, prompt: str, plan_json: dict[str, Any]) -> Optional[ActionPlan]:
+        """Build a plan from cached LLM output, or None if it no longer validates."""
+        try:
+            plan = ActionPlan(
+                prompt=prompt,
+                intent=plan_json["intent"],
+                steps=[ActionStep(**step) for step in plan_json["steps"]],
+                confidence=plan_json["confidence"],
+                explanation=plan_json["explanation"],
+            )
+        except (KeyError, TypeError, ValidationError):
+            return None
+        return plan if self._fits_catalog(plan) else None
+
+    def _fits_catalog(self, plan: ActionPlan) -> bool:
+        """Whether every step names a cataloged action and includes its required params."""
+        actions = {action["id"]: action for action in self.available_actions}
+        for step in plan.steps:
+            action = actions.get(step.action_id)
+            if action is None:
+                return False
+            schema = action.get("schema") or action.get("parameters") or {}
+            if any(param not in step.params for param in schema.get("required", [])):
+                return False
+        return True
+
     def _format_available_actions(self) -> str:
         """Format available actions for LLM prompt."""
         lines = []
         for action in self.available_actions:
             lines.append(f"- {action['id']}: {action.get('description', 'No description')}")
-            if action.get("parameters"):
-                params = ", ".join(action["parameters"].get("required", []))
+            schema = action.get("schema") or action.get("parameters")
+            if schema and schema.get("required"):
+                params = ", ".join(schema["required"])
                 lines.append(f"  Required: {params}")
         return "\n".join(lines)
 
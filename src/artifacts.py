@@ -28,6 +28,14 @@
 except ImportError:
     STORAGE_AVAILABLE = False
 
+# Content-addressed dedup for local run artifacts (optional)
+try:
+    from .storage.blob_store import BlobStore, content_digest, is_dedup_enabled
+
+    BLOB_STORE_AVAILABLE = True
+except ImportError:
+    BLOB_STORE_AVAILABLE = False
+
 
 def get_git_sha() -> str:
     """Get current git commit short SHA."""
@@ -278,6 +286,8 @@ def save_run_artifact(artifact: dict[str, Any], runs_dir: Optional[str] = None)
 
     Environment Variables:
         RUNS_DIR: Storage location (local path, s3://, or gs://)
+        STORAGE_DEDUP_ENABLED: Store identical local artifacts once ({runs_dir}/.blobs)
+            and hard-link run files to the shared copy
     """
     # Use env var if not specified
     if runs_dir is None:
@@ -307,6 +317,29 @@ def save_run_artifact(artifact: dict[str, Any], runs_dir: Optional[str] = None)
     runs_path.mkdir(exist_ok=True)
     file_path = runs_path / filename
 
+    if BLOB_STORE_AVAILABLE and is_dedup_enabled():
+        store = BlobStore(runs_path / ".blobs", encrypt=False)
+        data = content.encode("utf-8")
+        previous_digest = None
+        if file_path.exists():
+            previous_digest = content_digest(file_path.read_bytes())
+            if not store.is_linked("runs", previous_digest, file_path):
+                previous_digest = None  # An unlinked copy holds no reference
+
+        digest = store.put("runs", data)
+        if not store.link("runs", digest, file_path):
+            store.release("runs", digest)
+            # Replace rather than write through: the old file may be linked to a blob
+            temp_path = runs_path / f".{filename}.tmp"
+            temp_path.write_bytes(data)
+            temp_path.replace(file_path)
+
+        # Same-minute overwrite: drop the reference the old file held
+        if previous_digest:
+            store.release("runs", previous_digest)
+
+        return str(file_path)
+
     with open(file_path, "w", encoding="utf-8") as f:
         f.write(content)
 
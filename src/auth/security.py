@@ -10,8 +10,6 @@
 import argon2
 from fastapi import HTTPException, Request
 
-from relay_ai.db.connection import get_connection
-
 # Role to scopes mapping (matches CLI)
 ROLE_SCOPES = {
     "admin": ["actions:preview", "actions:execute", "audit:read"],
@@ -48,6 +46,9 @@ async def load_api_key(token: str) -> Optional[tuple[UUID, UUID, list[str]]]:
     Returns:
         Tuple of (key_id, workspace_id, scopes) or None if invalid/revoked
     """
+    # Imported on first use so importing the API does not pull in the DB driver
+    from relay_ai.db.connection import get_connection
+
     async with get_connection() as conn:
         # Fetch all non-revoked keys (we need to check hash)
         # In production with many keys, consider adding key_prefix index
@@ -95,6 +96,8 @@ async def load_user_scopes(user_id: str, workspace_id: UUID) -> list[str]:
     Returns:
         List of scopes derived from role, empty list if no role
     """
+    from relay_ai.db.connection import get_connection
+
     async with get_connection() as conn:
         role_record = await conn.fetchrow(
             """
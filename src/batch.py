@@ -10,9 +10,13 @@
 from typing import Any
 
 from .env_utils import pricing_for
+from .queue_strategy import TaskClass
+from .scale.async_pool import AsyncWorkerPool
+from .scale.worker_pool import Job
 
 # Corpus cache: avoid reloading same corpus across tasks
 _CORPUS_CACHE: dict[str, Any] = {}
+_ACTIVE_CORPUS: str | None = None
 
 
 def load_tasks_from_path(path: str) -> list[dict[str, Any]]:
@@ -42,6 +46,46 @@ def corpus_hash(paths: Iterable[str] | None) -> str:
     return h.hexdigest()[:16]
 
 
+def _corpus_fingerprint(paths: Iterable[str]) -> str:
+    """Cheap cache key from path, size, and mtime (no file reads)."""
+    h = hashlib.sha256()
+    for p in sorted(paths):
+        st = Path(p).stat()
+        h.update(f"{Path(p).resolve()}:{st.st_size}:{st.st_mtime_ns}".encode())
+    return h.hexdigest()[:16]
+
+
+def load_corpus_cached(corpus_paths: list[str] | None) -> list[Any]:
+    """
+    Load corpus documents for a batch, reusing them across tasks.
+
+    The first load refreshes the persistent corpus index (only new or changed
+    files are parsed); later tasks reuse the loaded documents unless the files
+    change on disk.
+
+    Args:
+        corpus_paths: Corpus files (or a single corpus directory)
+
+    Returns:
+        List of corpus.Doc
+    """
+    global _ACTIVE_CORPUS
+    if not corpus_paths:
+        return []
+
+    from .corpus import load_corpus
+
+    key = _corpus_fingerprint(corpus_paths)
+    docs = _CORPUS_CACHE.get(key)
+    # search_corpus() uses the corpus loaded last, so re-activate if another corpus was loaded since
+    if docs is None or _ACTIVE_CORPUS != key:
+        target = corpus_paths[0] if len(corpus_paths) == 1 and Path(corpus_paths[0]).is_dir() else list(corpus_paths)
+        docs = load_corpus(target)
+        _CORPUS_CACHE[key] = docs
+        _ACTIVE_CORPUS = key
+    return docs
+
+
 def estimate_cost(provider: str, prompt_tokens: int, completion_tokens: int) -> float:
     price = pricing_for(provider)
     return (prompt_tokens / 1000.0) * price.get("prompt_per_1k", 0.0) + (completion_tokens / 1000.0) * price.get(
@@ -88,10 +132,6 @@ def _tid(item: dict[str, Any]) -> str:
     # Filter tasks if resuming
     todo = [t for t in tasks if (not resume) or (_tid(t) not in completed)]
 
-    q = asyncio.Queue()
-    for t in todo:
-        q.put_nowait(t)
-
     totals = {"cost": 0.0, "prompt_tokens": 0, "completion_tokens": 0, "runs": 0}
     results = []
     cor_hash = corpus_hash(corpus_paths)
@@ -121,85 +161,81 @@ def _write_progress(done: int, cost: float, pt: int, ct: int):
 
     _write_progress(0, 0.0, 0, 0)
 
-    async def worker(wid: int):
-        nonlocal totals
-        while not q.empty():
-            item = await q.get()
-            task = item.get("task", "")
-            tid = item.get("id", "")
-            # stop if batch cap exceeded
-            if totals["cost"] >= per_batch_cap:
-                q.task_done()
-                continue
-
-            attempt, last_err = 0, None
-            while attempt < 3:
-                try:
-                    t0 = time.time()
-                    result = await run_once_fn(task, corpus_paths, cfg)
-                    dur = time.time() - t0
-                    usage = result.get("usage", []) or []
-
-                    # aggregate usage
-                    cost_run, pt, ct = 0.0, 0, 0
-                    for row in usage:
-                        prov = (row.get("provider") or "").strip()
-                        ptk = int(row.get("prompt_tokens", 0))
-                        ctk = int(row.get("completion_tokens", 0))
-                        pt += ptk
-                        ct += ctk
-                        if prov:
-                            cost_run += estimate_cost(prov, ptk, ctk)
-
-                    # enforce per-run cap
-                    if cost_run > per_run_cap:
-                        status = "blocked_cost_cap"
-                        reason = f"Per-run cap ${per_run_cap:.2f} exceeded (est ${cost_run:.4f})"
-                        cost_run = 0.0
-                    else:
-                        status = result.get("status", "unknown")
-                        reason = result.get("reason", "")
-                        totals["cost"] += cost_run
-                        totals["prompt_tokens"] += pt
-                        totals["completion_tokens"] += ct
-                        totals["runs"] += 1
-
-                    out = {
-                        "id": tid,
-                        "task": task,
-                        "duration_s": round(dur, 3),
-                        "status": status,
-                        "provider": result.get("provider", ""),
-                        "text": result.get("text", ""),
-                        "reason": reason,
-                        "usage": usage,
-                        "cost_estimate": round(cost_run, 6),
-                        "corpus_hash": cor_hash,
-                    }
-                    results.append(out)
-                    # Update progress
-                    _write_progress(
-                        totals["runs"], totals["cost"], totals["prompt_tokens"], totals["completion_tokens"]
-                    )
-                    # save each result
-                    Path(save_dir, f"batch-{int(time.time()*1000)}-{tid or 'x'}.json").write_text(
-                        json.dumps(out, indent=2), encoding="utf-8"
-                    )
-                    break
-                except Exception as e:
-                    last_err = e
-                    await asyncio.sleep(0.8 * (attempt + 1))
-                    attempt += 1
-
-            if attempt == 3 and last_err:
-                results.append({"id": tid, "task": task, "error": str(last_err), "status": "failed"})
-
-            q.task_done()
-
-    workers = [asyncio.create_task(worker(i)) for i in range(max(1, int(concurrency)))]
-    await q.join()
-    for w in workers:
-        w.cancel()
+    async def run_item(item: dict[str, Any]):
+        task = item.get("task", "")
+        tid = item.get("id", "")
+        # stop if batch cap exceeded
+        if totals["cost"] >= per_batch_cap:
+            return
+
+        attempt, last_err = 0, None
+        while attempt < 3:
+            try:
+                t0 = time.time()
+                result = await run_once_fn(task, corpus_paths, cfg)
+                dur = time.time() - t0
+                usage = result.get("usage", []) or []
+
+                # aggregate usage
+                cost_run, pt, ct = 0.0, 0, 0
+                for row in usage:
+                    prov = (row.get("provider") or "").strip()
+                    ptk = int(row.get("prompt_tokens", 0))
+                    ctk = int(row.get("completion_tokens", 0))
+                    pt += ptk
+                    ct += ctk
+                    if prov:
+                        cost_run += estimate_cost(prov, ptk, ctk)
+
+                # enforce per-run cap
+                if cost_run > per_run_cap:
+                    status = "blocked_cost_cap"
+                    reason = f"Per-run cap ${per_run_cap:.2f} exceeded (est ${cost_run:.4f})"
+                    cost_run = 0.0
+                else:
+                    status = result.get("status", "unknown")
+                    reason = result.get("reason", "")
+                    totals["cost"] += cost_run
+                    totals["prompt_tokens"] += pt
+                    totals["completion_tokens"] += ct
+                    totals["runs"] += 1
+
+                out = {
+                    "id": tid,
+                    "task": task,
+                    "duration_s": round(dur, 3),
+                    "status": status,
+                    "provider": result.get("provider", ""),
+                    "text": result.get("text", ""),
+                    "reason": reason,
+                    "usage": usage,
+                    "cost_estimate": round(cost_run, 6),
+                    "corpus_hash": cor_hash,
+                }
+                results.append(out)
+                # Update progress
+                _write_progress(totals["runs"], totals["cost"], totals["prompt_tokens"], totals["completion_tokens"])
+                # save each result
+                Path(save_dir, f"batch-{int(time.time()*1000)}-{tid or 'x'}.json").write_text(
+                    json.dumps(out, indent=2), encoding="utf-8"
+                )
+                break
+            except Exception as e:
+                last_err = e
+                await asyncio.sleep(0.8 * (attempt + 1))
+                attempt += 1
+
+        if attempt == 3 and last_err:
+            results.append({"id": tid, "task": task, "error": str(last_err), "status": "failed"})
+
+    pool = AsyncWorkerPool(initial_workers=max(1, int(concurrency)))
+    await pool.start()
+    for i, item in enumerate(todo):
+        await pool.submit_job(
+            Job(job_id=f"batch-{i}", task=run_item, args=(item,), kwargs={}, task_class=TaskClass.BULK)
+        )
+    await pool.join()
+    await pool.shutdown()
 
     # Final progress write
     _write_progress(totals["runs"], totals["cost"], totals["prompt_tokens"], totals["completion_tokens"])
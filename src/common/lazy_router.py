@@ -0,0 +1,119 @@
+"""
+Lazily imported routers for FastAPI apps.
+
+A router module (and everything it pulls in: database clients, embedding
+providers, ...) is only imported when the first request under its prefix
+arrives, so workers do not pay for subsystems they never serve.
+
+Usage:
+    include_lazy_router(app, "relay_ai.knowledge.api", prefix="/api/v1/knowledge")
+
+Set WEBAPI_EAGER_ROUTERS=true to import every router at startup instead
+(e.g. to warm a pre-forking server before it forks).
+"""
+
+import importlib
+import os
+import threading
+
+from fastapi import APIRouter, FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+WEBAPI_EAGER_ROUTERS = os.getenv("WEBAPI_EAGER_ROUTERS", "false").lower() in ("true", "1", "yes")
+
+
+class LazyRouter(BaseRoute):
+    """Placeholder route that imports the real router on first match.
+
+    Once loaded, the placeholder is replaced in the app's route table by the
+    router's own routes, so later requests route exactly as if the router had
+    been included eagerly.
+    """
+
+    def __init__(self, app: FastAPI, module: str, attribute: str = "router", prefix: str = "") -> None:
+        self.app = app
+        self.module = module
+        self.attribute = attribute
+        self.prefix = prefix
+        self.routes: list[BaseRoute] | None = None
+        self._lock = threading.Lock()
+
+    def load(self) -> list[BaseRoute]:
+        """Import the router and splice its routes in place of this placeholder."""
+        with self._lock:
+            if self.routes is None:
+                router = getattr(importlib.import_module(self.module), self.attribute)
+                holder = APIRouter()
+                holder.include_router(router)
+                routes = self.app.router.routes
+                if self in routes:
+                    index = routes.index(self)
+                    routes[index : index + 1] = holder.routes
+                self.app.openapi_schema = None  # Regenerate with the new routes
+                self.routes = holder.routes
+        return self.routes
+
+    def matches(self, scope: Scope) -> tuple[Match, Scope]:
+        if scope["type"] not in ("http", "websocket") or not scope["path"].startswith(self.prefix):
+            return Match.NONE, {}
+        best = Match.NONE
+        for route in self.load():
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return Match.FULL, {}
+            if match == Match.PARTIAL:
+                best = Match.PARTIAL
+        return best, {}
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Only reached for the request that triggered loading; re-match against the real routes
+        partial = None
+        for route in self.load():
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                scope["route"] = route
+                scope.update(child_scope)
+                await route.handle(scope, receive, send)
+                return
+            if match == Match.PARTIAL and partial is None:
+                partial = (route, child_scope)
+        if partial is not None:
+            route, child_scope = partial
+            scope["route"] = route
+            scope.update(child_scope)
+            await route.handle(scope, receive, send)
+
+    def url_path_for(self, name: str, /, **path_params):
+        for route in self.routes or ():
+            try:
+                return route.url_path_for(name, **path_params)
+            except NoMatchFound:
+                pass
+        raise NoMatchFound(name, path_params)
+
+
+def include_lazy_router(app: FastAPI, module: str, attribute: str = "router", prefix: str = "") -> LazyRouter:
+    """Register a router to be imported on the first request under prefix.
+
+    Args:
+        app: Application to add the router to
+        module: Dotted module path holding the router
+        attribute: Name of the APIRouter in that module
+        prefix: Path prefix all of the router's routes share (the router's own prefix)
+
+    Returns:
+        The placeholder route
+    """
+    route = LazyRouter(app, module, attribute, prefix)
+    app.router.routes.append(route)
+    if WEBAPI_EAGER_ROUTERS:
+        route.load()
+    return route
+
+
+def load_lazy_routers(app: FastAPI) -> None:
+    """Import every router still pending, e.g. before generating the OpenAPI schema."""
+    for route in list(app.router.routes):
+        if isinstance(route, LazyRouter):
+            route.load()
@@ -0,0 +1,86 @@
+"""
+Request body size limit middleware (Sprint 58 hardening).
+
+Counts body bytes as they arrive instead of buffering the body or trusting
+Content-Length, and answers 413 once the limit is crossed.
+"""
+
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Sprint 58 Slice 5: Request body size limit (512 KiB for security hardening)
+MAX_BODY_BYTES = 512 * 1024
+BODY_TOO_LARGE_MESSAGE = "Request body too large (max 512 KiB)"
+
+
+class _BodyTooLarge(HTTPException):
+    """Raised from receive() once the body passes MAX_BODY_BYTES.
+
+    An HTTPException so FastAPI's body parsing re-raises it instead of
+    turning it into a 400.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(status_code=413, detail=BODY_TOO_LARGE_MESSAGE)
+
+
+class BodySizeLimitMiddleware:
+    """Middleware to limit request body size (Sprint 58 hardening).
+
+    Pure ASGI: bytes are counted as the body arrives rather than buffered up
+    front, so Content-Length is only a shortcut and is not trusted. A declared
+    length over the limit is rejected before the app runs; a streamed body is
+    rejected as soon as it crosses the limit, provided the app has not started
+    its response yet.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_bytes: int = MAX_BODY_BYTES) -> None:
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.max_body_bytes:
+                    await self._reject(scope, receive, send)
+                    return
+                break
+
+        received = 0
+        response_started = False
+        rejected = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, rejected
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    if not response_started and not rejected:
+                        rejected = True
+                        await self._reject(scope, receive, send)
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if rejected:
+                return  # Already answered 413; drop the app's error response
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except _BodyTooLarge:
+            if not rejected:
+                raise
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send) -> None:
+        await Response(BODY_TOO_LARGE_MESSAGE, status_code=413)(scope, receive, send)
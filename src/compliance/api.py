@@ -5,17 +5,49 @@
 All operations are tenant-scoped, RBAC-enforced, and audited.
 
 Sprint 33B: Added classification and encryption support.
+
+Event stores are processed by the streaming engine in engine.py.
 """
 
 import json
 import os
+from collections.abc import Iterator
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
 from relay_ai.classify.policy import export_allowed
-
+from relay_ai.storage import manifest as storage_manifest
+from relay_ai.storage.tiered_store import (
+    VALID_TIERS,
+    ArtifactNotFoundError,
+    get_base_storage_path,
+    list_artifacts,
+    purge_artifact,
+)
+
+from .engine import (
+    EVENT_SOURCES,
+    EventSource,
+    delete_source,
+    export_source,
+    prune_source,
+    run_concurrently,
+    source_files,
+    source_path,
+)
 from .holds import is_on_hold
 
+COMPLIANCE_EXPORT_COMPRESS = os.getenv("COMPLIANCE_EXPORT_COMPRESS", "false").lower() in ("true", "1", "yes")
+
+# (window env var, event source key, default days)
+RETENTION_WINDOWS = (
+    ("RETAIN_ORCH_EVENTS_DAYS", "orch_events", 90),
+    ("RETAIN_QUEUE_EVENTS_DAYS", "queue_events", 60),
+    ("RETAIN_COST_EVENTS_DAYS", "cost_events", 180),
+    ("RETAIN_GOV_EVENTS_DAYS", "gov_events", 365),
+    ("RETAIN_CHECKPOINTS_DAYS", "approval_events", 90),
+)
+
 
 def check_rbac(operation: str, required_role: str = "Compliance") -> None:
     """
@@ -55,7 +87,7 @@ def check_rbac(operation: str, required_role: str = "Compliance") -> None:
         raise PermissionError(f"{operation} requires {required_role} role or higher, but user has {user_role}")
 
 
-def export_tenant(tenant: str, out_dir: Path) -> dict:
+def export_tenant(tenant: str, out_dir: Path, *, compress: bool | None = None) -> dict:
     """
     Export all tenant-scoped data to deterministic bundle.
 
@@ -67,9 +99,14 @@ def export_tenant(tenant: str, out_dir: Path) -> dict:
     - Cost and governance events
     - Template registry entries
 
+    Event stores are streamed in a single pass each, concurrently, straight
+    into the bundle; files the tenant index says hold no records for the
+    tenant are skipped.
+
     Args:
         tenant: Tenant ID
         out_dir: Output directory for export bundle
+        compress: Write event files as .jsonl.gz (defaults to COMPLIANCE_EXPORT_COMPRESS)
 
     Returns:
         Dict with export summary and counts
@@ -79,74 +116,36 @@ def export_tenant(tenant: str, out_dir: Path) -> dict:
     """
     check_rbac("export", "Auditor")
 
+    if compress is None:
+        compress = COMPLIANCE_EXPORT_COMPRESS
+
     # Create export bundle directory
     timestamp = datetime.now(UTC).strftime("%Y-%m-%d")
     export_path = out_dir / f"{tenant}-export-{timestamp}"
     export_path.mkdir(parents=True, exist_ok=True)
 
     counts = {}
+    files = []
 
-    # 1. Export tiered storage artifacts (by reference, not copies)
+    # 1. Export tiered storage artifacts (by reference, not copies). Runs first
+    # so export_denied governance events are part of the governance export.
     artifact_refs = _collect_artifact_refs(tenant)
     if artifact_refs:
         with open(export_path / "artifacts.json", "w", encoding="utf-8") as f:
             json.dump(artifact_refs, f, indent=2)
+        files.append("artifacts.json")
     counts["artifacts"] = len(artifact_refs)
 
-    # 2. Export orchestrator events
-    orch_events = _collect_jsonl_entries(
-        Path(os.getenv("ORCH_EVENTS_PATH", "logs/orchestrator_events.jsonl")),
-        tenant_filter=tenant,
-    )
-    if orch_events:
-        with open(export_path / "orchestrator_events.jsonl", "w", encoding="utf-8") as f:
-            for event in orch_events:
-                f.write(json.dumps(event) + "\n")
-    counts["orch_events"] = len(orch_events)
-
-    # 3. Export queue events
-    queue_events = _collect_jsonl_entries(
-        Path(os.getenv("QUEUE_EVENTS_PATH", "logs/queue_events.jsonl")),
-        tenant_filter=tenant,
-    )
-    if queue_events:
-        with open(export_path / "queue_events.jsonl", "w", encoding="utf-8") as f:
-            for event in queue_events:
-                f.write(json.dumps(event) + "\n")
-    counts["queue_events"] = len(queue_events)
-
-    # 4. Export cost events
-    cost_events = _collect_jsonl_entries(
-        Path(os.getenv("COST_LOG_PATH", "logs/cost_events.jsonl")),
-        tenant_filter=tenant,
-    )
-    if cost_events:
-        with open(export_path / "cost_events.jsonl", "w", encoding="utf-8") as f:
-            for event in cost_events:
-                f.write(json.dumps(event) + "\n")
-    counts["cost_events"] = len(cost_events)
-
-    # 5. Export approval/checkpoint events
-    approval_events = _collect_jsonl_entries(
-        Path(os.getenv("APPROVALS_LOG_PATH", "logs/approvals.jsonl")),
-        tenant_filter=tenant,
-    )
-    if approval_events:
-        with open(export_path / "approval_events.jsonl", "w", encoding="utf-8") as f:
-            for event in approval_events:
-                f.write(json.dumps(event) + "\n")
-    counts["approval_events"] = len(approval_events)
-
-    # 6. Export governance events
-    gov_events = _collect_jsonl_entries(
-        Path(os.getenv("GOV_EVENTS_PATH", "logs/governance_events.jsonl")),
-        tenant_filter=tenant,
-    )
-    if gov_events:
-        with open(export_path / "governance_events.jsonl", "w", encoding="utf-8") as f:
-            for event in gov_events:
-                f.write(json.dumps(event) + "\n")
-    counts["gov_events"] = len(gov_events)
+    # 2. Export event stores
+    def export_one(source: EventSource) -> tuple[int, Path | None]:
+        return export_source(
+            source_files(source_path(source)), tenant, export_path / source.export_name, compress=compress
+        )
+
+    for source, (count, written) in zip(EVENT_SOURCES, run_concurrently(export_one, EVENT_SOURCES), strict=True):
+        counts[source.key] = count
+        if written is not None:
+            files.append(written.name)
 
     # Write export manifest
     manifest = {
@@ -155,6 +154,8 @@ def export_tenant(tenant: str, out_dir: Path) -> dict:
         "export_path": str(export_path),
         "counts": counts,
         "total_items": sum(counts.values()),
+        "files": files,
+        "compressed": compress,
     }
 
     with open(export_path / "manifest.json", "w", encoding="utf-8") as f:
@@ -167,6 +168,9 @@ def delete_tenant(tenant: str, *, dry_run: bool = False, respect_legal_hold: boo
     """
     Delete all tenant-scoped data.
 
+    Each event store file holding the tenant is rewritten once, atomically;
+    dry runs are answered from the tenant index without reading the stores.
+
     Args:
         tenant: Tenant ID
         dry_run: If True, report what would be deleted without deleting
@@ -188,48 +192,14 @@ def delete_tenant(tenant: str, *, dry_run: bool = False, respect_legal_hold: boo
     counts = {}
 
     # 1. Delete tiered storage artifacts
-    artifact_count = _delete_artifacts(tenant, dry_run=dry_run)
-    counts["artifacts"] = artifact_count
-
-    # 2. Delete orchestrator events
-    orch_count = _delete_jsonl_entries(
-        Path(os.getenv("ORCH_EVENTS_PATH", "logs/orchestrator_events.jsonl")),
-        tenant_filter=tenant,
-        dry_run=dry_run,
-    )
-    counts["orch_events"] = orch_count
-
-    # 3. Delete queue events
-    queue_count = _delete_jsonl_entries(
-        Path(os.getenv("QUEUE_EVENTS_PATH", "logs/queue_events.jsonl")),
-        tenant_filter=tenant,
-        dry_run=dry_run,
-    )
-    counts["queue_events"] = queue_count
-
-    # 4. Delete cost events
-    cost_count = _delete_jsonl_entries(
-        Path(os.getenv("COST_LOG_PATH", "logs/cost_events.jsonl")),
-        tenant_filter=tenant,
-        dry_run=dry_run,
-    )
-    counts["cost_events"] = cost_count
-
-    # 5. Delete approval/checkpoint events
-    approval_count = _delete_jsonl_entries(
-        Path(os.getenv("APPROVALS_LOG_PATH", "logs/approvals.jsonl")),
-        tenant_filter=tenant,
-        dry_run=dry_run,
-    )
-    counts["approval_events"] = approval_count
-
-    # 6. Delete governance events
-    gov_count = _delete_jsonl_entries(
-        Path(os.getenv("GOV_EVENTS_PATH", "logs/governance_events.jsonl")),
-        tenant_filter=tenant,
-        dry_run=dry_run,
-    )
-    counts["gov_events"] = gov_count
+    counts["artifacts"] = _delete_artifacts(tenant, dry_run=dry_run)
+
+    # 2. Delete event store entries
+    def delete_one(source: EventSource) -> int:
+        return delete_source(source_files(source_path(source)), tenant, dry_run=dry_run)
+
+    for source, count in zip(EVENT_SOURCES, run_concurrently(delete_one, EVENT_SOURCES), strict=True):
+        counts[source.key] = count
 
     return {
         "tenant": tenant,
@@ -253,6 +223,9 @@ def enforce_retention(now: datetime | None = None) -> dict:
     - RETAIN_COST_EVENTS_DAYS (default: 180)
     - RETAIN_GOV_EVENTS_DAYS (default: 365)
 
+    Time-partitioned segments older than the window are unlinked whole; files
+    entirely inside the window are not rewritten.
+
     Args:
         now: Current time (defaults to UTC now, overridable for testing)
 
@@ -267,35 +240,18 @@ def enforce_retention(now: datetime | None = None) -> dict:
     if now is None:
         now = datetime.now(UTC)
 
-    counts = {}
+    sources = {source.key: source for source in EVENT_SOURCES}
 
-    # Define retention windows
-    retention_configs = [
-        ("RETAIN_ORCH_EVENTS_DAYS", "logs/orchestrator_events.jsonl", 90),
-        ("RETAIN_QUEUE_EVENTS_DAYS", "logs/queue_events.jsonl", 60),
-        ("RETAIN_COST_EVENTS_DAYS", "logs/cost_events.jsonl", 180),
-        ("RETAIN_GOV_EVENTS_DAYS", "logs/governance_events.jsonl", 365),
-        ("RETAIN_CHECKPOINTS_DAYS", "logs/approvals.jsonl", 90),
-    ]
-
-    for env_var, default_path, default_days in retention_configs:
-        days = int(os.getenv(env_var, str(default_days)))
-        cutoff = now - timedelta(days=days)
-
-        # Get path from env or use default
-        if "ORCH" in env_var:
-            path = Path(os.getenv("ORCH_EVENTS_PATH", default_path))
-        elif "QUEUE" in env_var:
-            path = Path(os.getenv("QUEUE_EVENTS_PATH", default_path))
-        elif "COST" in env_var:
-            path = Path(os.getenv("COST_LOG_PATH", default_path))
-        elif "GOV" in env_var:
-            path = Path(os.getenv("GOV_EVENTS_PATH", default_path))
-        else:
-            path = Path(os.getenv("APPROVALS_LOG_PATH", default_path))
+    def prune_one(window: tuple[str, str, int]) -> int:
+        env_var, key, default_days = window
+        cutoff = now - timedelta(days=int(os.getenv(env_var, str(default_days))))
+        path = source_path(sources[key])
+        return prune_source(source_files(path), path, cutoff)
 
-        purged = _prune_jsonl_by_date(path, cutoff)
-        counts[env_var] = purged
+    counts = {
+        window[0]: purged
+        for window, purged in zip(RETENTION_WINDOWS, run_concurrently(prune_one, RETENTION_WINDOWS), strict=True)
+    }
 
     return {
         "enforced_at": now.isoformat(),
@@ -307,6 +263,33 @@ def enforce_retention(now: datetime | None = None) -> dict:
 # Helper functions
 
 
+def _tenant_artifacts(tenant: str) -> Iterator[tuple[str, Path, dict | None]]:
+    """
+    Yield (tier, path, store row) for every tenant artifact.
+
+    Artifacts written through storage.tiered_store come from its manifest-aware
+    listing, so their blob digests and manifest rows are known. Loose *.md files
+    under <tier>/<tenant> that the store does not track are yielded with row None.
+    """
+    storage_base = get_base_storage_path()
+    if not storage_base.is_dir():
+        return
+
+    for tier in VALID_TIERS:
+        rows = list_artifacts(tier, tenant_id=tenant)
+        managed = {Path(row["path"]) for row in rows}
+        for row in rows:
+            yield tier, Path(row["path"]), row
+
+        tenant_path = storage_base / tier / tenant
+        if not tenant_path.is_dir():
+            continue
+
+        for artifact_file in tenant_path.rglob("*.md"):
+            if artifact_file not in managed:
+                yield tier, artifact_file, None
+
+
 def _collect_artifact_refs(tenant: str, user_clearance: str | None = None) -> list[dict]:
     """
     Collect artifact file references for tenant (not full copies).
@@ -322,7 +305,7 @@ def _collect_artifact_refs(tenant: str, user_clearance: str | None = None) -> li
     """
     refs = []
     denied_count = 0
-    storage_base = Path(os.getenv("STORAGE_BASE_PATH", "artifacts"))
+    storage_base = get_base_storage_path()
 
     if user_clearance is None:
         user_clearance = os.getenv("USER_CLEARANCE", "Operator")
@@ -330,60 +313,59 @@ def _collect_artifact_refs(tenant: str, user_clearance: str | None = None) -> li
     require_labels = os.getenv("REQUIRE_LABELS_FOR_EXPORT", "false").lower() in ("true", "1", "yes")
     export_policy = os.getenv("EXPORT_POLICY", "deny")  # deny|redact
 
-    for tier in ["hot", "warm", "cold"]:
-        tier_path = storage_base / tier
-        if not tier_path.exists():
-            continue
-
-        # Scan for tenant artifacts
-        for artifact_file in tier_path.rglob("*.md"):
-            # Check if artifact belongs to tenant (simple heuristic: tenant in path or metadata)
-            if tenant in str(artifact_file):
-                # Check for classification metadata
-                sidecar_path = artifact_file.with_suffix(artifact_file.suffix + ".json")
-                label = None
-                if sidecar_path.exists():
-                    try:
-                        meta = json.loads(sidecar_path.read_text(encoding="utf-8"))
-                        label = meta.get("label")
-                    except (json.JSONDecodeError, OSError):
-                        pass
-
-                # Check export policy
-                if not export_allowed(label, user_clearance, require_labels):
-                    denied_count += 1
-                    # Log governance event for denied export
-                    _log_governance_event(
-                        {
-                            "event": "export_denied",
-                            "tenant": tenant,
-                            "artifact": str(artifact_file),
-                            "label": label,
-                            "user_clearance": user_clearance,
-                            "reason": "unlabeled" if label is None else "insufficient_clearance",
-                            "policy": export_policy,
-                        }
-                    )
-
-                    if export_policy == "deny":
-                        continue  # Skip this artifact
-                    # elif export_policy == "redact": include with redacted flag
-
-                ref = {
-                    "path": str(artifact_file.relative_to(storage_base)),
-                    "tier": tier,
-                    "size_bytes": artifact_file.stat().st_size if artifact_file.exists() else 0,
+    for tier, artifact_file, row in _tenant_artifacts(tenant):
+        # Check for classification metadata (store metadata, then classification sidecar)
+        store_meta = (row or {}).get("metadata") or {}
+        label = store_meta.get("label")
+        sidecar_path = artifact_file.with_suffix(artifact_file.suffix + ".json")
+        if label is None and sidecar_path.exists():
+            try:
+                meta = json.loads(sidecar_path.read_text(encoding="utf-8"))
+                label = meta.get("label")
+            except (json.JSONDecodeError, OSError):
+                pass
+
+        # Check export policy
+        if not export_allowed(label, user_clearance, require_labels):
+            denied_count += 1
+            # Log governance event for denied export
+            _log_governance_event(
+                {
+                    "event": "export_denied",
+                    "tenant": tenant,
+                    "artifact": str(artifact_file),
+                    "label": label,
+                    "user_clearance": user_clearance,
+                    "reason": "unlabeled" if label is None else "insufficient_clearance",
+                    "policy": export_policy,
                 }
+            )
+
+            if export_policy == "deny":
+                continue  # Skip this artifact
+            # elif export_policy == "redact": include with redacted flag
+
+        ref = {
+            "path": str(artifact_file.relative_to(storage_base)),
+            "tier": tier,
+        }
+        if row is None:
+            ref["size_bytes"] = artifact_file.stat().st_size if artifact_file.exists() else 0
+        else:
+            # The tier file may be a compressed payload or a blob reference; report the content itself
+            ref["size_bytes"] = store_meta.get("_size_bytes", row["size_bytes"])
+            if store_meta.get("_blob_digest"):
+                ref["blob_digest"] = store_meta["_blob_digest"]
 
-                # Include label if present
-                if label:
-                    ref["label"] = label
+        # Include label if present
+        if label:
+            ref["label"] = label
 
-                # Mark as redacted if policy is redact
-                if export_policy == "redact" and label and not export_allowed(label, user_clearance, False):
-                    ref["redacted"] = True
+        # Mark as redacted if policy is redact
+        if export_policy == "redact" and label and not export_allowed(label, user_clearance, False):
+            ref["redacted"] = True
 
-                refs.append(ref)
+        refs.append(ref)
 
     # Log denied count if any
     if denied_count > 0:
@@ -401,125 +383,32 @@ def _collect_artifact_refs(tenant: str, user_clearance: str | None = None) -> li
     return refs
 
 
-def _collect_jsonl_entries(path: Path, tenant_filter: str | None = None) -> list[dict]:
-    """Collect JSONL entries, optionally filtered by tenant."""
-    if not path.exists():
-        return []
-
-    entries = []
-    with open(path, encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-
-            try:
-                entry = json.loads(line)
-                if tenant_filter is None or entry.get("tenant") == tenant_filter:
-                    entries.append(entry)
-            except json.JSONDecodeError:
-                continue
-
-    return entries
-
-
 def _delete_artifacts(tenant: str, dry_run: bool = False) -> int:
-    """Delete tenant artifacts from tiered storage."""
+    """
+    Delete tenant artifacts from tiered storage.
+
+    Store artifacts go through tiered_store.purge_artifact, which releases
+    their blob references and drops their manifest rows; manifest rows whose
+    files are already gone are dropped as well.
+    """
     count = 0
-    storage_base = Path(os.getenv("STORAGE_BASE_PATH", "artifacts"))
 
-    for tier in ["hot", "warm", "cold"]:
-        tier_path = storage_base / tier
-        if not tier_path.exists():
+    for tier, artifact_file, row in list(_tenant_artifacts(tenant)):
+        count += 1
+        if dry_run:
             continue
 
-        for artifact_file in tier_path.rglob("*.md"):
-            if tenant in str(artifact_file):
-                count += 1
-                if not dry_run:
-                    artifact_file.unlink()
-
-    return count
-
-
-def _delete_jsonl_entries(path: Path, tenant_filter: str, dry_run: bool = False) -> int:
-    """Delete JSONL entries matching tenant filter."""
-    if not path.exists():
-        return 0
-
-    # Collect entries to keep
-    keep_entries = []
-    delete_count = 0
-
-    with open(path, encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
+        if row is None:
+            artifact_file.unlink()
+            continue
 
-            try:
-                entry = json.loads(line)
-                if entry.get("tenant") == tenant_filter:
-                    delete_count += 1
-                else:
-                    keep_entries.append(line)
-            except json.JSONDecodeError:
-                keep_entries.append(line)
-
-    # Rewrite file without deleted entries
-    if not dry_run and delete_count > 0:
-        temp_path = path.with_suffix(".tmp")
-        with open(temp_path, "w", encoding="utf-8") as f:
-            for line in keep_entries:
-                f.write(line + "\n")
-        temp_path.replace(path)
-
-    return delete_count
-
-
-def _prune_jsonl_by_date(path: Path, cutoff: datetime) -> int:
-    """Prune JSONL entries older than cutoff date."""
-    if not path.exists():
-        return 0
-
-    keep_entries = []
-    purged_count = 0
-
-    with open(path, encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
+        try:
+            purge_artifact(tier, tenant, row["workflow_id"], row["artifact_id"])
+        except ArtifactNotFoundError:
+            if storage_manifest.is_manifest_enabled():
+                storage_manifest.remove_artifact(tier, tenant, row["workflow_id"], row["artifact_id"])
 
-            try:
-                entry = json.loads(line)
-                timestamp_str = entry.get("timestamp")
-                if timestamp_str:
-                    # Parse timestamp (handle both with and without Z suffix)
-                    ts_str = timestamp_str.rstrip("Z")
-                    if "+" in ts_str:
-                        entry_time = datetime.fromisoformat(ts_str)
-                    else:
-                        entry_time = datetime.fromisoformat(ts_str).replace(tzinfo=UTC)
-
-                    if entry_time < cutoff:
-                        purged_count += 1
-                        continue
-
-                keep_entries.append(line)
-            except (json.JSONDecodeError, ValueError, KeyError):
-                # Keep malformed entries to avoid data loss
-                keep_entries.append(line)
-
-    # Rewrite file
-    if purged_count > 0:
-        temp_path = path.with_suffix(".tmp")
-        with open(temp_path, "w", encoding="utf-8") as f:
-            for line in keep_entries:
-                f.write(line + "\n")
-        temp_path.replace(path)
-
-    return purged_count
+    return count
 
 
 def _log_governance_event(event: dict) -> None:
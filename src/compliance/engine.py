@@ -0,0 +1,533 @@
+"""
+Streaming Compliance Engine
+
+Single-pass, constant-memory export, deletion, and retention over the JSONL
+event stores. Each store is a live file plus, optionally, time-partitioned
+segments beside it (``<stem>-YYYY-MM-DD[.N]<suffix>``, see
+orchestrator.event_log), each holding records up to the day it is named for.
+
+Every file gets a per-tenant sidecar index (``<file>.tenants.json``) holding
+line counts, per-tenant byte spans, and the timestamp range. The index is
+caught up incrementally from its recorded end offset, so an append-only log
+is only ever parsed once. Export and delete skip files (and byte ranges) that
+hold no records for the tenant; retention skips files that are entirely
+inside the window and drops whole expired segments without reading them.
+
+Rewrites stream into a temp file in the same directory and are swapped in
+with ``os.replace``, so readers never see a partial file.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+from relay_ai.orchestrator.event_log import META_SUFFIX, sealed_segments, segment_key
+
+COMPLIANCE_WORKERS = int(os.getenv("COMPLIANCE_WORKERS", "4"))
+COMPLIANCE_TENANT_INDEX = os.getenv("COMPLIANCE_TENANT_INDEX", "true").lower() in ("true", "1", "yes")
+
+INDEX_SUFFIX = ".tenants.json"
+INDEX_VERSION = 1
+_COPY_CHUNK = 1 << 20
+
+_decode = json.JSONDecoder().decode
+
+
+def _parse_line(stripped: bytes):
+    """json.loads for one raw line, minus its per-call encoding sniffing."""
+    return _decode(stripped.decode("utf-8"))
+
+
+class EventSource(NamedTuple):
+    """A JSONL event store covered by export/delete/retention."""
+
+    key: str  # Key in the counts dict
+    env_var: str  # Env var overriding the path
+    default_path: str
+    export_name: str  # File name inside the export bundle
+
+
+EVENT_SOURCES = (
+    EventSource("orch_events", "ORCH_EVENTS_PATH", "logs/orchestrator_events.jsonl", "orchestrator_events.jsonl"),
+    EventSource("queue_events", "QUEUE_EVENTS_PATH", "logs/queue_events.jsonl", "queue_events.jsonl"),
+    EventSource("cost_events", "COST_LOG_PATH", "logs/cost_events.jsonl", "cost_events.jsonl"),
+    EventSource("approval_events", "APPROVALS_LOG_PATH", "logs/approvals.jsonl", "approval_events.jsonl"),
+    EventSource("gov_events", "GOV_EVENTS_PATH", "logs/governance_events.jsonl", "governance_events.jsonl"),
+)
+
+
+def source_path(source: EventSource) -> Path:
+    """Resolve the live file for a source from the environment."""
+    return Path(os.getenv(source.env_var, source.default_path))
+
+
+def source_files(path: Path) -> list[Path]:
+    """List a store's time-partitioned segments (oldest first) followed by its live file."""
+    files = sealed_segments(path)
+    if path.exists():
+        files.append(path)
+    return files
+
+
+def segment_date(segment: Path, path: Path) -> date | None:
+    """Return the day a ``<stem>-YYYY-MM-DD[.N]`` partition of path covers, or None if it is not one."""
+    key = segment_key(segment, path)
+    return key[0] if key is not None else None
+
+
+def parse_timestamp(value) -> datetime | None:
+    """Parse an event timestamp (with or without Z suffix); naive values are taken as UTC."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)  # Accepts a trailing Z as UTC
+    except ValueError:
+        try:
+            parsed = datetime.fromisoformat(value.rstrip("Z"))
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+# Per-tenant index
+
+
+@dataclass
+class TenantIndex:
+    """What a JSONL file holds, per tenant, up to byte offset ``end``.
+
+    ``tenants`` maps tenant -> [count, first, stop]: the number of records and
+    a byte range guaranteed to contain all of them.
+    """
+
+    inode: int = 0
+    end: int = 0
+    check: str = ""
+    lines: int = 0
+    undated: int = 0
+    min_ts: datetime | None = None
+    max_ts: datetime | None = None
+    tenants: dict[str, list[int]] = field(default_factory=dict)
+
+    def observe(self, offset: int, raw: bytes) -> None:
+        """Account for one raw line that starts at offset."""
+        stripped = raw.strip()
+        if not stripped:
+            return
+        self.lines += 1
+        try:
+            entry = _parse_line(stripped)
+        except ValueError:
+            self.undated += 1
+            return
+        if not isinstance(entry, dict):
+            self.undated += 1
+            return
+
+        tenant = entry.get("tenant")
+        if isinstance(tenant, str):
+            span = self.tenants.get(tenant)
+            if span is None:
+                self.tenants[tenant] = [1, offset, offset + len(raw)]
+            else:
+                span[0] += 1
+                span[2] = offset + len(raw)
+
+        timestamp = parse_timestamp(entry.get("timestamp"))
+        if timestamp is None:
+            self.undated += 1
+            return
+        if self.min_ts is None or timestamp < self.min_ts:
+            self.min_ts = timestamp
+        if self.max_ts is None or timestamp > self.max_ts:
+            self.max_ts = timestamp
+
+    def to_json(self) -> dict:
+        return {
+            "version": INDEX_VERSION,
+            "inode": self.inode,
+            "end": self.end,
+            "check": self.check,
+            "lines": self.lines,
+            "undated": self.undated,
+            "min_ts": self.min_ts.isoformat() if self.min_ts else None,
+            "max_ts": self.max_ts.isoformat() if self.max_ts else None,
+            "tenants": self.tenants,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "TenantIndex":
+        return cls(
+            inode=data["inode"],
+            end=data["end"],
+            check=data["check"],
+            lines=data["lines"],
+            undated=data["undated"],
+            min_ts=datetime.fromisoformat(data["min_ts"]) if data["min_ts"] else None,
+            max_ts=datetime.fromisoformat(data["max_ts"]) if data["max_ts"] else None,
+            tenants=data["tenants"],
+        )
+
+
+def index_path(path: Path) -> Path:
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def load_index(path: Path) -> TenantIndex | None:
+    """Load the tenant index for path, catching it up with anything appended since it was written.
+
+    Returns None when indexing is disabled or the file does not exist. The
+    index is rebuilt from scratch if the file was replaced or truncated.
+    """
+    if not COMPLIANCE_TENANT_INDEX:
+        return None
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+
+    index = _read_index(path)
+    with open(path, "rb") as f:
+        if (
+            index is None
+            or index.inode != stat.st_ino
+            or index.end > stat.st_size
+            or index.check != _fingerprint(f, index.end)
+        ):
+            index = TenantIndex(inode=stat.st_ino)
+        if index.end == stat.st_size:
+            return index
+
+        f.seek(index.end)
+        offset = index.end
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # A writer is mid-append; pick it up next time
+            index.observe(offset, raw)
+            offset += len(raw)
+        index.end = offset
+        index.check = _fingerprint(f, offset)
+    _write_index(path, index)
+    return index
+
+
+def _stamp(path: Path, index: TenantIndex) -> None:
+    """Bind an index built during a rewrite to the file that replaced path."""
+    index.inode = path.stat().st_ino
+    with open(path, "rb") as f:
+        index.check = _fingerprint(f, index.end)
+
+
+def _fingerprint(f, end: int) -> str:
+    """Hash the bytes either side of the indexed prefix so an in-place rewrite is noticed."""
+    f.seek(0)
+    head = f.read(min(end, 64))
+    f.seek(max(0, end - 64))
+    tail = f.read(min(end, 64))
+    return hashlib.blake2b(head + tail, digest_size=8).hexdigest()
+
+
+def _read_index(path: Path) -> TenantIndex | None:
+    try:
+        data = json.loads(index_path(path).read_text(encoding="utf-8"))
+        if data.get("version") != INDEX_VERSION:
+            return None
+        return TenantIndex.from_json(data)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_index(path: Path, index: TenantIndex) -> None:
+    """Persist the index next to path; best effort, a missing sidecar only costs a rescan."""
+    target = index_path(path)
+    temp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        temp.write_text(json.dumps(index.to_json(), separators=(",", ":")), encoding="utf-8")
+        temp.replace(target)
+    except OSError:
+        temp.unlink(missing_ok=True)
+
+
+def drop_index(path: Path) -> None:
+    index_path(path).unlink(missing_ok=True)
+
+
+# Streaming passes
+
+
+def _tenant_tokens(tenant: str) -> tuple[bytes, ...]:
+    """Byte strings at least one of which appears in any JSON line whose tenant field is tenant."""
+    return tuple({tenant.encode("utf-8"), json.dumps(tenant)[1:-1].encode("utf-8")})
+
+
+def _belongs_to(stripped: bytes, tenant: str, tokens: tuple[bytes, ...]) -> bool:
+    if not any(token in stripped for token in tokens):
+        return False
+    try:
+        entry = _parse_line(stripped)
+    except ValueError:
+        return False
+    return isinstance(entry, dict) and entry.get("tenant") == tenant
+
+
+def _tenant_range(path: Path, tenant: str) -> tuple[int, int | None] | None:
+    """Byte range of path to scan for tenant, or None if the index says there is nothing to find."""
+    index = load_index(path)
+    if index is None:
+        return 0, None
+    span = index.tenants.get(tenant)
+    if span is None:
+        return None
+    return span[1], span[2]
+
+
+def export_source(files: list[Path], tenant: str, dest: Path, *, compress: bool = False) -> tuple[int, Path | None]:
+    """Stream a tenant's records from files into dest (gzip-compressed if compress).
+
+    dest is only created when at least one record matches.
+
+    Returns:
+        (record count, path written or None)
+    """
+    tokens = _tenant_tokens(tenant)
+    out_path = dest.with_name(dest.name + ".gz") if compress else dest
+    out = None
+    count = 0
+    try:
+        for path in files:
+            scan = _tenant_range(path, tenant)
+            if scan is None:
+                continue
+            start, stop = scan
+            with open(path, "rb") as f:
+                f.seek(start)
+                offset = start
+                for raw in f:
+                    if stop is not None and offset >= stop:
+                        break
+                    offset += len(raw)
+                    stripped = raw.strip()
+                    if not stripped or not _belongs_to(stripped, tenant, tokens):
+                        continue
+                    if out is None:
+                        out = gzip.open(out_path, "wb", compresslevel=6) if compress else open(out_path, "wb")
+                    out.write(stripped + b"\n")
+                    count += 1
+    finally:
+        if out is not None:
+            out.close()
+    return count, out_path if count else None
+
+
+def delete_source(files: list[Path], tenant: str, *, dry_run: bool = False) -> int:
+    """Remove a tenant's records from files, rewriting each affected file once.
+
+    Returns:
+        Number of records deleted (or that would be, for dry_run)
+    """
+    return sum(_delete_from_file(path, tenant, dry_run=dry_run) for path in files)
+
+
+def _delete_from_file(path: Path, tenant: str, *, dry_run: bool) -> int:
+    tokens = _tenant_tokens(tenant)
+    index = load_index(path)
+    if index is not None:
+        span = index.tenants.get(tenant)
+        if span is None:
+            return 0
+        if dry_run:
+            return span[0]
+        start, stop = span[1], span[2]
+    else:
+        start = stop = 0
+
+    if dry_run:
+        with open(path, "rb") as f:
+            return sum(1 for raw in f if _belongs_to(raw.strip(), tenant, tokens))
+
+    indexed_end = index.end if index is not None else 0
+    removed_indexed = {"lines": 0, "bytes": 0}
+
+    def drop(offset: int, stripped: bytes, raw: bytes) -> bool:
+        if not _belongs_to(stripped, tenant, tokens):
+            return False
+        if offset < indexed_end:
+            removed_indexed["lines"] += 1
+            removed_indexed["bytes"] += len(raw)
+        return True
+
+    # Only the tenant's span (and anything appended since indexing) needs parsing
+    removed = _rewrite(path, drop, verbatim=((0, start), (stop, indexed_end)))
+    if not removed:
+        return 0
+
+    if index is not None:
+        # Shift the surviving spans conservatively instead of rescanning the file
+        shift = removed_indexed["bytes"]
+        index.end -= shift
+        index.lines -= removed_indexed["lines"]
+        index.tenants.pop(tenant, None)
+        for span in index.tenants.values():
+            if span[1] > start:
+                span[1] = max(start, span[1] - shift)
+            span[2] = min(span[2], index.end)
+        _stamp(path, index)
+        _write_index(path, index)
+    else:
+        drop_index(path)
+    return removed
+
+
+def prune_source(files: list[Path], path: Path, cutoff: datetime) -> int:
+    """Drop records older than cutoff from a store.
+
+    Segments whose whole day precedes cutoff are unlinked without being read;
+    files entirely inside the window are skipped via their index.
+
+    Returns:
+        Number of records purged
+    """
+    purged = 0
+    for file in files:
+        day = segment_date(file, path) if file != path else None
+        if day is not None and datetime.combine(day + timedelta(days=1), datetime.min.time(), UTC) <= cutoff:
+            purged += _count_records(file)
+            file.unlink()
+            drop_index(file)
+            file.with_name(file.name + META_SUFFIX).unlink(missing_ok=True)
+            continue
+        purged += _prune_file(file, cutoff)
+    return purged
+
+
+def _prune_file(path: Path, cutoff: datetime) -> int:
+    index = load_index(path)
+    if index is not None:
+        if index.min_ts is None or index.min_ts >= cutoff:
+            return 0
+        drop_all_indexed = index.undated == 0 and index.max_ts < cutoff
+    else:
+        drop_all_indexed = False
+    indexed_end = index.end if index is not None else 0
+
+    rebuilt = TenantIndex()
+
+    def drop(offset: int, stripped: bytes, raw: bytes) -> bool:
+        if drop_all_indexed and offset < indexed_end:
+            return True
+        try:
+            timestamp = parse_timestamp(_parse_line(stripped).get("timestamp"))
+        except (ValueError, AttributeError):
+            timestamp = None  # Keep malformed entries to avoid data loss
+        return timestamp is not None and timestamp < cutoff
+
+    removed = _rewrite(path, drop, observer=rebuilt)
+    if removed:
+        _stamp(path, rebuilt)
+        _write_index(path, rebuilt)
+    return removed
+
+
+def _rewrite(
+    path: Path,
+    drop: Callable[[int, bytes, bytes], bool],
+    *,
+    verbatim: tuple[tuple[int, int], ...] = (),
+    observer: TenantIndex | None = None,
+) -> int:
+    """Stream path into a sibling temp file without the lines drop() selects, then swap it in.
+
+    Byte ranges in verbatim (sorted, line-aligned) are copied without being
+    parsed. If observer is given it is fed every filtered line written, at its
+    offset in the new file, and its end is set. The original file is left
+    untouched when nothing is dropped.
+
+    Returns:
+        Number of lines dropped
+    """
+    temp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    removed = 0
+    written = 0
+
+    def filter_lines(src, dst, offset: int, until: int | None) -> int:
+        nonlocal removed, written
+        for raw in src:
+            line_offset, offset = offset, offset + len(raw)
+            stripped = raw.strip()
+            if stripped:
+                if drop(line_offset, stripped, raw):
+                    removed += 1
+                else:
+                    line = raw if raw.endswith(b"\n") else raw + b"\n"
+                    if observer is not None:
+                        observer.observe(written, line)
+                    dst.write(line)
+                    written += len(line)
+            if until is not None and offset >= until:
+                break
+        return offset
+
+    try:
+        with open(path, "rb") as src, open(temp, "wb") as dst:
+            offset = 0
+            for start, stop in verbatim:
+                if start > offset:
+                    offset = filter_lines(src, dst, offset, start)
+                if stop > offset:
+                    written += _copy_bytes(src, dst, stop - offset)
+                    offset = stop
+            filter_lines(src, dst, offset, None)
+            dst.flush()
+            os.fsync(dst.fileno())
+        if observer is not None:
+            observer.end = written
+        if removed:
+            shutil.copymode(path, temp)
+            os.replace(temp, path)
+    finally:
+        temp.unlink(missing_ok=True)
+    return removed
+
+
+def _copy_bytes(src, dst, length: int) -> int:
+    copied = 0
+    while copied < length:
+        chunk = src.read(min(_COPY_CHUNK, length - copied))
+        if not chunk:
+            break
+        dst.write(chunk)
+        copied += len(chunk)
+    return copied
+
+
+def _count_records(path: Path) -> int:
+    """Count records in a file, from its index if it is current, else by counting newlines."""
+    index = _read_index(path)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return 0
+    if index is not None and index.inode == stat.st_ino and index.end == stat.st_size:
+        return index.lines
+    count = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(_COPY_CHUNK):
+            count += chunk.count(b"\n")
+    return count
+
+
+def run_concurrently(fn: Callable, items: list) -> list:
+    """Apply fn to each item on up to COMPLIANCE_WORKERS threads, returning results in item order."""
+    workers = min(COMPLIANCE_WORKERS, len(items))
+    if workers <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="compliance") as pool:
+        return list(pool.map(fn, items))
@@ -5,7 +5,9 @@
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Union
+
+from .corpus_index import INDEX_DIRNAME, INDEX_ERRORS, CorpusIndex, get_index_dir, is_index_enabled
 
 # Try to import optional dependencies
 try:
@@ -54,29 +56,64 @@ def __init__(self):
         self.docs: list[Doc] = []
         self.vectorizer: Optional[Any] = None
         self.doc_vectors: Optional[Any] = None
+        self.index: Optional[CorpusIndex] = None
         self._doc_index: dict[str, Doc] = {}
+        self._doc_word_sets: Optional[list[tuple[set[str], set[str]]]] = None
 
-    def load_corpus(self, corpus_path: str) -> list[Doc]:
+    def _supported_extensions(self) -> list[str]:
+        supported_extensions = [".txt", ".md"]
+        if HAS_PYPDF:
+            supported_extensions.append(".pdf")
+        return supported_extensions
+
+    def load_corpus(self, corpus_path: Union[str, list[str]]) -> list[Doc]:
         """
-        Load all documents from a corpus directory.
+        Load all documents from a corpus directory (or an explicit list of files).
+
+        With the persistent index enabled, unchanged files are served from the
+        index cache and search uses BM25; otherwise every file is parsed and a
+        TF-IDF model is fitted in memory.
 
         Args:
-            corpus_path: Path to directory containing corpus files
+            corpus_path: Path to directory containing corpus files, or list of file paths
 
         Returns:
             List of loaded documents
         """
-        corpus_dir = Path(corpus_path)
-        if not corpus_dir.exists() or not corpus_dir.is_dir():
-            raise ValueError(f"Corpus path does not exist or is not a directory: {corpus_path}")
-
-        docs = []
-        supported_extensions = [".txt", ".md"]
-        if HAS_PYPDF:
-            supported_extensions.append(".pdf")
+        if isinstance(corpus_path, (list, tuple)):
+            files = [Path(p) for p in corpus_path if Path(p).suffix.lower() in self._supported_extensions()]
+            corpus_dir = Path(os.path.commonpath([str(Path(p).resolve().parent) for p in corpus_path]))
+        else:
+            corpus_dir = Path(corpus_path)
+            if not corpus_dir.exists() or not corpus_dir.is_dir():
+                raise ValueError(f"Corpus path does not exist or is not a directory: {corpus_path}")
+
+            files = []
+            supported_extensions = self._supported_extensions()
+            for root, dirs, names in os.walk(corpus_dir):
+                dirs[:] = [d for d in dirs if d != INDEX_DIRNAME]
+                files.extend(Path(root) / name for name in names if Path(name).suffix.lower() in supported_extensions)
+
+        self.vectorizer = None
+        self.doc_vectors = None
+        self.index = None
+        self._doc_word_sets = None
+
+        docs = None
+        if is_index_enabled():
+            try:
+                docs = self._load_from_index(corpus_dir, files)
+            except INDEX_ERRORS as e:
+                # Corrupt or truncated generation (bad JSON, short .npy): write a fresh one
+                logger.warning(f"Corpus index at {get_index_dir(corpus_dir)} unreadable, rebuilding: {e}")
+                try:
+                    docs = self._load_from_index(corpus_dir, files, rebuild=True)
+                except INDEX_ERRORS as e:
+                    logger.warning(f"Corpus index unavailable at {get_index_dir(corpus_dir)}, parsing files: {e}")
 
-        for file_path in corpus_dir.rglob("*"):
-            if file_path.suffix.lower() in supported_extensions:
+        if docs is None:
+            docs = []
+            for file_path in files:
                 try:
                     doc = self._load_document(file_path)
                     if doc:
@@ -88,41 +125,60 @@ def load_corpus(self, corpus_path: str) -> list[Doc]:
         self.docs = docs
         self._doc_index = {doc.id: doc for doc in docs}
 
-        # Build TF-IDF vectors if sklearn is available
-        if HAS_SKLEARN and docs:
+        # Build TF-IDF vectors if sklearn is available (BM25 index supersedes it)
+        if HAS_SKLEARN and docs and self.index is None:
             self._build_tfidf_index()
 
         logger.info(f"Loaded {len(docs)} documents from corpus")
         return docs
 
-    def _load_document(self, file_path: Path) -> Optional[Doc]:
-        """Load a single document from file."""
+    def _load_from_index(self, corpus_dir: Path, files: list[Path], rebuild: bool = False) -> list[Doc]:
+        """Refresh the persistent index for files and materialize its documents."""
+        index = CorpusIndex(get_index_dir(corpus_dir)).refresh(
+            files, self._extract_text, self._make_doc, rebuild=rebuild
+        )
+        docs = [
+            Doc(id=entry["id"], title=entry["title"], text=index.get_text(i).strip(), path=entry["path"])
+            for i, entry in enumerate(index.docs)
+        ]
+        self.index = index
+        logger.info(f"Corpus index: {index.stats}")
+        return docs
+
+    def _extract_text(self, file_path: Path) -> str:
+        """Read raw text from a corpus file (empty string if unreadable)."""
         try:
             if file_path.suffix.lower() == ".pdf":
                 if not HAS_PYPDF:
                     logger.warning(f"Skipping PDF {file_path}: pypdf not available")
-                    return None
-                text = self._extract_pdf_text(file_path)
-            else:
-                # Text/markdown files
-                with open(file_path, encoding="utf-8", errors="ignore") as f:
-                    text = f.read()
-
-            # Skip empty files
-            if not text.strip():
-                logger.warning(f"Skipping empty file: {file_path}")
-                return None
+                    return ""
+                return self._extract_pdf_text(file_path)
 
-            # Generate document ID and title
-            doc_id = str(file_path.relative_to(file_path.parent.parent)) if file_path.parent.parent else file_path.name
-            title = self._extract_title(text, file_path.stem)
-
-            return Doc(id=doc_id, title=title, text=text.strip(), path=str(file_path))
+            # Text/markdown files
+            with open(file_path, encoding="utf-8", errors="ignore") as f:
+                return f.read()
 
         except Exception as e:
             logger.error(f"Error loading document {file_path}: {e}")
+            return ""
+
+    def _make_doc(self, file_path: Path, text: str) -> Optional[Doc]:
+        """Build a document from extracted text, or None if it is empty."""
+        # Skip empty files
+        if not text.strip():
+            logger.warning(f"Skipping empty file: {file_path}")
             return None
 
+        # Generate document ID and title
+        doc_id = str(file_path.relative_to(file_path.parent.parent)) if file_path.parent.parent else file_path.name
+        title = self._extract_title(text, file_path.stem)
+
+        return Doc(id=doc_id, title=title, text=text.strip(), path=str(file_path))
+
+    def _load_document(self, file_path: Path) -> Optional[Doc]:
+        """Load a single document from file."""
+        return self._make_doc(file_path, self._extract_text(file_path))
+
     def _extract_pdf_text(self, file_path: Path) -> str:
         """Extract text from PDF file."""
         if not HAS_PYPDF:
@@ -197,6 +253,10 @@ def search_corpus(self, query: str, k: int = 8) -> list[Doc]:
         if not self.docs:
             return []
 
+        # Persistent BM25 index
+        if self.index is not None:
+            return [self.docs[doc_idx] for doc_idx, _ in self.index.search(query, k)]
+
         # Try semantic search first (TF-IDF)
         if self.vectorizer and self.doc_vectors is not None:
             return self._semantic_search(query, k)
@@ -234,9 +294,11 @@ def _keyword_search(self, query: str, k: int) -> list[Doc]:
         query_words = set(query.lower().split())
         scored_docs = []
 
-        for doc in self.docs:
-            doc_words = set(doc.text.lower().split())
-            title_words = set(doc.title.lower().split())
+        # Word sets are built once per load rather than on every query
+        if self._doc_word_sets is None:
+            self._doc_word_sets = [(set(doc.text.lower().split()), set(doc.title.lower().split())) for doc in self.docs]
+
+        for doc, (doc_words, title_words) in zip(self.docs, self._doc_word_sets):
 
             # Calculate simple relevance score
             text_matches = len(query_words.intersection(doc_words))
@@ -340,8 +402,8 @@ def _extract_relevant_snippet(self, query_text: str, doc_text: str, max_length:
 _corpus_manager = CorpusManager()
 
 
-def load_corpus(corpus_path: str) -> list[Doc]:
-    """Load corpus documents from directory."""
+def load_corpus(corpus_path: Union[str, list[str]]) -> list[Doc]:
+    """Load corpus documents from directory (or list of files)."""
     return _corpus_manager.load_corpus(corpus_path)
 
 
@@ -360,6 +422,7 @@ def get_corpus_stats() -> dict[str, Any]:
     return {
         "total_docs": len(_corpus_manager.docs),
         "has_tfidf": _corpus_manager.vectorizer is not None,
+        "has_bm25_index": _corpus_manager.index is not None,
         "has_pypdf": HAS_PYPDF,
         "has_sklearn": HAS_SKLEARN,
     }
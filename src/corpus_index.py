@@ -0,0 +1,446 @@
+"""Persistent, incremental BM25 index for grounded-mode corpora.
+
+Avoids re-parsing the corpus (PDFs in particular) on every load:
+- Extracted text and per-document term frequencies are cached by file SHA-256
+- Unchanged files (same size and mtime) are not re-read; changed files are
+  re-hashed and only re-extracted when their content is new
+- Postings and document texts are stored as flat files and memory-mapped on
+  load, so opening a prebuilt index takes milliseconds and doesn't read the
+  corpus text into memory
+- Queries use sparse BM25 over the postings with top-k selection
+
+Layout (CORPUS_INDEX_DIR/{corpus key}, default $XDG_CACHE_HOME/relay_ai/corpus_index):
+    manifest.json       file stats -> sha256, current generation, retired generations
+    cache/ab/<sha>.json extracted text + term frequencies
+    gen-<n>/            terms.json, docs.json, offsets.npy, postings_doc.npy,
+                        postings_tf.npy, doc_len.npy, texts.bin, text_offsets.npy
+
+Each rebuild writes a new generation directory and then swaps manifest.json,
+so readers never see a half-written index. Superseded generations are kept for
+CORPUS_INDEX_GC_GRACE_SEC and removed by a later refresh, so readers that
+loaded one just before the swap can finish with it.
+
+Build ahead of time with `python -m src.corpus_index build <corpus_dir>`.
+Disable with CORPUS_INDEX_ENABLED=false.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import sys
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+    HAS_NUMPY = False
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+# Legacy in-corpus index location; still skipped when walking a corpus directory
+INDEX_DIRNAME = ".corpus_index"
+
+# What a corrupt or truncated index raises on load (bad JSON or UTF-8, short .npy, missing keys)
+INDEX_ERRORS = (OSError, ValueError, KeyError, IndexError, EOFError)
+
+# Seconds a superseded generation is kept for readers that still have it open
+GC_GRACE_SEC = float(os.getenv("CORPUS_INDEX_GC_GRACE_SEC", "600"))
+
+# BM25 parameters (Robertson/Sparck Jones defaults)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Small English stopword list; mirrors the intent of the TF-IDF path's stop_words="english"
+STOP_WORDS = frozenset(
+    "a about above after again against all am an and any are as at be because been before being below between "
+    "both but by can did do does doing down during each few for from further had has have having he her here "
+    "hers herself him himself his how i if in into is it its itself just me more most my myself no nor not now "
+    "of off on once only or other our ours ourselves out over own same she should so some such than that the "
+    "their theirs them themselves then there these they this those through to too under until up very was we "
+    "were what when where which while who whom why will with you your yours yourself yourselves".split()
+)
+
+
+def is_index_enabled() -> bool:
+    """Check if the persistent corpus index is enabled (default: true when numpy is installed)."""
+    return HAS_NUMPY and os.getenv("CORPUS_INDEX_ENABLED", "true").lower() in {"1", "true", "yes"}
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lowercase index terms.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Terms with stopwords and single characters removed
+    """
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOP_WORDS]
+
+
+def file_sha256(path: Path) -> str:
+    """Hash a file in 1 MiB blocks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def get_index_dir(corpus_dir: Path) -> Path:
+    """
+    Resolve where the index for a corpus directory lives.
+
+    Args:
+        corpus_dir: Corpus root
+
+    Returns:
+        Per-corpus subdirectory of CORPUS_INDEX_DIR (default:
+        $XDG_CACHE_HOME/relay_ai/corpus_index, i.e. ~/.cache/...). The corpus
+        directory itself is never written to.
+    """
+    base = os.getenv("CORPUS_INDEX_DIR")
+    if not base:
+        base = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "relay_ai" / "corpus_index"
+    key = hashlib.sha256(str(corpus_dir.resolve()).encode("utf-8")).hexdigest()[:16]
+    return Path(base) / key
+
+
+def _write_json(path: Path, data: Any) -> None:
+    temp_path = path.parent / f".{path.name}.{os.getpid()}.tmp"
+    temp_path.write_text(json.dumps(data), encoding="utf-8")
+    temp_path.replace(path)
+
+
+class CorpusIndex:
+    """BM25 index over a set of corpus files, persisted under index_dir."""
+
+    def __init__(self, index_dir: Path):
+        """
+        Initialize index handle (call refresh() or load() before searching).
+
+        Args:
+            index_dir: Directory holding the manifest, text cache, and generations
+        """
+        self.index_dir = Path(index_dir)
+        self.docs: list[dict[str, Any]] = []
+        self.num_docs = 0
+        self.avg_doc_len = 0.0
+        self._terms: dict[str, int] = {}
+        self._offsets = None
+        self._postings_doc = None
+        self._postings_tf = None
+        self._doc_len = None
+        self._text_offsets = None
+        self._texts = None
+        self.stats: dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _cache_path(self, sha: str) -> Path:
+        return self.index_dir / "cache" / sha[:2] / f"{sha}.json"
+
+    def _read_cache(self, sha: str) -> Optional[dict[str, Any]]:
+        path = self._cache_path(sha)
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_cache(self, sha: str, text: str) -> dict[str, Any]:
+        entry = {"text": text, "tf": dict(Counter(tokenize(text)))}
+        path = self._cache_path(sha)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_json(path, entry)
+        return entry
+
+    # ------------------------------------------------------------------
+    # Build / refresh
+    # ------------------------------------------------------------------
+
+    def _read_manifest(self) -> dict[str, Any]:
+        path = self.index_dir / "manifest.json"
+        if path.exists():
+            try:
+                manifest = json.loads(path.read_text(encoding="utf-8"))
+                if manifest.get("version") == INDEX_VERSION:
+                    return manifest
+            except (OSError, json.JSONDecodeError):
+                pass
+        return {"version": INDEX_VERSION, "generation": 0, "files": {}}
+
+    def _collect_generations(self, current: str, retired: dict[str, float]) -> dict[str, float]:
+        """Delete superseded generations past the grace period; return those still retained."""
+        now = time.time()
+        kept = {}
+        for gen_dir in self.index_dir.glob("gen-*"):
+            if gen_dir.name == current:
+                continue
+            # Generations missing from the manifest (e.g. an interrupted build) age from their mtime
+            since = retired.get(gen_dir.name)
+            if since is None:
+                try:
+                    since = gen_dir.stat().st_mtime
+                except OSError:
+                    continue  # Removed by a concurrent refresh
+            if now - since >= GC_GRACE_SEC:
+                shutil.rmtree(gen_dir, ignore_errors=True)
+            else:
+                kept[gen_dir.name] = since
+        return kept
+
+    def refresh(
+        self,
+        files: Iterable[Path],
+        extract_text: Callable[[Path], str],
+        make_doc: Callable[[Path, str], Optional[Any]],
+        rebuild: bool = False,
+    ) -> "CorpusIndex":
+        """
+        Bring the index up to date with files, rebuilding postings only if something changed.
+
+        Args:
+            files: Corpus files to index
+            extract_text: Reads raw text from a file (only called for new content)
+            make_doc: Builds a Doc (id, title, text, path) from a file and its text, or None to skip
+            rebuild: Write a new generation even if nothing changed (e.g. the current one is corrupt)
+
+        Returns:
+            self, loaded and ready to search
+        """
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._read_manifest()
+        old_files = {} if rebuild else manifest["files"]
+        new_files: dict[str, dict[str, Any]] = {}
+        stats = {"files": 0, "unchanged": 0, "rehashed": 0, "extracted": 0}
+
+        for path in sorted(Path(p) for p in files):
+            key = os.path.abspath(path)
+            st = path.stat()
+            stats["files"] += 1
+            prev = old_files.get(key)
+
+            if prev and prev["size"] == st.st_size and prev["mtime_ns"] == st.st_mtime_ns:
+                new_files[key] = prev
+                stats["unchanged"] += 1
+                continue
+
+            sha = file_sha256(path)
+            if prev and prev["sha256"] == sha:
+                new_files[key] = {**prev, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+                stats["rehashed"] += 1
+                continue
+
+            cached = self._read_cache(sha)
+            if cached is None:
+                cached = self._write_cache(sha, extract_text(path))
+                stats["extracted"] += 1
+
+            doc = make_doc(path, cached["text"])
+            new_files[key] = {
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "sha256": sha,
+                "doc": None if doc is None else {"id": doc.id, "title": doc.title, "path": doc.path},
+            }
+
+        self.stats = stats
+        generation = manifest["generation"]
+        gen_dir = self.index_dir / f"gen-{generation}"
+        retired = manifest.get("retired", {})
+
+        if new_files == old_files and (gen_dir / "docs.json").exists():
+            kept = self._collect_generations(gen_dir.name, retired)
+            if kept != retired:
+                _write_json(self.index_dir / "manifest.json", {**manifest, "retired": kept})
+            return self.load()
+
+        if gen_dir.exists():
+            retired = {**retired, gen_dir.name: time.time()}
+        # Never reuse a directory a reader may still map (e.g. after the manifest was lost)
+        existing = [int(d.name[4:]) for d in self.index_dir.glob("gen-*") if d.name[4:].isdigit()]
+        generation = max([generation, *existing]) + 1
+        self._build_generation(self.index_dir / f"gen-{generation}", new_files)
+        kept = self._collect_generations(f"gen-{generation}", retired)
+        _write_json(
+            self.index_dir / "manifest.json",
+            {**manifest, "generation": generation, "files": new_files, "retired": kept},
+        )
+
+        return self.load()
+
+    def _build_generation(self, gen_dir: Path, files: dict[str, dict[str, Any]]) -> None:
+        """Merge cached per-document term frequencies into postings arrays."""
+        docs = []
+        term_ids: dict[str, int] = {}
+        rows_term, rows_doc, rows_tf, doc_len = [], [], [], []
+        texts = []
+
+        for entry in files.values():
+            if entry["doc"] is None:
+                continue
+            cached = self._read_cache(entry["sha256"])
+            if cached is None:
+                continue  # Cache pruned externally; the file is re-extracted on next change
+
+            doc_idx = len(docs)
+            docs.append({**entry["doc"], "sha256": entry["sha256"]})
+            doc_len.append(sum(cached["tf"].values()))
+            texts.append(cached["text"].encode("utf-8"))
+            for term, count in cached["tf"].items():
+                rows_term.append(term_ids.setdefault(term, len(term_ids)))
+                rows_doc.append(doc_idx)
+                rows_tf.append(count)
+
+        terms = np.asarray(rows_term, dtype=np.int64)
+        order = np.argsort(terms, kind="stable")
+        counts = np.bincount(terms, minlength=len(term_ids)) if len(terms) else np.zeros(0, dtype=np.int64)
+        offsets = np.zeros(len(term_ids) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        gen_dir.mkdir(parents=True, exist_ok=True)
+        np.save(gen_dir / "offsets.npy", offsets)
+        np.save(gen_dir / "postings_doc.npy", np.asarray(rows_doc, dtype=np.int32)[order])
+        np.save(gen_dir / "postings_tf.npy", np.asarray(rows_tf, dtype=np.float32)[order])
+        np.save(gen_dir / "doc_len.npy", np.asarray(doc_len, dtype=np.float32))
+
+        # Texts packed into one file so loading documents is a single read
+        text_offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in texts], out=text_offsets[1:])
+        (gen_dir / "texts.bin").write_bytes(b"".join(texts))
+        np.save(gen_dir / "text_offsets.npy", text_offsets)
+        _write_json(gen_dir / "terms.json", sorted(term_ids, key=term_ids.get))
+        _write_json(gen_dir / "docs.json", docs)
+
+    # ------------------------------------------------------------------
+    # Load / search
+    # ------------------------------------------------------------------
+
+    def load(self) -> "CorpusIndex":
+        """
+        Memory-map the current generation.
+
+        Returns:
+            self
+
+        Raises:
+            FileNotFoundError: If the index has not been built
+        """
+        manifest = self._read_manifest()
+        gen_dir = self.index_dir / f"gen-{manifest['generation']}"
+        if not (gen_dir / "docs.json").exists():
+            raise FileNotFoundError(f"No corpus index built at {self.index_dir}")
+
+        self.docs = json.loads((gen_dir / "docs.json").read_text(encoding="utf-8"))
+        terms = json.loads((gen_dir / "terms.json").read_text(encoding="utf-8"))
+        self._terms = {term: i for i, term in enumerate(terms)}
+        self._offsets = np.load(gen_dir / "offsets.npy", mmap_mode="r")
+        self._postings_doc = np.load(gen_dir / "postings_doc.npy", mmap_mode="r")
+        self._postings_tf = np.load(gen_dir / "postings_tf.npy", mmap_mode="r")
+        self._doc_len = np.load(gen_dir / "doc_len.npy", mmap_mode="r")
+        self._text_offsets = np.load(gen_dir / "text_offsets.npy")
+        # np.memmap can't map an empty file (a corpus of empty documents)
+        texts_path = gen_dir / "texts.bin"
+        self._texts = np.memmap(texts_path, dtype=np.uint8, mode="r") if texts_path.stat().st_size else b""
+        self.num_docs = len(self.docs)
+        self.avg_doc_len = float(self._doc_len.mean()) if self.num_docs else 0.0
+        return self
+
+    def get_text(self, doc_idx: int) -> str:
+        """Get extracted text for a document."""
+        start, end = self._text_offsets[doc_idx], self._text_offsets[doc_idx + 1]
+        return bytes(self._texts[start:end]).decode("utf-8")
+
+    def search(self, query: str, k: int = 8) -> list[tuple[int, float]]:
+        """
+        Rank documents for a query with BM25.
+
+        Args:
+            query: Free-text query
+            k: Number of results
+
+        Returns:
+            Up to k (doc_index, score) pairs with score > 0, best first
+        """
+        if not self.num_docs or k <= 0:
+            return []
+
+        scores = np.zeros(self.num_docs, dtype=np.float32)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * (self._doc_len / max(self.avg_doc_len, 1e-9)))
+
+        for term in set(tokenize(query)):
+            term_id = self._terms.get(term)
+            if term_id is None:
+                continue
+            start, end = int(self._offsets[term_id]), int(self._offsets[term_id + 1])
+            docs = self._postings_doc[start:end]
+            tf = self._postings_tf[start:end]
+            df = end - start
+            idf = math.log(1 + (self.num_docs - df + 0.5) / (df + 0.5))
+            scores[docs] += idf * tf * (BM25_K1 + 1) / (tf + norm[docs])
+
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [(int(i), float(scores[i])) for i in hits]
+
+
+def main():
+    """CLI for building and inspecting corpus indexes."""
+    from .corpus import CorpusManager
+
+    parser = argparse.ArgumentParser(description="Persistent BM25 corpus index")
+    subparsers = parser.add_subparsers(dest="command", help="Command")
+    build_parser = subparsers.add_parser("build", help="Build or refresh the index for a corpus directory")
+    build_parser.add_argument("corpus_dir", help="Corpus directory")
+    search_parser = subparsers.add_parser("search", help="Query an index")
+    search_parser.add_argument("corpus_dir", help="Corpus directory")
+    search_parser.add_argument("query", help="Query text")
+    search_parser.add_argument("-k", type=int, default=8, help="Number of results")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.time()
+        manager = CorpusManager()
+        docs = manager.load_corpus(args.corpus_dir)
+        stats = manager.index.stats if manager.index else {}
+        print(f"Indexed {len(docs)} documents in {time.time() - start:.2f}s at {get_index_dir(Path(args.corpus_dir))}")
+        for key, value in stats.items():
+            print(f"  {key:10s} {value}")
+        return 0
+
+    elif args.command == "search":
+        index = CorpusIndex(get_index_dir(Path(args.corpus_dir))).load()
+        for doc_idx, score in index.search(args.query, args.k):
+            doc = index.docs[doc_idx]
+            print(f"{score:8.3f}  {doc['title']}  ({doc['path']})")
+        return 0
+
+    parser.print_help()
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,14 +4,17 @@
 Sprint 33B: Envelope encryption with key rotation.
 """
 
-from .envelope import decrypt, encrypt
-from .keyring import active_key, get_key, list_keys, rotate_key
+from .envelope import decrypt, decrypt_many, encrypt, encrypt_many
+from .keyring import active_key, clear_keyring_cache, get_key, list_keys, rotate_key
 
 __all__ = [
     "active_key",
     "rotate_key",
     "get_key",
     "list_keys",
+    "clear_keyring_cache",
     "encrypt",
     "decrypt",
+    "encrypt_many",
+    "decrypt_many",
 ]
@@ -3,6 +3,10 @@
 
 Sprint 33B: Encrypt/decrypt with keyring support.
 Sprint 62: AAD (Additional Authenticated Data) support for Task D memory APIs.
+
+AESGCM objects are cached per key (see _cipher), and encrypt_many /
+decrypt_many handle many small blobs with one key lookup per key_id,
+optionally spread over threads.
 """
 
 import base64
@@ -10,11 +14,13 @@
 import hmac
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
-from .keyring import get_key
+from .keyring import active_key, get_key
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +28,34 @@
 # Used to compute AAD = HMAC-SHA256(MEMORY_TENANT_HMAC_KEY, user_hash)
 MEMORY_TENANT_HMAC_KEY = os.getenv("MEMORY_TENANT_HMAC_KEY", "dev-hmac-key-change-in-production")
 
+# Batch calls smaller than this stay on the calling thread
+ENVELOPE_PARALLEL_MIN_BLOBS = int(os.getenv("ENVELOPE_PARALLEL_MIN_BLOBS", "64"))
+ENVELOPE_WORKERS = int(os.getenv("ENVELOPE_WORKERS", str(min(8, os.cpu_count() or 1))))
+
+# key_id -> (key_material_base64, AESGCM); material is compared so a changed key is never reused
+_ciphers: dict[str, tuple[str, AESGCM]] = {}
+_ciphers_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+
+
+def _cipher(keyring_key: dict) -> AESGCM:
+    """Ready-to-use AESGCM for a key record (decoded and constructed once per key)."""
+    key_id = keyring_key["key_id"]
+    material_b64 = keyring_key["key_material_base64"]
+    cached = _ciphers.get(key_id)
+    if cached is not None and cached[0] == material_b64:
+        return cached[1]
+    aesgcm = AESGCM(base64.b64decode(material_b64))
+    with _ciphers_lock:
+        _ciphers[key_id] = (material_b64, aesgcm)
+    return aesgcm
+
+
+def clear_cipher_cache() -> None:
+    """Drop cached AESGCM objects."""
+    with _ciphers_lock:
+        _ciphers.clear()
+
 
 def encrypt(plaintext: bytes, keyring_key: dict) -> dict:
     """
@@ -43,18 +77,13 @@ def encrypt(plaintext: bytes, keyring_key: dict) -> dict:
         >>> 'ciphertext' in envelope
         True
     """
-    key_id = keyring_key["key_id"]
-    key_material_b64 = keyring_key["key_material_base64"]
-    key_material = base64.b64decode(key_material_b64)
+    return _seal_envelope(_cipher(keyring_key), keyring_key["key_id"], plaintext, None)
 
-    # Generate random nonce (96 bits recommended for GCM)
-    import os
 
+def _seal_envelope(aesgcm: AESGCM, key_id: str, plaintext: bytes, aad_digest: bytes | None) -> dict:
+    # Generate random nonce (96 bits recommended for GCM)
     nonce = os.urandom(12)
-
-    # Encrypt with AESGCM
-    aesgcm = AESGCM(key_material)
-    ciphertext = aesgcm.encrypt(nonce, plaintext, None)
+    ciphertext = aesgcm.encrypt(nonce, plaintext, aad_digest)
 
     # AESGCM returns ciphertext + tag concatenated
     # Tag is last 16 bytes
@@ -69,6 +98,15 @@ def encrypt(plaintext: bytes, keyring_key: dict) -> dict:
     }
 
 
+def _open_envelope(aesgcm: AESGCM, envelope: dict, aad_digest: bytes | None) -> bytes:
+    nonce = base64.b64decode(envelope["nonce"])
+    ciphertext_only = base64.b64decode(envelope["ciphertext"])
+    tag = base64.b64decode(envelope["tag"])
+
+    # Reconstruct full ciphertext (ciphertext + tag)
+    return aesgcm.decrypt(nonce, ciphertext_only + tag, aad_digest)
+
+
 def decrypt(envelope: dict, keyring_get_fn: Any = None) -> bytes:
     """
     Decrypt envelope-encrypted data.
@@ -98,21 +136,8 @@ def decrypt(envelope: dict, keyring_get_fn: Any = None) -> bytes:
     if not key_record:
         raise ValueError(f"Key not found: {key_id}")
 
-    key_material_b64 = key_record["key_material_base64"]
-    key_material = base64.b64decode(key_material_b64)
-
-    nonce = base64.b64decode(envelope["nonce"])
-    ciphertext_only = base64.b64decode(envelope["ciphertext"])
-    tag = base64.b64decode(envelope["tag"])
-
-    # Reconstruct full ciphertext (ciphertext + tag)
-    ciphertext = ciphertext_only + tag
-
-    # Decrypt with AESGCM
-    aesgcm = AESGCM(key_material)
     try:
-        plaintext = aesgcm.decrypt(nonce, ciphertext, None)
-        return plaintext
+        return _open_envelope(_cipher(key_record), envelope, None)
     except Exception as e:
         raise ValueError(f"Decryption failed: {e}") from e
 
@@ -164,31 +189,14 @@ def encrypt_with_aad(plaintext: bytes, aad: bytes, keyring_key: dict) -> dict:
         ... )
         >>> # Ciphertext now bound to user_hash; can't decrypt with different user
     """
-    key_id = keyring_key["key_id"]
-    key_material_b64 = keyring_key["key_material_base64"]
-    key_material = base64.b64decode(key_material_b64)
+    # Encrypt with AESGCM + AAD digest
+    envelope = _seal_envelope(_cipher(keyring_key), keyring_key["key_id"], plaintext, _compute_aad_digest(aad))
+    envelope["aad_bound_to"] = _aad_label(aad)  # Audit trail
+    return envelope
 
-    # Generate random nonce (96 bits recommended for GCM)
-    nonce = os.urandom(12)
 
-    # Compute AAD digest
-    aad_digest = _compute_aad_digest(aad)
-
-    # Encrypt with AESGCM + AAD
-    aesgcm = AESGCM(key_material)
-    ciphertext = aesgcm.encrypt(nonce, plaintext, aad_digest)
-
-    # AESGCM returns ciphertext + tag concatenated
-    tag = ciphertext[-16:]
-    ciphertext_only = ciphertext[:-16]
-
-    return {
-        "key_id": key_id,
-        "nonce": base64.b64encode(nonce).decode("utf-8"),
-        "ciphertext": base64.b64encode(ciphertext_only).decode("utf-8"),
-        "tag": base64.b64encode(tag).decode("utf-8"),
-        "aad_bound_to": aad.decode("utf-8") if isinstance(aad, bytes) else aad,  # Audit trail
-    }
+def _aad_label(aad: bytes) -> str:
+    return aad.decode("utf-8") if isinstance(aad, bytes) else aad
 
 
 def decrypt_with_aad(envelope: dict, aad: bytes, keyring_get_fn: Any = None) -> bytes:
@@ -237,23 +245,9 @@ def decrypt_with_aad(envelope: dict, aad: bytes, keyring_get_fn: Any = None) ->
     if not key_record:
         raise ValueError(f"Key not found: {key_id}")
 
-    key_material_b64 = key_record["key_material_base64"]
-    key_material = base64.b64decode(key_material_b64)
-
-    nonce = base64.b64decode(envelope["nonce"])
-    ciphertext_only = base64.b64decode(envelope["ciphertext"])
-    tag = base64.b64decode(envelope["tag"])
-
-    # Reconstruct full ciphertext (ciphertext + tag)
-    ciphertext = ciphertext_only + tag
-
-    # Compute AAD digest
-    aad_digest = _compute_aad_digest(aad)
-
     # Decrypt with AESGCM + AAD validation
-    aesgcm = AESGCM(key_material)
     try:
-        plaintext = aesgcm.decrypt(nonce, ciphertext, aad_digest)
+        plaintext = _open_envelope(_cipher(key_record), envelope, _compute_aad_digest(aad))
         logger.debug(f"Decryption with AAD successful (bound to: {envelope.get('aad_bound_to', 'unknown')})")
         return plaintext
     except Exception as e:
@@ -276,3 +270,115 @@ def get_aad_from_user_hash(user_hash: str) -> bytes:
         >>> envelope = encrypt_with_aad(b"data", aad=aad, keyring_key=key)
     """
     return user_hash.encode("utf-8") if isinstance(user_hash, str) else user_hash
+
+
+# --- Batch API ---
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _ciphers_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=ENVELOPE_WORKERS, thread_name_prefix="envelope")
+    return _executor
+
+
+def _map_blobs(fn: Any, items: list, max_workers: int | None) -> list:
+    """Apply fn to items in order, in up to max_workers slices on the shared pool."""
+    workers = max(1, min(max_workers or 1, ENVELOPE_WORKERS, len(items)))
+    if workers == 1 or len(items) < ENVELOPE_PARALLEL_MIN_BLOBS:
+        return [fn(item) for item in items]
+    # One task per slice keeps executor overhead per batch, not per blob
+    slice_size = -(-len(items) // workers)
+    slices = [items[i : i + slice_size] for i in range(0, len(items), slice_size)]
+    parts = _get_executor().map(lambda part: [fn(item) for item in part], slices)
+    return [result for part in parts for result in part]
+
+
+def encrypt_many(
+    plaintexts: list[bytes],
+    keyring_key: dict | None = None,
+    aad: bytes | None = None,
+    max_workers: int | None = None,
+) -> list[dict]:
+    """
+    Encrypt many blobs with one key.
+
+    Equivalent to calling encrypt() (or encrypt_with_aad() when aad is given)
+    per blob, but the key, cipher and AAD digest are resolved once.
+
+    Args:
+        plaintexts: Raw bytes to encrypt
+        keyring_key: Key record (defaults to the active key)
+        aad: Optional AAD bound to every blob (as encrypt_with_aad)
+        max_workers: Threads to spread the batch over (default: calling thread only)
+
+    Returns:
+        Envelopes in input order
+
+    Example:
+        >>> envelopes = encrypt_many([b"a", b"b"], max_workers=4)
+        >>> decrypt_many(envelopes)
+        [b'a', b'b']
+    """
+    key = keyring_key or active_key()
+    aesgcm = _cipher(key)
+    key_id = key["key_id"]
+
+    if aad is None:
+        return _map_blobs(lambda plaintext: _seal_envelope(aesgcm, key_id, plaintext, None), plaintexts, max_workers)
+
+    aad_digest = _compute_aad_digest(aad)
+    label = _aad_label(aad)
+
+    def seal_bound(plaintext: bytes) -> dict:
+        envelope = _seal_envelope(aesgcm, key_id, plaintext, aad_digest)
+        envelope["aad_bound_to"] = label
+        return envelope
+
+    return _map_blobs(seal_bound, plaintexts, max_workers)
+
+
+def decrypt_many(
+    envelopes: list[dict],
+    aad: bytes | None = None,
+    keyring_get_fn: Any = None,
+    max_workers: int | None = None,
+) -> list[bytes]:
+    """
+    Decrypt many envelopes, looking each distinct key_id up once.
+
+    Args:
+        envelopes: Envelopes from encrypt/encrypt_many (may mix key_ids)
+        aad: AAD every envelope was bound to (None for plain encrypt())
+        keyring_get_fn: Function to retrieve key by key_id (defaults to get_key)
+        max_workers: Threads to spread the batch over (default: calling thread only)
+
+    Returns:
+        Plaintexts in input order
+
+    Raises:
+        ValueError: If a key is not found or any envelope fails to decrypt
+    """
+    if keyring_get_fn is None:
+        keyring_get_fn = get_key
+
+    ciphers = {}
+    for envelope in envelopes:
+        key_id = envelope["key_id"]
+        if key_id not in ciphers:
+            key_record = keyring_get_fn(key_id)
+            if not key_record:
+                raise ValueError(f"Key not found: {key_id}")
+            ciphers[key_id] = _cipher(key_record)
+
+    aad_digest = _compute_aad_digest(aad) if aad is not None else None
+
+    def open_one(envelope: dict) -> bytes:
+        try:
+            return _open_envelope(ciphers[envelope["key_id"]], envelope, aad_digest)
+        except Exception as e:
+            raise ValueError(f"Decryption failed: {e}") from e
+
+    return _map_blobs(open_one, envelopes, max_workers)
@@ -2,11 +2,17 @@
 Keyring management for envelope encryption.
 
 Sprint 33B: JSONL-based keyring with rotation support.
+
+The parsed keyring is cached in-process and keyed by the file's identity
+(path, inode, mtime, size). Rotation, or any other append or rewrite,
+changes that identity, so lookups reparse only after the file changes.
 """
 
 import base64
 import json
 import os
+import threading
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -40,23 +46,82 @@ def _ensure_keyring_exists():
             f.write(json.dumps(initial_key) + "\n")
 
 
-def _read_keyring() -> list[dict]:
-    """Read all keyring entries."""
-    _ensure_keyring_exists()
-    keyring_path = get_keyring_path()
+@dataclass
+class _KeyringSnapshot:
+    """Parsed keyring for one version of the file."""
+
+    path: Path
+    identity: tuple[int, int, int]  # (st_ino, st_mtime_ns, st_size)
+    entries: list[dict]
+    by_id: dict[str, dict] = field(default_factory=dict)  # Last entry per key_id
+    active: dict | None = None  # Last entry with status='active'
 
+
+_snapshot: _KeyringSnapshot | None = None
+_snapshot_lock = threading.Lock()
+
+
+def _file_identity(path: Path) -> tuple[int, int, int]:
+    st = path.stat()
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _parse_keyring(path: Path) -> list[dict]:
     keys = []
-    with open(keyring_path, encoding="utf-8") as f:
+    with open(path, encoding="utf-8") as f:
         for line in f:
             if line.strip():
                 try:
                     keys.append(json.loads(line))
                 except json.JSONDecodeError:
                     continue
-
     return keys
 
 
+def _load_keyring() -> _KeyringSnapshot:
+    """Cached snapshot of the keyring, reparsed only when the file changed."""
+    global _snapshot
+    keyring_path = get_keyring_path()
+    try:
+        identity = _file_identity(keyring_path)
+    except FileNotFoundError:
+        _ensure_keyring_exists()
+        identity = _file_identity(keyring_path)
+
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.path == keyring_path and snapshot.identity == identity:
+        return snapshot
+
+    with _snapshot_lock:
+        snapshot = _snapshot
+        if snapshot is not None and snapshot.path == keyring_path and snapshot.identity == identity:
+            return snapshot
+        entries = _parse_keyring(keyring_path)
+        # Re-stat after reading: a write that raced the parse must not be cached under the old identity
+        identity_after = _file_identity(keyring_path)
+        snapshot = _KeyringSnapshot(path=keyring_path, identity=identity_after, entries=entries)
+        for entry in entries:
+            if entry.get("key_id"):
+                snapshot.by_id[entry["key_id"]] = entry
+            if entry.get("status") == "active":
+                snapshot.active = entry
+        if identity_after == identity:
+            _snapshot = snapshot
+        return snapshot
+
+
+def clear_keyring_cache() -> None:
+    """Drop the cached keyring (the next lookup rereads the file)."""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
+
+
+def _read_keyring() -> list[dict]:
+    """Read all keyring entries."""
+    return [dict(entry) for entry in _load_keyring().entries]
+
+
 def active_key() -> dict:
     """
     Get the current active key.
@@ -74,15 +139,13 @@ def active_key() -> dict:
         >>> key['alg']
         'AES256-GCM'
     """
-    keys = _read_keyring()
-
     # Last active key wins (allows rotation to update status)
-    active_keys = [k for k in keys if k.get("status") == "active"]
+    active = _load_keyring().active
 
-    if not active_keys:
+    if active is None:
         raise ValueError("No active key found in keyring")
 
-    return active_keys[-1]
+    return dict(active)
 
 
 def get_key(key_id: str) -> dict | None:
@@ -100,11 +163,9 @@ def get_key(key_id: str) -> dict | None:
         >>> key['status']
         'active'
     """
-    keys = _read_keyring()
-
     # Last entry with matching key_id wins
-    matches = [k for k in keys if k.get("key_id") == key_id]
-    return matches[-1] if matches else None
+    key = _load_keyring().by_id.get(key_id)
+    return dict(key) if key is not None else None
 
 
 def list_keys() -> list[dict]:
@@ -121,16 +182,8 @@ def list_keys() -> list[dict]:
         >>> keys[0]['status']
         'retired'
     """
-    keys = _read_keyring()
-
     # Deduplicate: last entry per key_id wins
-    key_map = {}
-    for key in keys:
-        key_id = key.get("key_id")
-        if key_id:
-            key_map[key_id] = key
-
-    return list(key_map.values())
+    return [dict(key) for key in _load_keyring().by_id.values()]
 
 
 def rotate_key() -> dict:
@@ -201,4 +254,6 @@ def rotate_key() -> dict:
     with open(keyring_path, "a", encoding="utf-8") as f:
         f.write(json.dumps(new_key) + "\n")
 
+    # The file identity changed too; clearing also covers filesystems with coarse mtimes
+    clear_keyring_cache()
     return new_key
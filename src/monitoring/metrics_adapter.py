@@ -181,3 +181,27 @@ def record_summarize(
             logger.debug(f"[{request_id}] record_index_operation not available")
     except Exception as e:
         logger.debug(f"[{request_id}] Error recording summarize: {e}")
+
+
+def record_stream_ttfv(
+    ttfv_ms: float,
+    user_id: Optional[str] = None,
+    request_id: Optional[str] = None,
+) -> None:
+    """
+    Record SSE time-to-first-visible-token.
+
+    Maps to R1: record_ttfv(ttfv_ms, user_id)
+    """
+    if get_default_collector is None:
+        logger.debug(f"[{request_id}] Skipping record_stream_ttfv: metrics module unavailable")
+        return
+
+    try:
+        collector = get_default_collector()
+        if hasattr(collector, "record_ttfv"):
+            collector.record_ttfv(ttfv_ms, user_id=user_id)
+        else:
+            logger.debug(f"[{request_id}] record_ttfv not available")
+    except Exception as e:
+        logger.debug(f"[{request_id}] Error recording stream_ttfv: {e}")
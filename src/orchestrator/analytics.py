@@ -3,15 +3,20 @@
 
 Pure Python functions for parsing and aggregating orchestrator JSONL logs.
 No UI/Streamlit dependencies - testable helpers only.
+
+The *_from_log variants read the segmented event log's pre-aggregated
+counters instead of a list of events, so their cost does not grow with
+the size of the log.
 """
 
-import json
 import os
 import statistics
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from .event_log import rolling_counters, tail
+
 
 def get_events_path() -> Path:
     """Get path to orchestrator events log."""
@@ -29,31 +34,16 @@ def load_events(path: str | Path, limit: int = 5000) -> list[dict[str, Any]]:
 
     Args:
         path: Path to JSONL file
-        limit: Maximum number of events to load (from end)
+        limit: Maximum number of events to load (from end, read backwards)
 
     Returns:
         List of event dictionaries (most recent first)
     """
-    path = Path(path)
-    if not path.exists():
-        return []
-
-    events = []
     try:
-        with open(path, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        events.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        pass  # Skip corrupted lines
+        return tail(path, limit)
     except Exception:
         return []
 
-    # Return last N events, most recent first
-    return events[-limit:][::-1]
-
 
 def summarize_tasks(events: list[dict[str, Any]], window_hours: int = 24) -> dict[str, Any]:
     """
@@ -297,3 +287,83 @@ def per_tenant_load(events: list[dict[str, Any]], window_hours: int = 24) -> lis
     result.sort(key=lambda x: x["runs"], reverse=True)
 
     return result
+
+
+def summarize_tasks_from_log(path: str | Path | None = None, window_hours: int = 24) -> dict[str, Any]:
+    """
+    Summarize task execution stats from the event log's rolling counters.
+
+    Same shape as summarize_tasks, but "all_time" covers the whole log rather
+    than a loaded tail. Durations (seconds) pair each task_start with its
+    task_ok/task_fail; the recent window includes the whole hour it starts in.
+
+    Args:
+        path: Events log path (defaults to ORCH_EVENTS_PATH)
+        window_hours: Time window for recent stats
+
+    Returns:
+        Dict with totals and recent stats
+    """
+    path = get_events_path() if path is None else path
+    cutoff_iso = (datetime.now(UTC) - timedelta(hours=window_hours)).isoformat()
+
+    all_time_counters = rolling_counters(path)
+    recent_counters = rolling_counters(path, since=cutoff_iso)
+    all_time = all_time_counters.events
+    recent = recent_counters.events
+
+    return {
+        "all_time": {
+            "tasks_started": all_time["task_start"],
+            "tasks_ok": all_time["task_ok"],
+            "tasks_fail": all_time["task_fail"],
+            "tasks_retry": all_time["task_retry"],
+            "avg_duration": all_time_counters.avg_duration(),
+            "p95_duration": all_time_counters.duration_percentile(0.95),
+        },
+        f"last_{window_hours}h": {
+            "tasks_started": recent["task_start"],
+            "tasks_ok": recent["task_ok"],
+            "tasks_fail": recent["task_fail"],
+            "avg_duration": recent_counters.avg_duration(),
+            "p95_duration": recent_counters.duration_percentile(0.95),
+            "error_rate": (recent["task_fail"] / recent["task_start"] if recent["task_start"] > 0 else 0.0),
+        },
+    }
+
+
+def per_tenant_load_from_log(path: str | Path | None = None, window_hours: int = 24) -> list[dict[str, Any]]:
+    """
+    Calculate per-tenant load statistics from the event log's rolling counters.
+
+    avg_latency is the mean duration in seconds of the tenant's tasks that
+    finished in the window (at hour resolution, see summarize_tasks_from_log).
+
+    Args:
+        path: Events log path (defaults to ORCH_EVENTS_PATH)
+        window_hours: Time window for recent stats
+
+    Returns:
+        List of per-tenant summaries, same shape as per_tenant_load
+    """
+    path = get_events_path() if path is None else path
+    cutoff_iso = (datetime.now(UTC) - timedelta(hours=window_hours)).isoformat()
+
+    counters = rolling_counters(path, since=cutoff_iso)
+    result = []
+    for tenant_id, counts in counters.tenants.items():
+        tasks = counts["task_ok"] + counts["task_fail"]
+        result.append(
+            {
+                "tenant": tenant_id,
+                "runs": counts["dag_start"],
+                "tasks": tasks,
+                "avg_latency": counters.tenant_avg_duration(tenant_id),
+                "error_rate": counts["task_fail"] / tasks if tasks > 0 else 0.0,
+            }
+        )
+
+    # Sort by run count descending
+    result.sort(key=lambda x: x["runs"], reverse=True)
+
+    return result
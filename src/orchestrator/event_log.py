@@ -0,0 +1,634 @@
+"""
+Segmented Event Log
+
+Append-only JSONL log for orchestrator events and the state store that rolls
+into sealed segments, so readers never have to scan the whole history.
+
+Layout for a log at logs/orchestrator_events.jsonl:
+
+    logs/orchestrator_events.jsonl                            live segment
+    logs/orchestrator_events-2025-06-01.0.jsonl               sealed segment
+    logs/orchestrator_events-2025-06-01.0.jsonl.meta.json     its index
+
+A sealed segment is named for the day of its last record, so every record in
+it is from that day or earlier. The live segment rolls when it would exceed
+EVENT_LOG_SEGMENT_MAX_MB, or when a record arrives on a new day once the live
+segment holds at least EVENT_LOG_MIN_ROLL_KB (tiny logs are not split).
+
+Each segment's index (SegmentMeta) records its record count, timestamp range,
+tenants, DAG names, and hourly event counters. It is built the first time a
+reader needs it and is rebuilt whenever the segment's size changes. Readers:
+- tail() / iter_events() read newest-first, backwards from the end of each file
+- iter_events(since=..., tenant=..., dag_name=...) skips whole segments
+- rolling_counters() sums the hourly counters instead of rescanning events
+
+Task durations are paired from task_start and task_ok/task_fail timestamps
+(keyed by dag_run_id and task_id) and indexed by the hour the task finished, as
+a log-bucketed histogram plus per-tenant totals. A start with no finish in its
+segment, or a finish whose start is in an older segment, is kept in the index
+so rolling_counters() can pair them across a roll.
+"""
+
+import copy
+import json
+import math
+import os
+import threading
+from collections import Counter, OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process locking only
+    fcntl = None
+
+EVENT_LOG_SEGMENT_MAX_MB = float(os.getenv("EVENT_LOG_SEGMENT_MAX_MB", "64"))
+EVENT_LOG_ROLL_DAILY = os.getenv("EVENT_LOG_ROLL_DAILY", "true").lower() in ("true", "1", "yes")
+EVENT_LOG_MIN_ROLL_KB = int(os.getenv("EVENT_LOG_MIN_ROLL_KB", "1024"))
+
+META_SUFFIX = ".meta.json"
+META_VERSION = 2
+META_CACHE_SEGMENTS = 1024
+TENANT_EVENTS = ("dag_start", "task_ok", "task_fail")
+TASK_FINISH_EVENTS = ("task_ok", "task_fail")
+# Duration histogram buckets grow by this factor (~5% percentile error)
+DURATION_BUCKET_BASE = 1.1
+
+_READ_BLOCK = 64 * 1024
+
+_lock = threading.Lock()
+_meta_cache: OrderedDict[str, tuple[int, int, "SegmentMeta"]] = OrderedDict()
+_first_days: dict[str, tuple[int, str | None]] = {}
+
+
+# Segment naming
+
+
+def segment_key(segment: Path, path: Path) -> tuple[date, int] | None:
+    """Return (day, sequence) for a ``<stem>-YYYY-MM-DD[.N]<suffix>`` segment of path, else None."""
+    name = segment.name
+    prefix = f"{path.stem}-"
+    if not name.startswith(prefix) or not name.endswith(path.suffix) or name == path.name:
+        return None
+    stamp = name[len(prefix) : len(name) - len(path.suffix)]
+    day, _, seq = stamp.partition(".")
+    if len(day) != 10 or (seq and not seq.isdigit()):
+        return None
+    try:
+        return date.fromisoformat(day), int(seq or 0)
+    except ValueError:
+        return None
+
+
+def sealed_segments(path: Path) -> list[Path]:
+    """Sealed segments of the log at path, oldest first."""
+    if not path.parent.is_dir():
+        return []
+    keyed = []
+    for segment in path.parent.glob(f"{path.stem}-*{path.suffix}"):
+        key = segment_key(segment, path)
+        if key is not None:
+            keyed.append((key, segment))
+    return [segment for _, segment in sorted(keyed)]
+
+
+# Writing
+
+
+def append_event(event: dict[str, Any], path: str | Path) -> None:
+    """Append one event to the log at path, rolling the live segment first if it is due."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(event) + "\n"
+    day = event.get("timestamp")
+    _maybe_roll(path, len(line), day[:10] if isinstance(day, str) else datetime.now(UTC).date().isoformat())
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line)
+
+
+def _maybe_roll(path: Path, incoming: int, day: str) -> None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return
+    if not _roll_due(path, stat, incoming, day):
+        return
+
+    with open(path.with_name(path.name + ".lock"), "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            # Another writer may have rolled while we waited
+            try:
+                current = path.stat()
+            except FileNotFoundError:
+                return
+            if current.st_ino != stat.st_ino:
+                return
+            last = next(read_reverse(path), None)
+            last_day = _record_day(last) or datetime.fromtimestamp(current.st_mtime, UTC).date().isoformat()
+            existing = [segment_key(s, path) for s in sealed_segments(path)]
+            seq = max((s for d, s in existing if d.isoformat() == last_day), default=-1) + 1
+            os.rename(path, path.with_name(f"{path.stem}-{last_day}.{seq}{path.suffix}"))
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _roll_due(path: Path, stat: os.stat_result, incoming: int, day: str) -> bool:
+    if stat.st_size == 0:
+        return False
+    if stat.st_size + incoming > EVENT_LOG_SEGMENT_MAX_MB * 1024 * 1024:
+        return True
+    if not EVENT_LOG_ROLL_DAILY or stat.st_size < EVENT_LOG_MIN_ROLL_KB * 1024:
+        return False
+    key = str(path)
+    cached = _first_days.get(key)
+    if cached is None or cached[0] != stat.st_ino:
+        with open(path, "rb") as f:
+            cached = (stat.st_ino, _record_day(f.readline()))
+        _first_days[key] = cached
+    return cached[1] is not None and cached[1] < day
+
+
+def _record_day(raw: bytes | None) -> str | None:
+    timestamp = _parse(raw).get("timestamp") if raw else None
+    return timestamp[:10] if isinstance(timestamp, str) and len(timestamp) >= 10 else None
+
+
+# Reading
+
+
+def _parse(raw: bytes) -> dict:
+    try:
+        entry = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return {}
+    return entry if isinstance(entry, dict) else {}
+
+
+def read_reverse(path: Path, block_size: int = _READ_BLOCK) -> Iterator[bytes]:
+    """Yield the non-blank lines of path newest first, reading backwards in blocks."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            lines = (f.read(step) + remainder).split(b"\n")
+            remainder = lines[0]
+            for line in reversed(lines[1:]):
+                if line.strip():
+                    yield line
+        if remainder.strip():
+            yield remainder
+
+
+def _files_newest_first(path: Path) -> list[tuple[Path, bool]]:
+    """(file, sealed) pairs: the live segment, then sealed segments newest first."""
+    files = [(segment, True) for segment in sealed_segments(path)]
+    if path.exists():
+        files.append((path, False))
+    return files[::-1]
+
+
+def iter_events(
+    path: str | Path,
+    *,
+    since: str | None = None,
+    tenant: str | None = None,
+    dag_name: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield events newest first, skipping corrupted lines.
+
+    Args:
+        path: Live segment path
+        since: Only events with timestamp >= since (ISO string comparison, as in analytics)
+        tenant: Only events for this tenant
+        dag_name: Only events for this DAG
+
+    Segments whose index rules them out are never opened; once a segment
+    ends before since, older segments are not considered either.
+    """
+    for file, sealed in _files_newest_first(Path(path)):
+        if since is not None or tenant is not None or dag_name is not None:
+            meta = segment_meta(file, persist=sealed)
+            if since is not None and meta.max_ts is not None and meta.max_ts < since:
+                if meta.undated == 0:
+                    return
+                continue
+            if tenant is not None and tenant not in meta.tenants:
+                continue
+            if dag_name is not None and dag_name not in meta.dags:
+                continue
+        for raw in read_reverse(file):
+            event = _parse(raw)
+            if not event:
+                continue
+            if since is not None and event.get("timestamp", "") < since:
+                continue
+            if tenant is not None and event.get("tenant") != tenant:
+                continue
+            if dag_name is not None and event.get("dag_name") != dag_name:
+                continue
+            yield event
+
+
+def tail(path: str | Path, limit: int) -> list[dict[str, Any]]:
+    """Return the last limit events, most recent first."""
+    return list(islice(iter_events(path), limit))
+
+
+# Task durations
+
+
+def task_key(event: dict[str, Any]) -> str | None:
+    """Key pairing a task's start with its finish, or None without a task_id."""
+    task_id = event.get("task_id")
+    if not isinstance(task_id, str) or not task_id:
+        return None
+    return f"{event.get('dag_run_id', '')}:{task_id}"
+
+
+def task_seconds(start: str, finish: str) -> float | None:
+    """Seconds between two ISO timestamps, or None if unparseable or negative."""
+    try:
+        seconds = (datetime.fromisoformat(finish) - datetime.fromisoformat(start)).total_seconds()
+    except (TypeError, ValueError):
+        return None
+    return seconds if seconds >= 0 else None
+
+
+def duration_bucket(seconds: float) -> int:
+    return math.floor(math.log(max(seconds, 0.001), DURATION_BUCKET_BASE))
+
+
+# Per-segment index
+
+
+@dataclass
+class SegmentMeta:
+    """Index of one segment, valid while the file is ``size`` bytes long."""
+
+    size: int = 0
+    count: int = 0
+    undated: int = 0
+    min_ts: str | None = None
+    max_ts: str | None = None
+    tenants: dict[str, int] = field(default_factory=dict)
+    dags: dict[str, int] = field(default_factory=dict)
+    # "YYYY-MM-DDTHH" -> event type -> count
+    hours: dict[str, dict[str, int]] = field(default_factory=dict)
+    # "YYYY-MM-DDTHH" -> tenant -> event type -> count, for TENANT_EVENTS only (empty
+    # when the tenant had only other events)
+    tenant_hours: dict[str, dict[str, dict[str, int]]] = field(default_factory=dict)
+    # "YYYY-MM-DDTHH" of the finish -> duration bucket -> count, and -> [total seconds, count]
+    durations: dict[str, dict[str, int]] = field(default_factory=dict)
+    duration_totals: dict[str, list[float]] = field(default_factory=dict)
+    # "YYYY-MM-DDTHH" of the finish -> tenant -> [total seconds, count]
+    tenant_durations: dict[str, dict[str, list[float]]] = field(default_factory=dict)
+    # Task key -> [start timestamp, tenant] for starts not finished in this segment
+    open_tasks: dict[str, list] = field(default_factory=dict)
+    # [task key, finish timestamp, tenant] for finishes whose start is in an older segment
+    orphan_finishes: list[list] = field(default_factory=list)
+
+    def observe(self, event: dict[str, Any]) -> None:
+        self.count += 1
+        tenant = event.get("tenant")
+        if isinstance(tenant, str) and tenant:
+            self.tenants[tenant] = self.tenants.get(tenant, 0) + 1
+        dag_name = event.get("dag_name")
+        if isinstance(dag_name, str) and dag_name:
+            self.dags[dag_name] = self.dags.get(dag_name, 0) + 1
+
+        timestamp = event.get("timestamp")
+        if not isinstance(timestamp, str) or len(timestamp) < 13:
+            self.undated += 1
+            return
+        if self.min_ts is None or timestamp < self.min_ts:
+            self.min_ts = timestamp
+        if self.max_ts is None or timestamp > self.max_ts:
+            self.max_ts = timestamp
+
+        event_type = event.get("event")
+        per_tenant = None
+        if isinstance(tenant, str) and tenant:
+            # Registered even with no TENANT_EVENTS so active tenants are listed
+            per_tenant = self.tenant_hours.setdefault(timestamp[:13], {}).setdefault(tenant, {})
+        if not isinstance(event_type, str):
+            return
+        hour = self.hours.setdefault(timestamp[:13], {})
+        hour[event_type] = hour.get(event_type, 0) + 1
+        if per_tenant is not None and event_type in TENANT_EVENTS:
+            per_tenant[event_type] = per_tenant.get(event_type, 0) + 1
+        if event_type == "task_start" or event_type in TASK_FINISH_EVENTS:
+            self._observe_task(event, event_type, timestamp, tenant if isinstance(tenant, str) and tenant else None)
+
+    def _observe_task(self, event: dict[str, Any], event_type: str, timestamp: str, tenant: str | None) -> None:
+        key = task_key(event)
+        if key is None:
+            return
+        if event_type == "task_start":
+            self.open_tasks[key] = [timestamp, tenant]
+            return
+        start = self.open_tasks.pop(key, None)
+        if start is None:
+            self.orphan_finishes.append([key, timestamp, tenant])
+            return
+        seconds = task_seconds(start[0], timestamp)
+        if seconds is not None:
+            self.add_duration(timestamp[:13], seconds, tenant or start[1])
+
+    def add_duration(self, hour: str, seconds: float, tenant: str | None) -> None:
+        bucket = self.durations.setdefault(hour, {})
+        key = str(duration_bucket(seconds))
+        bucket[key] = bucket.get(key, 0) + 1
+        totals = self.duration_totals.setdefault(hour, [0.0, 0])
+        totals[0] += seconds
+        totals[1] += 1
+        if tenant is not None:
+            totals = self.tenant_durations.setdefault(hour, {}).setdefault(tenant, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += 1
+
+    def to_json(self) -> dict:
+        return {"version": META_VERSION, **self.__dict__}
+
+    @classmethod
+    def from_json(cls, data: dict) -> "SegmentMeta":
+        data = dict(data)
+        if data.pop("version", None) != META_VERSION:
+            raise ValueError("segment meta version mismatch")
+        return cls(**data)
+
+
+def _scan(file: Path, meta: SegmentMeta) -> SegmentMeta:
+    """Feed complete lines from meta.size onwards into meta."""
+    with open(file, "rb") as f:
+        f.seek(meta.size)
+        offset = meta.size
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # A writer is mid-append
+            offset += len(raw)
+            if raw.strip():
+                event = _parse(raw)
+                if event:
+                    meta.observe(event)
+    meta.size = offset
+    return meta
+
+
+def segment_meta(file: Path, *, persist: bool = True) -> SegmentMeta:
+    """Return the index for a segment, building or extending it as needed.
+
+    Indexes are cached in memory and extended with whatever was appended since
+    they were last read. With persist (sealed segments) the index is also
+    written to a ``.meta.json`` sidecar so other processes can reuse it.
+    """
+    try:
+        stat = file.stat()
+    except FileNotFoundError:
+        return SegmentMeta()
+    key = str(file)
+
+    with _lock:
+        cached = _meta_cache.get(key)
+    if cached is not None and cached[0] == stat.st_ino and cached[1] == stat.st_size:
+        return cached[2]
+
+    meta = None
+    if cached is not None and cached[0] == stat.st_ino and cached[2].size <= stat.st_size:
+        meta = copy.deepcopy(cached[2])  # Appended since: extend a copy, readers may hold the original
+    if meta is None:
+        meta = _read_meta(file, stat.st_size)
+    if meta is None:
+        meta = SegmentMeta()
+    if meta.size != stat.st_size:
+        _scan(file, meta)
+        if persist and meta.size == stat.st_size:
+            _write_meta(file, meta)
+
+    with _lock:
+        _meta_cache[key] = (stat.st_ino, meta.size, meta)
+        _meta_cache.move_to_end(key)
+        while len(_meta_cache) > META_CACHE_SEGMENTS:
+            _meta_cache.popitem(last=False)
+    return meta
+
+
+def _meta_path(file: Path) -> Path:
+    return file.with_name(file.name + META_SUFFIX)
+
+
+def _read_meta(file: Path, size: int) -> SegmentMeta | None:
+    try:
+        meta = SegmentMeta.from_json(json.loads(_meta_path(file).read_text(encoding="utf-8")))
+    except (OSError, ValueError, TypeError):
+        return None
+    return meta if meta.size == size else None
+
+
+def _write_meta(file: Path, meta: SegmentMeta) -> None:
+    """Persist a segment index; best effort, a missing sidecar only costs a rescan."""
+    target = _meta_path(file)
+    temp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        temp.write_text(json.dumps(meta.to_json(), separators=(",", ":")), encoding="utf-8")
+        temp.replace(target)
+    except OSError:
+        temp.unlink(missing_ok=True)
+
+
+# Rolling counters
+
+
+@dataclass
+class EventCounters:
+    """Event-type counts, overall and for TENANT_EVENTS per tenant, plus task durations."""
+
+    events: Counter = field(default_factory=Counter)
+    tenants: dict[str, Counter] = field(default_factory=dict)
+    # Duration bucket -> count
+    durations: Counter = field(default_factory=Counter)
+    duration_total: float = 0.0
+    # Tenant -> [total seconds, count]
+    tenant_durations: dict[str, list[float]] = field(default_factory=dict)
+
+    def add_event(self, event: dict[str, Any]) -> None:
+        event_type = event.get("event")
+        tenant = event.get("tenant")
+        per_tenant = self.tenants.setdefault(tenant, Counter()) if isinstance(tenant, str) and tenant else None
+        if not isinstance(event_type, str):
+            return
+        self.events[event_type] += 1
+        if per_tenant is not None and event_type in TENANT_EVENTS:
+            per_tenant[event_type] += 1
+
+    def add_hour(self, meta: SegmentMeta, hour: str) -> None:
+        # Plain loops: Counter.update's type checks dominate on month-long windows
+        events = self.events
+        for event_type, count in meta.hours.get(hour, {}).items():
+            events[event_type] += count
+        for tenant, counts in meta.tenant_hours.get(hour, {}).items():
+            target = self.tenants.get(tenant)
+            if target is None:
+                target = self.tenants[tenant] = Counter()
+            for event_type, count in counts.items():
+                target[event_type] += count
+
+    def add_duration(self, seconds: float, tenant: str | None) -> None:
+        self.durations[duration_bucket(seconds)] += 1
+        self.duration_total += seconds
+        if tenant is not None:
+            totals = self.tenant_durations.setdefault(tenant, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += 1
+
+    def add_hour_durations(self, meta: SegmentMeta, hour: str) -> None:
+        for bucket, count in meta.durations.get(hour, {}).items():
+            self.durations[int(bucket)] += count
+        self.duration_total += meta.duration_totals.get(hour, (0.0, 0))[0]
+        for tenant, (total, count) in meta.tenant_durations.get(hour, {}).items():
+            totals = self.tenant_durations.setdefault(tenant, [0.0, 0])
+            totals[0] += total
+            totals[1] += count
+
+    def avg_duration(self) -> float:
+        count = sum(self.durations.values())
+        return self.duration_total / count if count else 0.0
+
+    def duration_percentile(self, q: float) -> float:
+        """Approximate q-quantile (0..1) of task durations in seconds, 0.0 if none."""
+        count = sum(self.durations.values())
+        if not count:
+            return 0.0
+        rank = q * count
+        seen = 0
+        for bucket in sorted(self.durations):
+            seen += self.durations[bucket]
+            if seen >= rank:
+                return DURATION_BUCKET_BASE ** (bucket + 0.5)
+        return DURATION_BUCKET_BASE ** (max(self.durations) + 0.5)
+
+    def tenant_avg_duration(self, tenant: str) -> float:
+        total, count = self.tenant_durations.get(tenant, (0.0, 0))
+        return total / count if count else 0.0
+
+
+def rolling_counters(path: str | Path, since: str | None = None) -> EventCounters:
+    """Count events at or after since (all time if None) from the segment indexes.
+
+    Whole hours come from the hourly counters; only the hour containing since
+    is read from disk, starting at a binary-searched offset. Events without a
+    timestamp are counted only when since is None.
+
+    Task durations are taken at hour resolution: tasks that finished in the
+    hour containing since are included. Finishes whose start lies in an older
+    segment are paired with that segment's open tasks.
+    """
+    counters = EventCounters()
+    since_hour = since[:13] if since is not None else None
+    # Task key -> (finish timestamp, tenant) still looking for its start in an older segment
+    unpaired: dict[str, tuple[str, str | None]] = {}
+    for file, sealed in _files_newest_first(Path(path)):
+        meta = segment_meta(file, persist=sealed)
+        _pair_across_segments(meta, unpaired, counters, since_hour)
+        if since is None:
+            for hour in meta.hours:
+                counters.add_hour(meta, hour)
+            for hour in meta.durations:
+                counters.add_hour_durations(meta, hour)
+            if meta.undated:
+                for event in _iter_file(file, 0, meta.size):
+                    timestamp = event.get("timestamp")
+                    if not isinstance(timestamp, str) or len(timestamp) < 13:
+                        counters.add_event(event)
+            continue
+
+        if meta.max_ts is not None and meta.max_ts < since and meta.undated == 0:
+            if not unpaired:
+                break
+            continue  # Only older segments' open tasks are still needed
+        for hour in meta.hours:
+            if hour > since_hour:
+                counters.add_hour(meta, hour)
+        for hour in meta.durations:
+            if hour >= since_hour:
+                counters.add_hour_durations(meta, hour)
+        if since_hour in meta.hours:
+            with open(file, "rb") as f:
+                start = _seek_timestamp(f, meta.size, since)
+            for event in _iter_file(file, start, meta.size):
+                timestamp = event.get("timestamp")
+                if not isinstance(timestamp, str) or len(timestamp) < 13:
+                    continue
+                if timestamp[:13] > since_hour:
+                    break
+                if timestamp[:13] == since_hour and timestamp >= since:
+                    counters.add_event(event)
+    return counters
+
+
+def _pair_across_segments(
+    meta: SegmentMeta, unpaired: dict[str, tuple[str, str | None]], counters: EventCounters, since_hour: str | None
+) -> None:
+    """Pair finishes from newer segments with meta's open tasks, then queue meta's own orphans."""
+    for key in [key for key in unpaired if key in meta.open_tasks]:
+        finish, tenant = unpaired.pop(key)
+        start, start_tenant = meta.open_tasks[key]
+        seconds = task_seconds(start, finish)
+        if seconds is not None:
+            counters.add_duration(seconds, tenant or start_tenant)
+    for key, finish, tenant in meta.orphan_finishes:
+        if since_hour is None or finish[:13] >= since_hour:
+            unpaired.setdefault(key, (finish, tenant))
+
+
+def _iter_file(file: Path, start: int, stop: int) -> Iterator[dict[str, Any]]:
+    with open(file, "rb") as f:
+        f.seek(start)
+        offset = start
+        for raw in f:
+            if offset >= stop:
+                break
+            offset += len(raw)
+            event = _parse(raw) if raw.strip() else None
+            if event:
+                yield event
+
+
+def _seek_timestamp(f, size: int, target: str) -> int:
+    """Return a line-aligned offset before the first record with timestamp >= target.
+
+    Assumes records are appended in roughly timestamp order, as event logs
+    are; lines without a timestamp are stepped over.
+    """
+    low, high = 0, size
+    while high - low > _READ_BLOCK:
+        middle = (low + high) // 2
+        f.seek(middle)
+        f.readline()  # Align to the next line start
+        timestamp = None
+        while timestamp is None and f.tell() < high:
+            value = _parse(f.readline()).get("timestamp")
+            timestamp = value if isinstance(value, str) else None
+        if timestamp is None or timestamp < target:
+            low = middle
+        else:
+            high = middle
+    if low:
+        f.seek(low)
+        f.readline()
+        return f.tell()
+    return 0
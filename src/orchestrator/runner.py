@@ -3,17 +3,16 @@
 Supports checkpoint tasks for human-in-the-loop approvals (Sprint 31).
 """
 
-import json
 import os
 import uuid
 from datetime import UTC, datetime
-from pathlib import Path
 
 from .checkpoints import (
     create_checkpoint,
     get_resume_token,
     write_resume_token,
 )
+from .event_log import append_event, iter_events
 from .graph import DAG, merge_payloads, toposort, validate
 
 
@@ -24,10 +23,8 @@ class RunnerError(Exception):
 
 
 def log_event(event: dict, events_path: str) -> None:
-    """Log event to JSONL file."""
-    Path(events_path).parent.mkdir(parents=True, exist_ok=True)
-    with open(events_path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(event) + "\n")
+    """Log event to the segmented JSONL event log."""
+    append_event(event, events_path)
 
 
 def run_dag(
@@ -102,14 +99,14 @@ def run_dag(
         start_idx = next((i for i, t in enumerate(ordered_tasks) if t.id == start_from_task), 0)
         tasks_to_execute = ordered_tasks[start_idx:]
 
-        # Count tasks that succeeded before the pause by reading events log
-        if Path(events_path).exists():
-            with open(events_path, encoding="utf-8") as f:
-                for line in f:
-                    if line.strip():
-                        event = json.loads(line)
-                        if event.get("dag_run_id") == dag_run_id and event.get("event") == "task_ok":
-                            tasks_succeeded += 1
+        # Count tasks that succeeded before the pause, reading back to this run's dag_start
+        for event in iter_events(events_path, dag_name=dag.name):
+            if event.get("dag_run_id") != dag_run_id:
+                continue
+            if event.get("event") == "task_ok":
+                tasks_succeeded += 1
+            elif event.get("event") == "dag_start":
+                break
     else:
         tasks_to_execute = ordered_tasks
 
@@ -3,14 +3,18 @@
 
 Append-only JSONL storage for DAG run metadata and scheduler events.
 Simple, fast, and easy to query with standard tools.
+
+Backed by the segmented event log (event_log.py): reads come from the tail
+of the newest segments instead of the whole history.
 """
 
-import json
 import os
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+from .event_log import append_event, tail
+
 
 def get_state_store_path() -> Path:
     """
@@ -33,19 +37,14 @@ def record_event(event: dict[str, Any], path: str | None = None) -> None:
         event: Event dictionary to record
         path: Optional path override (defaults to STATE_STORE_PATH)
     """
-    if path is None:
-        store_path = get_state_store_path()
-    else:
-        store_path = Path(path)
-        store_path.parent.mkdir(parents=True, exist_ok=True)
+    store_path = get_state_store_path() if path is None else Path(path)
 
     # Add timestamp if not present
     if "timestamp" not in event:
         event["timestamp"] = datetime.now(UTC).isoformat()
 
     try:
-        with open(store_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(event) + "\n")
+        append_event(event, store_path)
     except Exception as e:
         # Don't fail the operation if logging fails
         print(f"Warning: Failed to record event: {e}")
@@ -67,25 +66,8 @@ def last_runs(limit: int = 20, path: str | None = None) -> list[dict[str, Any]]:
     else:
         store_path = Path(path)
 
-    if not store_path.exists():
-        return []
-
-    events = []
-
     try:
-        with open(store_path, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        event = json.loads(line)
-                        events.append(event)
-                    except json.JSONDecodeError:
-                        pass  # Skip corrupted lines
-
-        # Return most recent events first
-        return events[-limit:][::-1]
-
+        return tail(store_path, limit)
     except Exception as e:
         print(f"Warning: Failed to read state store: {e}")
         return []
@@ -108,28 +90,10 @@ def index_by(field: str, limit: int = 100, path: str | None = None) -> dict[str,
     else:
         store_path = Path(path)
 
-    if not store_path.exists():
-        return {}
-
-    events = []
-
     try:
-        with open(store_path, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        event = json.loads(line)
-                        events.append(event)
-                    except json.JSONDecodeError:
-                        pass
-
-        # Take last N events
-        recent = events[-limit:]
-
-        # Index by field
+        # Index the last N events in chronological order
         index: dict[str, list[dict[str, Any]]] = {}
-        for event in recent:
+        for event in reversed(tail(store_path, limit)):
             key = event.get(field)
             if key:
                 if key not in index:
@@ -3,22 +3,33 @@
 
 Append-only JSONL storage for permanently failed jobs.
 Supports list and replay operations.
+
+Storage is segmented and indexed (see dlq_store.py) so filtered listing and
+bulk replay stay fast with tens of thousands of entries.
 """
 
 import argparse
-import json
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+from .dlq_store import DLQStore
+
 
 def get_dlq_path() -> Path:
     """Get DLQ file path from environment."""
     return Path(os.getenv("DLQ_PATH", "logs/dlq.jsonl"))
 
 
+def get_dlq_store() -> DLQStore:
+    """Get segmented DLQ store for the configured path."""
+    return DLQStore(get_dlq_path())
+
+
 def append_to_dlq(job_dict: dict[str, Any], reason: str) -> None:
     """
     Append failed job to DLQ.
@@ -27,50 +38,46 @@ def append_to_dlq(job_dict: dict[str, Any], reason: str) -> None:
         job_dict: Job data dictionary
         reason: Failure reason (max_retries, rate_limited, invalid)
     """
-    dlq_path = get_dlq_path()
-    dlq_path.parent.mkdir(parents=True, exist_ok=True)
-
     entry = {
         "timestamp": datetime.now(UTC).isoformat(),
         "reason": reason,
         "job": job_dict,
     }
 
-    with open(dlq_path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(entry) + "\n")
+    get_dlq_store().append(entry)
 
 
-def list_dlq(limit: int = 50) -> list[dict[str, Any]]:
+def list_dlq(
+    limit: int = 50,
+    reason: str | None = None,
+    tenant_id: str | None = None,
+    dag_path: str | None = None,
+    since: str | None = None,
+) -> list[dict[str, Any]]:
     """
     List entries from DLQ.
 
+    Reads segments backwards from the tail, so cost scales with `limit`
+    rather than DLQ size. Filtered reads skip sealed segments whose index
+    has no matching reason/tenant/dag.
+
     Args:
         limit: Maximum number of entries to return (most recent first)
+        reason: Filter by failure reason
+        tenant_id: Filter by tenant
+        dag_path: Filter by DAG path
+        since: Filter by minimum ISO timestamp
 
     Returns:
         List of DLQ entries
     """
-    dlq_path = get_dlq_path()
-
-    if not dlq_path.exists():
-        return []
-
-    entries = []
     try:
-        with open(dlq_path, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        entries.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        pass  # Skip corrupted lines
+        return get_dlq_store().list_entries(
+            limit=limit, reason=reason, tenant_id=tenant_id, dag_path=dag_path, since=since
+        )
     except Exception:
         return []
 
-    # Return most recent first
-    return entries[-limit:][::-1]
-
 
 def replay_job(job_id: str) -> dict[str, Any] | None:
     """
@@ -82,27 +89,149 @@ def replay_job(job_id: str) -> dict[str, Any] | None:
     Returns:
         Job dict if found, None otherwise
     """
-    dlq_path = get_dlq_path()
-
-    if not dlq_path.exists():
-        return None
-
     try:
-        with open(dlq_path, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        entry = json.loads(line)
-                        job = entry.get("job", {})
-                        if job.get("id") == job_id:
-                            return job
-                    except json.JSONDecodeError:
-                        pass
+        return get_dlq_store().find_job(job_id)
     except Exception:
         return None
 
-    return None
+
+def reset_job_for_replay(job: dict[str, Any]) -> dict[str, Any]:
+    """
+    Reset a DLQ job dict so it can be re-enqueued.
+
+    Args:
+        job: Job dict from DLQ entry
+
+    Returns:
+        Copy of job with run state cleared
+    """
+    job = dict(job)
+    job["status"] = "pending"
+    job["attempts"] = 0
+    job["error"] = None
+    job["result"] = None
+    job["started_at"] = None
+    job["finished_at"] = None
+    job["enqueued_at"] = datetime.now(UTC).isoformat()
+    return job
+
+
+def select_replay_jobs(
+    reason: str | None = None,
+    tenant_id: str | None = None,
+    dag_path: str | None = None,
+    since: str | None = None,
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Select distinct jobs from DLQ matching filters (newest entry per job ID wins).
+
+    Args:
+        reason: Filter by failure reason
+        tenant_id: Filter by tenant
+        dag_path: Filter by DAG path
+        since: Filter by minimum ISO timestamp
+        limit: Maximum number of jobs (None for all)
+
+    Returns:
+        Job dicts, most recent first
+    """
+    seen: set[str] = set()
+    jobs: list[dict[str, Any]] = []
+
+    for entry in get_dlq_store().iter_entries(reason=reason, tenant_id=tenant_id, dag_path=dag_path, since=since):
+        job = entry.get("job", {})
+        job_id = job.get("id")
+        if not job_id or job_id in seen:
+            continue
+        seen.add(job_id)
+        jobs.append(job)
+        if limit is not None and len(jobs) >= limit:
+            break
+
+    return jobs
+
+
+def replay_bulk(
+    queue: Any,
+    reason: str | None = None,
+    tenant_id: str | None = None,
+    dag_path: str | None = None,
+    since: str | None = None,
+    limit: int | None = None,
+    batch_size: int = 100,
+    workers: int = 4,
+    rate_per_sec: float = 50.0,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """
+    Re-enqueue matching DLQ jobs in rate-limited parallel batches.
+
+    Batches are admitted through a token bucket (one token per job), then
+    enqueued concurrently on a thread pool.
+
+    Args:
+        queue: Persistent queue backend to enqueue into
+        reason: Filter by failure reason
+        tenant_id: Filter by tenant
+        dag_path: Filter by DAG path
+        since: Filter by minimum ISO timestamp
+        limit: Maximum number of jobs to replay
+        batch_size: Jobs per batch
+        workers: Parallel enqueue threads
+        rate_per_sec: Maximum jobs enqueued per second (0 disables limiting)
+        dry_run: Select and report without enqueueing
+
+    Returns:
+        Summary with matched, replayed, failed counts, failed job IDs, and duration
+    """
+    from .persistent_queue import Job
+    from .ratelimit import TokenBucketLimiter
+
+    start = time.monotonic()
+    jobs = select_replay_jobs(reason=reason, tenant_id=tenant_id, dag_path=dag_path, since=since, limit=limit)
+
+    summary: dict[str, Any] = {
+        "matched": len(jobs),
+        "replayed": 0,
+        "failed": 0,
+        "failed_ids": [],
+        "dry_run": dry_run,
+    }
+
+    if dry_run or not jobs:
+        summary["duration_s"] = time.monotonic() - start
+        return summary
+
+    batch_size = max(1, batch_size)
+    limiter = None
+    if rate_per_sec > 0:
+        limiter = TokenBucketLimiter(rate=rate_per_sec, capacity=max(batch_size, int(rate_per_sec)))
+
+    def _enqueue(job: dict[str, Any]) -> str | None:
+        try:
+            queue.enqueue(Job.from_dict(reset_job_for_replay(job)))
+            return None
+        except Exception:
+            return job.get("id", "unknown")
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for offset in range(0, len(jobs), batch_size):
+            batch = jobs[offset : offset + batch_size]
+
+            if limiter is not None:
+                while not limiter.allow(len(batch)):
+                    time.sleep(min(1.0, len(batch) / rate_per_sec))
+
+            for failed_id in executor.map(_enqueue, batch):
+                if failed_id is None:
+                    summary["replayed"] += 1
+                else:
+                    summary["failed"] += 1
+                    summary["failed_ids"].append(failed_id)
+
+    summary["duration_s"] = time.monotonic() - start
+    return summary
 
 
 def main():
@@ -114,15 +243,39 @@ def main():
     # List command
     list_parser = subparsers.add_parser("list", help="List DLQ entries")
     list_parser.add_argument("--limit", type=int, default=50, help="Max entries to show")
+    list_parser.add_argument("--reason", help="Filter by failure reason")
+    list_parser.add_argument("--tenant", help="Filter by tenant ID")
+    list_parser.add_argument("--dag", help="Filter by DAG path")
+    list_parser.add_argument("--since", help="Filter by minimum ISO timestamp")
 
     # Replay command
     replay_parser = subparsers.add_parser("replay", help="Replay job from DLQ")
     replay_parser.add_argument("--id", required=True, help="Job ID to replay")
 
+    # Bulk replay command
+    bulk_parser = subparsers.add_parser("replay-bulk", help="Replay all matching jobs from DLQ")
+    bulk_parser.add_argument("--reason", help="Filter by failure reason")
+    bulk_parser.add_argument("--tenant", help="Filter by tenant ID")
+    bulk_parser.add_argument("--dag", help="Filter by DAG path")
+    bulk_parser.add_argument("--since", help="Filter by minimum ISO timestamp")
+    bulk_parser.add_argument("--limit", type=int, default=None, help="Max jobs to replay")
+    bulk_parser.add_argument("--batch-size", type=int, default=100, help="Jobs per batch")
+    bulk_parser.add_argument("--workers", type=int, default=4, help="Parallel enqueue threads")
+    bulk_parser.add_argument("--rate", type=float, default=50.0, help="Max jobs per second (0 = unlimited)")
+    bulk_parser.add_argument("--dry-run", action="store_true", help="Show what would be replayed")
+
+    # Stats command
+    subparsers.add_parser("stats", help="Show DLQ segment and counter stats")
+
+    # Rotate command
+    subparsers.add_parser("rotate", help="Seal active DLQ segment and index it")
+
     args = parser.parse_args()
 
     if args.command == "list":
-        entries = list_dlq(limit=args.limit)
+        entries = list_dlq(
+            limit=args.limit, reason=args.reason, tenant_id=args.tenant, dag_path=args.dag, since=args.since
+        )
 
         if not entries:
             print("DLQ is empty")
@@ -156,13 +309,7 @@ def main():
         from relay_ai.queue.persistent_queue import Job  # noqa: E402
 
         # Reset job for replay
-        job["status"] = "pending"
-        job["attempts"] = 0
-        job["error"] = None
-        job["result"] = None
-        job["started_at"] = None
-        job["finished_at"] = None
-        job["enqueued_at"] = datetime.now(UTC).isoformat()
+        job = reset_job_for_replay(job)
 
         # Get queue backend
         from relay_ai.orchestrator.scheduler import get_queue_backend  # noqa: E402
@@ -174,6 +321,56 @@ def main():
         print(f"Job {args.id} replayed successfully")
         return 0
 
+    elif args.command == "replay-bulk":
+        queue = None
+        if not args.dry_run:
+            sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+            from relay_ai.orchestrator.scheduler import get_queue_backend  # noqa: E402
+
+            queue = get_queue_backend()
+
+        summary = replay_bulk(
+            queue,
+            reason=args.reason,
+            tenant_id=args.tenant,
+            dag_path=args.dag,
+            since=args.since,
+            limit=args.limit,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            rate_per_sec=args.rate,
+            dry_run=args.dry_run,
+        )
+
+        prefix = "[DRY RUN] " if args.dry_run else ""
+        print(f"{prefix}Matched {summary['matched']} jobs")
+        if not args.dry_run:
+            print(f"Replayed: {summary['replayed']}  Failed: {summary['failed']}  ({summary['duration_s']:.2f}s)")
+            for failed_id in summary["failed_ids"]:
+                print(f"  failed: {failed_id}")
+
+        return 0 if summary["failed"] == 0 else 1
+
+    elif args.command == "stats":
+        stats = get_dlq_store().stats()
+
+        print(f"Segments: {stats['segments']}  Size: {stats['size_bytes']} bytes  Entries: {stats['total']}")
+        for reason, count in sorted(stats["reasons"].items(), key=lambda kv: -kv[1]):
+            print(f"  {reason:20s} {count}")
+
+        return 0
+
+    elif args.command == "rotate":
+        segment = get_dlq_store().rotate()
+
+        if segment is None:
+            print("Active DLQ segment is empty, nothing to rotate")
+        else:
+            print(f"Sealed {segment}")
+
+        return 0
+
     else:
         parser.print_help()
         return 1
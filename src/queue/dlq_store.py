@@ -0,0 +1,572 @@
+"""
+Segmented DLQ Store (Sprint 29)
+
+Segment-rotated JSONL storage for the dead letter queue:
+- Active segment is the configured DLQ_PATH (append-only, same format as before)
+- Sealed segments are rotated out by size with a sidecar index of reason/tenant/dag counts
+- Reads walk segments newest-first and read each file backwards from the tail
+- Hourly counters are maintained on append so rate signals never scan entries
+- Writers in separate processes serialize on an flock'd sidecar lock file
+"""
+
+import json
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process locking only
+    fcntl = None
+
+DEFAULT_SEGMENT_MAX_BYTES = 8 * 1024 * 1024
+COUNTER_RETENTION_HOURS = 7 * 24
+COUNTER_JOURNAL_MAX_BYTES = 64 * 1024  # Fold the counter journal into the snapshot past this size
+_READ_BLOCK_SIZE = 64 * 1024
+
+_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(path: Path) -> threading.Lock:
+    """Get the process-wide lock guarding a DLQ path."""
+    key = str(path.resolve())
+    with _locks_guard:
+        if key not in _locks:
+            _locks[key] = threading.Lock()
+        return _locks[key]
+
+
+def _hour_bucket(timestamp: str) -> str:
+    """Truncate an ISO timestamp to its hour bucket (YYYY-MM-DDTHH)."""
+    return timestamp[:13]
+
+
+def reverse_lines(path: Path, block_size: int = _READ_BLOCK_SIZE) -> Iterator[str]:
+    """
+    Yield non-empty lines of a file from last to first.
+
+    Reads fixed-size blocks backwards from the end, so returning the newest
+    N lines costs O(N) regardless of file size.
+
+    Args:
+        path: File to read
+        block_size: Bytes per backwards read
+
+    Yields:
+        Decoded, stripped lines, newest first
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+
+    with f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b""
+
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size) + remainder
+            lines = chunk.split(b"\n")
+            # First piece may be a partial line continued in the previous block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                line = line.strip()
+                if line:
+                    yield line.decode("utf-8", errors="replace")
+
+        remainder = remainder.strip()
+        if remainder:
+            yield remainder.decode("utf-8", errors="replace")
+
+
+def _entry_matches(
+    entry: dict[str, Any],
+    reason: str | None,
+    tenant_id: str | None,
+    dag_path: str | None,
+) -> bool:
+    """Check whether a DLQ entry matches the given filters."""
+    job = entry.get("job", {})
+    if reason is not None and entry.get("reason") != reason:
+        return False
+    if tenant_id is not None and job.get("tenant_id") != tenant_id:
+        return False
+    if dag_path is not None and job.get("dag_path") != dag_path:
+        return False
+    return True
+
+
+class DLQStore:
+    """
+    Segmented, indexed dead letter queue.
+
+    Layout next to the configured path (e.g. logs/dlq.jsonl):
+        dlq.jsonl                 active segment
+        dlq.000001.jsonl          sealed segment
+        dlq.000001.idx.json       sidecar index for the sealed segment
+        dlq.counters.json         hourly counters snapshot
+        dlq.counters.log          counter journal (one line per append since the snapshot)
+        dlq.lock                  flock target serializing writers across processes
+    """
+
+    def __init__(self, path: Path, segment_max_bytes: int | None = None):
+        """
+        Initialize DLQ store.
+
+        Args:
+            path: Active segment path
+            segment_max_bytes: Rotate active segment once it exceeds this size
+                (defaults to DLQ_SEGMENT_MAX_BYTES env or 8 MiB)
+        """
+        self.path = Path(path)
+        if segment_max_bytes is None:
+            segment_max_bytes = int(os.getenv("DLQ_SEGMENT_MAX_BYTES", str(DEFAULT_SEGMENT_MAX_BYTES)))
+        self.segment_max_bytes = segment_max_bytes
+        self._lock = _lock_for(self.path)
+
+    @property
+    def counters_path(self) -> Path:
+        """Path of the hourly counters snapshot."""
+        return self.path.with_name(f"{self.path.stem}.counters.json")
+
+    @property
+    def journal_path(self) -> Path:
+        """Path of the counter journal appended to on every write."""
+        return self.path.with_name(f"{self.path.stem}.counters.log")
+
+    @contextmanager
+    def _locked(self, shared: bool = False) -> Iterator[None]:
+        """Hold the store lock: the process-wide thread lock plus an flock for other processes.
+
+        Shared mode (readers) only takes the flock, so readers don't block each other,
+        and never creates the lock file: if no writer has made it there is nothing to guard.
+        """
+        thread_lock = None if shared else self._lock
+        if thread_lock is not None:
+            thread_lock.acquire()
+        try:
+            lock_path = self.path.with_name(f"{self.path.stem}.lock")
+            if fcntl is None:
+                yield
+                return
+            if shared:
+                try:
+                    lock_file = open(lock_path)
+                except FileNotFoundError:  # No writer yet
+                    yield
+                    return
+            else:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                lock_file = open(lock_path, "a")
+            with lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        finally:
+            if thread_lock is not None:
+                thread_lock.release()
+
+    def _segment_path(self, seq: int) -> Path:
+        return self.path.with_name(f"{self.path.stem}.{seq:06d}.jsonl")
+
+    def _index_path(self, segment: Path) -> Path:
+        return segment.with_name(segment.name[: -len(".jsonl")] + ".idx.json")
+
+    def sealed_segments(self) -> list[Path]:
+        """List sealed segments, oldest first."""
+        if not self.path.parent.exists():
+            return []
+        prefix = f"{self.path.stem}."
+        segments = []
+        for candidate in self.path.parent.glob(f"{self.path.stem}.*.jsonl"):
+            seq = candidate.name[len(prefix) : -len(".jsonl")]
+            if seq.isdigit():
+                segments.append((int(seq), candidate))
+        return [p for _, p in sorted(segments)]
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, entry: dict[str, Any]) -> None:
+        """
+        Append an entry to the active segment and bump counters.
+
+        Rotates the active segment when it grows past segment_max_bytes.
+
+        Args:
+            entry: DLQ entry with timestamp, reason, and job
+        """
+        line = json.dumps(entry) + "\n"
+
+        with self._locked():
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                size = f.tell()
+
+            self._bump_counters(entry)
+
+            if size >= self.segment_max_bytes:
+                self._rotate_locked()
+
+    def rotate(self) -> Path | None:
+        """
+        Seal the active segment and write its sidecar index.
+
+        Returns:
+            Path of the sealed segment, or None if the active segment is empty
+        """
+        with self._locked():
+            return self._rotate_locked()
+
+    def _rotate_locked(self) -> Path | None:
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return None
+
+        sealed = self.sealed_segments()
+        next_seq = 1
+        if sealed:
+            next_seq = int(sealed[-1].name[len(self.path.stem) + 1 : -len(".jsonl")]) + 1
+
+        segment = self._segment_path(next_seq)
+        self.path.replace(segment)
+
+        index = self._build_index(segment)
+        self._write_json_atomic(self._index_path(segment), index)
+        return segment
+
+    def _build_index(self, segment: Path) -> dict[str, Any]:
+        """Scan a segment once and summarize it for later filtered reads."""
+        index: dict[str, Any] = {
+            "segment": segment.name,
+            "count": 0,
+            "first_ts": None,
+            "last_ts": None,
+            "reasons": {},
+            "tenants": {},
+            "dags": {},
+        }
+
+        with open(segment, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                ts = entry.get("timestamp", "")
+                job = entry.get("job", {})
+                index["count"] += 1
+                if index["first_ts"] is None or ts < index["first_ts"]:
+                    index["first_ts"] = ts
+                if index["last_ts"] is None or ts > index["last_ts"]:
+                    index["last_ts"] = ts
+
+                for key, value in (
+                    ("reasons", entry.get("reason")),
+                    ("tenants", job.get("tenant_id")),
+                    ("dags", job.get("dag_path")),
+                ):
+                    if value is not None:
+                        index[key][value] = index[key].get(value, 0) + 1
+
+        return index
+
+    def load_index(self, segment: Path) -> dict[str, Any]:
+        """
+        Load a sealed segment's sidecar index, rebuilding it in memory if missing.
+
+        Indexes are written when a segment is sealed; reads never write one back.
+
+        Args:
+            segment: Sealed segment path
+
+        Returns:
+            Index dict
+        """
+        index_path = self._index_path(segment)
+        try:
+            with open(index_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return self._build_index(segment)
+
+    @staticmethod
+    def _write_json_atomic(path: Path, data: dict[str, Any]) -> None:
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        temp_path.replace(path)
+
+    # ------------------------------------------------------------------
+    # Counters
+    # ------------------------------------------------------------------
+
+    def _read_counters(self) -> dict[str, Any] | None:
+        try:
+            with open(self.counters_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _apply_journal(self, counters: dict[str, Any]) -> dict[str, Any]:
+        """Fold journal lines (``bucket\\treason``) into a counters snapshot."""
+        hourly = counters.setdefault("hourly", {})
+        reasons = counters.setdefault("reasons", {})
+        try:
+            with open(self.journal_path, encoding="utf-8") as f:
+                for line in f:
+                    bucket, _, reason = line.rstrip("\n").partition("\t")
+                    if not reason:
+                        continue  # Torn write
+                    hourly[bucket] = hourly.get(bucket, 0) + 1
+                    reasons[reason] = reasons.get(reason, 0) + 1
+                    counters["total"] = counters.get("total", 0) + 1
+        except FileNotFoundError:
+            pass
+
+        # Prune buckets beyond retention; ISO hour strings sort chronologically
+        if len(hourly) > COUNTER_RETENTION_HOURS:
+            for stale in sorted(hourly)[: len(hourly) - COUNTER_RETENTION_HOURS]:
+                del hourly[stale]
+        return counters
+
+    def _bump_counters(self, entry: dict[str, Any]) -> None:
+        """Record an append in the counter journal (caller holds the lock).
+
+        Appends one short line instead of rewriting the snapshot; the journal is
+        folded into the snapshot once it passes COUNTER_JOURNAL_MAX_BYTES.
+        """
+        if self._read_counters() is None:
+            # First write after upgrade: seed from any pre-existing entries
+            # (the entry just appended is already on disk and gets counted)
+            self._write_json_atomic(self.counters_path, self._rebuild_counters())
+            self.journal_path.unlink(missing_ok=True)
+            return
+
+        bucket = _hour_bucket(entry.get("timestamp", ""))
+        reason = str(entry.get("reason", "unknown")).replace("\t", " ").replace("\n", " ")
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(f"{bucket}\t{reason}\n")
+            journal_size = f.tell()
+
+        if journal_size >= COUNTER_JOURNAL_MAX_BYTES:
+            self._write_json_atomic(self.counters_path, self._apply_journal(self._read_counters() or {}))
+            self.journal_path.unlink()
+
+    def _rebuild_counters(self) -> dict[str, Any]:
+        """Rebuild counters by scanning every segment (one-time migration path)."""
+        counters: dict[str, Any] = {"total": 0, "hourly": {}, "reasons": {}}
+        for segment in [*self.sealed_segments(), self.path]:
+            if not segment.exists():
+                continue
+            with open(segment, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    bucket = _hour_bucket(entry.get("timestamp", ""))
+                    counters["hourly"][bucket] = counters["hourly"].get(bucket, 0) + 1
+                    reason = entry.get("reason", "unknown")
+                    counters["reasons"][reason] = counters["reasons"].get(reason, 0) + 1
+                    counters["total"] += 1
+        return counters
+
+    def get_counters(self) -> dict[str, Any]:
+        """
+        Get DLQ counters (total, per-reason, hourly buckets).
+
+        Without a snapshot (store written before counters existed) the counters
+        are rebuilt in memory; the next append persists them.
+
+        Returns:
+            Counters dict
+        """
+        with self._locked(shared=True):
+            counters = self._read_counters()
+            if counters is not None:
+                return self._apply_journal(counters)
+            return self._rebuild_counters()
+
+    def count_since(self, cutoff: datetime) -> int:
+        """
+        Count entries appended at or after cutoff.
+
+        Whole hours after the cutoff come from the hourly counters; only the
+        entries of the hour containing the cutoff are read, from segments
+        whose index overlaps that hour.
+
+        Args:
+            cutoff: Window start (naive datetimes are taken as UTC)
+
+        Returns:
+            Number of entries in the window
+        """
+        if cutoff.tzinfo is None:
+            cutoff = cutoff.replace(tzinfo=UTC)
+        cutoff_iso = cutoff.astimezone(UTC).isoformat()
+        cutoff_bucket = _hour_bucket(cutoff_iso)
+        hourly = self.get_counters().get("hourly", {})
+
+        total = sum(n for bucket, n in hourly.items() if bucket > cutoff_bucket)
+        if hourly.get(cutoff_bucket):
+            bucket_end = (datetime.fromisoformat(cutoff_bucket + ":00:00+00:00") + timedelta(hours=1)).isoformat()
+            total += self._count_between(cutoff_iso, bucket_end)
+        return total
+
+    def _count_between(self, start: str, end: str) -> int:
+        """Count entries with start <= timestamp < end by reading overlapping segments."""
+        count = 0
+        for segment in [*self.sealed_segments(), self.path]:
+            if segment != self.path:
+                index = self.load_index(segment)
+                if (index["last_ts"] or "") < start or (index["first_ts"] or "") >= end:
+                    continue
+            try:
+                f = open(segment, encoding="utf-8")
+            except FileNotFoundError:
+                continue
+            with f:
+                for line in f:
+                    try:
+                        timestamp = json.loads(line).get("timestamp", "")
+                    except json.JSONDecodeError:
+                        continue
+                    if start <= timestamp < end:
+                        count += 1
+        return count
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def iter_entries(
+        self,
+        reason: str | None = None,
+        tenant_id: str | None = None,
+        dag_path: str | None = None,
+        since: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Iterate DLQ entries newest first, optionally filtered.
+
+        Sealed segments whose index rules out the filters are skipped without
+        being opened; iteration stops once entries fall before `since`.
+
+        Args:
+            reason: Only entries with this failure reason
+            tenant_id: Only jobs for this tenant
+            dag_path: Only jobs for this DAG
+            since: Only entries with timestamp >= this ISO string
+
+        Yields:
+            DLQ entries, most recent first
+        """
+        segments = [self.path, *reversed(self.sealed_segments())]
+
+        for segment in segments:
+            if segment != self.path:
+                index = self.load_index(segment)
+                if reason is not None and reason not in index["reasons"]:
+                    continue
+                if tenant_id is not None and tenant_id not in index["tenants"]:
+                    continue
+                if dag_path is not None and dag_path not in index["dags"]:
+                    continue
+                if since is not None and (index["last_ts"] or "") < since:
+                    return
+
+            for line in reverse_lines(segment):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Skip corrupted lines
+
+                if since is not None and entry.get("timestamp", "") < since:
+                    return
+                if _entry_matches(entry, reason, tenant_id, dag_path):
+                    yield entry
+
+    def list_entries(
+        self,
+        limit: int = 50,
+        reason: str | None = None,
+        tenant_id: str | None = None,
+        dag_path: str | None = None,
+        since: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        List the newest matching entries.
+
+        Args:
+            limit: Maximum entries to return
+            reason: Filter by failure reason
+            tenant_id: Filter by tenant
+            dag_path: Filter by DAG path
+            since: Filter by minimum ISO timestamp
+
+        Returns:
+            Matching entries, most recent first
+        """
+        entries: list[dict[str, Any]] = []
+        if limit <= 0:
+            return entries
+
+        for entry in self.iter_entries(reason=reason, tenant_id=tenant_id, dag_path=dag_path, since=since):
+            entries.append(entry)
+            if len(entries) >= limit:
+                break
+        return entries
+
+    def find_job(self, job_id: str) -> dict[str, Any] | None:
+        """
+        Find the most recent DLQ entry for a job.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Job dict if found, None otherwise
+        """
+        for entry in self.iter_entries():
+            job = entry.get("job", {})
+            if job.get("id") == job_id:
+                return job
+        return None
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Summarize the store without reading entries.
+
+        Returns:
+            Dict with segment count, sizes, and counters
+        """
+        sealed = self.sealed_segments()
+        size_bytes = sum(p.stat().st_size for p in sealed)
+        if self.path.exists():
+            size_bytes += self.path.stat().st_size
+        counters = self.get_counters()
+        return {
+            "segments": len(sealed) + (1 if self.path.exists() else 0),
+            "size_bytes": size_bytes,
+            "total": counters.get("total", 0),
+            "reasons": counters.get("reasons", {}),
+        }
@@ -1,11 +1,31 @@
-"""Redaction system for secrets and PII sanitation."""
+"""Redaction system for secrets and PII sanitation.
 
+Rules are compiled once. Each rule's matches are collected and merged in
+position order; where matches from different rules overlap they are combined
+into one span that covers all of them, labelled by the longest match (ties
+going to the earlier rule), so a short rule can never split a longer secret
+and leak the rest. Redacted output is built with one join, and redact_stream()
+handles chunked input without losing matches that straddle chunk boundaries.
+"""
+
+import heapq
 import json
 import logging
 import re
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
+
+REGEX_FLAGS = re.IGNORECASE | re.MULTILINE
+
+# Text held back between chunks in redact_stream(); matches longer than this
+# (e.g. PEM keys) may be missed if they span a chunk boundary
+STREAM_HOLDBACK_CHARS = 8192
+
+# Already-emitted text kept as regex context so \b and lookbehinds see the real
+# preceding characters when scanning resumes
+_STREAM_CONTEXT_CHARS = 64
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +58,7 @@ def __init__(self, rules_path: str = None):
         self.rules: list[dict[str, Any]] = []
         self.strategies: dict[str, dict[str, Any]] = {}
         self.default_strategy: str = "label"
+        self._compiled_rules: list[tuple[dict[str, Any], re.Pattern]] = []
 
         # Load rules
         if rules_path:
@@ -60,6 +81,9 @@ def load_rules(self, rules_path: str):
         except Exception as e:
             logger.error(f"Error loading redaction rules from {rules_path}: {e}")
             self.load_default_rules()
+            return
+
+        self.compile()
 
     def load_default_rules(self):
         """Load default built-in rules."""
@@ -84,51 +108,106 @@ def load_default_rules(self):
             ]
             self.strategies = {"label": {"replacement": "[REDACTED:{type}]"}}
             self.default_strategy = "label"
+            self.compile()
 
-    def find_redactions(self, text: str) -> list[RedactionMatch]:
+    def compile(self):
         """
-        Find all redaction matches in text.
+        Precompile rule patterns.
 
-        Args:
-            text: Text to scan for sensitive information
+        Called automatically when rules are loaded; call again after mutating
+        self.rules. Rules that fail to compile are skipped with a warning.
+        """
+        self._compiled_rules = []
+        for rule in self.rules:
+            try:
+                self._compiled_rules.append((rule, re.compile(rule["pattern"], REGEX_FLAGS)))
+            except (re.error, KeyError) as e:
+                logger.warning(f"Error compiling rule {rule.get('name', 'unknown')}: {e}")
 
-        Returns:
-            List of redaction matches
+    def _validate(self, rule: dict[str, Any], matched_text: str) -> bool:
+        # Special validation for credit cards (Luhn check)
+        if rule["type"] == "credit_card":
+            return self._validate_credit_card(matched_text)
+        return True
+
+    def _scan(self, text: str, pos: int = 0) -> Iterator[tuple[dict[str, Any], int, int]]:
         """
-        if not text:
-            return []
+        Yield non-overlapping (rule, start, end) in one left-to-right pass over text[pos:].
 
-        matches = []
+        Each rule's own matches are merged through a heap ordered by (start,
+        rule order), so each pattern keeps its own literal-prefix search.
+        Overlapping matches are coalesced into one span reported under the
+        rule with the longest match.
+        """
+        rules = self._compiled_rules
+        heap = []
+        for priority, (rule, pattern) in enumerate(rules):
+            matches = self._rule_matches(rule, pattern, text, pos)
+            first = next(matches, None)
+            if first:
+                heap.append((first[0], priority, first[1], matches))
+        heapq.heapify(heap)
+
+        current = None  # [rule, start, end, longest match length]
+        while heap:
+            start, priority, end, matches = heap[0]
+            rule = rules[priority][0]
+
+            if current and start < current[2]:
+                current[2] = max(current[2], end)
+                if end - start > current[3]:
+                    current[0], current[3] = rule, end - start
+            else:
+                if current:
+                    yield current[0], current[1], current[2]
+                current = [rule, start, end, end - start]
 
-        for rule in self.rules:
-            try:
-                pattern = rule["pattern"]
-                rule_type = rule["type"]
-                rule_name = rule["name"]
+            following = next(matches, None)
+            if following:
+                heapq.heapreplace(heap, (following[0], priority, following[1], matches))
+            else:
+                heapq.heappop(heap)
+
+        if current:
+            yield current[0], current[1], current[2]
+
+    def _rule_matches(
+        self, rule: dict[str, Any], pattern: re.Pattern, text: str, pos: int
+    ) -> Iterator[tuple[int, int]]:
+        """Yield (start, end) of one rule's non-empty, validated matches in text[pos:]."""
+        while True:
+            m = pattern.search(text, pos)
+            if not m:
+                return
+            if m.end() > m.start() and self._validate(rule, m.group()):
+                yield m.start(), m.end()
+                pos = m.end()
+            else:
+                # Empty or rejected by the validator
+                pos = m.start() + 1
 
-                # Find all matches for this rule
-                for match in re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE):
-                    start, end = match.span()
-                    matched_text = text[start:end]
+    def _make_match(self, rule: dict[str, Any], text: str, start: int, end: int) -> RedactionMatch:
+        matched_text = text[start:end]
 
-                    # Create preview (first few chars)
-                    preview = matched_text[:10] + "..." if len(matched_text) > 10 else matched_text
+        # Create preview (first few chars)
+        preview = matched_text[:10] + "..." if len(matched_text) > 10 else matched_text
 
-                    # Special validation for credit cards (Luhn check)
-                    if rule_type == "credit_card":
-                        if not self._validate_credit_card(matched_text):
-                            continue
+        return RedactionMatch(type=rule["type"], start=start, end=end, preview=preview, rule_name=rule["name"])
 
-                    matches.append(
-                        RedactionMatch(type=rule_type, start=start, end=end, preview=preview, rule_name=rule_name)
-                    )
+    def find_redactions(self, text: str) -> list[RedactionMatch]:
+        """
+        Find all redaction matches in text.
+
+        Args:
+            text: Text to scan for sensitive information
 
-            except Exception as e:
-                logger.warning(f"Error processing rule {rule.get('name', 'unknown')}: {e}")
+        Returns:
+            List of non-overlapping redaction matches in text order
+        """
+        if not text:
+            return []
 
-        # Sort matches by position
-        matches.sort(key=lambda x: x.start)
-        return matches
+        return [self._make_match(rule, text, start, end) for rule, start, end in self._scan(text)]
 
     def _validate_credit_card(self, number: str) -> bool:
         """Validate credit card number using Luhn algorithm."""
@@ -176,28 +255,97 @@ def apply_redactions(self, text: str, strategy: str = None) -> tuple[str, list[R
         if not strategy:
             strategy = self.default_strategy
 
-        # Apply redactions in reverse order to preserve positions
-        redacted_text = text
         events_counter = {}
+        redacted_text = "".join(self._render(text, matches, 0, strategy, events_counter))
 
-        for match in reversed(matches):
-            # Apply redaction based on strategy
-            replacement = self._get_replacement(match, strategy)
+        return redacted_text, self._to_events(events_counter)
 
-            # Replace the text
-            redacted_text = redacted_text[: match.start] + replacement + redacted_text[match.end :]
+    def _render(
+        self, text: str, matches: list[RedactionMatch], pos: int, strategy: str, events_counter: dict
+    ) -> Iterator[str]:
+        """Yield output pieces for text[pos:] with matches replaced, counting events."""
+        for match in matches:
+            yield text[pos : match.start]
+            yield self._get_replacement(match, strategy)
+            pos = match.end
 
             # Count events
             key = (match.type, match.rule_name)
             events_counter[key] = events_counter.get(key, 0) + 1
 
+        yield text[pos:]
+
+    def _to_events(self, events_counter: dict) -> list[RedactionEvent]:
         # Convert counter to events list
-        events = [
+        return [
             RedactionEvent(type=type_name, count=count, rule_name=rule_name)
             for (type_name, rule_name), count in events_counter.items()
         ]
 
-        return redacted_text, events
+    def redact_stream(
+        self,
+        chunks: Iterable[str],
+        strategy: str = None,
+        events: Optional[list[RedactionEvent]] = None,
+        holdback: int = STREAM_HOLDBACK_CHARS,
+    ) -> Iterator[str]:
+        """
+        Redact a stream of text chunks.
+
+        Text within `holdback` characters of the end of the data seen so far is
+        not emitted until more input arrives, so a match split across chunks is
+        still found whole. Concatenated output equals apply_redactions() on the
+        concatenated input for any match no longer than `holdback`.
+
+        Args:
+            chunks: Iterable of text chunks (e.g. a file read in blocks)
+            strategy: Redaction strategy to use (default: configured default)
+            events: Optional list, filled with redaction events once the stream is exhausted
+            holdback: Characters held back between chunks (bounds memory and max match length)
+
+        Yields:
+            Redacted text pieces
+        """
+        if not strategy:
+            strategy = self.default_strategy
+
+        events_counter = {}
+        buf = ""
+        base = 0  # Offset in buf where unemitted text starts (preceded by context)
+
+        for chunk in chunks:
+            if not chunk:
+                continue
+            buf += chunk
+            safe = len(buf) - holdback
+            if safe <= base:
+                continue
+
+            # Commit matches that end before the safe point; stop at one that crosses it
+            committed = []
+            cut = safe
+            for match in self._find_from(buf, base):
+                if match.end <= safe:
+                    committed.append(match)
+                else:
+                    cut = min(match.start, safe)
+                    break
+
+            yield "".join(self._render(buf[:cut], committed, base, strategy, events_counter))
+
+            context_start = max(cut - _STREAM_CONTEXT_CHARS, 0)
+            buf = buf[context_start:]
+            base = cut - context_start
+
+        if len(buf) > base:
+            matches = list(self._find_from(buf, base))
+            yield "".join(self._render(buf, matches, base, strategy, events_counter))
+
+        if events is not None:
+            events.extend(self._to_events(events_counter))
+
+    def _find_from(self, text: str, pos: int) -> Iterator[RedactionMatch]:
+        return (self._make_match(rule, text, start, end) for rule, start, end in self._scan(text, pos))
 
     def _get_replacement(self, match: RedactionMatch, strategy: str) -> str:
         """Get replacement text for a match based on strategy."""
@@ -246,6 +394,17 @@ def apply_redactions(text: str, strategy: str = "label", rules_path: str = None)
     return engine.apply_redactions(text, strategy)
 
 
+def redact_stream(
+    chunks: Iterable[str],
+    strategy: str = "label",
+    rules_path: str = None,
+    events: Optional[list[RedactionEvent]] = None,
+) -> Iterator[str]:
+    """Redact a stream of text chunks using global engine."""
+    engine = get_redaction_engine(rules_path)
+    return engine.redact_stream(chunks, strategy, events)
+
+
 if __name__ == "__main__":
     # Test redaction system
     test_text = """
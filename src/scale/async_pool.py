@@ -0,0 +1,261 @@
+"""Asyncio worker pool for I/O-bound jobs.
+
+Event-loop counterpart to WorkerPool: the same priority lanes, weighted lane
+selection, and windowed latency histograms, but workers are asyncio tasks so thousands
+of concurrent I/O waits don't each need a thread. Work stealing is unnecessary
+here because all workers share one loop and one set of lane queues.
+
+Coroutine functions are awaited directly; plain callables run in the loop's
+default executor so they cannot block other jobs. join() waits until every
+submitted job has finished, which lets batch callers (see batch.run_batch)
+use the pool as a bounded-concurrency executor.
+
+Environment Variables:
+    CURRENT_REGION: Current region identifier
+    WORKER_SHUTDOWN_TIMEOUT_S: Graceful shutdown timeout (default: 30)
+    WORKER_LANE_WEIGHTS: Lane weights, e.g. "realtime=4,bulk=1" (default)
+    WORKER_LATENCY_WINDOW_S: Window behind the p95s in get_stats() (default: 60)
+"""
+
+import asyncio
+import functools
+import os
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+from ..queue_strategy import TaskClass
+from .autoscaler import ScaleDecision, ScaleDirection, engine_state_from_stats, make_scale_decision
+from .worker_pool import (
+    Job,
+    WeightedLanePicker,
+    WorkerStats,
+    _latency_histogram,
+    _window_p95_ms,
+    load_lane_weights,
+)
+
+
+class AsyncWorkerPool:
+    """Asyncio task-based worker pool with priority lanes."""
+
+    def __init__(self, initial_workers: int = 1, region: Optional[str] = None):
+        """
+        Initialize async worker pool (call start() from a running loop).
+
+        Args:
+            initial_workers: Initial number of worker tasks
+            region: Region identifier for this pool
+        """
+        self.region = region or os.getenv("CURRENT_REGION", "default")
+        self.initial_workers = initial_workers
+        self.lane_weights = load_lane_weights()
+        self.lanes = list(self.lane_weights)
+
+        self._lanes: dict[TaskClass, deque[Job]] = {lane: deque() for lane in self.lanes}
+        self._picker = WeightedLanePicker(self.lane_weights)
+        self._work_available: Optional[asyncio.Condition] = None
+        self._workers: list[asyncio.Task] = []
+        self._retire = 0
+        self._shutdown = False
+        self._unfinished = 0
+        self._all_done: Optional[asyncio.Event] = None
+
+        self.active_jobs: dict[str, Job] = {}
+        self.stats = {
+            "completed": 0,
+            "failed": 0,
+        }
+        self.queue_wait = {lane: _latency_histogram() for lane in self.lanes}
+        self.run_time = {lane: _latency_histogram() for lane in self.lanes}
+
+    async def start(self):
+        """Start initial worker tasks on the running loop."""
+        self._work_available = asyncio.Condition()
+        self._all_done = asyncio.Event()
+        self._all_done.set()
+        for _ in range(self.initial_workers):
+            self._spawn_worker()
+
+    def _spawn_worker(self):
+        """Spawn a new worker task."""
+        name = f"AsyncWorker-{self.region}-{len(self._workers)}"
+        self._workers.append(asyncio.create_task(self._worker_loop(), name=name))
+
+    def _queue_depth(self) -> int:
+        return sum(len(dq) for dq in self._lanes.values())
+
+    async def _next_job(self) -> Optional[Job]:
+        """Wait for work and pop from the next weighted lane (None means exit)."""
+        async with self._work_available:
+            while True:
+                if self._retire > 0:
+                    self._retire -= 1
+                    return None
+
+                ready = [lane for lane in self.lanes if self._lanes[lane]]
+                lane = self._picker.pick(ready)
+                if lane is not None:
+                    return self._lanes[lane].popleft()
+
+                if self._shutdown:
+                    return None
+
+                await self._work_available.wait()
+
+    async def _worker_loop(self):
+        """Main worker loop - processes jobs until retired or shut down."""
+        from ..telemetry.prom import record_worker_job
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+            job = await self._next_job()
+            if job is None:
+                return
+
+            started = time.monotonic()
+            wait_s = started - (job.submitted_mono or started)
+            self.active_jobs[job.job_id] = job
+
+            try:
+                if asyncio.iscoroutinefunction(job.task):
+                    await job.task(*job.args, **job.kwargs)
+                else:
+                    await loop.run_in_executor(None, functools.partial(job.task, *job.args, **job.kwargs))
+                self.stats["completed"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Job {job.job_id} failed: {e}")
+                self.stats["failed"] += 1
+            finally:
+                run_s = time.monotonic() - started
+                self.active_jobs.pop(job.job_id, None)
+                self.queue_wait[job.task_class].record(wait_s * 1000)
+                self.run_time[job.task_class].record(run_s * 1000)
+                record_worker_job(job.task_class.value, wait_s, run_s)
+                self._unfinished -= 1
+                if self._unfinished == 0:
+                    self._all_done.set()
+
+    async def submit_job(self, job: Job):
+        """
+        Submit a job to the pool.
+
+        Args:
+            job: Job to execute (routed by job.task_class)
+        """
+        if not job.submitted_at:
+            job.submitted_at = datetime.utcnow()
+        job.submitted_mono = time.monotonic()
+
+        self._unfinished += 1
+        self._all_done.clear()
+        async with self._work_available:
+            self._lanes[job.task_class].append(job)
+            self._work_available.notify()
+
+    async def join(self):
+        """Wait until every submitted job has finished."""
+        await self._all_done.wait()
+
+    async def scale_to(self, desired_workers: int) -> bool:
+        """
+        Scale pool to desired worker task count.
+
+        Scale-down retires idle workers first; busy ones finish their job.
+
+        Args:
+            desired_workers: Target number of workers
+
+        Returns:
+            True if scaling succeeded, False otherwise
+        """
+        self._workers = [w for w in self._workers if not w.done()]
+        current = len(self._workers) - self._retire
+
+        if desired_workers == current:
+            return True
+
+        if desired_workers > current:
+            for _ in range(desired_workers - current):
+                self._spawn_worker()
+            return True
+
+        async with self._work_available:
+            self._retire += current - desired_workers
+            self._work_available.notify_all()
+
+        timeout_s = int(os.getenv("WORKER_SHUTDOWN_TIMEOUT_S", "30"))
+        deadline = time.monotonic() + timeout_s
+        while time.monotonic() < deadline:
+            self._workers = [w for w in self._workers if not w.done()]
+            if len(self._workers) <= desired_workers:
+                return True
+            await asyncio.sleep(0.05)
+
+        return len(self._workers) == desired_workers
+
+    def get_stats(self) -> WorkerStats:
+        """
+        Get current worker pool statistics.
+
+        Returns:
+            WorkerStats with current state
+        """
+        total = len([w for w in self._workers if not w.done()])
+        active = len(self.active_jobs)
+        lane_depths = {lane.value: len(dq) for lane, dq in self._lanes.items()}
+
+        return WorkerStats(
+            total_workers=total,
+            active_workers=active,
+            idle_workers=total - active,
+            queue_depth=sum(lane_depths.values()),
+            jobs_completed=self.stats["completed"],
+            jobs_failed=self.stats["failed"],
+            lane_depths=lane_depths,
+            queue_wait_p95_ms=_window_p95_ms(self.queue_wait),
+            run_time_p95_ms=_window_p95_ms(self.run_time),
+        )
+
+    async def autoscale(self, last_scale_time: Optional[datetime] = None) -> ScaleDecision:
+        """
+        Decide a worker count from current stats and apply it.
+
+        Args:
+            last_scale_time: Time of the previous scaling action (for cooldown)
+
+        Returns:
+            The ScaleDecision that was applied
+        """
+        decision = make_scale_decision(engine_state_from_stats(self.get_stats(), last_scale_time))
+        if decision.direction != ScaleDirection.HOLD:
+            await self.scale_to(decision.desired_workers)
+        return decision
+
+    async def shutdown(self, timeout_s: Optional[int] = None):
+        """
+        Gracefully shutdown the pool, draining queued jobs until the timeout.
+
+        Args:
+            timeout_s: Timeout in seconds (default: WORKER_SHUTDOWN_TIMEOUT_S env)
+        """
+        if timeout_s is None:
+            timeout_s = int(os.getenv("WORKER_SHUTDOWN_TIMEOUT_S", "30"))
+
+        async with self._work_available:
+            self._shutdown = True
+            self._work_available.notify_all()
+
+        workers = [w for w in self._workers if not w.done()]
+        if workers:
+            _, pending = await asyncio.wait(workers, timeout=timeout_s)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        self._workers.clear()
@@ -7,6 +7,7 @@
     MAX_WORKERS: Maximum worker count (default: 12)
     TARGET_P95_LATENCY_MS: Target P95 latency (default: 2000)
     TARGET_QUEUE_DEPTH: Target queue depth (default: 50)
+    TARGET_QUEUE_WAIT_P95_MS: Target P95 queue wait before a job starts (default: 1000)
     SCALE_UP_STEP: Workers to add when scaling up (default: 2)
     SCALE_DOWN_STEP: Workers to remove when scaling down (default: 1)
     SCALE_DECISION_INTERVAL_MS: Minimum time between scaling decisions (default: 1500)
@@ -16,7 +17,7 @@
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 
 
 class ScaleDirection(Enum):
@@ -36,6 +37,7 @@ class EngineState:
     p95_latency_ms: float
     in_flight_jobs: int
     last_scale_time: Optional[datetime] = None
+    queue_wait_p95_ms: float = 0.0
 
 
 @dataclass
@@ -48,6 +50,27 @@ class ScaleDecision:
     current_workers: int
 
 
+def engine_state_from_stats(stats: Any, last_scale_time: Optional[datetime] = None) -> EngineState:
+    """
+    Build engine state from worker pool statistics.
+
+    Args:
+        stats: WorkerStats from WorkerPool.get_stats()
+        last_scale_time: Time of the previous scaling action
+
+    Returns:
+        EngineState using the pool's run-time and queue-wait histograms
+    """
+    return EngineState(
+        current_workers=stats.total_workers,
+        queue_depth=stats.queue_depth,
+        p95_latency_ms=stats.run_time_p95_ms,
+        in_flight_jobs=stats.active_workers,
+        last_scale_time=last_scale_time,
+        queue_wait_p95_ms=stats.queue_wait_p95_ms,
+    )
+
+
 def make_scale_decision(state: EngineState) -> ScaleDecision:
     """
     Determine desired worker count based on engine state.
@@ -63,6 +86,7 @@ def make_scale_decision(state: EngineState) -> ScaleDecision:
     max_workers = int(os.getenv("MAX_WORKERS", "12"))
     target_p95_ms = int(os.getenv("TARGET_P95_LATENCY_MS", "2000"))
     target_queue_depth = int(os.getenv("TARGET_QUEUE_DEPTH", "50"))
+    target_wait_p95_ms = int(os.getenv("TARGET_QUEUE_WAIT_P95_MS", "1000"))
     scale_up_step = int(os.getenv("SCALE_UP_STEP", "2"))
     scale_down_step = int(os.getenv("SCALE_DOWN_STEP", "1"))
     scale_interval_ms = int(os.getenv("SCALE_DECISION_INTERVAL_MS", "1500"))
@@ -94,7 +118,14 @@ def make_scale_decision(state: EngineState) -> ScaleDecision:
         latency_ratio = state.p95_latency_ms / target_p95_ms
         scale_up_reasons.append(f"P95 latency {state.p95_latency_ms}ms > {target_p95_ms}ms ({latency_ratio:.1f}x)")
 
-    # 3. All workers busy with queue backlog
+    # 3. Jobs wait too long before starting
+    if state.queue_wait_p95_ms > target_wait_p95_ms:
+        wait_ratio = state.queue_wait_p95_ms / target_wait_p95_ms
+        scale_up_reasons.append(
+            f"P95 queue wait {state.queue_wait_p95_ms:.0f}ms > {target_wait_p95_ms}ms ({wait_ratio:.1f}x)"
+        )
+
+    # 4. All workers busy with queue backlog
     if state.in_flight_jobs >= current and state.queue_depth > 0:
         scale_up_reasons.append(f"all {current} workers busy, {state.queue_depth} queued")
 
@@ -120,7 +151,11 @@ def make_scale_decision(state: EngineState) -> ScaleDecision:
     if state.p95_latency_ms > target_p95_ms * 0.5:  # 50% threshold
         scale_down_ok = False
 
-    # 3. Workers not fully utilized
+    # 3. Queue wait well below target
+    if state.queue_wait_p95_ms > target_wait_p95_ms * 0.5:  # 50% threshold
+        scale_down_ok = False
+
+    # 4. Workers not fully utilized
     utilization = state.in_flight_jobs / current if current > 0 else 0
     if utilization > 0.7:  # 70% threshold
         scale_down_ok = False
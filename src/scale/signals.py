@@ -81,6 +81,9 @@ def compute_dlq_rate(dlq_path: Path, window_hours: int = 24) -> float:
     """
     Compute DLQ rate from recent entries.
 
+    Counts exactly via the DLQ store: whole hours come from its hourly
+    counters and only the entries of the hour containing the cutoff are read.
+
     Args:
         dlq_path: Path to DLQ file
         window_hours: Time window in hours
@@ -88,32 +91,18 @@ def compute_dlq_rate(dlq_path: Path, window_hours: int = 24) -> float:
     Returns:
         DLQ rate (entries per hour)
     """
-    if not dlq_path.exists():
+    from ..queue.dlq_store import DLQStore
+
+    if window_hours == 0:
         return 0.0
 
     cutoff = datetime.now(UTC) - timedelta(hours=window_hours)
-    cutoff_iso = cutoff.isoformat()
-
-    dlq_count = 0
 
     try:
-        with open(dlq_path, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        entry = json.loads(line)
-                        timestamp = entry.get("timestamp", "")
-                        if timestamp >= cutoff_iso:
-                            dlq_count += 1
-                    except json.JSONDecodeError:
-                        pass
+        dlq_count = DLQStore(dlq_path).count_since(cutoff)
     except Exception:
         return 0.0
 
-    if window_hours == 0:
-        return 0.0
-
     return dlq_count / window_hours
 
 
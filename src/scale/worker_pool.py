@@ -3,19 +3,45 @@
 Manages a pool of background worker threads that process jobs from a queue.
 Supports graceful drain on scale-down and region-aware job routing.
 
+Scheduling:
+    Jobs are routed into priority lanes by TaskClass (REALTIME, BULK). Workers
+    choose the next lane with smooth weighted round-robin, so a burst of bulk
+    work cannot starve realtime jobs and bulk still makes progress. Each worker
+    owns a deque per lane; submissions are spread across workers and idle
+    workers steal from the busiest deque.
+
+Metrics:
+    Queue wait (submit -> start) and run time (start -> finish) are recorded in
+    per-lane windowed histograms. get_stats() reports p95 over the last
+    WORKER_LATENCY_WINDOW_S seconds, so autoscale() reacts to current queue
+    pressure rather than lifetime history; values are also exported to
+    Prometheus when telemetry is enabled.
+
 Environment Variables:
     CURRENT_REGION: Current region identifier
     WORKER_SHUTDOWN_TIMEOUT_S: Graceful shutdown timeout (default: 30)
+    WORKER_LANE_WEIGHTS: Lane weights, e.g. "realtime=4,bulk=1" (default)
+    WORKER_LATENCY_WINDOW_S: Window behind the p95s in get_stats() (default: 60)
 """
 
+import itertools
 import os
-import queue
 import threading
 import time
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Callable, Optional
 
+from ..queue_strategy import TaskClass
+from ..telemetry.histograms import WindowedHistogram
+from .autoscaler import ScaleDecision, ScaleDirection, engine_state_from_stats, make_scale_decision
+
+DEFAULT_LANE_WEIGHTS = {TaskClass.REALTIME: 4, TaskClass.BULK: 1}
+
+# The latency window is split into this many rotating intervals
+LATENCY_WINDOW_INTERVALS = 6
+
 
 @dataclass
 class Job:
@@ -28,6 +54,8 @@ class Job:
     region: Optional[str] = None
     submitted_at: Optional[datetime] = None
     retries: int = 0
+    task_class: TaskClass = TaskClass.BULK
+    submitted_mono: Optional[float] = field(default=None, repr=False)
 
 
 @dataclass
@@ -40,10 +68,98 @@ class WorkerStats:
     queue_depth: int
     jobs_completed: int
     jobs_failed: int
+    lane_depths: dict[str, int] = field(default_factory=dict)
+    queue_wait_p95_ms: float = 0.0
+    run_time_p95_ms: float = 0.0
+    steals: int = 0
+
+
+def load_lane_weights() -> dict[TaskClass, int]:
+    """
+    Load lane weights from WORKER_LANE_WEIGHTS.
+
+    Returns:
+        Mapping of TaskClass to positive integer weight
+    """
+    weights = dict(DEFAULT_LANE_WEIGHTS)
+    raw = os.getenv("WORKER_LANE_WEIGHTS", "")
+
+    for part in raw.split(","):
+        if "=" not in part:
+            continue
+        name, value = part.split("=", 1)
+        try:
+            lane = TaskClass(name.strip().lower())
+            weights[lane] = max(1, int(value))
+        except ValueError:
+            continue
+
+    return weights
+
+
+def _latency_histogram() -> WindowedHistogram:
+    window_s = float(os.getenv("WORKER_LATENCY_WINDOW_S", "60"))
+    return WindowedHistogram(interval_sec=window_s / LATENCY_WINDOW_INTERVALS, intervals=LATENCY_WINDOW_INTERVALS)
+
+
+def _window_p95_ms(histograms: dict[TaskClass, WindowedHistogram]) -> float:
+    return max(h.window().percentiles((0.95,))[0.95] for h in histograms.values())
+
+
+class WeightedLanePicker:
+    """Smooth weighted round-robin over lanes that currently have work."""
+
+    def __init__(self, weights: dict[TaskClass, int]):
+        """
+        Initialize picker.
+
+        Args:
+            weights: Lane weights
+        """
+        self.weights = weights
+        self._current = dict.fromkeys(weights, 0)
+
+    def pick(self, ready: list[TaskClass]) -> Optional[TaskClass]:
+        """
+        Pick the next lane to serve.
+
+        Not thread-safe; callers hold the pool scheduler lock.
+
+        Args:
+            ready: Lanes with pending jobs
+
+        Returns:
+            Selected lane, or None if no lane is ready
+        """
+        if not ready:
+            return None
+        if len(ready) == 1:
+            return ready[0]
+
+        total = 0
+        best = None
+        for lane in ready:
+            self._current[lane] += self.weights[lane]
+            total += self.weights[lane]
+            if best is None or self._current[lane] > self._current[best]:
+                best = lane
+
+        self._current[best] -= total
+        return best
+
+
+class _WorkerSlot:
+    """Per-worker deques (one per lane) plus lifecycle flags."""
+
+    def __init__(self, name: str, lanes: list[TaskClass]):
+        self.name = name
+        self.deques: dict[TaskClass, deque[Job]] = {lane: deque() for lane in lanes}
+        self.thread: Optional[threading.Thread] = None
+        self.retiring = False
 
 
 class WorkerPool:
-    """Thread-based worker pool with graceful scaling."""
+    """Thread-based worker pool with priority lanes, work stealing, and graceful scaling."""
 
     def __init__(self, initial_workers: int = 1, region: Optional[str] = None):
         """
@@ -54,71 +170,158 @@ def __init__(self, initial_workers: int = 1, region: Optional[str] = None):
             region: Region identifier for this pool
         """
         self.region = region or os.getenv("CURRENT_REGION", "default")
-        self.job_queue: queue.Queue[Optional[Job]] = queue.Queue()
-        self.workers: list[threading.Thread] = []
+        self.lane_weights = load_lane_weights()
+        self.lanes = list(self.lane_weights)
+
+        # Scheduler state: slots, per-lane pending counts, lane picker
+        self._cond = threading.Condition()
+        self._slots: list[_WorkerSlot] = []
+        self._orphans = _WorkerSlot("orphans", self.lanes)  # Jobs handed off by retired workers
+        self._pending = dict.fromkeys(self.lanes, 0)
+        self._picker = WeightedLanePicker(self.lane_weights)
+        self._rr = itertools.count()
+        self._spawned = 0
+
+        # Stats state (separate from scheduling)
         self.active_jobs: dict[str, Job] = {}
         self.stats = {
             "completed": 0,
             "failed": 0,
+            "steals": 0,
         }
-        self.shutdown_event = threading.Event()
         self.lock = threading.Lock()
+        self.queue_wait = {lane: _latency_histogram() for lane in self.lanes}
+        self.run_time = {lane: _latency_histogram() for lane in self.lanes}
+
+        self.shutdown_event = threading.Event()
 
         # Start initial workers
         for _ in range(initial_workers):
             self._spawn_worker()
 
+    @property
+    def workers(self) -> list[threading.Thread]:
+        """Worker threads (including ones draining after scale-down)."""
+        return [slot.thread for slot in self._slots if slot.thread is not None]
+
     def _spawn_worker(self):
         """Spawn a new worker thread."""
-        worker = threading.Thread(target=self._worker_loop, daemon=True, name=f"Worker-{self.region}-{len(self.workers)}")
-        worker.start()
-        self.workers.append(worker)
-
-    def _worker_loop(self):
-        """Main worker loop - processes jobs from queue."""
-        while not self.shutdown_event.is_set():
+        slot = _WorkerSlot(f"Worker-{self.region}-{self._spawned}", self.lanes)
+        self._spawned += 1
+        slot.thread = threading.Thread(target=self._worker_loop, args=(slot,), daemon=True, name=slot.name)
+        with self._cond:
+            self._slots.append(slot)
+        slot.thread.start()
+
+    def _take(self, slot: _WorkerSlot, lane: TaskClass) -> Optional[Job]:
+        """Pop a reserved job: own deque first, then orphans, then steal from the busiest worker."""
+        try:
+            return slot.deques[lane].popleft()
+        except IndexError:
+            pass
+
+        try:
+            return self._orphans.deques[lane].popleft()
+        except IndexError:
+            pass
+
+        victims = sorted(self._slots, key=lambda s: len(s.deques[lane]), reverse=True)
+        for victim in victims:
+            if victim is slot:
+                continue
             try:
-                # Get job with timeout to check shutdown periodically
-                job = self.job_queue.get(timeout=1.0)
+                job = victim.deques[lane].popleft()
+            except IndexError:
+                continue
+            with self.lock:
+                self.stats["steals"] += 1
+            return job
+
+        return None
+
+    def _next_job(self, slot: _WorkerSlot) -> Optional[Job]:
+        """Reserve a job from the next weighted lane, waiting briefly if idle."""
+        with self._cond:
+            ready = [lane for lane in self.lanes if self._pending[lane] > 0]
+            lane = self._picker.pick(ready)
+            if lane is None:
+                self._cond.wait(timeout=1.0)
+                return None
+            self._pending[lane] -= 1
+
+        # A reservation guarantees exactly one job in this lane is ours to take.
+        # It can only be missed while a retiring worker hands its deques off
+        # (under _cond), so retry under _cond, waiting for the handoff's notify.
+        job = self._take(slot, lane)
+        if job is not None:
+            return job
+        with self._cond:
+            while (job := self._take(slot, lane)) is None:
+                self._cond.wait(timeout=0.05)
+        return job
+
+    def _worker_loop(self, slot: _WorkerSlot):
+        """Main worker loop - processes jobs from lanes."""
+        from ..telemetry.prom import record_worker_job
+
+        while not self.shutdown_event.is_set() and not slot.retiring:
+            job = self._next_job(slot)
+            if job is None:
+                continue
 
-                # None is poison pill for graceful shutdown
-                if job is None:
-                    break
+            # Mark job as active
+            started = time.monotonic()
+            wait_s = started - (job.submitted_mono or started)
+            with self.lock:
+                self.active_jobs[job.job_id] = job
 
-                # Mark job as active
+            # Execute job
+            try:
+                job.task(*job.args, **job.kwargs)
                 with self.lock:
-                    self.active_jobs[job.job_id] = job
-
-                # Execute job
-                try:
-                    job.task(*job.args, **job.kwargs)
-                    with self.lock:
-                        self.stats["completed"] += 1
-                except Exception as e:
-                    print(f"Job {job.job_id} failed: {e}")
-                    with self.lock:
-                        self.stats["failed"] += 1
-                finally:
-                    # Remove from active jobs
-                    with self.lock:
-                        self.active_jobs.pop(job.job_id, None)
-                    self.job_queue.task_done()
-
-            except queue.Empty:
-                # No job available, loop back to check shutdown
-                continue
+                    self.stats["completed"] += 1
+            except Exception as e:
+                print(f"Job {job.job_id} failed: {e}")
+                with self.lock:
+                    self.stats["failed"] += 1
+            finally:
+                run_s = time.monotonic() - started
+                # Remove from active jobs
+                with self.lock:
+                    self.active_jobs.pop(job.job_id, None)
+                self.queue_wait[job.task_class].record(wait_s * 1000)
+                self.run_time[job.task_class].record(run_s * 1000)
+                record_worker_job(job.task_class.value, wait_s, run_s)
+
+        # Hand off anything still queued on this worker before exiting
+        with self._cond:
+            for lane, dq in slot.deques.items():
+                while dq:
+                    self._orphans.deques[lane].append(dq.popleft())
+            self._cond.notify_all()
 
     def submit_job(self, job: Job):
         """
         Submit a job to the pool.
 
         Args:
-            job: Job to execute
+            job: Job to execute (routed by job.task_class)
         """
         if not job.submitted_at:
             job.submitted_at = datetime.utcnow()
+        job.submitted_mono = time.monotonic()
 
-        self.job_queue.put(job)
+        with self._cond:
+            live = [slot for slot in self._slots if not slot.retiring]
+            target = live[next(self._rr) % len(live)] if live else self._orphans
+            target.deques[job.task_class].append(job)
+            self._pending[job.task_class] += 1
+            self._cond.notify()
+
+    def queue_depth(self) -> int:
+        """Total jobs waiting across all lanes."""
+        with self._cond:
+            return sum(self._pending.values())
 
     def scale_to(self, desired_workers: int) -> bool:
         """
@@ -130,7 +333,9 @@ def scale_to(self, desired_workers: int) -> bool:
         Returns:
             True if scaling succeeded, False otherwise
         """
-        current = len([w for w in self.workers if w.is_alive()])
+        with self._cond:
+            live = [s for s in self._slots if not s.retiring and s.thread is not None and s.thread.is_alive()]
+        current = len(live)
 
         if desired_workers == current:
             return True
@@ -142,26 +347,60 @@ def scale_to(self, desired_workers: int) -> bool:
                 self._spawn_worker()
             return True
 
-        # Scale down: send poison pills
-        to_remove = current - desired_workers
-        for _ in range(to_remove):
-            self.job_queue.put(None)  # Poison pill
+        # Scale down: retire newest workers; they finish their current job and
+        # hand queued work to the orphan deques for others to pick up
+        with self._cond:
+            for slot in live[desired_workers:]:
+                slot.retiring = True
+            self._cond.notify_all()
 
         # Wait for workers to drain (with timeout)
         timeout_s = int(os.getenv("WORKER_SHUTDOWN_TIMEOUT_S", "30"))
         deadline = time.time() + timeout_s
 
         while time.time() < deadline:
-            alive = len([w for w in self.workers if w.is_alive()])
+            alive = len(self._alive_slots())
             if alive <= desired_workers:
-                # Clean up dead threads
-                self.workers = [w for w in self.workers if w.is_alive()]
+                self._prune_dead_slots()
                 return True
-            time.sleep(0.5)
+            time.sleep(0.05)
 
         # Timeout - force cleanup
-        self.workers = [w for w in self.workers if w.is_alive()]
-        return len(self.workers) == desired_workers
+        self._prune_dead_slots()
+        return len(self._alive_slots()) == desired_workers
+
+    def _alive_slots(self) -> list[_WorkerSlot]:
+        with self._cond:
+            return [s for s in self._slots if s.thread is not None and s.thread.is_alive()]
+
+    def _prune_dead_slots(self):
+        with self._cond:
+            self._slots = [s for s in self._slots if s.thread is not None and s.thread.is_alive()]
+
+    def get_lane_histograms(self) -> dict[str, dict]:
+        """
+        Get histogram summaries per lane.
+
+        Returns:
+            {lane: {"queue_wait": summary, "run_time": summary}} where summary has
+            lifetime count/sum_ms/p50_ms/p95_ms/p99_ms and window_p95_ms
+        """
+
+        def summary(histogram: WindowedHistogram) -> dict:
+            lifetime = histogram.total.percentiles()
+            return {
+                "count": histogram.total.count,
+                "sum_ms": histogram.total.total_ms,
+                "p50_ms": lifetime[0.50],
+                "p95_ms": lifetime[0.95],
+                "p99_ms": lifetime[0.99],
+                "window_p95_ms": histogram.window().percentiles((0.95,))[0.95],
+            }
+
+        return {
+            lane.value: {"queue_wait": summary(self.queue_wait[lane]), "run_time": summary(self.run_time[lane])}
+            for lane in self.lanes
+        }
 
     def get_stats(self) -> WorkerStats:
         """
@@ -170,18 +409,43 @@ def get_stats(self) -> WorkerStats:
         Returns:
             WorkerStats with current state
         """
+        with self._cond:
+            lane_depths = {lane.value: n for lane, n in self._pending.items()}
+        total = len(self._alive_slots())
+
         with self.lock:
-            total = len([w for w in self.workers if w.is_alive()])
             active = len(self.active_jobs)
+            completed = self.stats["completed"]
+            failed = self.stats["failed"]
+            steals = self.stats["steals"]
+
+        return WorkerStats(
+            total_workers=total,
+            active_workers=active,
+            idle_workers=total - active,
+            queue_depth=sum(lane_depths.values()),
+            jobs_completed=completed,
+            jobs_failed=failed,
+            lane_depths=lane_depths,
+            queue_wait_p95_ms=_window_p95_ms(self.queue_wait),
+            run_time_p95_ms=_window_p95_ms(self.run_time),
+            steals=steals,
+        )
+
+    def autoscale(self, last_scale_time: Optional[datetime] = None) -> ScaleDecision:
+        """
+        Decide a worker count from current stats and apply it.
 
-            return WorkerStats(
-                total_workers=total,
-                active_workers=active,
-                idle_workers=total - active,
-                queue_depth=self.job_queue.qsize(),
-                jobs_completed=self.stats["completed"],
-                jobs_failed=self.stats["failed"],
-            )
+        Args:
+            last_scale_time: Time of the previous scaling action (for cooldown)
+
+        Returns:
+            The ScaleDecision that was applied
+        """
+        decision = make_scale_decision(engine_state_from_stats(self.get_stats(), last_scale_time))
+        if decision.direction != ScaleDirection.HOLD:
+            self.scale_to(decision.desired_workers)
+        return decision
 
     def shutdown(self, timeout_s: Optional[int] = None):
         """
@@ -193,17 +457,15 @@ def shutdown(self, timeout_s: Optional[int] = None):
         if timeout_s is None:
             timeout_s = int(os.getenv("WORKER_SHUTDOWN_TIMEOUT_S", "30"))
 
-        # Wait for queue to drain first (with timeout)
+        # Wait for lanes to drain first (with timeout)
         deadline = time.time() + timeout_s
-        while not self.job_queue.empty() and time.time() < deadline:
+        while self.queue_depth() > 0 and time.time() < deadline:
             time.sleep(0.1)
 
         # Signal shutdown
         self.shutdown_event.set()
-
-        # Send poison pills to all workers
-        for _ in self.workers:
-            self.job_queue.put(None)
+        with self._cond:
+            self._cond.notify_all()
 
         # Wait for workers to finish
         remaining = deadline - time.time()
@@ -212,4 +474,5 @@ def shutdown(self, timeout_s: Optional[int] = None):
                 worker.join(timeout=remaining)
                 remaining = deadline - time.time()
 
-        self.workers.clear()
+        with self._cond:
+            self._slots.clear()
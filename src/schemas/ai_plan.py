@@ -22,6 +22,10 @@
 MAX_PARAMS_DEPTH = 5
 MAX_PARAMS_STRLEN = 10_000
 
+# Reference to an earlier step's output inside a param value, e.g.
+# "{{steps.0.result.event_id}}"; implies a dependency on that step
+STEP_REFERENCE_PATTERN = re.compile(r"\{\{\s*steps\.(\d+)((?:\.\w+)*)\s*\}\}")
+
 SENSITIVE_KEYS = {
     "password",
     "token",
@@ -45,6 +49,31 @@ def _max_depth(obj: Any, depth: int = 0) -> int:
     return max([depth] + [_max_depth(v, depth + 1) for v in obj]) if obj else depth
 
 
+def _string_values(obj: Any):
+    """Yield every string nested in a params structure."""
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            yield from _string_values(value)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            yield from _string_values(value)
+
+
+def _renumber_references(obj: Any, mapping: dict[int, int]) -> Any:
+    """Rewrite step indices in references after steps were removed from a plan."""
+    if isinstance(obj, str):
+        return STEP_REFERENCE_PATTERN.sub(
+            lambda m: m.group(0).replace(f"steps.{m.group(1)}", f"steps.{mapping[int(m.group(1))]}", 1), obj
+        )
+    if isinstance(obj, dict):
+        return {k: _renumber_references(v, mapping) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_renumber_references(v, mapping) for v in obj]
+    return obj
+
+
 def _json_strlen(obj: Any) -> int:
     """Get approximate serialized JSON length."""
     try:
@@ -108,6 +137,32 @@ def validate_depends_on(cls, v: Optional[list[int]]) -> Optional[list[int]]:
                 raise ValueError("depends_on indices must be non-negative")
         return v
 
+    def referenced_steps(self) -> set[int]:
+        """Indices of earlier steps whose output this step's params reference."""
+        return {
+            int(match.group(1))
+            for value in _string_values(self.params)
+            for match in STEP_REFERENCE_PATTERN.finditer(value)
+        }
+
+    def dependencies(self) -> list[int]:
+        """Explicit depends_on plus steps inferred from params references, sorted."""
+        return sorted(set(self.depends_on or ()) | self.referenced_steps())
+
+    def renumbered(self, mapping: dict[int, int]) -> "PlannedAction":
+        """Copy with dependency indices remapped (old index -> new index).
+
+        Every dependency must be present in mapping.
+        """
+        if not self.dependencies():
+            return self
+        return self.model_copy(
+            update={
+                "params": _renumber_references(self.params, mapping),
+                "depends_on": [mapping[idx] for idx in self.depends_on] if self.depends_on is not None else None,
+            }
+        )
+
 
 class PlanResult(BaseModel):
     """Structured plan generated from natural language prompt.
@@ -141,8 +196,8 @@ def validate_steps_dependencies(cls, v: list[PlannedAction]) -> list[PlannedActi
         """Validate that all depends_on indices are valid and acyclic."""
         n = len(v)
         for i, step in enumerate(v):
-            if step.depends_on:
-                for dep_idx in step.depends_on:
+            if step.depends_on or step.referenced_steps():
+                for dep_idx in step.dependencies():
                     if dep_idx == i:
                         raise ValueError(f"Step {i} has self-reference in depends_on")
                     if dep_idx >= i:
@@ -153,6 +208,13 @@ def validate_steps_dependencies(cls, v: list[PlannedAction]) -> list[PlannedActi
                         raise ValueError(f"Step {i} depends on step {dep_idx}, but only {n} steps exist")
         return v
 
+    def step_dependencies(self) -> list[list[int]]:
+        """Dependencies of each step (explicit and inferred), indexed like steps.
+
+        Steps with no dependencies can run concurrently with each other.
+        """
+        return [step.dependencies() for step in self.steps]
+
     def safe_dict(self) -> dict[str, Any]:
         """Export plan with sensitive fields in params redacted.
 
@@ -8,7 +8,40 @@
 from enum import Enum
 from typing import Any, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is read-only")
+
+
+class FrozenDict(dict):
+    """dict that rejects mutation (still a dict for equality and serialization)."""
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        # copy/deepcopy/pickle rebuild through the constructor, not __setitem__
+        return type(self), (dict(self),)
+
+
+class FrozenList(list):
+    """list that rejects mutation (still a list for equality and serialization)."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+
+def freeze(value: Any) -> Any:
+    """Read-only deep copy of JSON-like data (dicts and lists; other values are kept)."""
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
 
 
 class JobStatus(str, Enum):
@@ -25,9 +58,12 @@ class JobRecord(BaseModel):
 
     Tracks one action's execution within a plan step.
     Stores status, timestamps, and redacted result/error.
+    Frozen: stores hand out the same snapshot to every reader, and each
+    transition creates a new record. ``result`` is frozen too (see freeze());
+    stores building records with model_copy must pass it through freeze().
     """
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     job_id: str = Field(..., description="Unique job identifier (UUID)")
     user_id: str = Field(..., description="User who initiated job")
@@ -39,3 +75,8 @@ class JobRecord(BaseModel):
     finished_at: Optional[datetime] = Field(None, description="Execution finish timestamp")
     error: Optional[str] = Field(None, description="Error message if failed (redacted)")
     result: Optional[dict[str, Any]] = Field(None, description="Execution result (redacted)")
+
+    @field_validator("result", mode="after")
+    @classmethod
+    def _freeze_result(cls, value: Optional[dict[str, Any]]) -> Optional[dict[str, Any]]:
+        return freeze(value)
@@ -1,13 +1,20 @@
-"""Audit logging for security and compliance."""
+"""Audit logging for security and compliance.
+
+Events are written by a background group-commit writer and queried through
+per-day segment indexes; see audit_store.py.
+"""
 
 import json
 import os
-from dataclasses import asdict, dataclass
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, fields
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any, Optional
 
+from .audit_store import get_audit_store, segment_path
+
 
 class AuditAction(str, Enum):
     """Audit event actions."""
@@ -78,7 +85,11 @@ def to_dict(self) -> dict[str, Any]:
 
     def to_log_line(self) -> str:
         """Convert to structured log line (JSON)."""
-        return json.dumps(self.to_dict(), separators=(",", ":"))
+        # Shallow field copy: same output as to_dict() without asdict()'s deep copy on the hot path
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        data["action"] = self.action.value
+        data["result"] = self.result.value
+        return json.dumps(data, separators=(",", ":"))
 
 
 class AuditLogger:
@@ -94,9 +105,12 @@ def __init__(self, audit_dir: str = "audit"):
         self.audit_dir = Path(audit_dir)
         self.audit_dir.mkdir(parents=True, exist_ok=True)
 
-        # Get current date for daily log file
-        self.current_date = datetime.now().strftime("%Y-%m-%d")
-        self.log_file = self.audit_dir / f"audit-{self.current_date}.jsonl"
+        # Daily log files are named by UTC date, matching event timestamps
+        self.current_date = datetime.utcnow().strftime("%Y-%m-%d")
+        self.log_file = segment_path(self.audit_dir, self.current_date)
+
+        # Writer and indexes are shared by every logger on the same directory
+        self._store = get_audit_store(self.audit_dir)
 
     def log(
         self,
@@ -143,17 +157,28 @@ def log(
             user_agent=user_agent,
         )
 
-        # Write to log file
+        # Queue for the background writer (never waits on disk)
         try:
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(event.to_log_line() + "\n")
+            self._store.append(
+                event.timestamp[:10],
+                event.to_log_line(),
+                {
+                    "tenant_id": tenant_id,
+                    "user_id": user_id,
+                    "action": event.action.value,
+                    "result": event.result.value,
+                },
+            )
         except Exception as e:
-            # Log to stderr if file write fails
             print(f"AUDIT_ERROR: Failed to write audit log: {e}", flush=True)
             print(f"AUDIT_EVENT: {event.to_log_line()}", flush=True)
 
         return event
 
+    def flush(self) -> bool:
+        """Wait until queued events are on disk (returns False on timeout)."""
+        return self._store.flush()
+
     def log_success(
         self,
         tenant_id: str,
@@ -225,6 +250,7 @@ def query(
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         limit: int = 100,
+        offset: int = 0,
     ) -> list[AuditEvent]:
         """
         Query audit logs.
@@ -237,65 +263,79 @@ def query(
             start_date: Filter by start date (YYYY-MM-DD)
             end_date: Filter by end date (YYYY-MM-DD)
             limit: Maximum number of events to return
+            offset: Matching events to skip (oldest first)
 
         Returns:
             List of matching audit events
         """
-        events = []
+        return list(
+            self.iter_query(
+                tenant_id=tenant_id,
+                user_id=user_id,
+                action=action,
+                result=result,
+                start_date=start_date,
+                end_date=end_date,
+                limit=limit,
+                offset=offset,
+            )
+        )
 
-        # Determine which log files to scan
-        log_files = []
-        if start_date and end_date:
-            # TODO: Scan date range
-            log_files = list(self.audit_dir.glob("audit-*.jsonl"))
-        else:
-            # Just scan current log file
-            log_files = [self.log_file] if self.log_file.exists() else []
+    def iter_query(
+        self,
+        tenant_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        action: Optional[AuditAction] = None,
+        result: Optional[AuditResult] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Iterator[AuditEvent]:
+        """
+        Stream matching events, oldest first.
+
+        Only segments inside [start_date, end_date] are opened (today's
+        segment when neither is given). Filters are answered from each
+        segment's sidecar index and offset/limit are applied before any
+        event line is read.
+        """
+        # Read-your-writes: events logged by this process are written first
+        self._store.flush()
 
-        for log_file in log_files:
+        if start_date or end_date:
+            segments = self._store.segments(start_date, end_date)
+        else:
+            today = datetime.utcnow().strftime("%Y-%m-%d")
+            segments = self._store.segments(today, today)
+
+        filters = {}
+        if tenant_id:
+            filters["tenant_id"] = tenant_id
+        if user_id:
+            filters["user_id"] = user_id
+        if action:
+            filters["action"] = getattr(action, "value", action)
+        if result:
+            filters["result"] = getattr(result, "value", result)
+
+        for data in self._store.scan(segments, filters, offset=offset, limit=limit):
             try:
-                with open(log_file, encoding="utf-8") as f:
-                    for line in f:
-                        try:
-                            data = json.loads(line.strip())
-
-                            # Apply filters
-                            if tenant_id and data.get("tenant_id") != tenant_id:
-                                continue
-                            if user_id and data.get("user_id") != user_id:
-                                continue
-                            if action and data.get("action") != action.value:
-                                continue
-                            if result and data.get("result") != result.value:
-                                continue
-
-                            # Reconstruct AuditEvent
-                            event = AuditEvent(
-                                timestamp=data["timestamp"],
-                                tenant_id=data["tenant_id"],
-                                user_id=data["user_id"],
-                                action=AuditAction(data["action"]),
-                                resource_type=data["resource_type"],
-                                resource_id=data["resource_id"],
-                                result=AuditResult(data["result"]),
-                                reason=data.get("reason"),
-                                metadata=data.get("metadata"),
-                                ip_address=data.get("ip_address"),
-                                user_agent=data.get("user_agent"),
-                            )
-
-                            events.append(event)
-
-                            if len(events) >= limit:
-                                return events
-
-                        except (json.JSONDecodeError, KeyError, ValueError):
-                            continue  # Skip malformed lines
-
-            except FileNotFoundError:
-                continue
-
-        return events
+                yield AuditEvent(
+                    timestamp=data["timestamp"],
+                    tenant_id=data["tenant_id"],
+                    user_id=data["user_id"],
+                    action=AuditAction(data["action"]),
+                    resource_type=data["resource_type"],
+                    resource_id=data["resource_id"],
+                    result=AuditResult(data["result"]),
+                    reason=data.get("reason"),
+                    metadata=data.get("metadata"),
+                    ip_address=data.get("ip_address"),
+                    user_agent=data.get("user_agent"),
+                )
+            except (KeyError, ValueError):
+                continue  # Skip malformed lines
 
 
 # Global audit logger instance
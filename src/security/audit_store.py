@@ -0,0 +1,536 @@
+"""
+Segmented audit log storage: background writer and indexed reader.
+
+Layout (one pair per UTC day):
+    audit-YYYY-MM-DD.jsonl      events, one JSON object per line (unchanged format)
+    audit-YYYY-MM-DD.jsonl.idx  sidecar index, one JSON entry per write:
+        {"start": s, "end": e, "offsets": [...], "postings": {field: {value: [offset, ...]}}}
+
+Writes go through AuditStore.append(), which only enqueues. A writer thread
+drains the bounded queue, group-commits each batch with one write per
+segment, appends the batch's index entry, and fsyncs per AUDIT_FSYNC.
+Segment and sidecar writes happen under an exclusive flock, so sidecar
+offsets stay exact when several processes share an audit directory.
+flush() and an atexit hook drain the queue; a full queue blocks append()
+for up to AUDIT_ENQUEUE_TIMEOUT_SEC before the event is counted as dropped.
+The writer never creates files: append() creates the day's segment and
+sidecar, so a writer running after the directory is removed reports the
+failure instead of recreating it.
+
+Queries open only segments in the date range, merge their sidecar entries
+(index gaps left by a crash or by legacy files are scanned once and
+appended), intersect postings, and seek straight to matching lines.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process locking only
+    fcntl = None
+
+AUDIT_ASYNC = os.getenv("AUDIT_ASYNC", "true").lower() == "true"
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_ENQUEUE_TIMEOUT_SEC = float(os.getenv("AUDIT_ENQUEUE_TIMEOUT_SEC", "0.1"))  # Backpressure when full
+AUDIT_BATCH_MAX = int(os.getenv("AUDIT_BATCH_MAX", "512"))
+AUDIT_FSYNC = os.getenv("AUDIT_FSYNC", "interval")  # always | interval | never
+AUDIT_FSYNC_INTERVAL_SEC = float(os.getenv("AUDIT_FSYNC_INTERVAL_SEC", "1.0"))
+AUDIT_FLUSH_TIMEOUT_SEC = float(os.getenv("AUDIT_FLUSH_TIMEOUT_SEC", "5.0"))
+AUDIT_WRITER_IDLE_SEC = float(os.getenv("AUDIT_WRITER_IDLE_SEC", "5.0"))  # Writer thread exits when idle
+AUDIT_INDEX_CACHE_SEGMENTS = int(os.getenv("AUDIT_INDEX_CACHE_SEGMENTS", "400"))  # Sidecars kept in memory
+AUDIT_STORE_CACHE = int(os.getenv("AUDIT_STORE_CACHE", "16"))  # Directories with a shared store
+
+INDEXED_FIELDS = ("tenant_id", "user_id", "action", "result")
+
+_STOP = object()
+
+
+def segment_path(audit_dir: Path, date: str) -> Path:
+    """Event file for a UTC date (YYYY-MM-DD)."""
+    return audit_dir / f"audit-{date}.jsonl"
+
+
+def _index_path(segment: Path) -> Path:
+    return segment.with_name(segment.name + ".idx")
+
+
+class _Locked:
+    """Exclusive flock on an open file for the duration of a with-block."""
+
+    def __init__(self, f):
+        self.f = f
+
+    def __enter__(self):
+        if fcntl is not None:
+            fcntl.flock(self.f.fileno(), fcntl.LOCK_EX)
+        return self.f
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.f.fileno(), fcntl.LOCK_UN)
+        return False
+
+
+def _index_entry(start: int, lines: list[bytes], keys: list[dict[str, str]]) -> dict[str, Any]:
+    offsets, postings = [], {field: {} for field in INDEXED_FIELDS}
+    position = start
+    for line, key in zip(lines, keys):
+        offsets.append(position)
+        for field in INDEXED_FIELDS:
+            value = key.get(field)
+            if value is not None:
+                postings[field].setdefault(value, []).append(position)
+        position += len(line)
+    return {"start": start, "end": position, "offsets": offsets, "postings": postings}
+
+
+# ============================================================================
+# Writer
+# ============================================================================
+
+
+class _Flush:
+    __slots__ = ("done",)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+def _open_existing(path: Path):
+    """Append handle on a file that must already exist (never recreates a removed directory)."""
+    return os.fdopen(os.open(path, os.O_WRONLY | os.O_APPEND), "ab")
+
+
+class _SegmentFiles:
+    """Open append handles for one segment and its sidecar."""
+
+    def __init__(self, segment: Path):
+        self.segment = _open_existing(segment)
+        try:
+            self.index = _open_existing(_index_path(segment))
+        except OSError:
+            self.segment.close()
+            raise
+
+    def close(self) -> None:
+        self.segment.close()
+        self.index.close()
+
+
+class AuditStore:
+    """
+    Audit segments under one directory: queued group-commit writes and indexed reads.
+
+    Args:
+        audit_dir: Directory holding audit-YYYY-MM-DD.jsonl segments
+        async_writes: Enqueue for the writer thread (False writes inline)
+        queue_size: Events buffered before append() applies backpressure
+        batch_max: Most events per group commit
+        fsync: "always" (every commit), "interval" (at most every fsync_interval_sec) or "never"
+    """
+
+    def __init__(
+        self,
+        audit_dir: Path,
+        async_writes: bool = AUDIT_ASYNC,
+        queue_size: int = AUDIT_QUEUE_SIZE,
+        batch_max: int = AUDIT_BATCH_MAX,
+        fsync: str = AUDIT_FSYNC,
+        fsync_interval_sec: float = AUDIT_FSYNC_INTERVAL_SEC,
+    ):
+        if fsync not in ("always", "interval", "never"):
+            raise ValueError(f"Invalid fsync policy: {fsync}")
+        self.audit_dir = Path(audit_dir)
+        self.async_writes = async_writes
+        self.batch_max = batch_max
+        self.fsync = fsync
+        self.fsync_interval_sec = fsync_interval_sec
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._write_lock = threading.Lock()  # Inline writes vs. writer thread
+        self._files: dict[str, _SegmentFiles] = {}
+        self._known_segments: set[str] = set()
+        self._last_fsync = time.monotonic()
+        self._indexes: dict[str, _SegmentIndex] = {}
+        self._index_lock = threading.Lock()
+        self.stats = {"enqueued": 0, "written": 0, "batches": 0, "dropped": 0, "fsyncs": 0, "errors": 0}
+
+    # ------------------------------------------------------------------ writes
+
+    def append(self, date: str, line: str, keys: dict[str, str]) -> bool:
+        """
+        Record one event line for a UTC date. Never blocks on disk.
+
+        The day's segment file and sidecar are created synchronously the first
+        time a date is seen, so they exist as soon as append() returns. When
+        the queue is full, waits up to AUDIT_ENQUEUE_TIMEOUT_SEC for room.
+
+        Returns:
+            False if the queue stayed full and the event was dropped (printed to stdout instead)
+        """
+        if date not in self._known_segments:
+            segment = segment_path(self.audit_dir, date)
+            segment.touch(exist_ok=True)
+            _index_path(segment).touch(exist_ok=True)
+            self._known_segments.add(date)
+
+        if not self.async_writes:
+            with self._write_lock:
+                self._write_batch([(date, line, keys)])
+            return True
+
+        try:
+            self._queue.put((date, line, keys), timeout=AUDIT_ENQUEUE_TIMEOUT_SEC)
+        except queue.Full:
+            self.stats["dropped"] += 1
+            print(f"AUDIT_DROPPED: {line}", flush=True)
+            return False
+        self.stats["enqueued"] += 1
+        self._ensure_writer()
+        return True
+
+    def flush(self, timeout: float = AUDIT_FLUSH_TIMEOUT_SEC) -> bool:
+        """Wait until every event appended so far is written. Returns False on timeout."""
+        if not self.async_writes or (self._thread is None and self._queue.empty()):
+            return True
+        marker = _Flush()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        self._ensure_writer()
+        return marker.done.wait(timeout)
+
+    def close(self) -> None:
+        """Drain the queue, stop the writer and close files."""
+        self.flush()
+        with self._thread_lock:
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(AUDIT_FLUSH_TIMEOUT_SEC)
+        with self._write_lock:
+            self._close_files()
+
+    def _ensure_writer(self) -> None:
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"audit-writer:{self.audit_dir}", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=AUDIT_WRITER_IDLE_SEC)
+            except queue.Empty:
+                with self._thread_lock:
+                    if self._queue.empty():
+                        self._thread = None
+                        with self._write_lock:
+                            self._close_files()
+                        return
+                continue
+
+            # Group commit: everything queued behind the first item, up to batch_max
+            items = [item]
+            while len(items) < self.batch_max:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            events = [i for i in items if isinstance(i, tuple)]
+            if events:
+                with self._write_lock:
+                    self._write_batch(events)
+            for i in items:
+                if isinstance(i, _Flush):
+                    i.done.set()
+            if any(i is _STOP for i in items):
+                with self._thread_lock:
+                    self._thread = None
+                return
+
+    def _write_batch(self, events: list[tuple[str, str, dict[str, str]]]) -> None:
+        by_date: dict[str, tuple[list[bytes], list[dict[str, str]]]] = {}
+        for date, line, keys in events:
+            lines, key_list = by_date.setdefault(date, ([], []))
+            lines.append((line + "\n").encode("utf-8"))
+            key_list.append(keys)
+
+        for date, (lines, key_list) in by_date.items():
+            try:
+                files = self._segment_files(date)
+                with _Locked(files.segment):
+                    start = files.segment.seek(0, os.SEEK_END)
+                    files.segment.write(b"".join(lines))
+                    files.segment.flush()
+                    entry = _index_entry(start, lines, key_list)
+                    files.index.write((json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8"))
+                    files.index.flush()
+                self.stats["written"] += len(lines)
+                self.stats["batches"] += 1
+                self._maybe_fsync(files)
+            except Exception as e:
+                self.stats["errors"] += 1
+                self._known_segments.discard(date)  # Recreate the segment on the next append
+                stale = self._files.pop(date, None)
+                if stale is not None:
+                    stale.close()
+                print(f"AUDIT_ERROR: Failed to write audit log: {e}", flush=True)
+                for line in lines:
+                    print(f"AUDIT_EVENT: {line.decode('utf-8').rstrip()}", flush=True)
+
+    def _segment_files(self, date: str) -> _SegmentFiles:
+        files = self._files.get(date)
+        if files is not None and os.fstat(files.segment.fileno()).st_nlink == 0:
+            # Segment deleted (or its directory removed) while open: writing would lose the events
+            self._files.pop(date).close()
+            files = None
+        if files is None:
+            # Keep only the newest days open (a batch may straddle midnight)
+            for old in sorted(self._files)[:-1]:
+                self._files.pop(old).close()
+            files = self._files[date] = _SegmentFiles(segment_path(self.audit_dir, date))
+        return files
+
+    def _maybe_fsync(self, files: _SegmentFiles) -> None:
+        if self.fsync == "never":
+            return
+        now = time.monotonic()
+        if self.fsync == "always" or now - self._last_fsync >= self.fsync_interval_sec:
+            os.fsync(files.segment.fileno())
+            self._last_fsync = now
+            self.stats["fsyncs"] += 1
+
+    def _close_files(self) -> None:
+        for files in self._files.values():
+            if self.fsync != "never":
+                os.fsync(files.segment.fileno())
+            files.close()
+        self._files.clear()
+
+    # ------------------------------------------------------------------- reads
+
+    def segments(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> list[tuple[str, Path]]:
+        """(date, path) of segments within [start_date, end_date], oldest first."""
+        found = []
+        for path in self.audit_dir.glob("audit-????-??-??.jsonl"):
+            date = path.name[6:16]
+            if (start_date is None or date >= start_date) and (end_date is None or date <= end_date):
+                found.append((date, path))
+        return sorted(found)
+
+    def scan(
+        self,
+        segments: list[tuple[str, Path]],
+        filters: dict[str, str],
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Stream matching events (as dicts) from segments, oldest first.
+
+        Offset is applied per segment from index counts, so skipped segments
+        are never read; reading stops once limit events have been yielded.
+        """
+        remaining = limit
+        for date, path in segments:
+            if remaining is not None and remaining <= 0:
+                return
+            candidates = self._lookup(date, path, filters)
+            if offset >= len(candidates):
+                offset -= len(candidates)
+                continue
+            candidates = candidates[offset:]
+            offset = 0
+            if remaining is not None:
+                candidates = candidates[:remaining]
+            for data in _read_lines(path, candidates):
+                if remaining is not None:
+                    remaining -= 1
+                yield data
+
+    def _lookup(self, date: str, path: Path, filters: dict[str, str]) -> list[int]:
+        with self._index_lock:
+            index = self._indexes.pop(date, None)
+            if index is None or index.path != path:
+                index = _SegmentIndex(path)
+            self._indexes[date] = index  # Most recently used last
+            while len(self._indexes) > AUDIT_INDEX_CACHE_SEGMENTS:
+                self._indexes.pop(next(iter(self._indexes)))
+            return index.lookup(filters)
+
+
+def _read_lines(path: Path, offsets: list[int]) -> Iterator[dict[str, Any]]:
+    try:
+        with open(path, "rb") as f:
+            for position in offsets:
+                f.seek(position)
+                try:
+                    yield json.loads(f.readline())
+                except json.JSONDecodeError:
+                    continue  # Skip malformed lines
+    except FileNotFoundError:
+        return
+
+
+# ============================================================================
+# Sidecar index
+# ============================================================================
+
+
+class _SegmentIndex:
+    """
+    In-memory view of one segment's sidecar, refreshed incrementally.
+
+    Entries are merged in segment order; any byte range no entry covers
+    (legacy file, crash between the two writes) is scanned and appended to
+    the sidecar so the next reader does not scan it again.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.index_path = _index_path(path)
+        self._index_read = 0  # Sidecar bytes consumed
+        self._segment_size = -1
+        self._entries: list[dict[str, Any]] = []
+        self._merged: Optional[tuple[list[int], dict[str, dict[str, list[int]]]]] = None
+
+    def lookup(self, filters: dict[str, str]) -> list[int]:
+        """Sorted line offsets matching every filter (all lines when filters is empty)."""
+        self._refresh()
+        offsets, postings = self._merge()
+        if not filters:
+            return offsets
+        lists = [postings.get(field, {}).get(value, []) for field, value in filters.items()]
+        lists.sort(key=len)
+        if not lists[0]:
+            return []
+        matched = set(lists[0])
+        for other in lists[1:]:
+            matched.intersection_update(other)
+            if not matched:
+                return []
+        return sorted(matched)
+
+    def _refresh(self) -> None:
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            self._entries, self._merged, self._segment_size = [], None, 0
+            return
+        index_size = self.index_path.stat().st_size if self.index_path.exists() else 0
+        if size == self._segment_size and index_size == self._index_read:
+            return
+
+        with open(self.path, "rb") as segment, _Locked(segment):
+            self._read_sidecar()
+            gaps = self._gaps(segment.seek(0, os.SEEK_END))
+            if gaps:
+                with open(self.index_path, "ab") as sidecar:
+                    for start, end in gaps:
+                        entry = self._scan(segment, start, end)
+                        if entry["offsets"]:
+                            sidecar.write((json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8"))
+                            self._entries.append(entry)
+                    self._index_read = sidecar.tell()
+            self._segment_size = size
+        self._merged = None
+
+    def _read_sidecar(self) -> None:
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, "rb") as sidecar:
+            sidecar.seek(self._index_read)
+            for line in sidecar:
+                if not line.endswith(b"\n"):
+                    break  # Partially written entry; read it next time
+                self._index_read += len(line)
+                try:
+                    self._entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+
+    def _gaps(self, size: int) -> list[tuple[int, int]]:
+        gaps, position = [], 0
+        for start, end in sorted((e["start"], e["end"]) for e in self._entries):
+            if start > position:
+                gaps.append((position, start))
+            position = max(position, end)
+        if size > position:
+            gaps.append((position, size))
+        return gaps
+
+    def _scan(self, segment, start: int, end: int) -> dict[str, Any]:
+        segment.seek(start)
+        data = segment.read(end - start)
+        data = data[: data.rfind(b"\n") + 1]  # Whole lines only
+        lines, keys = [], []
+        for line in data.splitlines(keepends=True):
+            lines.append(line)
+            try:
+                record = json.loads(line)
+                keys.append({field: record.get(field) for field in INDEXED_FIELDS})
+            except json.JSONDecodeError:
+                keys.append({})
+        return _index_entry(start, lines, keys)
+
+    def _merge(self) -> tuple[list[int], dict[str, dict[str, list[int]]]]:
+        if self._merged is None:
+            offsets: list[int] = []
+            postings: dict[str, dict[str, list[int]]] = {field: {} for field in INDEXED_FIELDS}
+            for entry in sorted(self._entries, key=lambda e: e["start"]):
+                offsets.extend(entry["offsets"])
+                for field, values in entry["postings"].items():
+                    merged = postings.setdefault(field, {})
+                    for value, positions in values.items():
+                        merged.setdefault(value, []).extend(positions)
+            self._merged = (offsets, postings)
+        return self._merged
+
+
+# ============================================================================
+# Shared stores (one writer per directory per process)
+# ============================================================================
+
+_stores: dict[Path, AuditStore] = {}  # Least recently used first
+_stores_lock = threading.Lock()
+
+
+def get_audit_store(audit_dir: Path) -> AuditStore:
+    """The process-wide AuditStore for a directory (the AUDIT_STORE_CACHE most recent are kept)."""
+    key = Path(audit_dir).resolve()
+    evicted = []
+    with _stores_lock:
+        store = _stores.pop(key, None)
+        if store is None:
+            store = AuditStore(key)
+        _stores[key] = store
+        while len(_stores) > AUDIT_STORE_CACHE:
+            evicted.append(_stores.pop(next(iter(_stores))))
+    for old in evicted:
+        old.close()  # Drains its queue; a logger still holding it restarts the writer on append
+    return store
+
+
+def close_audit_stores() -> None:
+    """Flush and stop every writer (registered with atexit)."""
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        store.close()
+
+
+atexit.register(close_audit_stores)
@@ -4,6 +4,7 @@
 Provides three-tier storage system with automated lifecycle management.
 """
 
+from .blob_store import BlobStore, get_blob_store
 from .lifecycle import (
     get_last_lifecycle_job,
     get_recent_lifecycle_events,
@@ -15,6 +16,7 @@
     restore_artifact,
     run_lifecycle_job,
 )
+from .manifest import get_manifest_path, rebuild_manifest
 from .tiered_store import (
     TIER_COLD,
     TIER_HOT,
@@ -27,9 +29,11 @@
     get_artifact_age_days,
     get_tier_stats,
     list_artifacts,
+    list_expired_artifacts,
     promote_artifact,
     purge_artifact,
     read_artifact,
+    transfer_artifact,
     write_artifact,
 )
 
@@ -43,11 +47,19 @@
     "read_artifact",
     "artifact_exists",
     "promote_artifact",
+    "transfer_artifact",
     "list_artifacts",
+    "list_expired_artifacts",
     "get_artifact_age_days",
     "purge_artifact",
     "get_tier_stats",
     "get_all_tier_stats",
+    # Content-addressed blobs
+    "BlobStore",
+    "get_blob_store",
+    # Manifest index
+    "get_manifest_path",
+    "rebuild_manifest",
     # Lifecycle operations
     "get_retention_days",
     "run_lifecycle_job",
@@ -0,0 +1,355 @@
+"""
+Content-Addressed Blob Store for Sprint 26 tiered storage
+
+Deduplicates artifact payloads by SHA-256. Identical content written by many
+artifacts is stored once; tier files hold a reference and the blob is deleted
+only when its reference count drops to zero.
+
+Layout: {root}/{namespace}/{digest[:2]}/{digest}
+Refcounts: {root}/refcounts.db (SQLite, WAL)
+
+Blob files are written read-only and never modified in place: a blob is only
+ever created (temp file + rename) or deleted. Anything materialized from a
+blob with link() must likewise be replaced, never written through.
+
+Namespaces are per tenant, so content is never shared across tenants and a
+tenant cannot probe for another tenant's payloads by hash. When
+ENCRYPTION_ENABLED is set, blobs are stored as secure_io envelopes; the digest
+is taken over the plaintext, so dedup still works within a tenant.
+
+Enable for tiered storage with STORAGE_DEDUP_ENABLED=true.
+"""
+
+import hashlib
+import os
+import sqlite3
+import stat
+import threading
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    namespace TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    stored_bytes INTEGER NOT NULL,
+    encrypted INTEGER NOT NULL,
+    refcount INTEGER NOT NULL,
+    PRIMARY KEY (namespace, digest)
+);
+"""
+
+
+class BlobNotFoundError(Exception):
+    """Raised when a referenced blob is missing."""
+
+    pass
+
+
+def is_dedup_enabled() -> bool:
+    """Check if content-addressed dedup is enabled for tiered storage (default: false)."""
+    return os.getenv("STORAGE_DEDUP_ENABLED", "false").lower() in {"1", "true", "yes"}
+
+
+def content_digest(data: bytes) -> str:
+    """
+    Compute the content address for a payload.
+
+    Args:
+        data: Plaintext bytes
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore:
+    """Reference-counted, content-addressed blob storage under a root directory."""
+
+    def __init__(self, root: Path, encrypt: Optional[bool] = None):
+        """
+        Initialize blob store.
+
+        Args:
+            root: Directory holding blobs and the refcount database
+            encrypt: Encrypt new blobs (default: secure_io.is_encryption_enabled())
+        """
+        self.root = Path(root)
+        self._encrypt = encrypt
+
+    def _connect(self) -> sqlite3.Connection:
+        self.root.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.root / "refcounts.db", timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _should_encrypt(self) -> bool:
+        if self._encrypt is not None:
+            return self._encrypt
+        from .secure_io import is_encryption_enabled
+
+        return is_encryption_enabled()
+
+    def blob_path(self, namespace: str, digest: str) -> Path:
+        """
+        Get the on-disk path for a blob.
+
+        Args:
+            namespace: Isolation namespace (tenant ID)
+            digest: Hex SHA-256 digest
+
+        Returns:
+            Path: Blob file path
+        """
+        return self.root / namespace / digest[:2] / digest
+
+    def put(self, namespace: str, data: bytes) -> str:
+        """
+        Store a payload (or add a reference to an existing copy).
+
+        The blob file is written before the reference is committed, so a crash
+        can leave an unreferenced blob but never a reference to a missing one.
+        Both happen under the refcount write lock, so a concurrent release can
+        never delete a blob that a writer is about to rely on.
+
+        Args:
+            namespace: Isolation namespace (tenant ID)
+            data: Plaintext bytes
+
+        Returns:
+            Hex SHA-256 digest of data
+        """
+        digest = content_digest(data)
+        path = self.blob_path(namespace, digest)
+
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT encrypted FROM blobs WHERE namespace = ? AND digest = ?", (namespace, digest)
+                ).fetchone()
+                if row and path.exists():
+                    conn.execute(
+                        "UPDATE blobs SET refcount = refcount + 1 WHERE namespace = ? AND digest = ?",
+                        (namespace, digest),
+                    )
+                else:
+                    encrypt = bool(row[0]) if row else self._should_encrypt()
+                    stored = data
+                    if encrypt:
+                        from .secure_io import encrypt_bytes
+
+                        stored = encrypt_bytes(data)
+                    self._write_blob(path, stored)
+
+                    if row:
+                        # Row survived but the file did not (e.g. crash mid-release): restore it
+                        conn.execute(
+                            "UPDATE blobs SET refcount = refcount + 1, stored_bytes = ? "
+                            "WHERE namespace = ? AND digest = ?",
+                            (len(stored), namespace, digest),
+                        )
+                    else:
+                        conn.execute(
+                            "INSERT INTO blobs (namespace, digest, size_bytes, stored_bytes, encrypted, refcount) "
+                            "VALUES (?, ?, ?, ?, ?, 1)",
+                            (namespace, digest, len(data), len(stored), int(encrypt)),
+                        )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        return digest
+
+    def _write_blob(self, path: Path, stored: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.parent / f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(stored)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(temp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            temp_path.replace(path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+
+    def get(self, namespace: str, digest: str) -> bytes:
+        """
+        Read a payload by digest.
+
+        Args:
+            namespace: Isolation namespace (tenant ID)
+            digest: Hex SHA-256 digest
+
+        Returns:
+            Plaintext bytes
+
+        Raises:
+            BlobNotFoundError: If the blob file is missing
+        """
+        path = self.blob_path(namespace, digest)
+        if not path.exists():
+            raise BlobNotFoundError(f"Blob not found: {namespace}/{digest}")
+
+        stored = path.read_bytes()
+
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT encrypted FROM blobs WHERE namespace = ? AND digest = ?", (namespace, digest)
+            ).fetchone()
+
+        if row and row[0]:
+            from .secure_io import decrypt_bytes
+
+            return decrypt_bytes(stored)
+        return stored
+
+    def release(self, namespace: str, digest: str) -> int:
+        """
+        Drop one reference; delete the blob when none remain.
+
+        Args:
+            namespace: Isolation namespace (tenant ID)
+            digest: Hex SHA-256 digest
+
+        Returns:
+            int: Remaining reference count (0 if the blob was deleted or unknown)
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT refcount FROM blobs WHERE namespace = ? AND digest = ?", (namespace, digest)
+            ).fetchone()
+            if not row:
+                conn.execute("COMMIT")
+                return 0
+
+            remaining = row[0] - 1
+            if remaining > 0:
+                conn.execute(
+                    "UPDATE blobs SET refcount = ? WHERE namespace = ? AND digest = ?", (remaining, namespace, digest)
+                )
+            else:
+                # Delete while still holding the write lock so no put() can re-reference it in between
+                conn.execute("DELETE FROM blobs WHERE namespace = ? AND digest = ?", (namespace, digest))
+                path = self.blob_path(namespace, digest)
+                if path.exists():
+                    path.unlink()
+                try:
+                    path.parent.rmdir()
+                except OSError:
+                    pass  # Directory not empty
+            conn.execute("COMMIT")
+
+        return max(remaining, 0)
+
+    def refcount(self, namespace: str, digest: str) -> int:
+        """
+        Get the current reference count for a blob.
+
+        Args:
+            namespace: Isolation namespace (tenant ID)
+            digest: Hex SHA-256 digest
+
+        Returns:
+            int: Reference count (0 if unknown)
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT refcount FROM blobs WHERE namespace = ? AND digest = ?", (namespace, digest)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def link(self, namespace: str, digest: str, dest: Path) -> bool:
+        """
+        Materialize a plaintext blob at dest as a hard link.
+
+        dest shares the blob's read-only inode. Writers must replace dest
+        (temp file + rename) rather than write through it, or they would
+        change the blob and every other file linked to it.
+
+        Args:
+            namespace: Isolation namespace
+            digest: Hex SHA-256 digest
+            dest: Target path (replaced if it exists)
+
+        Returns:
+            bool: True if linked; False if the blob is encrypted or linking is
+            unsupported (caller should write the content itself and release
+            the reference it took for dest)
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT encrypted FROM blobs WHERE namespace = ? AND digest = ?", (namespace, digest)
+            ).fetchone()
+        if not row or row[0]:
+            return False
+
+        temp_path = dest.parent / f".{dest.name}.{os.getpid()}.{threading.get_ident()}.link.tmp"
+        try:
+            os.link(self.blob_path(namespace, digest), temp_path)
+            temp_path.replace(dest)
+            return True
+        except OSError:
+            return False
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+
+    def is_linked(self, namespace: str, digest: str, path: Path) -> bool:
+        """
+        Check whether path is a link to a blob (and so holds a reference to it).
+
+        Args:
+            namespace: Isolation namespace
+            digest: Hex SHA-256 digest
+            path: File to check
+
+        Returns:
+            bool: True if path and the blob are the same file
+        """
+        try:
+            return os.path.samefile(path, self.blob_path(namespace, digest))
+        except OSError:
+            return False
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get dedup statistics.
+
+        Returns:
+            Dict with blob_count, reference_count, logical_bytes, stored_bytes, bytes_deduped
+        """
+        with closing(self._connect()) as conn:
+            blob_count, refs, logical, stored, unique = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(refcount), 0), COALESCE(SUM(size_bytes * refcount), 0), "
+                "COALESCE(SUM(stored_bytes), 0), COALESCE(SUM(size_bytes), 0) FROM blobs"
+            ).fetchone()
+
+        return {
+            "blob_count": blob_count,
+            "reference_count": refs,
+            "logical_bytes": logical,
+            "stored_bytes": stored,
+            "bytes_deduped": logical - unique,
+        }
+
+
+def get_blob_store() -> BlobStore:
+    """
+    Get the blob store for tiered storage.
+
+    Returns:
+        BlobStore rooted at {STORAGE_BASE_PATH}/blobs
+    """
+    from .tiered_store import get_base_storage_path
+
+    return BlobStore(get_base_storage_path() / "blobs")
@@ -0,0 +1,116 @@
+"""
+Cold Tier Compression for Sprint 26 tiered storage
+
+Artifacts entering the cold tier are compressed; the codec is recorded in the
+metadata sidecar (`_compression`) so reads decompress transparently.
+
+Codecs:
+- zstd: used when the optional `zstandard` package is installed
+- gzip: stdlib fallback
+- none: compression disabled
+
+Config:
+- COLD_TIER_COMPRESSION: auto|zstd|gzip|none (default: auto -> zstd if available, else gzip)
+- COLD_TIER_COMPRESSION_LEVEL: codec level (default: zstd 10, gzip 6)
+"""
+
+import gzip
+import os
+from typing import Optional
+
+try:
+    import zstandard
+
+    _ZSTD_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+    _ZSTD_AVAILABLE = False
+
+CODEC_ZSTD = "zstd"
+CODEC_GZIP = "gzip"
+CODEC_NONE = "none"
+
+_DEFAULT_LEVELS = {CODEC_ZSTD: 10, CODEC_GZIP: 6}
+
+
+class CompressionError(Exception):
+    """Raised when a codec is unknown or unavailable."""
+
+    pass
+
+
+def get_cold_codec() -> str:
+    """
+    Resolve the cold tier codec from environment.
+
+    Returns:
+        str: zstd, gzip, or none
+
+    Raises:
+        CompressionError: If zstd is requested but not installed, or codec is unknown
+    """
+    codec = os.getenv("COLD_TIER_COMPRESSION", "auto").lower()
+
+    if codec == "auto":
+        return CODEC_ZSTD if _ZSTD_AVAILABLE else CODEC_GZIP
+    if codec == CODEC_ZSTD and not _ZSTD_AVAILABLE:
+        raise CompressionError("COLD_TIER_COMPRESSION=zstd requires the 'zstandard' package")
+    if codec not in (CODEC_ZSTD, CODEC_GZIP, CODEC_NONE):
+        raise CompressionError(f"Unknown compression codec: {codec}")
+
+    return codec
+
+
+def _get_level(codec: str) -> int:
+    level = os.getenv("COLD_TIER_COMPRESSION_LEVEL")
+    return int(level) if level else _DEFAULT_LEVELS[codec]
+
+
+def compress(data: bytes, codec: str) -> Optional[bytes]:
+    """
+    Compress data with the given codec.
+
+    Args:
+        data: Raw bytes
+        codec: zstd, gzip, or none
+
+    Returns:
+        Compressed bytes, or None if the codec is none or compression does not
+        shrink the data (tiny or already-compressed artifacts are stored raw)
+    """
+    if codec == CODEC_NONE:
+        return None
+
+    if codec == CODEC_ZSTD:
+        if not _ZSTD_AVAILABLE:
+            raise CompressionError("zstd codec requires the 'zstandard' package")
+        packed = zstandard.ZstdCompressor(level=_get_level(codec)).compress(data)
+    elif codec == CODEC_GZIP:
+        # mtime=0 keeps output deterministic for identical content
+        packed = gzip.compress(data, compresslevel=_get_level(codec), mtime=0)
+    else:
+        raise CompressionError(f"Unknown compression codec: {codec}")
+
+    return packed if len(packed) < len(data) else None
+
+
+def decompress(data: bytes, codec: Optional[str]) -> bytes:
+    """
+    Decompress data written by compress().
+
+    Args:
+        data: Stored bytes
+        codec: Codec recorded in metadata (None or none for raw)
+
+    Returns:
+        Raw bytes
+    """
+    if not codec or codec == CODEC_NONE:
+        return data
+    if codec == CODEC_ZSTD:
+        if not _ZSTD_AVAILABLE:
+            raise CompressionError("Artifact is zstd-compressed but 'zstandard' is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == CODEC_GZIP:
+        return gzip.decompress(data)
+    raise CompressionError(f"Unknown compression codec: {codec}")
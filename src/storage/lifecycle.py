@@ -11,23 +11,28 @@
 4. Purged: Artifacts older than COLD_RETENTION_DAYS
 
 All operations emit audit events to logs/lifecycle_events.jsonl
+
+Promotions and purges run on a thread pool (LIFECYCLE_WORKERS, default 4);
+each step reports bytes in/out and throughput so cold tier compression
+savings are visible per run.
 """
 
 import json
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from .tiered_store import (
     TIER_COLD,
     TIER_HOT,
     TIER_WARM,
-    get_artifact_age_days,
-    list_artifacts,
+    list_expired_artifacts,
     promote_artifact,
     purge_artifact,
+    transfer_artifact,
 )
 
 # Default retention policies (in days)
@@ -35,6 +40,8 @@
 DEFAULT_WARM_RETENTION_DAYS = 30
 DEFAULT_COLD_RETENTION_DAYS = 90
 
+DEFAULT_LIFECYCLE_WORKERS = 4
+
 
 def get_retention_days() -> dict[str, int]:
     """
@@ -95,33 +102,9 @@ def scan_tier_for_expired(tier: str, max_age_days: int, fake_clock: Optional[flo
     Returns:
         List of expired artifact info dictionaries
     """
-    expired = []
-
     try:
-        artifacts = list_artifacts(tier)
-
-        for artifact in artifacts:
-            try:
-                age_days = get_artifact_age_days(
-                    tier, artifact["tenant_id"], artifact["workflow_id"], artifact["artifact_id"], fake_clock=fake_clock
-                )
-
-                if age_days > max_age_days:
-                    artifact["age_days"] = age_days
-                    expired.append(artifact)
-
-            except Exception as e:
-                # Log error but continue scanning
-                log_lifecycle_event(
-                    {
-                        "event_type": "scan_error",
-                        "tier": tier,
-                        "artifact": artifact.get("artifact_id", "unknown"),
-                        "error": str(e),
-                    }
-                )
-
-        return expired
+        # Single indexed range query on the manifest instead of a stat() per artifact
+        return list_expired_artifacts(tier, max_age_days, fake_clock=fake_clock)
 
     except Exception as e:
         log_lifecycle_event(
@@ -134,65 +117,121 @@ def scan_tier_for_expired(tier: str, max_age_days: int, fake_clock: Optional[flo
         return []
 
 
-def promote_expired_to_warm(dry_run: bool = False, fake_clock: Optional[float] = None) -> dict[str, Any]:
+def get_lifecycle_workers() -> int:
     """
-    Promote expired artifacts from hot to warm tier.
+    Get lifecycle worker pool size from environment.
+
+    Returns:
+        int: Number of worker threads (>= 1)
+    """
+    return max(1, int(os.getenv("LIFECYCLE_WORKERS", str(DEFAULT_LIFECYCLE_WORKERS))))
+
+
+def _execute_parallel(
+    artifacts: list[dict[str, Any]], action: Callable[[dict[str, Any]], dict[str, Any]], workers: int
+) -> list[tuple[dict[str, Any], Optional[dict[str, Any]], Optional[Exception]]]:
+    """
+    Run action over artifacts on a thread pool, preserving input order.
 
     Args:
-        dry_run: If True, don't actually move files
-        fake_clock: Optional fake current time for testing
+        artifacts: Expired artifact dicts from scan_tier_for_expired
+        action: Per-artifact operation returning a bytes_in/bytes_out dict
+        workers: Pool size
 
     Returns:
-        Dict with stats: promoted, errors, artifacts
+        List of (artifact, result, error) tuples; exactly one of result/error is set
     """
-    retention = get_retention_days()
-    max_age_days = retention["hot_days"]
 
-    expired = scan_tier_for_expired(TIER_HOT, max_age_days, fake_clock=fake_clock)
+    def run(artifact: dict[str, Any]) -> tuple[dict[str, Any], Optional[dict[str, Any]], Optional[Exception]]:
+        try:
+            return artifact, action(artifact), None
+        except Exception as e:
+            return artifact, None, e
 
-    promoted = 0
-    errors = []
-    promoted_artifacts = []
+    if workers <= 1 or len(artifacts) <= 1:
+        return [run(a) for a in artifacts]
 
-    for artifact in expired:
-        try:
-            tenant_id = artifact["tenant_id"]
-            workflow_id = artifact["workflow_id"]
-            artifact_id = artifact["artifact_id"]
+    with ThreadPoolExecutor(max_workers=min(workers, len(artifacts)), thread_name_prefix="lifecycle") as executor:
+        return list(executor.map(run, artifacts))
 
-            success = promote_artifact(
-                tenant_id, workflow_id, artifact_id, from_tier=TIER_HOT, to_tier=TIER_WARM, dry_run=dry_run
-            )
 
-            if success:
-                promoted += 1
-                promoted_artifacts.append(artifact_id)
-
-                log_lifecycle_event(
-                    {
-                        "event_type": "promoted_to_warm",
-                        "tenant_id": tenant_id,
-                        "workflow_id": workflow_id,
-                        "artifact_id": artifact_id,
-                        "age_days": artifact.get("age_days"),
-                        "dry_run": dry_run,
-                    }
-                )
+def _throughput_stats(count: int, bytes_in: int, duration: float, workers: int) -> dict[str, Any]:
+    """Summarize a lifecycle step's throughput."""
+    return {
+        "duration_seconds": duration,
+        "artifacts_per_second": count / duration if duration > 0 else 0.0,
+        "mb_per_second": (bytes_in / (1024 * 1024)) / duration if duration > 0 else 0.0,
+        "workers": workers,
+    }
 
-        except Exception as e:
-            error_msg = f"Failed to promote {artifact['artifact_id']}: {e}"
+
+def _promote_expired(
+    from_tier: str,
+    to_tier: str,
+    max_age_days: int,
+    event_type: str,
+    dry_run: bool,
+    fake_clock: Optional[float],
+    workers: Optional[int],
+) -> dict[str, Any]:
+    """Promote every expired artifact in from_tier to to_tier in parallel."""
+    workers = workers or get_lifecycle_workers()
+    expired = scan_tier_for_expired(from_tier, max_age_days, fake_clock=fake_clock)
+
+    def action(artifact: dict[str, Any]) -> dict[str, Any]:
+        return transfer_artifact(
+            artifact["tenant_id"],
+            artifact["workflow_id"],
+            artifact["artifact_id"],
+            from_tier=from_tier,
+            to_tier=to_tier,
+            dry_run=dry_run,
+        )
+
+    step_start = time.time()
+    outcomes = _execute_parallel(expired, action, workers)
+    duration = time.time() - step_start
+
+    promoted = 0
+    errors = []
+    promoted_artifacts = []
+    bytes_in = 0
+    bytes_out = 0
+
+    for artifact, result, error in outcomes:
+        if error is not None:
+            error_msg = f"Failed to promote {artifact['artifact_id']}: {error}"
             errors.append(error_msg)
 
             log_lifecycle_event(
                 {
                     "event_type": "promotion_error",
-                    "from_tier": TIER_HOT,
-                    "to_tier": TIER_WARM,
+                    "from_tier": from_tier,
+                    "to_tier": to_tier,
                     "artifact_id": artifact["artifact_id"],
-                    "error": str(e),
+                    "error": str(error),
                     "dry_run": dry_run,
                 }
             )
+            continue
+
+        promoted += 1
+        promoted_artifacts.append(artifact["artifact_id"])
+        bytes_in += result["bytes_in"]
+        bytes_out += result["bytes_out"]
+
+        log_lifecycle_event(
+            {
+                "event_type": event_type,
+                "tenant_id": artifact["tenant_id"],
+                "workflow_id": artifact["workflow_id"],
+                "artifact_id": artifact["artifact_id"],
+                "age_days": artifact.get("age_days"),
+                "bytes_in": result["bytes_in"],
+                "bytes_out": result["bytes_out"],
+                "dry_run": dry_run,
+            }
+        )
 
     return {
         "promoted": promoted,
@@ -201,125 +240,90 @@ def promote_expired_to_warm(dry_run: bool = False, fake_clock: Optional[float] =
         "artifacts": promoted_artifacts,
         "scanned": len(expired),
         "max_age_days": max_age_days,
+        "bytes_in": bytes_in,
+        "bytes_out": bytes_out,
+        "bytes_saved": bytes_in - bytes_out,
+        **_throughput_stats(promoted, bytes_in, duration, workers),
     }
 
 
-def promote_expired_to_cold(dry_run: bool = False, fake_clock: Optional[float] = None) -> dict[str, Any]:
+def promote_expired_to_warm(
+    dry_run: bool = False, fake_clock: Optional[float] = None, workers: Optional[int] = None
+) -> dict[str, Any]:
     """
-    Promote expired artifacts from warm to cold tier.
+    Promote expired artifacts from hot to warm tier.
 
     Args:
         dry_run: If True, don't actually move files
         fake_clock: Optional fake current time for testing
+        workers: Worker pool size (default: LIFECYCLE_WORKERS)
 
     Returns:
-        Dict with stats: promoted, errors, artifacts
+        Dict with stats: promoted, errors, artifacts, bytes_in/out/saved, throughput
     """
     retention = get_retention_days()
-    max_age_days = retention["warm_days"]
-
-    expired = scan_tier_for_expired(TIER_WARM, max_age_days, fake_clock=fake_clock)
-
-    promoted = 0
-    errors = []
-    promoted_artifacts = []
-
-    for artifact in expired:
-        try:
-            tenant_id = artifact["tenant_id"]
-            workflow_id = artifact["workflow_id"]
-            artifact_id = artifact["artifact_id"]
-
-            success = promote_artifact(
-                tenant_id, workflow_id, artifact_id, from_tier=TIER_WARM, to_tier=TIER_COLD, dry_run=dry_run
-            )
+    return _promote_expired(
+        TIER_HOT, TIER_WARM, retention["hot_days"], "promoted_to_warm", dry_run, fake_clock, workers
+    )
 
-            if success:
-                promoted += 1
-                promoted_artifacts.append(artifact_id)
-
-                log_lifecycle_event(
-                    {
-                        "event_type": "promoted_to_cold",
-                        "tenant_id": tenant_id,
-                        "workflow_id": workflow_id,
-                        "artifact_id": artifact_id,
-                        "age_days": artifact.get("age_days"),
-                        "dry_run": dry_run,
-                    }
-                )
 
-        except Exception as e:
-            error_msg = f"Failed to promote {artifact['artifact_id']}: {e}"
-            errors.append(error_msg)
+def promote_expired_to_cold(
+    dry_run: bool = False, fake_clock: Optional[float] = None, workers: Optional[int] = None
+) -> dict[str, Any]:
+    """
+    Promote expired artifacts from warm to cold tier, compressing on the way.
 
-            log_lifecycle_event(
-                {
-                    "event_type": "promotion_error",
-                    "from_tier": TIER_WARM,
-                    "to_tier": TIER_COLD,
-                    "artifact_id": artifact["artifact_id"],
-                    "error": str(e),
-                    "dry_run": dry_run,
-                }
-            )
+    Args:
+        dry_run: If True, don't actually move files
+        fake_clock: Optional fake current time for testing
+        workers: Worker pool size (default: LIFECYCLE_WORKERS)
 
-    return {
-        "promoted": promoted,
-        "errors": len(errors),
-        "error_details": errors,
-        "artifacts": promoted_artifacts,
-        "scanned": len(expired),
-        "max_age_days": max_age_days,
-    }
+    Returns:
+        Dict with stats: promoted, errors, artifacts, bytes_in/out/saved, throughput
+    """
+    retention = get_retention_days()
+    return _promote_expired(
+        TIER_WARM, TIER_COLD, retention["warm_days"], "promoted_to_cold", dry_run, fake_clock, workers
+    )
 
 
-def purge_expired_from_cold(dry_run: bool = False, fake_clock: Optional[float] = None) -> dict[str, Any]:
+def purge_expired_from_cold(
+    dry_run: bool = False, fake_clock: Optional[float] = None, workers: Optional[int] = None
+) -> dict[str, Any]:
     """
     Purge expired artifacts from cold tier.
 
     Args:
         dry_run: If True, don't actually delete files
         fake_clock: Optional fake current time for testing
+        workers: Worker pool size (default: LIFECYCLE_WORKERS)
 
     Returns:
-        Dict with stats: purged, errors, artifacts
+        Dict with stats: purged, errors, artifacts, bytes_freed, throughput
     """
+    workers = workers or get_lifecycle_workers()
     retention = get_retention_days()
     max_age_days = retention["cold_days"]
 
     expired = scan_tier_for_expired(TIER_COLD, max_age_days, fake_clock=fake_clock)
 
+    def action(artifact: dict[str, Any]) -> dict[str, Any]:
+        purge_artifact(TIER_COLD, artifact["tenant_id"], artifact["workflow_id"], artifact["artifact_id"], dry_run)
+        size = artifact.get("size_bytes", 0)
+        return {"bytes_in": size, "bytes_out": 0}
+
+    step_start = time.time()
+    outcomes = _execute_parallel(expired, action, workers)
+    duration = time.time() - step_start
+
     purged = 0
     errors = []
     purged_artifacts = []
+    bytes_freed = 0
 
-    for artifact in expired:
-        try:
-            tenant_id = artifact["tenant_id"]
-            workflow_id = artifact["workflow_id"]
-            artifact_id = artifact["artifact_id"]
-
-            success = purge_artifact(TIER_COLD, tenant_id, workflow_id, artifact_id, dry_run=dry_run)
-
-            if success:
-                purged += 1
-                purged_artifacts.append(artifact_id)
-
-                log_lifecycle_event(
-                    {
-                        "event_type": "purged_from_cold",
-                        "tenant_id": tenant_id,
-                        "workflow_id": workflow_id,
-                        "artifact_id": artifact_id,
-                        "age_days": artifact.get("age_days"),
-                        "size_bytes": artifact.get("size_bytes"),
-                        "dry_run": dry_run,
-                    }
-                )
-
-        except Exception as e:
-            error_msg = f"Failed to purge {artifact['artifact_id']}: {e}"
+    for artifact, result, error in outcomes:
+        if error is not None:
+            error_msg = f"Failed to purge {artifact['artifact_id']}: {error}"
             errors.append(error_msg)
 
             log_lifecycle_event(
@@ -327,10 +331,27 @@ def purge_expired_from_cold(dry_run: bool = False, fake_clock: Optional[float] =
                     "event_type": "purge_error",
                     "tier": TIER_COLD,
                     "artifact_id": artifact["artifact_id"],
-                    "error": str(e),
+                    "error": str(error),
                     "dry_run": dry_run,
                 }
             )
+            continue
+
+        purged += 1
+        purged_artifacts.append(artifact["artifact_id"])
+        bytes_freed += result["bytes_in"]
+
+        log_lifecycle_event(
+            {
+                "event_type": "purged_from_cold",
+                "tenant_id": artifact["tenant_id"],
+                "workflow_id": artifact["workflow_id"],
+                "artifact_id": artifact["artifact_id"],
+                "age_days": artifact.get("age_days"),
+                "size_bytes": artifact.get("size_bytes"),
+                "dry_run": dry_run,
+            }
+        )
 
     return {
         "purged": purged,
@@ -339,16 +360,21 @@ def purge_expired_from_cold(dry_run: bool = False, fake_clock: Optional[float] =
         "artifacts": purged_artifacts,
         "scanned": len(expired),
         "max_age_days": max_age_days,
+        "bytes_freed": bytes_freed,
+        **_throughput_stats(purged, bytes_freed, duration, workers),
     }
 
 
-def run_lifecycle_job(dry_run: bool = False, fake_clock: Optional[float] = None) -> dict[str, Any]:
+def run_lifecycle_job(
+    dry_run: bool = False, fake_clock: Optional[float] = None, workers: Optional[int] = None
+) -> dict[str, Any]:
     """
     Run complete lifecycle job: promote hot→warm, warm→cold, purge cold.
 
     Args:
         dry_run: If True, don't actually move or delete files
         fake_clock: Optional fake current time for testing
+        workers: Worker pool size per step (default: LIFECYCLE_WORKERS)
 
     Returns:
         Dict with complete job stats
@@ -372,7 +398,7 @@ def run_lifecycle_job(dry_run: bool = False, fake_clock: Optional[float] = None)
 
     # Step 1: Promote hot → warm
     try:
-        warm_results = promote_expired_to_warm(dry_run=dry_run, fake_clock=fake_clock)
+        warm_results = promote_expired_to_warm(dry_run=dry_run, fake_clock=fake_clock, workers=workers)
         results["promoted_to_warm"] = warm_results["promoted"]
         results["warm_errors"] = warm_results["errors"]
         results["warm_details"] = warm_results
@@ -391,7 +417,7 @@ def run_lifecycle_job(dry_run: bool = False, fake_clock: Optional[float] = None)
 
     # Step 2: Promote warm → cold
     try:
-        cold_results = promote_expired_to_cold(dry_run=dry_run, fake_clock=fake_clock)
+        cold_results = promote_expired_to_cold(dry_run=dry_run, fake_clock=fake_clock, workers=workers)
         results["promoted_to_cold"] = cold_results["promoted"]
         results["cold_errors"] = cold_results["errors"]
         results["cold_details"] = cold_results
@@ -410,7 +436,7 @@ def run_lifecycle_job(dry_run: bool = False, fake_clock: Optional[float] = None)
 
     # Step 3: Purge from cold
     try:
-        purge_results = purge_expired_from_cold(dry_run=dry_run, fake_clock=fake_clock)
+        purge_results = purge_expired_from_cold(dry_run=dry_run, fake_clock=fake_clock, workers=workers)
         results["purged"] = purge_results["purged"]
         results["purge_errors"] = purge_results["errors"]
         results["purge_details"] = purge_results
@@ -435,6 +461,14 @@ def run_lifecycle_job(dry_run: bool = False, fake_clock: Optional[float] = None)
     total_errors = results.get("warm_errors", 0) + results.get("cold_errors", 0) + results.get("purge_errors", 0)
     results["total_errors"] = total_errors
 
+    # Compression savings come from warm → cold; purge frees whatever cold held
+    results["bytes_saved"] = results.get("cold_details", {}).get("bytes_saved", 0)
+    results["bytes_freed"] = results.get("purge_details", {}).get("bytes_freed", 0)
+    results["bytes_moved"] = results.get("warm_details", {}).get("bytes_in", 0) + results.get("cold_details", {}).get(
+        "bytes_in", 0
+    )
+    results["mb_per_second"] = (results["bytes_moved"] / (1024 * 1024)) / job_duration if job_duration > 0 else 0.0
+
     # Log completion
     log_lifecycle_event(
         {
@@ -444,6 +478,8 @@ def run_lifecycle_job(dry_run: bool = False, fake_clock: Optional[float] = None)
             "promoted_to_cold": results.get("promoted_to_cold", 0),
             "purged": results.get("purged", 0),
             "total_errors": total_errors,
+            "bytes_saved": results["bytes_saved"],
+            "bytes_freed": results["bytes_freed"],
             "duration_seconds": job_duration,
         }
     )
@@ -509,6 +545,8 @@ def restore_artifact(
     """
     Restore an artifact from a lower tier back to a higher tier.
 
+    Cold tier content is decompressed on the way out.
+
     Args:
         tenant_id: Tenant identifier
         workflow_id: Workflow identifier
@@ -0,0 +1,334 @@
+"""
+Artifact Manifest Index for Sprint 26 tiered storage
+
+SQLite (WAL mode) index of every artifact in the hot/warm/cold tiers, kept in
+step with the filesystem by write_artifact, promote_artifact, and purge_artifact.
+Listing, expiry scans, and tier statistics become indexed queries instead of
+directory walks with a stat() and sidecar parse per artifact.
+
+Location: STORAGE_MANIFEST_PATH, or {STORAGE_BASE_PATH}/.manifest.db
+Disable with STORAGE_MANIFEST_ENABLED=false to fall back to directory walks.
+
+If the manifest file is missing when first used, it is built from disk
+automatically. Use `python -m src.storage.manifest rebuild` (or
+`scripts/lifecycle_run.py --rebuild-manifest`) after out-of-band changes.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    tier TEXT NOT NULL,
+    tenant_id TEXT NOT NULL,
+    workflow_id TEXT NOT NULL,
+    artifact_id TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    ctime REAL NOT NULL,
+    metadata_json TEXT,
+    PRIMARY KEY (tier, tenant_id, workflow_id, artifact_id)
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_tier_mtime ON artifacts (tier, mtime);
+"""
+
+_COLUMNS = "tier, tenant_id, workflow_id, artifact_id, size_bytes, mtime, ctime, metadata_json"
+
+
+def is_manifest_enabled() -> bool:
+    """Check if the manifest index is enabled (default: true)."""
+    return os.getenv("STORAGE_MANIFEST_ENABLED", "true").lower() in {"1", "true", "yes"}
+
+
+def get_manifest_path() -> Path:
+    """
+    Get manifest database path from environment or storage base.
+
+    Returns:
+        Path: Manifest SQLite file
+    """
+    explicit = os.getenv("STORAGE_MANIFEST_PATH")
+    if explicit:
+        return Path(explicit)
+
+    from .tiered_store import get_base_storage_path
+
+    return get_base_storage_path() / ".manifest.db"
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    """Open a connection with WAL journaling and a generous busy timeout."""
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Open a connection to the manifest, creating and backfilling it if missing.
+
+    Returns:
+        sqlite3.Connection: Caller is responsible for closing
+    """
+    db_path = get_manifest_path()
+    if db_path.exists():
+        return _connect(db_path)
+
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = _connect(db_path)
+    conn.executescript(SCHEMA)
+    _rebuild_into(conn)
+    return conn
+
+
+def _row_values(
+    tier: str,
+    tenant_id: str,
+    workflow_id: str,
+    artifact_id: str,
+    size_bytes: int,
+    mtime: float,
+    ctime: float,
+    metadata: Optional[dict[str, Any]],
+) -> tuple:
+    metadata_json = json.dumps(metadata) if metadata is not None else None
+    return (tier, tenant_id, workflow_id, artifact_id, size_bytes, mtime, ctime, metadata_json)
+
+
+def record_artifact(
+    tier: str,
+    tenant_id: str,
+    workflow_id: str,
+    artifact_id: str,
+    size_bytes: int,
+    mtime: float,
+    ctime: float,
+    metadata: Optional[dict[str, Any]] = None,
+) -> None:
+    """
+    Insert or replace an artifact row.
+
+    Args:
+        tier: Storage tier
+        tenant_id: Tenant identifier
+        workflow_id: Workflow identifier
+        artifact_id: Artifact identifier
+        size_bytes: Content size
+        mtime: Content file modification time (drives age)
+        ctime: Content file change time
+        metadata: Sidecar metadata dict
+    """
+    values = _row_values(tier, tenant_id, workflow_id, artifact_id, size_bytes, mtime, ctime, metadata)
+    with closing(get_connection()) as conn, conn:
+        conn.execute(f"INSERT OR REPLACE INTO artifacts ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", values)
+
+
+def move_artifact(
+    tenant_id: str,
+    workflow_id: str,
+    artifact_id: str,
+    from_tier: str,
+    to_tier: str,
+    size_bytes: int,
+    mtime: float,
+    ctime: float,
+    metadata: Optional[dict[str, Any]] = None,
+) -> None:
+    """
+    Move an artifact row between tiers in one transaction.
+
+    Args:
+        tenant_id: Tenant identifier
+        workflow_id: Workflow identifier
+        artifact_id: Artifact identifier
+        from_tier: Source tier
+        to_tier: Destination tier
+        size_bytes: Content size at destination
+        mtime: Content modification time at destination
+        ctime: Content change time at destination
+        metadata: Updated sidecar metadata
+    """
+    values = _row_values(to_tier, tenant_id, workflow_id, artifact_id, size_bytes, mtime, ctime, metadata)
+    with closing(get_connection()) as conn, conn:
+        conn.execute(
+            "DELETE FROM artifacts WHERE tier = ? AND tenant_id = ? AND workflow_id = ? AND artifact_id = ?",
+            (from_tier, tenant_id, workflow_id, artifact_id),
+        )
+        conn.execute(f"INSERT OR REPLACE INTO artifacts ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", values)
+
+
+def remove_artifact(tier: str, tenant_id: str, workflow_id: str, artifact_id: str) -> None:
+    """
+    Delete an artifact row.
+
+    Args:
+        tier: Storage tier
+        tenant_id: Tenant identifier
+        workflow_id: Workflow identifier
+        artifact_id: Artifact identifier
+    """
+    with closing(get_connection()) as conn, conn:
+        conn.execute(
+            "DELETE FROM artifacts WHERE tier = ? AND tenant_id = ? AND workflow_id = ? AND artifact_id = ?",
+            (tier, tenant_id, workflow_id, artifact_id),
+        )
+
+
+def _row_to_dict(row: tuple) -> dict[str, Any]:
+    tier, tenant_id, workflow_id, artifact_id, size_bytes, mtime, ctime, metadata_json = row
+    entry: dict[str, Any] = {
+        "tier": tier,
+        "tenant_id": tenant_id,
+        "workflow_id": workflow_id,
+        "artifact_id": artifact_id,
+        "size_bytes": size_bytes,
+        "mtime": mtime,
+        "ctime": ctime,
+    }
+    if metadata_json is not None:
+        try:
+            entry["metadata"] = json.loads(metadata_json)
+        except json.JSONDecodeError:
+            pass  # Skip corrupted metadata
+    return entry
+
+
+def query_artifacts(
+    tier: str,
+    tenant_id: Optional[str] = None,
+    older_than_mtime: Optional[float] = None,
+) -> list[dict[str, Any]]:
+    """
+    Query artifacts in a tier by tenant and/or age.
+
+    Args:
+        tier: Storage tier
+        tenant_id: Optional tenant filter (uses primary key prefix)
+        older_than_mtime: Only artifacts with mtime strictly before this (uses tier/mtime index)
+
+    Returns:
+        List of row dicts (tier, tenant_id, workflow_id, artifact_id, size_bytes, mtime, ctime, metadata)
+    """
+    sql = f"SELECT {_COLUMNS} FROM artifacts WHERE tier = ?"
+    params: list[Any] = [tier]
+
+    if tenant_id is not None:
+        sql += " AND tenant_id = ?"
+        params.append(tenant_id)
+    if older_than_mtime is not None:
+        sql += " AND mtime < ?"
+        params.append(older_than_mtime)
+
+    sql += " ORDER BY tenant_id, workflow_id, artifact_id"
+
+    with closing(get_connection()) as conn:
+        return [_row_to_dict(row) for row in conn.execute(sql, params)]
+
+
+def query_tier_stats(tier: str) -> dict[str, Any]:
+    """
+    Aggregate tier statistics in a single grouped query.
+
+    Args:
+        tier: Storage tier
+
+    Returns:
+        Dict with artifact_count, total_bytes, tenant_count, tenants, workflow_count
+    """
+    with closing(get_connection()) as conn:
+        rows = conn.execute(
+            "SELECT tenant_id, COUNT(*), COALESCE(SUM(size_bytes), 0), COUNT(DISTINCT workflow_id) "
+            "FROM artifacts WHERE tier = ? GROUP BY tenant_id",
+            (tier,),
+        ).fetchall()
+
+    return {
+        "artifact_count": sum(r[1] for r in rows),
+        "total_bytes": sum(r[2] for r in rows),
+        "tenant_count": len(rows),
+        "tenants": sorted(r[0] for r in rows),
+        "workflow_count": sum(r[3] for r in rows),
+    }
+
+
+def _rebuild_into(conn: sqlite3.Connection) -> dict[str, int]:
+    """Replace all rows with a fresh scan of the tier directories."""
+    from .tiered_store import VALID_TIERS, scan_tier_from_disk
+
+    counts = {}
+    with conn:
+        conn.execute("DELETE FROM artifacts")
+        for tier in VALID_TIERS:
+            rows = [
+                _row_values(
+                    tier,
+                    a["tenant_id"],
+                    a["workflow_id"],
+                    a["artifact_id"],
+                    a["size_bytes"],
+                    a["mtime"],
+                    a["ctime"],
+                    a.get("metadata"),
+                )
+                for a in scan_tier_from_disk(tier)
+            ]
+            conn.executemany(f"INSERT OR REPLACE INTO artifacts ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            counts[tier] = len(rows)
+    return counts
+
+
+def rebuild_manifest() -> dict[str, int]:
+    """
+    Rebuild the manifest from the tier directories on disk.
+
+    Returns:
+        Dict mapping tier to number of indexed artifacts
+    """
+    db_path = get_manifest_path()
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with closing(_connect(db_path)) as conn:
+        conn.executescript(SCHEMA)
+        return _rebuild_into(conn)
+
+
+def main():
+    """CLI for manifest operations."""
+    parser = argparse.ArgumentParser(description="Tiered storage manifest index")
+    subparsers = parser.add_subparsers(dest="command", help="Command")
+    subparsers.add_parser("rebuild", help="Rebuild manifest from disk")
+    subparsers.add_parser("stats", help="Show per-tier stats from manifest")
+
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        counts = rebuild_manifest()
+        print(f"Rebuilt manifest at {get_manifest_path()}")
+        for tier, count in counts.items():
+            print(f"  {tier:5s} {count} artifacts")
+        return 0
+
+    elif args.command == "stats":
+        from .tiered_store import VALID_TIERS
+
+        for tier in VALID_TIERS:
+            stats = query_tier_stats(tier)
+            print(
+                f"{tier:5s} {stats['artifact_count']:8d} artifacts "
+                f"{stats['total_bytes']:14d} bytes {stats['tenant_count']:5d} tenants"
+            )
+        return 0
+
+    parser.print_help()
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,6 +20,33 @@ def is_encryption_enabled() -> bool:
     return os.getenv("ENCRYPTION_ENABLED", "false").lower() in ("true", "1", "yes")
 
 
+def encrypt_bytes(data: bytes) -> bytes:
+    """
+    Encrypt raw bytes with the active key into a serialized envelope.
+
+    Args:
+        data: Plaintext bytes
+
+    Returns:
+        UTF-8 JSON envelope bytes (same format as .enc files)
+    """
+    envelope = encrypt(data, active_key())
+    return json.dumps(envelope).encode("utf-8")
+
+
+def decrypt_bytes(blob: bytes) -> bytes:
+    """
+    Decrypt a serialized envelope produced by encrypt_bytes().
+
+    Args:
+        blob: UTF-8 JSON envelope bytes
+
+    Returns:
+        Plaintext bytes
+    """
+    return decrypt(json.loads(blob.decode("utf-8")))
+
+
 def write_encrypted(path: Path, data: bytes, label: str | None = None, tenant: str | None = None) -> dict:
     """
     Write encrypted artifact with metadata sidecar.
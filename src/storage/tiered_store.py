@@ -12,8 +12,20 @@
 Each artifact has:
 - Content file: {artifact_id}
 - Metadata file: {artifact_id}.metadata.json
+
+Writes, promotions, and purges are mirrored into the SQLite manifest
+(see manifest.py) so listing, expiry scans, and stats avoid directory walks.
+
+Cold tier content is compressed (see compression.py); the codec is recorded in
+the metadata sidecar and read_artifact decompresses transparently. Promotions
+that don't change encoding are same-filesystem renames.
+
+With STORAGE_DEDUP_ENABLED, payloads go to the content-addressed blob store
+(see blob_store.py) and tier files hold only a `sha256:<digest>` reference;
+blobs are shared across tiers and dropped when their last reference is purged.
 """
 
+import errno
 import json
 import os
 import shutil
@@ -22,6 +34,10 @@
 from pathlib import Path
 from typing import Any, Optional
 
+from . import manifest
+from .blob_store import get_blob_store, is_dedup_enabled
+from .compression import compress, decompress, get_cold_codec
+
 
 class StorageError(Exception):
     """Base exception for storage operations."""
@@ -185,6 +201,16 @@ def get_metadata_path(artifact_path: Path) -> Path:
     return artifact_path.parent / f"{artifact_path.name}.metadata.json"
 
 
+def _read_metadata(metadata_path: Path) -> dict[str, Any]:
+    """Read a metadata sidecar, returning {} if missing or corrupted."""
+    if not metadata_path.exists():
+        return {}
+    try:
+        return json.loads(metadata_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
 def write_artifact(
     tier: str,
     tenant_id: str,
@@ -217,10 +243,34 @@ def write_artifact(
     artifact_path.parent.mkdir(parents=True, exist_ok=True)
 
     try:
+        # Remember any blob the artifact currently references so overwrites release it
+        previous_digest = _read_metadata(metadata_path).get("_blob_digest")
+
+        stored = content
+        codec = None
+        digest = None
+        if is_dedup_enabled():
+            # Tier file becomes a reference; the payload is stored once per tenant
+            digest = get_blob_store().put(tenant_id, content)
+            stored = f"sha256:{digest}".encode()
+        elif tier == TIER_COLD:
+            # Cold tier stores compressed content when it actually shrinks
+            codec = get_cold_codec()
+            packed = compress(content, codec)
+            if packed is None:
+                codec = None
+            else:
+                stored = packed
+
         # Write content atomically using temp file + rename
         temp_content = artifact_path.parent / f".{artifact_path.name}.tmp"
-        temp_content.write_bytes(content)
-        temp_content.replace(artifact_path)
+        try:
+            temp_content.write_bytes(stored)
+            temp_content.replace(artifact_path)
+        except OSError:
+            if digest:
+                get_blob_store().release(tenant_id, digest)  # Nothing will hold the new reference
+            raise
 
         # Write metadata
         if metadata is None:
@@ -233,11 +283,25 @@ def write_artifact(
         metadata["_workflow_id"] = workflow_id
         metadata["_artifact_id"] = artifact_id
         metadata["_size_bytes"] = len(content)
+        if codec:
+            metadata["_compression"] = codec
+            metadata["_stored_bytes"] = len(stored)
+        if digest:
+            metadata["_blob_digest"] = digest
 
         temp_metadata = metadata_path.parent / f".{metadata_path.name}.tmp"
         temp_metadata.write_text(json.dumps(metadata, indent=2))
         temp_metadata.replace(metadata_path)
 
+        if previous_digest:
+            get_blob_store().release(tenant_id, previous_digest)
+
+        if manifest.is_manifest_enabled():
+            stat = artifact_path.stat()
+            manifest.record_artifact(
+                tier, tenant_id, workflow_id, artifact_id, stat.st_size, stat.st_mtime, stat.st_ctime, metadata
+            )
+
         return artifact_path
 
     except Exception as e:
@@ -275,6 +339,11 @@ def read_artifact(tier: str, tenant_id: str, workflow_id: str, artifact_id: str)
         else:
             metadata = {}
 
+        if metadata.get("_blob_digest"):
+            content = get_blob_store().get(tenant_id, metadata["_blob_digest"])
+        else:
+            content = decompress(content, metadata.get("_compression"))
+
         return content, metadata
 
     except ArtifactNotFoundError:
@@ -303,11 +372,33 @@ def artifact_exists(tier: str, tenant_id: str, workflow_id: str, artifact_id: st
         return False
 
 
-def promote_artifact(
+def _move_file(source: Path, dest: Path) -> None:
+    """Rename within a filesystem, falling back to copy + unlink across devices."""
+    try:
+        os.replace(source, dest)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.copy2(source, dest)
+        source.unlink()
+
+
+def _write_atomic(path: Path, data: bytes) -> Path:
+    """Write bytes to a temp file next to path and return the temp path (caller replaces)."""
+    temp_path = path.parent / f".{path.name}.tmp"
+    temp_path.write_bytes(data)
+    return temp_path
+
+
+def transfer_artifact(
     tenant_id: str, workflow_id: str, artifact_id: str, from_tier: str, to_tier: str, dry_run: bool = False
-) -> bool:
+) -> dict[str, Any]:
     """
-    Promote (or demote) an artifact from one tier to another.
+    Move an artifact between tiers, (de)compressing at the cold tier boundary.
+
+    Content is renamed when encoding is unchanged; it is only rewritten when
+    entering the cold tier uncompressed or leaving it compressed. Modification
+    time is preserved either way so lifecycle ages carry over.
 
     Args:
         tenant_id: Tenant identifier
@@ -318,11 +409,12 @@ def promote_artifact(
         dry_run: If True, don't actually move files
 
     Returns:
-        bool: True if promotion succeeded
+        Dict with bytes_in (stored size at source), bytes_out (stored size at
+        destination), and renamed (True if no rewrite was needed)
 
     Raises:
         ArtifactNotFoundError: If source artifact doesn't exist
-        StorageError: If promotion fails
+        StorageError: If the transfer fails
     """
     validate_tier(from_tier)
     validate_tier(to_tier)
@@ -340,25 +432,61 @@ def promote_artifact(
     dest_metadata_path = get_metadata_path(dest_path)
 
     if dry_run:
-        return True
+        size = source_path.stat().st_size
+        return {"bytes_in": size, "bytes_out": size, "renamed": True}
 
     try:
         # Ensure destination directory exists
         dest_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Copy content
-        shutil.copy2(source_path, dest_path)
+        bytes_in = source_path.stat().st_size
 
-        # Copy and update metadata
+        metadata = None
         if source_metadata_path.exists():
             metadata = json.loads(source_metadata_path.read_text())
+        source_codec = (metadata or {}).get("_compression")
+        # Blob references are always renamed: the shared blob itself never moves
+        blob_backed = bool((metadata or {}).get("_blob_digest"))
+
+        # Decide whether content needs rewriting at the cold tier boundary
+        rewritten = None
+        new_codec = source_codec
+        if source_codec and to_tier != TIER_COLD:
+            rewritten = decompress(source_path.read_bytes(), source_codec)
+            new_codec = None
+        elif not source_codec and not blob_backed and to_tier == TIER_COLD:
+            codec = get_cold_codec()
+            rewritten = compress(source_path.read_bytes(), codec)
+            if rewritten is not None:
+                new_codec = codec
+
+        if rewritten is not None:
+            temp_content = _write_atomic(dest_path, rewritten)
+            shutil.copystat(source_path, temp_content)  # keep mtime so age carries over
+            temp_content.replace(dest_path)
+        else:
+            _move_file(source_path, dest_path)
+
+        # Write updated metadata (always when encoding changed, so reads can decode)
+        if metadata is not None or new_codec != source_codec:
+            metadata = metadata or {}
             metadata["_tier"] = to_tier
             metadata["_promoted_from"] = from_tier
             metadata["_promoted_at"] = datetime.utcnow().isoformat()
-            dest_metadata_path.write_text(json.dumps(metadata, indent=2))
+            if new_codec:
+                metadata["_compression"] = new_codec
+                metadata["_stored_bytes"] = len(rewritten) if rewritten is not None else bytes_in
+            else:
+                metadata.pop("_compression", None)
+                metadata.pop("_stored_bytes", None)
+
+            temp_metadata = dest_metadata_path.parent / f".{dest_metadata_path.name}.tmp"
+            temp_metadata.write_text(json.dumps(metadata, indent=2))
+            temp_metadata.replace(dest_metadata_path)
 
         # Remove source files
-        source_path.unlink()
+        if source_path.exists():
+            source_path.unlink()
         if source_metadata_path.exists():
             source_metadata_path.unlink()
 
@@ -368,25 +496,68 @@ def promote_artifact(
         except OSError:
             pass  # Directory not empty
 
-        return True
+        stat = dest_path.stat()
+
+        if manifest.is_manifest_enabled():
+            manifest.move_artifact(
+                tenant_id,
+                workflow_id,
+                artifact_id,
+                from_tier,
+                to_tier,
+                stat.st_size,
+                stat.st_mtime,
+                stat.st_ctime,
+                metadata,
+            )
+
+        return {"bytes_in": bytes_in, "bytes_out": stat.st_size, "renamed": rewritten is None}
 
     except Exception as e:
         raise StorageError(f"Failed to promote artifact {artifact_id}: {e}") from e
 
 
-def list_artifacts(tier: str, tenant_id: Optional[str] = None) -> list[dict[str, Any]]:
+def promote_artifact(
+    tenant_id: str, workflow_id: str, artifact_id: str, from_tier: str, to_tier: str, dry_run: bool = False
+) -> bool:
     """
-    List all artifacts in a tier, optionally filtered by tenant.
+    Promote (or demote) an artifact from one tier to another.
+
+    Args:
+        tenant_id: Tenant identifier
+        workflow_id: Workflow identifier
+        artifact_id: Artifact identifier
+        from_tier: Source tier
+        to_tier: Destination tier
+        dry_run: If True, don't actually move files
+
+    Returns:
+        bool: True if promotion succeeded
+
+    Raises:
+        ArtifactNotFoundError: If source artifact doesn't exist
+        StorageError: If promotion fails
+    """
+    transfer_artifact(tenant_id, workflow_id, artifact_id, from_tier, to_tier, dry_run=dry_run)
+    return True
+
+
+def scan_tier_from_disk(tier: str, tenant_id: Optional[str] = None) -> list[dict[str, Any]]:
+    """
+    Walk a tier directory and stat every artifact.
+
+    Used when the manifest is disabled and to (re)build the manifest.
 
     Args:
         tier: Storage tier (hot/warm/cold)
         tenant_id: Optional tenant filter
 
     Returns:
-        List of artifact info dictionaries
+        List of dicts with tier, tenant_id, workflow_id, artifact_id, path,
+        size_bytes, mtime, ctime, and metadata (if readable)
 
     Raises:
-        StorageError: If listing fails
+        StorageError: If the walk fails
     """
     validate_tier(tier)
 
@@ -421,9 +592,11 @@ def list_artifacts(tier: str, tenant_id: Optional[str] = None) -> list[dict[str,
 
                 # Iterate through artifacts
                 for artifact_path in workflow_dir.iterdir():
-                    # Skip metadata files
+                    # Skip metadata files and in-flight temp files
                     if artifact_path.suffix == ".json" and ".metadata" in artifact_path.name:
                         continue
+                    if artifact_path.name.startswith(".") and artifact_path.name.endswith(".tmp"):
+                        continue
 
                     if not artifact_path.is_file():
                         continue
@@ -440,8 +613,8 @@ def list_artifacts(tier: str, tenant_id: Optional[str] = None) -> list[dict[str,
                         "artifact_id": artifact_id,
                         "path": str(artifact_path),
                         "size_bytes": stat.st_size,
-                        "modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                        "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
+                        "mtime": stat.st_mtime,
+                        "ctime": stat.st_ctime,
                     }
 
                     # Add metadata if available
@@ -456,9 +629,115 @@ def list_artifacts(tier: str, tenant_id: Optional[str] = None) -> list[dict[str,
 
         return artifacts
 
+    except StorageError:
+        raise
+    except Exception as e:
+        raise StorageError(f"Failed to scan tier {tier}: {e}") from e
+
+
+def _query_tier(
+    tier: str, tenant_id: Optional[str] = None, older_than_mtime: Optional[float] = None
+) -> list[dict[str, Any]]:
+    """Query the manifest (or walk the disk when disabled) for raw artifact rows."""
+    if tenant_id:
+        validate_tenant_id(tenant_id)
+
+    if not manifest.is_manifest_enabled():
+        rows = scan_tier_from_disk(tier, tenant_id=tenant_id)
+        if older_than_mtime is not None:
+            rows = [r for r in rows if r["mtime"] < older_than_mtime]
+        return rows
+
+    rows = manifest.query_artifacts(tier, tenant_id=tenant_id, older_than_mtime=older_than_mtime)
+    base = get_base_storage_path()
+    for row in rows:
+        row["path"] = str(base / tier / row["tenant_id"] / row["workflow_id"] / row["artifact_id"])
+    return rows
+
+
+def list_artifacts(tier: str, tenant_id: Optional[str] = None) -> list[dict[str, Any]]:
+    """
+    List all artifacts in a tier, optionally filtered by tenant.
+
+    Args:
+        tier: Storage tier (hot/warm/cold)
+        tenant_id: Optional tenant filter
+
+    Returns:
+        List of artifact info dictionaries
+
+    Raises:
+        StorageError: If listing fails
+    """
+    validate_tier(tier)
+
+    try:
+        rows = _query_tier(tier, tenant_id=tenant_id)
+    except StorageError:
+        raise
     except Exception as e:
         raise StorageError(f"Failed to list artifacts in tier {tier}: {e}") from e
 
+    artifacts = []
+    for row in rows:
+        artifact_info = {
+            "tier": row["tier"],
+            "tenant_id": row["tenant_id"],
+            "workflow_id": row["workflow_id"],
+            "artifact_id": row["artifact_id"],
+            "path": row["path"],
+            "size_bytes": row["size_bytes"],
+            "modified_at": datetime.fromtimestamp(row["mtime"]).isoformat(),
+            "created_at": datetime.fromtimestamp(row["ctime"]).isoformat(),
+        }
+        if "metadata" in row:
+            artifact_info["metadata"] = row["metadata"]
+        artifacts.append(artifact_info)
+
+    return artifacts
+
+
+def list_expired_artifacts(tier: str, max_age_days: int, fake_clock: Optional[float] = None) -> list[dict[str, Any]]:
+    """
+    List artifacts in a tier older than max_age_days.
+
+    With the manifest enabled this is a single range query on (tier, mtime).
+
+    Args:
+        tier: Storage tier (hot/warm/cold)
+        max_age_days: Age threshold in days
+        fake_clock: Optional fake current time for testing (Unix timestamp)
+
+    Returns:
+        List of dicts with tenant_id, workflow_id, artifact_id, age_days, size_bytes, path
+
+    Raises:
+        StorageError: If the query fails
+    """
+    validate_tier(tier)
+
+    current_time = fake_clock if fake_clock is not None else time.time()
+    cutoff = current_time - max_age_days * 86400.0
+
+    try:
+        rows = _query_tier(tier, older_than_mtime=cutoff)
+    except StorageError:
+        raise
+    except Exception as e:
+        raise StorageError(f"Failed to query expired artifacts in tier {tier}: {e}") from e
+
+    return [
+        {
+            "tenant_id": row["tenant_id"],
+            "workflow_id": row["workflow_id"],
+            "artifact_id": row["artifact_id"],
+            "age_days": (current_time - row["mtime"]) / 86400.0,
+            "size_bytes": row["size_bytes"],
+            "path": row["path"],
+        }
+        for row in rows
+    ]
+
 
 def get_artifact_age_days(
     tier: str, tenant_id: str, workflow_id: str, artifact_id: str, fake_clock: Optional[float] = None
@@ -522,6 +801,8 @@ def purge_artifact(tier: str, tenant_id: str, workflow_id: str, artifact_id: str
         return True
 
     try:
+        digest = _read_metadata(metadata_path).get("_blob_digest")
+
         # Delete content file
         artifact_path.unlink()
 
@@ -529,6 +810,13 @@ def purge_artifact(tier: str, tenant_id: str, workflow_id: str, artifact_id: str
         if metadata_path.exists():
             metadata_path.unlink()
 
+        if manifest.is_manifest_enabled():
+            manifest.remove_artifact(tier, tenant_id, workflow_id, artifact_id)
+
+        # Blob is deleted only when this was its last reference
+        if digest:
+            get_blob_store().release(tenant_id, digest)
+
         # Try to clean up empty directories
         try:
             artifact_path.parent.rmdir()  # workflow dir
@@ -550,14 +838,18 @@ def get_tier_stats(tier: str) -> dict[str, Any]:
         tier: Storage tier (hot/warm/cold)
 
     Returns:
-        Dict with stats: count, total_bytes, tenants
+        Dict with stats: count, total_bytes, tenants, workflow_count
     """
     validate_tier(tier)
 
-    artifacts = list_artifacts(tier)
+    if manifest.is_manifest_enabled():
+        return {"tier": tier, **manifest.query_tier_stats(tier)}
+
+    artifacts = scan_tier_from_disk(tier)
 
     total_bytes = sum(a["size_bytes"] for a in artifacts)
     tenants = {a["tenant_id"] for a in artifacts}
+    workflows = {(a["tenant_id"], a["workflow_id"]) for a in artifacts}
 
     return {
         "tier": tier,
@@ -565,6 +857,7 @@ def get_tier_stats(tier: str) -> dict[str, Any]:
         "total_bytes": total_bytes,
         "tenant_count": len(tenants),
         "tenants": sorted(tenants),
+        "workflow_count": len(workflows),
     }
 
 
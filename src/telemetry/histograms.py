@@ -0,0 +1,250 @@
+"""Constant-memory latency histograms shared by metrics collectors.
+
+LogLinearHistogram is an HDR-style log-linear histogram: recording is an
+O(1) bucket increment on a per-thread shard and reads are O(buckets).
+WindowedHistogram adds a ring of per-interval histograms for recent-window
+percentiles without keeping raw samples or running a background thread.
+"""
+
+import itertools
+import threading
+import time
+from threading import Lock
+from typing import Any, Callable
+
+# Log-linear histogram layout: values are stored in microseconds with
+# 2**HIST_SUB_BUCKET_BITS linear sub-buckets per power of two (~3% max error)
+HIST_UNIT_MS = 0.001
+HIST_SUB_BUCKET_BITS = 5
+HIST_MAX_VALUE_MS = 3_600_000.0  # 1 hour; larger values land in the top bucket
+HIST_SHARDS = 4
+
+DEFAULT_QUANTILES = (0.50, 0.95, 0.99)
+
+
+class _HistogramShard:
+    """Bucket counts written by a subset of threads."""
+
+    __slots__ = ("lock", "counts", "count", "total", "min", "max")
+
+    def __init__(self, num_buckets: int):
+        self.lock = Lock()
+        self.counts = [0] * num_buckets
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+
+class LogLinearHistogram:
+    """Constant-memory, mergeable log-linear (HDR-style) latency histogram.
+
+    Values below 2 * 2**sub_bucket_bits units get one bucket each; above that
+    every power of two is split into 2**sub_bucket_bits linear sub-buckets, so
+    percentile error is bounded relative to the value no matter how many
+    samples are recorded. Each thread records into one of `shards` count
+    arrays, so concurrent recorders rarely contend; reads merge the shards.
+    """
+
+    def __init__(
+        self,
+        sub_bucket_bits: int = HIST_SUB_BUCKET_BITS,
+        max_value_ms: float = HIST_MAX_VALUE_MS,
+        unit_ms: float = HIST_UNIT_MS,
+        shards: int = HIST_SHARDS,
+    ):
+        """Initialize histogram
+
+        Args:
+            sub_bucket_bits: Precision; relative error is at most 2**-sub_bucket_bits
+            max_value_ms: Largest distinguishable value (larger values are clamped)
+            unit_ms: Resolution of the smallest buckets
+            shards: Count arrays to spread concurrent recorders over
+        """
+        self.sub_bucket_bits = sub_bucket_bits
+        self.unit_ms = unit_ms
+        self.max_value_ms = max_value_ms
+        self._half = 1 << sub_bucket_bits
+        self._max_units = max(int(max_value_ms / unit_ms), 2 * self._half)
+        self.num_buckets = self._index(self._max_units) + 1
+        self._shards = [_HistogramShard(self.num_buckets) for _ in range(max(1, shards))]
+        self._next_shard = itertools.count()
+        self._local = threading.local()
+
+    @property
+    def layout(self) -> tuple[int, float, float]:
+        return (self.sub_bucket_bits, self.max_value_ms, self.unit_ms)
+
+    def _index(self, units: int) -> int:
+        if units < 2 * self._half:
+            return units
+        shift = units.bit_length() - (self.sub_bucket_bits + 1)
+        return (shift + 1) * self._half + (units >> shift) - self._half
+
+    def _bucket_bounds(self, index: int) -> tuple[int, int]:
+        if index < 2 * self._half:
+            return index, index + 1
+        shift = index // self._half - 1
+        sub_bucket = index - shift * self._half
+        return sub_bucket << shift, (sub_bucket + 1) << shift
+
+    def _shard(self) -> _HistogramShard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._shards[next(self._next_shard) % len(self._shards)]
+            self._local.shard = shard
+        return shard
+
+    def record(self, value_ms: float, count: int = 1) -> None:
+        """Record value_ms (count times)"""
+        value_ms = max(value_ms, 0.0)
+        index = self._index(min(int(value_ms / self.unit_ms), self._max_units))
+        shard = self._shard()
+        with shard.lock:
+            shard.counts[index] += count
+            shard.count += count
+            shard.total += value_ms * count
+            if value_ms < shard.min:
+                shard.min = value_ms
+            if value_ms > shard.max:
+                shard.max = value_ms
+
+    def merge(self, other: "LogLinearHistogram") -> "LogLinearHistogram":
+        """Add another histogram's counts into this one (layouts must match)
+
+        Returns:
+            self, for chaining
+        """
+        if other.layout != self.layout:
+            raise ValueError(f"Cannot merge histograms with layouts {self.layout} and {other.layout}")
+        counts, count, total, low, high = other._snapshot()
+        if not count:
+            return self
+        shard = self._shard()
+        with shard.lock:
+            shard.counts = [a + b for a, b in zip(shard.counts, counts)]
+            shard.count += count
+            shard.total += total
+            shard.min = min(shard.min, low)
+            shard.max = max(shard.max, high)
+        return self
+
+    def _snapshot(self) -> tuple[list[int], int, float, float, float]:
+        """Merged (counts, count, sum, min, max) across shards"""
+        counts = [0] * self.num_buckets
+        count, total, low, high = 0, 0.0, float("inf"), 0.0
+        for shard in self._shards:
+            with shard.lock:
+                if not shard.count:
+                    continue
+                shard_counts = list(shard.counts)
+                count += shard.count
+                total += shard.total
+                low = min(low, shard.min)
+                high = max(high, shard.max)
+            counts = [a + b for a, b in zip(counts, shard_counts)]
+        return counts, count, total, low, high
+
+    @property
+    def count(self) -> int:
+        return sum(shard.count for shard in self._shards)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(shard.total for shard in self._shards)
+
+    def percentiles(self, quantiles: tuple[float, ...] = DEFAULT_QUANTILES) -> dict[float, float]:
+        """Get values at the given quantiles in one O(buckets) pass
+
+        Args:
+            quantiles: Quantiles in [0, 1]
+
+        Returns:
+            {quantile: value_ms}; all zeros if nothing was recorded
+        """
+        counts, count, _, low, high = self._snapshot()
+        if not count:
+            return dict.fromkeys(quantiles, 0.0)
+
+        # Rank of the sample at quantile q, matching sorted(samples)[int(n * q)]
+        targets = sorted((min(int(count * q), count - 1), q) for q in quantiles)
+        result: dict[float, float] = {}
+        seen = 0
+        pending = iter(targets)
+        rank, q = next(pending)
+        for index, bucket_count in enumerate(counts):
+            if not bucket_count:
+                continue
+            seen += bucket_count
+            while seen > rank:
+                lower, upper = self._bucket_bounds(index)
+                value = (lower + upper) / 2 * self.unit_ms
+                result[q] = min(max(value, low), high)
+                try:
+                    rank, q = next(pending)
+                except StopIteration:
+                    return result
+        return result
+
+    def reset(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.counts = [0] * self.num_buckets
+                shard.count = 0
+                shard.total = 0.0
+                shard.min = float("inf")
+                shard.max = 0.0
+
+
+class WindowedHistogram:
+    """Cumulative histogram plus a ring of per-interval histograms.
+
+    The ring slot for the current interval is reset lazily the first time it
+    is written in a new interval, so recent-window percentiles cover the last
+    `intervals` intervals without a background thread.
+    """
+
+    def __init__(
+        self,
+        interval_sec: float = 60.0,
+        intervals: int = 5,
+        clock: Callable[[], float] = time.time,
+        **histogram_kwargs: Any,
+    ):
+        self.interval_sec = interval_sec
+        self.clock = clock
+        self._histogram_kwargs = histogram_kwargs
+        self.total = LogLinearHistogram(**histogram_kwargs)
+        self._slots = [LogLinearHistogram(**histogram_kwargs) for _ in range(intervals)]
+        self._epochs = [-1] * intervals
+        self._rotate_lock = Lock()
+
+    def _current_slot(self) -> LogLinearHistogram:
+        epoch = int(self.clock() // self.interval_sec)
+        slot = epoch % len(self._slots)
+        if self._epochs[slot] != epoch:
+            with self._rotate_lock:
+                if self._epochs[slot] != epoch:
+                    self._slots[slot].reset()
+                    self._epochs[slot] = epoch
+        return self._slots[slot]
+
+    def record(self, value_ms: float, count: int = 1) -> None:
+        self.total.record(value_ms, count)
+        self._current_slot().record(value_ms, count)
+
+    def window(self) -> LogLinearHistogram:
+        """Merged histogram of the intervals still inside the window"""
+        epoch = int(self.clock() // self.interval_sec)
+        merged = LogLinearHistogram(shards=1, **self._histogram_kwargs)
+        for slot, slot_epoch in zip(self._slots, self._epochs):
+            if 0 <= epoch - slot_epoch < len(self._slots):
+                merged.merge(slot)
+        return merged
+
+    def reset(self) -> None:
+        with self._rotate_lock:
+            self.total.reset()
+            for slot in self._slots:
+                slot.reset()
+            self._epochs = [-1] * len(self._slots)
@@ -4,6 +4,8 @@
 - relay_jobs_total: counter by status (success/failed)
 - relay_jobs_per_provider_total: counter by provider + status (bounded cardinality)
 - relay_job_latency_seconds: histogram of job duration by provider (bounded)
+- relay_plan_duration_seconds: histogram of plan wall time
+- relay_plan_critical_path_seconds: histogram of the longest dependent step chain per plan
 """
 
 import re
@@ -31,6 +33,21 @@
     buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 100.0),
 )
 
+# Plan-level histograms: wall time vs. the critical path (the wall time a plan
+# would take with unlimited concurrency). A wide gap means steps queued on
+# provider concurrency limits.
+relay_plan_duration_seconds = Histogram(
+    "relay_plan_duration_seconds",
+    "Plan execution wall time in seconds",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 100.0),
+)
+
+relay_plan_critical_path_seconds = Histogram(
+    "relay_plan_critical_path_seconds",
+    "Duration of the longest chain of dependent steps per plan, in seconds",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 100.0),
+)
+
 
 def inc_job(status: str) -> None:
     """Increment total job counter.
@@ -83,3 +100,14 @@ def observe_job_latency(provider: str, seconds: float) -> None:
         seconds: Execution time in seconds (non-negative)
     """
     relay_job_latency_seconds.labels(provider=provider).observe(seconds)
+
+
+def observe_plan_duration(wall_seconds: float, critical_path_seconds: float) -> None:
+    """Record plan wall time and critical-path duration.
+
+    Args:
+        wall_seconds: Time from first step start to last step finish
+        critical_path_seconds: Sum of step durations along the longest dependency chain
+    """
+    relay_plan_duration_seconds.observe(wall_seconds)
+    relay_plan_critical_path_seconds.observe(critical_path_seconds)
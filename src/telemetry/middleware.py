@@ -1,4 +1,4 @@
-"""FastAPI middleware for automatic HTTP request telemetry.
+"""ASGI middleware for automatic HTTP request telemetry.
 
 Sprint 46: Automatic instrumentation for HTTP endpoints.
 Sprint 50: Added X-Request-ID and X-Trace-Link headers for observability.
@@ -12,77 +12,117 @@
 
 import logging
 import os
+import re
 import time
-from typing import Callable
 from uuid import uuid4
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Mount
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 _LOG = logging.getLogger(__name__)
 
+_UUID_SEGMENT = re.compile(r"/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I)
+_NUMERIC_SEGMENT = re.compile(r"/\d+")
+_TENANT_SEGMENT = re.compile(r"/tenant-[a-zA-Z0-9_-]+")
 
-class TelemetryMiddleware(BaseHTTPMiddleware):
-    """FastAPI middleware for automatic HTTP telemetry.
+
+class TelemetryMiddleware:
+    """ASGI middleware for automatic HTTP telemetry.
 
     Tracks request latency and counts for all HTTP endpoints.
     Safe to install even when telemetry is disabled (minimal overhead).
+
+    Implemented as a pure ASGI middleware rather than BaseHTTPMiddleware so
+    that responses are passed through message by message: no extra task per
+    request, and streaming (SSE) responses keep their backpressure.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._record = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request and record metrics.
 
         Sprint 50: Also generates request_id and adds X-Request-ID/X-Trace-Link headers.
 
-        Args:
-            request: FastAPI request object
-            call_next: Next middleware/handler in chain
-
-        Returns:
-            Response from downstream handler with observability headers
+        Latency is measured to the start of the response (status and headers),
+        as it was with call_next, so long-lived streams do not skew it.
         """
-        # Import here to avoid circular dependencies and support lazy loading
-        from relay_ai.telemetry.prom import record_http_request
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self._record is None:
+            # Import here to avoid circular dependencies and support lazy loading
+            from relay_ai.telemetry.prom import record_http_request
+
+            self._record = record_http_request
 
-        # Sprint 50: Generate request ID for tracing
+        # Sprint 50: Generate request ID for tracing (exposed as request.state.request_id)
         request_id = str(uuid4())
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
+        root_path = scope.get("root_path", "")
 
         start_time = time.perf_counter()
-        response = None
         status_code = 500  # Default to 500 if exception occurs
+        duration_seconds = None
 
-        try:
-            response = await call_next(request)
-            status_code = response.status_code
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, duration_seconds
+            if message["type"] == "http.response.start":
+                duration_seconds = time.perf_counter() - start_time
+                status_code = message["status"]
 
-            # Sprint 50: Add observability headers
-            response.headers["X-Request-ID"] = request_id
+                # Sprint 50: Add observability headers
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
 
-            # Add X-Trace-Link if Grafana/Tempo URL is configured
-            trace_link = self._build_trace_link(request_id)
-            if trace_link:
-                response.headers["X-Trace-Link"] = trace_link
+                # Add X-Trace-Link if Grafana/Tempo URL is configured
+                trace_link = self._build_trace_link(request_id)
+                if trace_link:
+                    headers["X-Trace-Link"] = trace_link
+            await send(message)
 
-            return response
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
             _LOG.error("Exception in request handler: %s", exc, exc_info=True)
             raise
         finally:
-            duration_seconds = time.perf_counter() - start_time
-
-            # Simplify endpoint path to avoid cardinality explosion
-            # /api/workflows/abc123 -> /api/workflows/{id}
-            endpoint = self._normalize_endpoint(request.url.path)
+            if duration_seconds is None:
+                duration_seconds = time.perf_counter() - start_time
 
             # Record metrics (no-op if telemetry disabled)
-            record_http_request(
-                method=request.method,
-                endpoint=endpoint,
+            self._record(
+                method=scope["method"],
+                endpoint=self._endpoint_label(scope, root_path),
                 status_code=status_code,
                 duration_seconds=duration_seconds,
             )
 
+    @classmethod
+    def _endpoint_label(cls, scope: Scope, root_path: str = "") -> str:
+        """Metric label for the request: the matched route template when routed.
+
+        The router records the matched route in the scope, so
+        /api/workflows/abc123 is labelled /api/workflows/{workflow_id}.
+        Unmatched paths (404s) fall back to _normalize_endpoint.
+        """
+        route = scope.get("route")
+        template = getattr(route, "path", None)
+        if template is None:
+            return cls._normalize_endpoint(scope["path"])
+        if isinstance(route, Mount):
+            # Mounted app without its own router (e.g. StaticFiles)
+            return template + "/{path}"
+        # Routes inside a mounted sub-application are relative to the mount
+        mount_prefix = scope.get("root_path", "")[len(root_path) :]
+        if mount_prefix:
+            return cls._normalize_endpoint(mount_prefix) + template
+        return template
+
     @staticmethod
     def _build_trace_link(request_id: str) -> str | None:
         """Build Grafana/Tempo trace link if configured.
@@ -119,15 +159,13 @@ def _normalize_endpoint(path: str) -> str:
         Returns:
             Normalized path with ID placeholders
         """
-        import re
-
         # Replace UUID-like segments with {id}
-        path = re.sub(r"/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", "/{id}", path, flags=re.I)
+        path = _UUID_SEGMENT.sub("/{id}", path)
 
         # Replace numeric IDs with {id}
-        path = re.sub(r"/\d+", "/{id}", path)
+        path = _NUMERIC_SEGMENT.sub("/{id}", path)
 
         # Replace tenant IDs (pattern: tenant-*)
-        path = re.sub(r"/tenant-[a-zA-Z0-9_-]+", "/tenant-{id}", path)
+        path = _TENANT_SEGMENT.sub("/tenant-{id}", path)
 
         return path
@@ -71,6 +71,10 @@
 _ai_job_latency_seconds = None
 _ai_queue_depth = None
 _security_decisions_total = None
+# AI planner cache metrics
+_ai_planner_cache_requests_total = None
+_ai_planner_cache_hit_ratio = None
+_ai_planner_cache_saved_seconds_total = None
 # Sprint 60 Phase 1: Dual-write migration metrics
 _ai_jobs_dual_write_total = None
 # Sprint 60 Phase 2.2: Read-routing metrics
@@ -83,6 +87,16 @@
 _relay_backfill_skipped_total = None
 _relay_backfill_errors_total = None
 _relay_backfill_duration_seconds = None
+# Worker pool lane latency metrics
+_worker_queue_wait_seconds = None
+_worker_run_seconds = None
+# Knowledge embedding cache metrics
+_embedding_cache_requests_total = None
+_embedding_cache_hit_ratio = None
+# Knowledge ingestion pipeline metrics
+_ingest_stage_seconds = None
+_ingest_stage_items_total = None
+_ingest_jobs_total = None
 
 
 def _is_enabled() -> bool:
@@ -113,10 +127,14 @@ def init_prometheus() -> None:
     global _outlook_draft_sent_total, _outlook_draft_send_seconds
     global _ai_planner_seconds, _ai_tokens_total, _ai_jobs_total
     global _ai_job_latency_seconds, _ai_queue_depth, _security_decisions_total
+    global _ai_planner_cache_requests_total, _ai_planner_cache_hit_ratio, _ai_planner_cache_saved_seconds_total
     global _ai_jobs_dual_write_total
     global _relay_job_read_path_total, _relay_job_list_read_path_total, _relay_job_list_results_total
     global _relay_backfill_scanned_total, _relay_backfill_migrated_total, _relay_backfill_skipped_total
     global _relay_backfill_errors_total, _relay_backfill_duration_seconds
+    global _worker_queue_wait_seconds, _worker_run_seconds
+    global _embedding_cache_requests_total, _embedding_cache_hit_ratio
+    global _ingest_stage_seconds, _ingest_stage_items_total, _ingest_jobs_total
 
     if not _is_enabled():
         _LOG.debug("Telemetry disabled, skipping Prometheus init")
@@ -346,6 +364,23 @@ def init_prometheus() -> None:
             ["workspace_id"],  # workspace_id label
         )
 
+        # AI planner cache metrics
+        _ai_planner_cache_requests_total = Counter(
+            "ai_planner_cache_requests_total",
+            "AI planner cache lookups by result",
+            ["result"],  # memory | redis | miss | invalid
+        )
+
+        _ai_planner_cache_hit_ratio = Gauge(
+            "ai_planner_cache_hit_ratio",
+            "AI planner cache hit ratio since process start",
+        )
+
+        _ai_planner_cache_saved_seconds_total = Counter(
+            "ai_planner_cache_saved_seconds_total",
+            "LLM latency avoided by AI planner cache hits, in seconds",
+        )
+
         _security_decisions_total = Counter(
             "security_decisions_total",
             "Security permission decisions",
@@ -409,6 +444,54 @@ def init_prometheus() -> None:
             buckets=[60, 300, 600, 1800, 3600, 7200, 14400],  # 1m, 5m, 10m, 30m, 1h, 2h, 4h
         )
 
+        # Worker pool lane latency metrics
+        _worker_queue_wait_seconds = Histogram(
+            "worker_queue_wait_seconds",
+            "Time jobs wait in a worker pool lane before starting",
+            ["lane"],  # realtime | bulk
+            buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0],
+        )
+
+        _worker_run_seconds = Histogram(
+            "worker_run_seconds",
+            "Worker pool job execution time in seconds",
+            ["lane"],  # realtime | bulk
+            buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0],
+        )
+
+        # Knowledge embedding cache metrics
+        _embedding_cache_requests_total = Counter(
+            "embedding_cache_requests_total",
+            "Embedding cache lookups by result",
+            ["model", "result"],  # result: memory | disk | redis | miss
+        )
+
+        _embedding_cache_hit_ratio = Gauge(
+            "embedding_cache_hit_ratio",
+            "Embedding cache hit ratio since process start",
+            ["model"],
+        )
+
+        # Knowledge ingestion pipeline metrics
+        _ingest_stage_seconds = Histogram(
+            "ingest_stage_seconds",
+            "Knowledge ingestion stage work time per batch in seconds",
+            ["stage"],  # extract | chunk | embed | store
+            buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+        )
+
+        _ingest_stage_items_total = Counter(
+            "ingest_stage_items_total",
+            "Items processed by knowledge ingestion stage (segments, chunks, vectors)",
+            ["stage"],
+        )
+
+        _ingest_jobs_total = Counter(
+            "ingest_jobs_total",
+            "Knowledge ingestion jobs finished by status",
+            ["status"],  # completed | failed
+        )
+
         _METRICS_INITIALIZED = True
         _LOG.info("Prometheus metrics initialized (port configured via PROM_EXPORT_PORT, default 9090)")
 
@@ -457,6 +540,42 @@ def record_queue_job(job_type: str, duration_seconds: float) -> None:
         _LOG.warning("Failed to record queue job metric: %s", exc)
 
 
+def record_worker_job(lane: str, wait_seconds: float, run_seconds: float) -> None:
+    """Record worker pool queue wait and run time.
+
+    Args:
+        lane: Priority lane (realtime, bulk)
+        wait_seconds: Time from submit to start
+        run_seconds: Time from start to finish
+    """
+    if not _PROM_AVAILABLE or not _METRICS_INITIALIZED:
+        return
+
+    try:
+        _worker_queue_wait_seconds.labels(lane=lane).observe(wait_seconds)
+        _worker_run_seconds.labels(lane=lane).observe(run_seconds)
+    except Exception as exc:
+        _LOG.warning("Failed to record worker job metric: %s", exc)
+
+
+def record_embedding_cache(model: str, result: str, hit_ratio: float) -> None:
+    """Record an embedding cache lookup.
+
+    Args:
+        model: Backend-qualified model (e.g., openai:text-embedding-ada-002)
+        result: Tier that served the lookup (memory, disk, redis) or miss
+        hit_ratio: Current overall hit ratio of the cache
+    """
+    if not _PROM_AVAILABLE or not _METRICS_INITIALIZED:
+        return
+
+    try:
+        _embedding_cache_requests_total.labels(model=model, result=result).inc()
+        _embedding_cache_hit_ratio.labels(model=model).set(hit_ratio)
+    except Exception as exc:
+        _LOG.warning("Failed to record embedding cache metric: %s", exc)
+
+
 def set_queue_depth(queue_name: str, depth: int) -> None:
     """Set current queue depth gauge.
 
@@ -692,6 +811,27 @@ def record_ai_planner(status: str, duration_seconds: float, workspace_id: str =
         _LOG.warning("Failed to record AI planner metric: %s", exc)
 
 
+def record_ai_planner_cache(result: str, hit_ratio: float, saved_seconds: float = 0.0) -> None:
+    """Record an AI planner cache lookup.
+
+    Args:
+        result: Tier that served the lookup (memory, redis), miss, or invalid
+            (cached plan no longer valid for the action catalog)
+        hit_ratio: Current overall hit ratio of the cache
+        saved_seconds: LLM latency avoided by this lookup (0 on a miss)
+    """
+    if not _PROM_AVAILABLE or not _METRICS_INITIALIZED:
+        return
+
+    try:
+        _ai_planner_cache_requests_total.labels(result=result).inc()
+        _ai_planner_cache_hit_ratio.set(hit_ratio)
+        if saved_seconds > 0:
+            _ai_planner_cache_saved_seconds_total.inc(saved_seconds)
+    except Exception as exc:
+        _LOG.warning("Failed to record AI planner cache metric: %s", exc)
+
+
 def record_ai_tokens(tokens_input: int, tokens_output: int) -> None:
     """Record AI token usage metrics.
 
@@ -841,3 +981,36 @@ def record_job_list_results(workspace_id: str, count: int) -> None:
         _relay_job_list_results_total.labels(workspace_id=workspace_id).inc(count)
     except Exception as exc:
         _LOG.warning("Failed to record job list results metric: %s", exc)
+
+
+def record_ingest_stage(stage: str, items: int, seconds: float) -> None:
+    """Record one batch of knowledge ingestion stage work.
+
+    Args:
+        stage: Pipeline stage (extract, chunk, embed, store)
+        items: Items produced by the batch
+        seconds: Work time, excluding time blocked on full channels
+    """
+    if not _PROM_AVAILABLE or not _METRICS_INITIALIZED:
+        return
+
+    try:
+        _ingest_stage_seconds.labels(stage=stage).observe(seconds)
+        _ingest_stage_items_total.labels(stage=stage).inc(items)
+    except Exception as exc:
+        _LOG.warning("Failed to record ingest stage metric: %s", exc)
+
+
+def record_ingest_job(status: str) -> None:
+    """Record a finished knowledge ingestion job.
+
+    Args:
+        status: Final job status (completed, failed)
+    """
+    if not _PROM_AVAILABLE or not _METRICS_INITIALIZED:
+        return
+
+    try:
+        _ingest_jobs_total.labels(status=status).inc()
+    except Exception as exc:
+        _LOG.warning("Failed to record ingest job metric: %s", exc)
@@ -0,0 +1,423 @@
+"""
+Streaming batch template engine.
+
+Renders a template over a CSV without materializing it:
+- Rows are read lazily and shipped to a process pool in chunks (Jinja
+  rendering and validation are CPU-bound)
+- Results are written in CSV order to JSONL or Parquet
+- Per-row cost estimates are folded into the same pass (no second render)
+- Ordered checkpoints make interrupted runs resumable; a budget stop leaves a
+  valid, resumable prefix that never includes the row that would cross the limit
+
+Output record fields: row, status (ok|error), inputs, rendered_output, error,
+cost_usd, tokens_estimated.
+
+Checkpoint: {output}.checkpoint.json, rewritten atomically every
+checkpoint_every rows. JSONL output is truncated back to the checkpointed
+offset on resume; Parquet output is a directory of part files, one per
+checkpoint interval.
+"""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+from jinja2 import TemplateError
+
+from .templates import (
+    TemplateDef,
+    _default_workflow_projection,
+    _get_cached_template,
+    _get_sandbox_env,
+    check_budget,
+    estimate_cost_for_prompt_length,
+    validate_inputs,
+)
+
+OUTPUT_FORMATS = ("jsonl", "parquet")
+
+_PARQUET_COLUMNS = ("row", "status", "inputs", "rendered_output", "error", "cost_usd", "tokens_estimated")
+
+
+class BatchError(Exception):
+    """Raised when a batch cannot start or resume."""
+
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Input
+# ---------------------------------------------------------------------------
+
+
+def iter_csv_rows(csv_path: str | Path, template: TemplateDef) -> Iterator[tuple[int, dict[str, Any]]]:
+    """
+    Lazily yield (row_number, template_inputs) from a CSV file.
+
+    Args:
+        csv_path: Path to CSV file
+        template: Template definition (selects which columns are kept)
+
+    Yields:
+        Tuples of (1-based file row number, input dict); header is row 1
+
+    Raises:
+        BatchError: If the file is missing, empty, or lacks required columns
+    """
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        raise BatchError(f"CSV file not found: {csv_path}")
+
+    required_ids = {inp.id for inp in template.inputs if inp.required}
+    all_ids = {inp.id for inp in template.inputs}
+
+    with open(csv_path, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+
+        if not reader.fieldnames:
+            raise BatchError("CSV file is empty or has no headers")
+
+        missing = required_ids - set(reader.fieldnames)
+        if missing:
+            raise BatchError(f"Missing required columns: {', '.join(sorted(missing))}")
+
+        for row_num, row in enumerate(reader, start=2):  # Start at 2 (1 is header)
+            yield row_num, {key: val for key, val in row.items() if key in all_ids}
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+_worker_template: TemplateDef | None = None
+_worker_projection: Any = None
+
+
+def _init_worker(template: TemplateDef) -> None:
+    """Process pool initializer: bind template and precompute the cost projection once."""
+    global _worker_template, _worker_projection
+    _worker_template = template
+    _worker_projection = _default_workflow_projection()
+
+
+def _process_row(row_num: int, row_data: dict[str, Any]) -> dict[str, Any]:
+    """Validate, render, and cost one row using the worker's template."""
+    template = _worker_template
+    record: dict[str, Any] = {
+        "row": row_num,
+        "status": "error",
+        "inputs": row_data,
+        "rendered_output": None,
+        "error": None,
+        "cost_usd": 0.0,
+        "tokens_estimated": 0,
+    }
+
+    errors = validate_inputs(template, row_data)
+    if errors:
+        record["error"] = f"Row {row_num}: {'; '.join(errors)}"
+        return record
+
+    try:
+        compiled = _get_cached_template(template, _get_sandbox_env(template.context))
+        rendered = compiled.render(**row_data)
+    except TemplateError as e:
+        record["error"] = f"Row {row_num}: Template rendering failed: {e}"
+        return record
+    except Exception as e:
+        record["error"] = f"Row {row_num}: Unexpected error during rendering: {e}"
+        return record
+
+    if _worker_projection is not None:
+        estimate = estimate_cost_for_prompt_length(len(rendered), _worker_projection)
+    else:
+        estimate = {"cost_usd": 0.0, "tokens_estimated": 0}
+
+    record.update(
+        status="ok",
+        rendered_output=rendered,
+        cost_usd=estimate["cost_usd"],
+        tokens_estimated=estimate["tokens_estimated"],
+    )
+    return record
+
+
+def _process_chunk(chunk: list[tuple[int, dict[str, Any]]]) -> list[dict[str, Any]]:
+    return [_process_row(row_num, row_data) for row_num, row_data in chunk]
+
+
+def _chunked(items: Iterator[Any], size: int) -> Iterator[list[Any]]:
+    while True:
+        chunk = list(itertools.islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _iter_results(
+    rows: Iterator[tuple[int, dict[str, Any]]], template: TemplateDef, workers: int, chunk_size: int
+) -> Iterator[dict[str, Any]]:
+    """Yield processed records in input order, keeping a bounded number of chunks in flight."""
+    if workers <= 0:
+        _init_worker(template)
+        for chunk in _chunked(rows, chunk_size):
+            yield from _process_chunk(chunk)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(template,))
+    pending: deque = deque()
+    try:
+        for chunk in _chunked(rows, chunk_size):
+            pending.append(executor.submit(_process_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+
+class _JsonlSink:
+    """Append-only JSONL writer that can truncate back to a checkpointed offset."""
+
+    def __init__(self, path: Path, offset: int):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(path, "a+b")
+        self._f.truncate(offset)
+        self._f.seek(offset)
+
+    def write(self, record: dict[str, Any]) -> None:
+        self._f.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    def flush(self) -> dict[str, Any]:
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        return {"output_offset": self._f.tell()}
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class _ParquetSink:
+    """Buffers records and writes one Parquet part file per checkpoint."""
+
+    def __init__(self, path: Path, parts: int):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise BatchError("Parquet output requires pyarrow. Install with: pip install pyarrow") from e
+
+        self._dir = path
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._parts = parts
+        self._buffer: list[dict[str, Any]] = []
+
+        # Drop part files written after the last checkpoint
+        for stale in self._dir.glob("part-*.parquet"):
+            if int(stale.stem.split("-")[1]) >= parts:
+                stale.unlink()
+
+    def write(self, record: dict[str, Any]) -> None:
+        record = dict(record)
+        record["inputs"] = json.dumps(record["inputs"], ensure_ascii=False)
+        self._buffer.append(record)
+
+    def flush(self) -> dict[str, Any]:
+        if self._buffer:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.table({col: [r[col] for r in self._buffer] for col in _PARQUET_COLUMNS})
+            part_path = self._dir / f"part-{self._parts:05d}.parquet"
+            temp_path = self._dir / f".{part_path.name}.tmp"
+            pq.write_table(table, temp_path)
+            temp_path.replace(part_path)
+            self._parts += 1
+            self._buffer = []
+        return {"parts": self._parts}
+
+    def close(self) -> None:
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+
+def get_checkpoint_path(output_path: str | Path) -> Path:
+    """Get the checkpoint file path for an output path."""
+    output_path = Path(output_path)
+    return output_path.parent / f"{output_path.name}.checkpoint.json"
+
+
+def _write_checkpoint(path: Path, state: dict[str, Any]) -> None:
+    temp_path = path.parent / f".{path.name}.tmp"
+    temp_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    temp_path.replace(path)
+
+
+def run_batch(
+    template: TemplateDef,
+    csv_path: str | Path,
+    output_path: str | Path | None = None,
+    output_format: str | None = None,
+    workers: int | None = None,
+    chunk_size: int = 64,
+    checkpoint_every: int = 1000,
+    resume: bool = True,
+    budget_usd: float | None = None,
+    budget_tokens: int | None = None,
+    dry_run: bool = False,
+    on_progress: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Stream a CSV through a template, writing ordered results with checkpoints.
+
+    Args:
+        template: Template definition
+        csv_path: Input CSV path
+        output_path: JSONL file or Parquet directory (required unless dry_run)
+        output_format: jsonl or parquet (default: parquet if output_path ends in .parquet, else jsonl)
+        workers: Process pool size (default: os.cpu_count(); 0 renders in-process)
+        chunk_size: Rows per task sent to a worker
+        checkpoint_every: Rows between checkpoints (and Parquet part files)
+        resume: Continue from an existing checkpoint instead of starting over
+        budget_usd: Stop before the row that would take the running cost estimate past this
+        budget_tokens: Stop before the row that would take the running token estimate past this
+        dry_run: Estimate cost only; no output or checkpoint is written
+        on_progress: Called with the running totals after each checkpoint
+
+    Returns:
+        Dict with rows_processed, rows_ok, rows_failed, total_cost_usd,
+        total_tokens, within_budget, budget_error, resumed_from, complete,
+        errors (first 100 messages), duration_s, output_path, checkpoint_path
+
+    Raises:
+        BatchError: If input is invalid or the checkpoint doesn't match this batch
+    """
+    start = time.time()
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    totals = {"rows_processed": 0, "rows_ok": 0, "rows_failed": 0, "total_cost_usd": 0.0, "total_tokens": 0}
+    errors: list[str] = []
+    sink = None
+    checkpoint_path = None
+    resumed_from = 0
+    identity = {"csv_path": str(Path(csv_path).resolve()), "template": template.key, "version": template.version}
+
+    if not dry_run:
+        if output_path is None:
+            raise BatchError("output_path is required unless dry_run is set")
+        output_path = Path(output_path)
+        output_format = output_format or ("parquet" if output_path.suffix == ".parquet" else "jsonl")
+        if output_format not in OUTPUT_FORMATS:
+            raise BatchError(f"Unknown output format: {output_format}. Must be one of {OUTPUT_FORMATS}")
+
+        checkpoint_path = get_checkpoint_path(output_path)
+        state: dict[str, Any] = {}
+        if resume and checkpoint_path.exists():
+            state = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+            if state.get("identity") != identity or state.get("format") != output_format:
+                raise BatchError(f"Checkpoint {checkpoint_path} belongs to a different batch; use resume=False")
+            resumed_from = state["rows_processed"]
+            totals.update({k: state["totals"][k] for k in totals})
+
+        if output_format == "jsonl":
+            sink = _JsonlSink(output_path, state.get("output_offset", 0))
+        else:
+            sink = _ParquetSink(output_path, state.get("parts", 0))
+
+    def checkpoint(complete: bool) -> None:
+        if sink is not None:
+            sink_state = sink.flush()
+            _write_checkpoint(
+                checkpoint_path,
+                {
+                    "identity": identity,
+                    "format": output_format,
+                    "rows_processed": totals["rows_processed"],
+                    "totals": totals,
+                    "complete": complete,
+                    **sink_state,
+                },
+            )
+        if on_progress:
+            on_progress(dict(totals))
+
+    within_budget = True
+    budget_error = ""
+    complete = False
+
+    try:
+        rows = itertools.islice(iter_csv_rows(csv_path, template), resumed_from, None)
+        results = closing(_iter_results(rows, template, workers, chunk_size))
+        since_checkpoint = 0
+
+        with results as records:
+            for record in records:
+                if record["status"] == "ok" and (budget_usd is not None or budget_tokens is not None):
+                    # Check the projected totals first: the crossing row is neither written nor
+                    # checkpointed, so resuming under the same budget never overshoots
+                    within_budget, _, budget_error = check_budget(
+                        totals["total_cost_usd"] + record["cost_usd"],
+                        totals["total_tokens"] + record["tokens_estimated"],
+                        budget_usd,
+                        budget_tokens,
+                    )
+                    if not within_budget:
+                        break
+
+                totals["rows_processed"] += 1
+                if record["status"] == "ok":
+                    totals["rows_ok"] += 1
+                    totals["total_cost_usd"] += record["cost_usd"]
+                    totals["total_tokens"] += record["tokens_estimated"]
+                else:
+                    totals["rows_failed"] += 1
+                    if len(errors) < 100:
+                        errors.append(record["error"])
+
+                if sink is not None:
+                    sink.write(record)
+
+                since_checkpoint += 1
+                if since_checkpoint >= checkpoint_every:
+                    checkpoint(complete=False)
+                    since_checkpoint = 0
+            else:
+                complete = True
+
+        checkpoint(complete=complete)
+    finally:
+        if sink is not None:
+            sink.close()
+
+    return {
+        **totals,
+        "total_cost_usd": round(totals["total_cost_usd"], 4),
+        "within_budget": within_budget,
+        "budget_error": budget_error,
+        "resumed_from": resumed_from,
+        "complete": complete,
+        "errors": errors,
+        "duration_s": round(time.time() - start, 3),
+        "output_path": str(output_path) if output_path is not None else None,
+        "checkpoint_path": str(checkpoint_path) if checkpoint_path is not None else None,
+    }
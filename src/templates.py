@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import copy
 import csv
-import hashlib
 import json
+import os
 import re
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
@@ -32,10 +35,19 @@
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 STYLES_DIR.mkdir(parents=True, exist_ok=True)
 
+# Bounded LRU size for both the catalog (parsed YAML) and compiled template caches
+TEMPLATE_CACHE_MAX_ENTRIES = int(os.getenv("TEMPLATE_CACHE_MAX_ENTRIES", "256"))
+
 # Template compilation cache
-# Key: (template_path, content_hash) -> Value: compiled Jinja2 Template
-_template_cache: dict[tuple[str, str], Template] = {}
-_cache_stats = {"hits": 0, "misses": 0}
+# Key: (template_path, context, body) -> Value: compiled Jinja2 Template.
+# Keying on the body string itself (whose hash Python caches on the str object)
+# avoids re-hashing the body with SHA-256 on every render.
+_template_cache: OrderedDict[tuple[str, str, str], Template] = OrderedDict()
+_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_cache_lock = threading.Lock()
+
+# Sandboxed Jinja2 environments, one per output context
+_env_cache: dict[str, Environment] = {}
 
 
 class TemplateValidationError(Exception):
@@ -177,33 +189,208 @@ def _parse_template(path: Path) -> TemplateDef:
     )
 
 
-def list_templates() -> list[TemplateDef]:
+class TemplateCatalogCache:
     """
-    List all valid templates from templates/ directory.
+    LRU cache of parsed templates keyed by path and (mtime_ns, size).
 
-    Returns:
-        List of TemplateDef objects. Invalid templates are logged but not returned.
+    A template file is re-read and re-validated only when its stat signature
+    changes. When a filesystem watcher is active, the whole listing is reused
+    until the watcher reports a change, so steady-state listing does no I/O.
     """
-    TEMPLATES_DIR.mkdir(exist_ok=True, parents=True)
-    CUSTOM_TEMPLATES_DIR.mkdir(exist_ok=True, parents=True)
 
-    out: list[TemplateDef] = []
-    search_paths = [
-        *sorted(TEMPLATES_DIR.glob("*.yaml")),
-        *sorted(CUSTOM_TEMPLATES_DIR.glob("*.yaml")),
-    ]
+    def __init__(self, max_entries: int = TEMPLATE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        # path -> (signature, TemplateDef or None, error or None)
+        self._entries: OrderedDict[str, tuple[tuple[int, int], TemplateDef | None, Exception | None]] = OrderedDict()
+        self._listing: dict[tuple[str, ...], list[TemplateDef]] = {}
+        self._lock = threading.Lock()
+        self._observer = None
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
 
-    for yml in search_paths:
+    @property
+    def watching(self) -> bool:
+        """True if a filesystem watcher is keeping the listing fresh."""
+        return self._observer is not None
+
+    def get(self, path: Path) -> TemplateDef | None:
+        """
+        Get the parsed template for path, parsing only if the file changed.
+
+        Args:
+            path: Path to template YAML file
+
+        Returns:
+            TemplateDef, or None if the template is invalid (warning printed once per change)
+        """
+        key = str(path)
+        st = path.stat()
+        signature = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]
+            self.stats["misses"] += 1
+
+        template: TemplateDef | None = None
+        error: Exception | None = None
         try:
-            template = _parse_template(yml)
-            out.append(template)
+            template = _parse_template(path)
         except TemplateValidationError as e:
             # Log but don't crash - allow UI to show error
+            error = e
             print(f"Warning: {e}")
         except Exception as e:
-            print(f"Warning: Failed to load {yml}: {e}")
+            error = e
+            print(f"Warning: Failed to load {path}: {e}")
+
+        with self._lock:
+            self._entries[key] = (signature, template, error)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+        return template
+
+    def list(self, directories: tuple[Path, ...]) -> list[TemplateDef]:
+        """
+        List valid templates in directories (each sorted by filename).
+
+        Args:
+            directories: Directories to scan for *.yaml
+
+        Returns:
+            List of cached TemplateDef objects (callers must not mutate them)
+        """
+        listing_key = tuple(str(d) for d in directories)
+
+        with self._lock:
+            if self._observer is not None and listing_key in self._listing:
+                self.stats["hits"] += 1
+                return self._listing[listing_key]
+
+        out: list[TemplateDef] = []
+        for directory in directories:
+            for yml in sorted(directory.glob("*.yaml")):
+                try:
+                    template = self.get(yml)
+                except OSError:
+                    continue  # Removed between glob and stat
+                if template is not None:
+                    out.append(template)
+
+        with self._lock:
+            self._listing[listing_key] = out
+        return out
+
+    def invalidate(self, path: Path | None = None) -> None:
+        """
+        Drop cached state for one path (or everything).
+
+        Args:
+            path: Template path to drop, or None to clear all entries
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(path), None)
+            self._listing.clear()
+
+    def clear(self) -> None:
+        """Clear all entries and reset stats."""
+        self.invalidate()
+        with self._lock:
+            self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def start_watching(self, directories: tuple[Path, ...]) -> bool:
+        """
+        Invalidate on filesystem events using watchdog (inotify on Linux).
+
+        Args:
+            directories: Directories to watch
+
+        Returns:
+            bool: True if watching; False if watchdog is not installed
+        """
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return False
+
+        cache = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                for attr in ("src_path", "dest_path"):
+                    changed = getattr(event, attr, None)
+                    if changed and str(changed).endswith(".yaml"):
+                        cache.invalidate(Path(changed))
+
+        self.stop_watching()
+        observer = Observer()
+        for directory in directories:
+            directory.mkdir(parents=True, exist_ok=True)
+            observer.schedule(_Handler(), str(directory), recursive=False)
+        observer.daemon = True
+        observer.start()
+
+        with self._lock:
+            self._observer = observer
+            self._listing.clear()
+        return True
+
+    def stop_watching(self) -> None:
+        """Stop the filesystem watcher if running."""
+        with self._lock:
+            observer, self._observer = self._observer, None
+            self._listing.clear()
+        if observer is not None:
+            observer.stop()
+            observer.join(timeout=5)
+
+
+_catalog = TemplateCatalogCache()
+
+
+def enable_template_watcher() -> bool:
+    """
+    Start watchdog-based invalidation for the template directories.
+
+    Returns:
+        bool: True if the watcher started; False if watchdog is unavailable
+    """
+    return _catalog.start_watching((TEMPLATES_DIR, CUSTOM_TEMPLATES_DIR))
+
 
-    return out
+def disable_template_watcher() -> None:
+    """Stop watchdog-based invalidation (listing falls back to stat checks)."""
+    _catalog.stop_watching()
+
+
+def list_templates() -> list[TemplateDef]:
+    """
+    List all valid templates from templates/ directory.
+
+    Parsed templates are cached by path and (mtime, size), so unchanged files
+    are never re-read or re-validated. Set TEMPLATE_CACHE_WATCH=true (or call
+    enable_template_watcher()) to also skip the per-file stat checks.
+
+    Returns:
+        List of TemplateDef objects. Invalid templates are logged but not returned.
+    """
+    TEMPLATES_DIR.mkdir(exist_ok=True, parents=True)
+    CUSTOM_TEMPLATES_DIR.mkdir(exist_ok=True, parents=True)
+
+    if not _catalog.watching and os.getenv("TEMPLATE_CACHE_WATCH", "false").lower() in ("true", "1", "yes"):
+        enable_template_watcher()
+
+    # Deep copies so callers can't mutate cached definitions (inputs/rendering are nested)
+    return [copy.deepcopy(t) for t in _catalog.list((TEMPLATES_DIR, CUSTOM_TEMPLATES_DIR))]
 
 
 # Custom Jinja2 filters for template safety
@@ -220,19 +407,6 @@ def to_title(text: str) -> str:
     return str(text).title()
 
 
-def _compute_template_hash(template_body: str) -> str:
-    """
-    Compute hash of template body for cache invalidation.
-
-    Args:
-        template_body: Template body text
-
-    Returns:
-        SHA256 hash of template body
-    """
-    return hashlib.sha256(template_body.encode("utf-8")).hexdigest()[:16]
-
-
 def _get_cached_template(template: TemplateDef, env: Environment) -> Template:
     """
     Get cached compiled template or compile and cache it.
@@ -244,35 +418,69 @@ def _get_cached_template(template: TemplateDef, env: Environment) -> Template:
     Returns:
         Compiled Jinja2 Template
     """
-    cache_key = (str(template.path), _compute_template_hash(template.body))
+    cache_key = (str(template.path), template.context, template.body)
 
-    if cache_key in _template_cache:
-        _cache_stats["hits"] += 1
-        return _template_cache[cache_key]
+    with _cache_lock:
+        compiled = _template_cache.get(cache_key)
+        if compiled is not None:
+            _template_cache.move_to_end(cache_key)
+            _cache_stats["hits"] += 1
+            return compiled
+        _cache_stats["misses"] += 1
 
     # Cache miss - compile template
-    _cache_stats["misses"] += 1
     compiled = env.from_string(template.body)
-    _template_cache[cache_key] = compiled
+
+    with _cache_lock:
+        _template_cache[cache_key] = compiled
+        while len(_template_cache) > TEMPLATE_CACHE_MAX_ENTRIES:
+            _template_cache.popitem(last=False)
+            _cache_stats["evictions"] += 1
 
     return compiled
 
 
-def get_cache_stats() -> dict[str, int]:
+def get_cache_stats() -> dict[str, Any]:
     """
     Get template cache statistics.
 
     Returns:
-        Dictionary with cache hits and misses
+        Dictionary with compile cache hits/misses/evictions and hit_rate, plus
+        catalog_* counters for parsed-template lookups
     """
-    return _cache_stats.copy()
+    with _cache_lock:
+        stats: dict[str, Any] = dict(_cache_stats)
+        stats["entries"] = len(_template_cache)
+
+    catalog = dict(_catalog.stats)
+    stats["catalog_hits"] = catalog["hits"]
+    stats["catalog_misses"] = catalog["misses"]
+    stats["catalog_evictions"] = catalog["evictions"]
+    stats["catalog_watching"] = _catalog.watching
+
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    catalog_lookups = catalog["hits"] + catalog["misses"]
+    stats["catalog_hit_rate"] = catalog["hits"] / catalog_lookups if catalog_lookups else 0.0
+
+    return stats
 
 
 def clear_template_cache() -> None:
-    """Clear the template compilation cache."""
-    global _template_cache, _cache_stats
-    _template_cache.clear()
-    _cache_stats = {"hits": 0, "misses": 0}
+    """Clear the template compilation and catalog caches."""
+    global _cache_stats
+    with _cache_lock:
+        _template_cache.clear()
+        _cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+    _catalog.clear()
+
+
+def _get_sandbox_env(context: str) -> Environment:
+    """Get the shared sandboxed environment for a context, creating it once."""
+    env = _env_cache.get(context)
+    if env is None:
+        env = _env_cache.setdefault(context, _create_sandbox_env(context))
+    return env
 
 
 def _create_sandbox_env(context: str) -> Environment:
@@ -427,8 +635,8 @@ def render_template(template: TemplateDef, variables: dict[str, Any]) -> str:
     if validation_errors:
         raise TemplateRenderError("Validation failed:\n" + "\n".join(f"  - {e}" for e in validation_errors))
 
-    # Create sandboxed environment
-    env = _create_sandbox_env(template.context)
+    # Shared sandboxed environment (compiled templates are bound to it)
+    env = _get_sandbox_env(template.context)
 
     try:
         # Use cached compiled template
@@ -511,13 +719,6 @@ def estimate_template_cost(template: TemplateDef, variables: dict[str, Any]) ->
     Returns:
         Dictionary with cost_usd, tokens_estimated, margin_pct
     """
-    # Import costs module
-    try:
-        from .costs import project_workflow_cost
-    except ImportError:
-        # Fallback if costs module unavailable
-        return {"cost_usd": 0.0, "tokens_estimated": 0, "margin_pct": 50.0, "note": "Cost estimation unavailable"}
-
     # Render template to estimate length
     try:
         rendered = render_template(template, variables)
@@ -526,17 +727,29 @@ def estimate_template_cost(template: TemplateDef, variables: dict[str, Any]) ->
         # Use template body length as fallback
         prompt_length = len(template.body)
 
+    return estimate_cost_for_prompt_length(prompt_length)
+
+
+def estimate_cost_for_prompt_length(prompt_length: int, projection: Any = None) -> dict[str, Any]:
+    """
+    Estimate DJP cost for an already-rendered prompt of the given length.
+
+    Args:
+        prompt_length: Rendered prompt length in characters
+        projection: Optional precomputed project_workflow_cost() result (reused across rows in batches)
+
+    Returns:
+        Dictionary with cost_usd, tokens_estimated, margin_pct
+    """
+    if projection is None:
+        projection = _default_workflow_projection()
+        if projection is None:
+            # Fallback if costs module unavailable
+            return {"cost_usd": 0.0, "tokens_estimated": 0, "margin_pct": 50.0, "note": "Cost estimation unavailable"}
+
     # Rough token estimation: ~4 chars per token
     estimated_prompt_tokens = prompt_length // 4
 
-    # Project workflow cost (uses default models)
-    projection = project_workflow_cost(
-        max_debaters=3,
-        max_tokens=1200,
-        require_citations=0,
-        fastpath=False,
-    )
-
     # Add template-specific token overhead
     total_tokens = projection.total_tokens_projected + estimated_prompt_tokens
 
@@ -556,6 +769,21 @@ def estimate_template_cost(template: TemplateDef, variables: dict[str, Any]) ->
     }
 
 
+def _default_workflow_projection() -> Any:
+    """Project workflow cost with default models, or None if the costs module is unavailable."""
+    try:
+        from .costs import project_workflow_cost
+    except ImportError:
+        return None
+
+    return project_workflow_cost(
+        max_debaters=3,
+        max_tokens=1200,
+        require_citations=0,
+        fastpath=False,
+    )
+
+
 def check_budget(
     estimated_cost: float, estimated_tokens: int, budget_usd: float | None = None, budget_tokens: int | None = None
 ) -> tuple[bool, str, str]:
@@ -812,6 +1040,7 @@ def clone_template(source_template: TemplateDef, new_name: str, new_description:
 
     # Write to custom directory
     target_path.write_text(yaml.dump(source_data, sort_keys=False), encoding="utf-8")
+    _catalog.invalidate(target_path)
 
     return target_path
 
@@ -842,6 +1071,7 @@ def update_template_yaml(template_path: Path, yaml_content: str) -> tuple[bool,
 
         # Write to file
         template_path.write_text(yaml_content, encoding="utf-8")
+        _catalog.invalidate(template_path)
 
         return True, []
 
@@ -872,6 +1102,7 @@ def delete_custom_template(template_path: Path) -> tuple[bool, str]:
 
     try:
         template_path.unlink()
+        _catalog.invalidate(template_path)
         return True, ""
     except Exception as e:
         return False, f"Error deleting template: {e}"
@@ -20,11 +20,11 @@
 from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
 
 from .auth.security import require_scopes
-from .knowledge import router as knowledge_router
+from .common.lazy_router import include_lazy_router, load_lazy_routers
+from .common.middleware.body_limit import BodySizeLimitMiddleware
+from .common.middleware.security_headers import SecurityHeadersMiddleware
 from .limits.limiter import RateLimitExceeded, get_rate_limiter
 
 # Note: stream auth module imports deferred to avoid startup issues
@@ -32,29 +32,6 @@
 # from .stream.limits import RateLimiter
 from .telemetry import init_telemetry
 from .telemetry.middleware import TelemetryMiddleware
-from .templates import list_templates
-from .templates import render_template as render_template_content
-
-# Sprint 58 Slice 5: Request body size limit (512 KiB for security hardening)
-MAX_BODY_BYTES = 512 * 1024
-
-
-class BodySizeLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware to limit request body size (Sprint 58 hardening)."""
-
-    async def dispatch(self, request: Request, call_next):
-        """Check request body size before processing."""
-        body = await request.body()
-        if len(body) > MAX_BODY_BYTES:
-            return Response("Request body too large (max 512 KiB)", status_code=413)
-
-        # Re-inject body for downstream consumption
-        async def receive():
-            return {"type": "http.request", "body": body, "more_body": False}
-
-        request._receive = receive
-        return await call_next(request)
-
 
 app = FastAPI(
     title="DJP Workflow API",
@@ -77,6 +54,9 @@ def custom_openapi():
 
     from fastapi.openapi.utils import get_openapi
 
+    # Lazy routers must be imported for their paths to appear in the schema
+    load_lazy_routers(app)
+
     openapi_schema = get_openapi(
         title=app.title,
         version=app.version,
@@ -176,8 +156,8 @@ def custom_openapi():
     max_age=600,  # Cache preflight for 10 minutes
 )
 
-# R2 Phase 3: Register Knowledge API router
-app.include_router(knowledge_router)
+# R2 Phase 3: Register Knowledge API router (imported on first /api/v1/knowledge request)
+include_lazy_router(app, f"{__package__}.knowledge.api", prefix="/api/v1/knowledge")
 
 
 # Sprint 51 Phase 2: Rate limit exception handler
@@ -194,40 +174,7 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
 
 
 # Sprint 51 Phase 2: Security headers middleware
-@app.middleware("http")
-async def add_security_headers(request: Request, call_next):
-    """Add security headers to all responses."""
-    response = await call_next(request)
-
-    # HSTS: Force HTTPS for 180 days, include subdomains, preload
-    response.headers["Strict-Transport-Security"] = "max-age=15552000; includeSubDomains; preload"
-
-    # CSP: Content security policy for UI + API (Sprint 60 Phase 3)
-    csp_directives = [
-        "default-src 'self'",
-        "connect-src 'self' https://relay-production-f2a6.up.railway.app https://*.vercel.app",
-        "img-src 'self' data:",
-        "script-src 'self' 'unsafe-inline' https://cdn.tailwindcss.com https://cdn.jsdelivr.net",  # Allow CDN for UI libraries + inline scripts
-        "style-src 'self' 'unsafe-inline' https://cdn.tailwindcss.com",  # Tailwind injects styles
-        "frame-ancestors 'none'",  # Prevent clickjacking
-        "base-uri 'self'",
-        "form-action 'self'",
-    ]
-    response.headers["Content-Security-Policy"] = "; ".join(csp_directives)
-
-    # Referrer policy: Don't leak referrer information
-    response.headers["Referrer-Policy"] = "no-referrer"
-
-    # Prevent MIME sniffing
-    response.headers["X-Content-Type-Options"] = "nosniff"
-
-    # Prevent clickjacking
-    response.headers["X-Frame-Options"] = "DENY"
-
-    # XSS protection (legacy, but doesn't hurt)
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-
-    return response
+app.add_middleware(SecurityHeadersMiddleware)
 
 
 class TemplateInfo(BaseModel):
@@ -399,6 +346,8 @@ def ready():
 
     # Check templates loadable
     try:
+        from .templates import list_templates
+
         templates = list_templates()
         checks["templates"] = len(templates) > 0
     except Exception:
@@ -463,6 +412,8 @@ def get_templates():
     Returns:
         List of template metadata with inputs schema
     """
+    from .templates import list_templates
+
     try:
         templates = list_templates()
 
@@ -500,6 +451,9 @@ def render_template(request: RenderRequest):
     Returns:
         Rendered HTML and/or DOCX (base64 encoded)
     """
+    from .templates import list_templates
+    from .templates import render_template as render_template_content
+
     try:
         # Get template
         templates = list_templates()
@@ -1796,6 +1750,8 @@ async def stream_response(
     """
     from fastapi.responses import StreamingResponse
 
+    request_start = time.perf_counter()
+
     # Authenticate via Authorization header or reject with 401
     auth_header = request.headers.get("Authorization", "")
     if not auth_header or not auth_header.startswith("Bearer "):
@@ -1887,6 +1843,7 @@ async def generate_sse_stream() -> AsyncIterator[str]:
             # Stream response in chunks
             chunk_size = 7  # Characters per chunk
             current_pos = 0
+            ttfv_recorded = False
 
             while current_pos < len(response_text):
                 if state.is_closed:
@@ -1916,6 +1873,11 @@ async def generate_sse_stream() -> AsyncIterator[str]:
                     "cost_usd": cost_usd,
                 }
                 sse_event = await format_sse_event("message_chunk", event_data, event_id)
+                if not ttfv_recorded:
+                    from .monitoring.metrics_adapter import record_stream_ttfv
+
+                    record_stream_ttfv((time.perf_counter() - request_start) * 1000, user_id, stream_id)
+                    ttfv_recorded = True
                 yield sse_event
 
                 # Small delay between chunks for demo